@@ -2,6 +2,7 @@
 # 초안만 일단
 # CRUD는 백엔드 개발 중 언제든지 수정될 수 있음
 
+import math
 from datetime import datetime, timezone, timedelta
 
 # 한국 표준시 (KST = UTC+9)
@@ -12,6 +13,18 @@ from sqlalchemy.orm import Session
 
 from app import models
 from app.constants.speed_constants import SLOW_WALK_SPEED_RATIO
+from app.utils.polyline import RESOLUTION_TOLERANCES_M, encode_polyline, simplify_coordinates
+from app.utils.principal_cache import principal_cache
+from app.utils.route_catalog import route_catalog
+from app.utils.route_itinerary import canonical_json
+from app.utils.segment_pack import PACK_FORMAT_VERSION, pack_segments
+from app.utils.speed_profile_cache import speed_profile_cache
+from app.utils.user_speed_model import (
+    PersonalSpeedModel,
+    SpeedModelStats,
+    speed_features,
+    speed_model_cache,
+)
 
 
 # ================================
@@ -57,6 +70,7 @@ def update_last_login(db: Session, user_id: int):
         user.last_login = datetime.utcnow()
         db.commit()
         db.refresh(user)
+        principal_cache.invalidate(user_id)
     return user
 
 
@@ -67,8 +81,23 @@ def get_all_users(db: Session):
 def delete_user(db: Session, user_id: int):
     user = get_user_by_id(db, user_id)
     if user:
+        # 사용자 로그만 참조하던 경로(route_itineraries)도 함께 삭제
+        itinerary_hashes = [
+            row[0]
+            for row in db.query(models.NavigationLogs.route_itinerary_hash)
+            .filter(
+                models.NavigationLogs.user_id == user_id,
+                models.NavigationLogs.route_itinerary_hash.isnot(None),
+            )
+            .distinct()
+        ]
         db.delete(user)
+        db.flush()
+        delete_orphan_route_itineraries(db, itinerary_hashes)
         db.commit()
+        principal_cache.invalidate(user_id)
+        speed_profile_cache.invalidate(user_id)
+        speed_model_cache.invalidate(user_id)
     return user
 
 
@@ -142,6 +171,8 @@ def delete_health_data(db: Session, health_data_id: int):
 def create_speed_profile(db: Session, **kwargs):
     profile = models.ActivitySpeedProfile(**kwargs)
     db.add(profile)
+    db.flush()
+    speed_profile_cache.stage(db, profile.user_id, profile.activity_type, profile)
     db.commit()
     db.refresh(profile)
     return profile
@@ -162,11 +193,28 @@ def delete_speed_profile(db: Session, profile_id: int):
         .first()
     )
     if profile:
+        speed_profile_cache.stage(db, profile.user_id, profile.activity_type)
         db.delete(profile)
         db.commit()
     return profile
 
 
+# 측정 횟수 구간별 알파값 (data_points_count 상한, 알파)
+# 초기에는 과감하게 반영(Cold Start 해결), 측정이 쌓일수록 안정화(노이즈 제거)
+ALPHA_SCHEDULE = ((3, 0.50), (10, 0.40), (20, 0.30), (50, 0.20))
+ALPHA_LONG_TERM = 0.15
+
+# 프로필이 있지만 속도가 비어 있을 때 기준 속도 (km/h)
+DEFAULT_PROFILE_SPEED_KMH = 4.0
+
+# 속도 프로필에 반영하는 네비게이션 로그의 최소 실제 보행 시간 (초)
+PROFILE_MIN_WALKING_SECONDS = 300
+
+# speed_history.ck_speed_range와 같은 범위 (km/h)
+SPEED_HISTORY_MIN_KMH = 2.0
+SPEED_HISTORY_MAX_KMH = 8.0
+
+
 def get_alpha(data_points_count: int) -> float:
     """
     측정 횟수에 따른 동적 알파값 계산
@@ -177,16 +225,21 @@ def get_alpha(data_points_count: int) -> float:
     Returns:
         알파값 (새 데이터의 가중치)
     """
-    if data_points_count <= 3:
-        return 0.50  # 초기: 과감한 반영 (Cold Start 해결)
-    elif data_points_count <= 10:
-        return 0.40
-    elif data_points_count <= 20:
-        return 0.30
-    elif data_points_count <= 50:
-        return 0.20
-    else:
-        return 0.15  # 장기: 안정화 (노이즈 제거)
+    for max_count, alpha in ALPHA_SCHEDULE:
+        if data_points_count <= max_count:
+            return alpha
+    return ALPHA_LONG_TERM
+
+
+def _alpha_expression(count_column):
+    """get_alpha와 같은 구간의 SQL CASE 식 (UPDATE 한 번으로 가중 평균 계산용)"""
+    from sqlalchemy import case, func
+
+    count = func.coalesce(count_column, 0)
+    return case(
+        *[(count <= max_count, alpha) for max_count, alpha in ALPHA_SCHEDULE],
+        else_=ALPHA_LONG_TERM,
+    )
 
 
 def update_speed_profile_with_weighted_avg(
@@ -198,10 +251,16 @@ def update_speed_profile_with_weighted_avg(
     weight_new: float = None,
     source: str = "navigation_log",
     navigation_log_id: int = None,
+    commit: bool = True,
 ):
     """
     가중 평균으로 속도 프로필 업데이트 + 이력 기록
     
+    프로필은 UPDATE 한 번으로 제자리 갱신하고(알파값도 SQL에서 계산),
+    이력은 speed_history에 1행만 추가합니다.
+    (speed_history.ck_speed_range 밖의 속도는 이력을 남기지 않음 - 잘라서 기록하면 프로필과 맞지 않으므로)
+    로그가 쌓여도 로그 1건당 쓰기량이 일정합니다. (speed_history JSONB 컬럼은 더 이상 갱신하지 않음)
+    
     Args:
         db: 데이터베이스 세션
         user_id: 사용자 ID
@@ -211,89 +270,81 @@ def update_speed_profile_with_weighted_avg(
         weight_new: 새 데이터 가중치 (None이면 동적 계산)
         source: 속도 출처 ('navigation_log', 'manual', 'health_connect', 'initial')
         navigation_log_id: 네비게이션 로그 ID (있는 경우)
+        commit: False면 commit하지 않음 (호출한 쪽 트랜잭션에 포함)
     
     Returns:
-        업데이트된 ActivitySpeedProfile 객체
+        갱신된 프로필 값 (profile_id, speed_case1, speed_case2, data_points_count)
     """
-    from datetime import datetime
-    
-    # 기존 프로필 조회
-    profile = (
-        db.query(models.ActivitySpeedProfile)
-        .filter(
-            models.ActivitySpeedProfile.user_id == user_id,
-            models.ActivitySpeedProfile.activity_type == activity_type,
-        )
-        .first()
+    from sqlalchemy import Numeric, cast, func, insert, update
+    from sqlalchemy.exc import IntegrityError
+
+    profile = models.ActivitySpeedProfile
+    returning = (
+        profile.profile_id,
+        profile.speed_case1,
+        profile.speed_case2,
+        profile.data_points_count,
     )
-    
-    if profile:
-        # 동적 알파값 계산 (weight_new, weight_old가 None인 경우)
-        if weight_new is None:
-            alpha = get_alpha(profile.data_points_count)
-            weight_new = alpha
-            weight_old = 1.0 - alpha
-        
-        # 기존 프로필 있음 - 가중 평균 계산
-        old_speed = float(profile.speed_case1 or 4.0)
-        updated_speed = old_speed * weight_old + new_speed_kmh * weight_new
-        
-        profile.speed_case1 = round(updated_speed, 2)
-        # Case2도 자동 업데이트 (비율 유지)
-        profile.speed_case2 = round(updated_speed * SLOW_WALK_SPEED_RATIO, 2)
-        profile.data_points_count += 1
-        
-        # 이력 추가 (KST 기준 타임스탬프)
-        history_entry = {
-            "speed_kmh": round(new_speed_kmh, 2),
-            "source": source,
-            "timestamp": datetime.now(KST).isoformat(),
-            "navigation_log_id": navigation_log_id,
-            "old_avg": round(old_speed, 2),
-            "new_avg": round(updated_speed, 2),
-            "alpha": round(weight_new, 2),  # 적용된 알파값 기록
-            "data_points": profile.data_points_count + 1
-        }
-        
-        # JSONB 배열에 추가 (최근 100개만 유지)
-        current_history = profile.speed_history or []
-        if isinstance(current_history, str):
-            import json
-            current_history = json.loads(current_history)
-        
-        current_history.append(history_entry)
-        profile.speed_history = current_history[-100:]  # 최근 100개만 유지
-        
-        # SQLAlchemy에게 JSONB 변경 알림
-        from sqlalchemy.orm.attributes import flag_modified
-        flag_modified(profile, "speed_history")
-        
-    else:
-        # 기존 프로필 없음 - 새로 생성 (KST 기준 타임스탬프)
-        history_entry = {
-            "speed_kmh": round(new_speed_kmh, 2),
-            "source": source,
-            "timestamp": datetime.now(KST).isoformat(),
-            "navigation_log_id": navigation_log_id,
-            "old_avg": None,
-            "new_avg": round(new_speed_kmh, 2),
-            "alpha": 1.0,  # 첫 데이터는 100% 반영
-            "data_points": 1
-        }
-        
-        profile = models.ActivitySpeedProfile(
+
+    if weight_new is None:
+        weight_new = _alpha_expression(profile.data_points_count)
+        weight_old = 1.0 - weight_new
+
+    old_speed = func.coalesce(profile.speed_case1, DEFAULT_PROFILE_SPEED_KMH)
+    updated_speed = cast(old_speed * weight_old + new_speed_kmh * weight_new, Numeric)
+
+    def _update():
+        # 기존 프로필 있음 - 가중 평균 (Case2도 비율 유지하며 자동 업데이트)
+        return db.execute(
+            update(profile)
+            .where(profile.user_id == user_id, profile.activity_type == activity_type)
+            .values(
+                speed_case1=func.round(updated_speed, 2),
+                speed_case2=func.round(updated_speed * SLOW_WALK_SPEED_RATIO, 2),
+                data_points_count=func.coalesce(profile.data_points_count, 0) + 1,
+            )
+            .returning(*returning)
+            .execution_options(synchronize_session=False)
+        ).first()
+
+    row = _update()
+    if row is None:
+        # 기존 프로필 없음 - 새로 생성 (첫 데이터는 100% 반영)
+        # 동시에 같은 프로필을 만든 요청이 있으면(IntegrityError) UPDATE를 다시 시도
+        try:
+            with db.begin_nested():
+                row = db.execute(
+                    insert(profile)
+                    .values(
+                        user_id=user_id,
+                        activity_type=activity_type,
+                        speed_case1=round(new_speed_kmh, 2),
+                        speed_case2=round(new_speed_kmh * SLOW_WALK_SPEED_RATIO, 2),
+                        data_points_count=1,
+                    )
+                    .returning(*returning)
+                ).first()
+        except IntegrityError:
+            row = _update()
+
+    measured_speed_kmh = round(new_speed_kmh, 2)
+    if SPEED_HISTORY_MIN_KMH <= measured_speed_kmh <= SPEED_HISTORY_MAX_KMH:
+        create_speed_history(
+            db,
+            commit=False,
             user_id=user_id,
             activity_type=activity_type,
-            speed_case1=round(new_speed_kmh, 2),
-            speed_case2=round(new_speed_kmh * SLOW_WALK_SPEED_RATIO, 2),
-            data_points_count=1,
-            speed_history=[history_entry]
+            measured_speed_kmh=measured_speed_kmh,
+            source=source,
+            navigation_log_id=navigation_log_id,
         )
-        db.add(profile)
-    
-    db.commit()
-    db.refresh(profile)
-    return profile
+
+    # commit 후 캐시에 새 값 반영 (write-through)
+    speed_profile_cache.stage(db, user_id, activity_type, row)
+
+    if commit:
+        db.commit()
+    return row
 
 
 # ================================
@@ -333,6 +384,8 @@ def create_route(db: Session, **kwargs):
     db.add(route)
     db.commit()
     db.refresh(route)
+    # 다음 카탈로그 조회에서 바로 반영
+    route_catalog.invalidate()
     return route
 
 
@@ -349,6 +402,7 @@ def delete_route(db: Session, route_id: int):
     if route:
         db.delete(route)
         db.commit()
+        route_catalog.invalidate()
     return route
 
 
@@ -358,6 +412,10 @@ def delete_route(db: Session, route_id: int):
 def create_route_segment(db: Session, **kwargs):
     segment = models.RouteSegments(**kwargs)
     db.add(segment)
+    # 세그먼트가 바뀌었으므로 묶음 저장본은 삭제 (상세 조회는 route_segments로 대체)
+    db.query(models.RouteSegmentPacks).filter(
+        models.RouteSegmentPacks.route_id == kwargs.get("route_id")
+    ).delete(synchronize_session=False)
     db.commit()
     db.refresh(segment)
     return segment
@@ -371,6 +429,70 @@ def get_segments_by_route(db: Session, route_id: int):
     )
 
 
+def save_route_segment_pack(db: Session, route_id: int, segments, commit: bool = True):
+    """
+    경로 세그먼트 묶음 저장 (있으면 교체)
+
+    Args:
+        segments: route_segments 행과 같은 키의 dict 목록 (segment_order 순)
+    """
+    segment_data, terrain_types = pack_segments(segments)
+    pack = db.merge(
+        models.RouteSegmentPacks(
+            route_id=route_id,
+            format_version=PACK_FORMAT_VERSION,
+            segment_count=len(segments),
+            segment_data=segment_data,
+            terrain_types=terrain_types,
+        )
+    )
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return pack
+
+
+def get_route_segment_pack(db: Session, route_id: int):
+    return (
+        db.query(models.RouteSegmentPacks)
+        .filter(models.RouteSegmentPacks.route_id == route_id)
+        .first()
+    )
+
+
+def save_route_geometries(db: Session, route_id: int, coordinates, commit: bool = True):
+    """
+    해상도별 단순화 좌표 저장 (기존 값은 교체)
+
+    Args:
+        coordinates: 원본 좌표 [[경도, 위도], ...]
+    """
+    db.query(models.RouteGeometries).filter(
+        models.RouteGeometries.route_id == route_id
+    ).delete(synchronize_session=False)
+
+    geometries = []
+    for resolution, tolerance_m in RESOLUTION_TOLERANCES_M.items():
+        simplified = simplify_coordinates(coordinates, tolerance_m)
+        geometries.append(
+            models.RouteGeometries(
+                route_id=route_id,
+                resolution=resolution,
+                tolerance_m=tolerance_m,
+                point_count=len(simplified),
+                coordinates={"type": "LineString", "coordinates": simplified},
+                encoded_polyline=encode_polyline(simplified),
+            )
+        )
+    db.add_all(geometries)
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return geometries
+
+
 # ================================
 # 8. ROUTE_SEARCH_HISTORY
 # ================================
@@ -476,12 +598,15 @@ def get_user_rating_for_route(db: Session, user_id: int, route_id: int):
 # ================================
 # 12. SPEED_HISTORY
 # ================================
-def create_speed_history(db: Session, **kwargs):
-    """속도 이력 기록 생성"""
+def create_speed_history(db: Session, commit: bool = True, **kwargs):
+    """속도 이력 기록 생성 (commit=False면 호출한 쪽 트랜잭션에 포함)"""
     history = models.SpeedHistory(**kwargs)
     db.add(history)
-    db.commit()
-    db.refresh(history)
+    if commit:
+        db.commit()
+        db.refresh(history)
+    else:
+        db.flush()
     return history
 
 
@@ -502,3 +627,296 @@ def get_speed_history_by_user(
         .limit(limit)
         .all()
     )
+
+
+# ================================
+# 13. NAVIGATION_DAILY_STATS
+# ================================
+# 롤업 컬럼 → 로그 1건이 더하는 값
+_NAV_STATS_FACTOR_COLUMNS = ("user_speed_factor", "slope_factor", "weather_factor")
+
+
+def navigation_log_stats_delta(log) -> dict:
+    """
+    네비게이션 로그 1건이 일별 통계에 더하는 값 계산
+
+    기존 통계 API와 같은 규칙:
+    - 정확도: |실제 - 예상| / 예상 <= 20% (예상 시간이 0이면 정확하지 않은 것으로 처리)
+    - 계수 평균: 값이 있는(0이 아닌) 로그만 포함
+    """
+    actual = log.actual_time_seconds or 0
+    estimated = log.estimated_time_seconds or 0
+    difference = actual - estimated
+
+    delta = {
+        "total_count": 1,
+        "walking_count": 1 if log.route_mode == "walking" else 0,
+        "transit_count": 1 if log.route_mode == "transit" else 0,
+        "accurate_count": 1 if estimated > 0 and abs(difference) / estimated <= 0.2 else 0,
+        "total_distance_m": float(log.total_distance_m or 0),
+        "total_actual_time_seconds": actual,
+        "total_time_difference_seconds": difference,
+    }
+    for name in _NAV_STATS_FACTOR_COLUMNS:
+        value = getattr(log, name)
+        delta[f"{name}_sum"] = float(value) if value else 0.0
+        delta[f"{name}_count"] = 1 if value else 0
+    return delta
+
+
+def _apply_daily_stats_delta(db: Session, user_id: int, stat_date, delta: dict, sign: int = 1):
+    """
+    (사용자, 날짜) 행 하나에 delta를 증감
+
+    UPDATE로 먼저 증감하고, 해당 날짜 행이 없으면 INSERT합니다.
+    동시에 같은 날짜 행을 만든 요청이 있으면(IntegrityError) UPDATE를 다시 시도합니다.
+    """
+    from sqlalchemy.exc import IntegrityError
+
+    stats = models.NavigationDailyStats
+
+    def _increment():
+        return (
+            db.query(stats)
+            .filter(stats.user_id == user_id, stats.stat_date == stat_date)
+            .update(
+                {getattr(stats, key): getattr(stats, key) + sign * value for key, value in delta.items()},
+                synchronize_session=False,
+            )
+        )
+
+    if _increment() or sign < 0:
+        return
+
+    try:
+        with db.begin_nested():
+            db.add(stats(user_id=user_id, stat_date=stat_date, **delta))
+    except IntegrityError:
+        _increment()
+
+
+def apply_navigation_log_to_daily_stats(db: Session, log, sign: int = 1):
+    """
+    네비게이션 로그를 일별 통계 롤업에 반영 (sign=1: 저장, sign=-1: 삭제)
+
+    commit하지 않으므로 로그 INSERT/DELETE와 같은 트랜잭션에서 호출해야 합니다.
+    """
+    _apply_daily_stats_delta(
+        db, log.user_id, log.started_at.date(), navigation_log_stats_delta(log), sign
+    )
+
+
+def apply_navigation_logs_to_daily_stats(db: Session, logs):
+    """
+    여러 로그를 일별 통계 롤업에 반영 (일괄 저장용)
+
+    (사용자, 날짜)별로 먼저 합산하므로 로그 수가 아니라 날짜 수만큼만 UPDATE합니다.
+    commit하지 않습니다.
+    """
+    grouped = {}
+    for log in logs:
+        key = (log.user_id, log.started_at.date())
+        delta = navigation_log_stats_delta(log)
+        if key in grouped:
+            for name, value in delta.items():
+                grouped[key][name] += value
+        else:
+            grouped[key] = delta
+
+    for (user_id, stat_date), delta in grouped.items():
+        _apply_daily_stats_delta(db, user_id, stat_date, delta)
+
+
+def get_navigation_stats_summary(db: Session, user_id: int, start_date) -> dict:
+    """
+    start_date(포함) 이후 일별 통계를 한 번의 집계 쿼리로 합산
+
+    Returns:
+        롤업 컬럼별 합계 dict (행이 없으면 모두 0)
+    """
+    from sqlalchemy import func
+
+    stats = models.NavigationDailyStats
+    columns = [
+        "total_count",
+        "walking_count",
+        "transit_count",
+        "accurate_count",
+        "total_distance_m",
+        "total_actual_time_seconds",
+        "total_time_difference_seconds",
+    ] + [f"{name}_{suffix}" for name in _NAV_STATS_FACTOR_COLUMNS for suffix in ("sum", "count")]
+
+    row = (
+        db.query(*[func.coalesce(func.sum(getattr(stats, c)), 0).label(c) for c in columns])
+        .filter(stats.user_id == user_id, stats.stat_date >= start_date)
+        .one()
+    )
+    return {c: float(getattr(row, c)) for c in columns}
+
+
+def estimate_navigation_log_count(
+    db: Session,
+    user_id: int,
+    route_mode: str = None,
+    start_date: datetime = None,
+    end_date: datetime = None,
+) -> int:
+    """
+    일별 통계 롤업으로 로그 개수 근사 (목록 API count_mode=estimate용)
+
+    날짜 필터는 일 단위로 적용되므로 시작/종료일 당일 로그는 시간과 무관하게 포함됩니다.
+    """
+    from sqlalchemy import func
+
+    stats = models.NavigationDailyStats
+    if route_mode == "walking":
+        column = stats.walking_count
+    elif route_mode == "transit":
+        column = stats.transit_count
+    else:
+        column = stats.total_count
+
+    query = db.query(func.coalesce(func.sum(column), 0)).filter(stats.user_id == user_id)
+    if start_date:
+        query = query.filter(stats.stat_date >= start_date.date())
+    if end_date:
+        query = query.filter(stats.stat_date <= end_date.date())
+    return int(query.scalar())
+
+
+# ================================
+# 14. ROUTE_ITINERARIES
+# ================================
+def store_route_itineraries(db: Session, itineraries: dict):
+    """
+    경로(itinerary) 저장 - 이미 있는 해시는 건너뜀 (INSERT ... ON CONFLICT DO NOTHING)
+
+    Args:
+        itineraries: 해시 → 경로 dict (route_itinerary.split_route_data로 분리한 값)
+    """
+    if not itineraries:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    rows = [
+        {
+            "itinerary_hash": itinerary_hash,
+            "itinerary": itinerary,
+            "byte_size": len(canonical_json(itinerary).encode("utf-8")),
+        }
+        for itinerary_hash, itinerary in itineraries.items()
+    ]
+    db.execute(
+        insert(models.RouteItineraries).values(rows).on_conflict_do_nothing(
+            index_elements=["itinerary_hash"]
+        )
+    )
+
+
+def delete_orphan_route_itineraries(db: Session, itinerary_hashes) -> int:
+    """
+    더 이상 어떤 로그도 참조하지 않는 경로 삭제 (로그 삭제 후 같은 트랜잭션에서 호출)
+
+    Returns:
+        삭제한 경로 수
+    """
+    from sqlalchemy import exists
+
+    itinerary_hashes = [h for h in set(itinerary_hashes) if h]
+    if not itinerary_hashes:
+        return 0
+    itineraries = models.RouteItineraries
+    logs = models.NavigationLogs
+    return (
+        db.query(itineraries)
+        .filter(
+            itineraries.itinerary_hash.in_(itinerary_hashes),
+            ~exists().where(logs.route_itinerary_hash == itineraries.itinerary_hash),
+        )
+        .delete(synchronize_session=False)
+    )
+
+
+# ================================
+# 15. USER_SPEED_MODELS
+# ================================
+def update_user_speed_model(
+    db: Session,
+    user_id: int,
+    nav_log: models.NavigationLogs,
+    base_speed_kmh: float,
+    activity_type: str = "walking",
+    commit: bool = True,
+):
+    """
+    네비게이션 로그 1건으로 사용자 경사도/날씨 민감도 모델 갱신 (O(1))
+
+    충분 통계량에 관측 1개만 더하고 민감도를 다시 풉니다 (이전 로그는 읽지 않음).
+    같은 사용자 로그가 동시에 저장되어도 합이 빠지지 않도록 행을 잠그고 갱신합니다.
+
+    Args:
+        nav_log: 속도 프로필에 반영하는 로그 (slope_factor, weather_factor, weather_id 사용)
+        base_speed_kmh: 로그에서 역산한 기준 속도 (reverse_calculate_base_speed)
+        commit: False면 commit하지 않음 (호출한 쪽 트랜잭션에 포함)
+
+    Returns:
+        갱신된 모델 값 (PersonalSpeedModel)
+    """
+    from sqlalchemy.exc import IntegrityError
+
+    temperature_c = precipitation_mm = None
+    if nav_log.weather_id:
+        weather = db.get(models.WeatherCache, nav_log.weather_id)
+        if weather is not None:
+            temperature_c = weather.temperature_celsius
+            precipitation_mm = weather.precipitation_mm
+    x = speed_features(float(nav_log.slope_factor), temperature_c, precipitation_mm)
+    y = math.log(base_speed_kmh)
+
+    def _load():
+        return (
+            db.query(models.UserSpeedModels)
+            .filter(
+                models.UserSpeedModels.user_id == user_id,
+                models.UserSpeedModels.activity_type == activity_type,
+            )
+            .with_for_update()
+            .first()
+        )
+
+    record = _load()
+    if record is None:
+        # 첫 로그 - 새로 생성 (동시에 같은 모델을 만든 요청이 있으면(IntegrityError) 그 행에 더함)
+        stats = SpeedModelStats()
+        stats.add(x, y)
+        model = PersonalSpeedModel.from_stats(stats)
+        try:
+            with db.begin_nested():
+                db.add(models.UserSpeedModels(
+                    user_id=user_id,
+                    activity_type=activity_type,
+                    stats=stats.to_bytes(),
+                    **model._asdict(),
+                ))
+        except IntegrityError:
+            record = _load()
+
+    if record is not None:
+        stats = SpeedModelStats.from_bytes(record.stats)
+        stats.add(x, y)
+        model = PersonalSpeedModel.from_stats(stats)
+        record.stats = stats.to_bytes()
+        for name, value in model._asdict().items():
+            setattr(record, name, value)
+        db.flush()
+
+    # commit 후 캐시에 새 값 반영 (write-through)
+    speed_model_cache.stage(db, user_id, activity_type, model)
+
+    if commit:
+        db.commit()
+    return model
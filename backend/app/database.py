@@ -7,6 +7,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from app.utils.worker_pool import BoundedExecutor
+
 # .env 파일에서 환경 변수 로드 (DB 보안 정보 분리)
 load_dotenv()
 
@@ -14,11 +16,42 @@ load_dotenv()
 # URL은 .env 파일 안에 존재
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
-# SQLAlchemy 엔진 생성 (DB 연결 객체)
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# 커넥션 풀 설정
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))  # 커넥션 대기 최대 시간 (초)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # 커넥션 재생성 주기 (초)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"  # 연결 안정성 향상
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))  # 0이면 제한 없음 (PostgreSQL)
+
+
+def _create_engine(database_url: str):
+    """DB 종류에 맞는 옵션으로 SQLAlchemy 엔진 생성"""
+    if database_url.startswith("sqlite"):
+        # SQLite(테스트/CI): DB 전용 스레드 풀에서도 같은 커넥션을 쓸 수 있도록 허용
+        return create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
 
-# 연결 안정성 향상 옵션
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
+    connect_args = {}
+    if DB_STATEMENT_TIMEOUT_MS > 0 and database_url.startswith("postgresql"):
+        connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+
+    return create_engine(
+        database_url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+# SQLAlchemy 엔진 생성 (DB 연결 객체)
+engine = _create_engine(SQLALCHEMY_DATABASE_URL)
 
 # 세션(Session) 생성 — 실제 쿼리 실행 시 사용됨
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -26,6 +59,43 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base 클래스 생성 — 모든 모델 클래스가 이걸 상속받음
 Base = declarative_base()
 
+# DB 전용 스레드 풀
+# async 핸들러에서 동기 Session을 직접 쓰면 쿼리마다 이벤트 루프가 멈추므로,
+# DB 작업은 run_db()로 이 풀에서 실행한다.
+# 워커 수는 커넥션 풀 크기를 넘지 않게 맞춰 스레드가 커넥션을 기다리며 쌓이지 않도록 함
+# run_db 함수는 Session을 캡처한 클로저라 pickle할 수 없으므로 process 풀은 허용하지 않음
+DB_EXECUTOR_POOL_KINDS = ("thread", "inline")
+DB_EXECUTOR_POOL = os.getenv("DB_EXECUTOR_POOL", "thread").lower()
+if DB_EXECUTOR_POOL not in DB_EXECUTOR_POOL_KINDS:
+    raise ValueError(
+        f"DB_EXECUTOR_POOL은 {', '.join(DB_EXECUTOR_POOL_KINDS)} 중 하나여야 합니다: {DB_EXECUTOR_POOL} "
+        "(DB 작업은 Session을 넘겨야 하므로 process 풀 불가)"
+    )
+
+db_executor = BoundedExecutor(
+    name="db",
+    kind=DB_EXECUTOR_POOL,
+    max_workers=int(os.getenv("DB_EXECUTOR_WORKERS", DB_POOL_SIZE + DB_MAX_OVERFLOW)),
+    max_pending=int(os.getenv("DB_EXECUTOR_MAX_PENDING", 64)),
+    queue_timeout=float(os.getenv("DB_EXECUTOR_QUEUE_TIMEOUT", DB_POOL_TIMEOUT)),
+)
+
+
+async def run_db(func, *args, **kwargs):
+    """
+    동기 DB 작업을 DB 전용 스레드 풀에서 실행
+
+    사용 예:
+        def _load(db):
+            return db.query(Users).count()
+
+        count = await run_db(_load, db)
+
+    주의: 커밋 이후 ORM 객체 속성 접근도 쿼리를 일으킬 수 있으므로
+    응답 객체 생성까지 func 안에서 마치는 것을 권장
+    """
+    return await db_executor.run(func, *args, **kwargs)
+
 
 # FastAPI 의존성 주입용 함수
 # 요청마다 새로운 DB 세션을 생성하고, 끝나면 자동 종료되게 함
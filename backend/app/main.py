@@ -2,20 +2,25 @@ import os
 
 # import joblib  # 제거됨: ml_helpers와 함께 사용하지 않음
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import logging
 from datetime import datetime
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 from pathlib import Path
 
-from app.database import engine, get_db
-from app.routers import auth, routes, weather, gpx_routes, navigation_logs, personalization
+from app.database import SessionLocal, db_executor, engine, get_db, run_db
+from app.routers import admin, auth, routes, weather, gpx_routes, navigation_logs, personalization
 
 # from app.utils.ml_helpers import predict_adjustment, train_personalization_model  # 제거됨: 더 이상 사용하지 않음
 from app.utils import walking_only
 from app.utils.api_helpers import call_tmap_transit_api
+from app.utils.route_catalog import route_catalog
+from app.utils.route_prefetch import route_prefetcher
+from app.utils.upstream_governor import UpstreamUnavailableError, tmap_governor
+from app.utils.worker_pool import WorkerPoolBusyError, password_hash_pool, route_analysis_pool
 
 load_dotenv()  # .env 로드
 
@@ -73,6 +78,38 @@ app.include_router(walking_only.router, prefix="/api")
 app.include_router(gpx_routes.router)
 app.include_router(navigation_logs.router)
 app.include_router(personalization.router)
+app.include_router(admin.router)
+
+
+@app.exception_handler(WorkerPoolBusyError)
+async def worker_pool_busy_handler(request: Request, exc: WorkerPoolBusyError):
+    """워커 풀(DB/비밀번호 해싱/경로 분석) 대기열 초과 → 503 (잠시 후 재시도)"""
+    logger.warning(f"[워커 풀] {request.method} {request.url.path} 거절: {exc}")
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+@app.on_event("startup")
+async def load_route_catalog():
+    """GPX 경로 카탈로그 미리 로드 (실패해도 첫 경로 요청 때 다시 시도)"""
+    def _load():
+        db = SessionLocal()
+        try:
+            route_catalog.get(db)
+        finally:
+            db.close()
+
+    try:
+        await run_db(_load)
+    except Exception as e:
+        logger.warning(f"⚠️ 경로 카탈로그 로드 실패 (첫 요청 때 재시도): {e}")
+
+
+@app.on_event("shutdown")
+def shutdown_worker_pools():
+    """앱 종료 시 경로 분석/DB 워커 풀 정리"""
+    route_analysis_pool.shutdown()
+    password_hash_pool.shutdown()
+    db_executor.shutdown()
 
 
 def calculate_walking_time(distance_meters: float, avg_speed_kmh: float = 4.5) -> int:
@@ -140,20 +177,35 @@ async def get_transit_route(
     count: int = Query(10, description="경로 개수"),
     lang: int = Query(0, description="언어 설정"),
     format: str = Query("json", description="응답 형식"),
+    prefetch: bool = Query(
+        False, description="보행 구간 고도/횡단보도 미리 계산 (이후 /api/routes/analyze-slope를 캐시로 처리)"
+    ),
 ):
     """
     T맵 대중교통 경로를 검색합니다.
 
     보행 시간 재계산 및 보정은 /api/routes/analyze-slope에서 수행
+    prefetch=true면 응답 후 앞쪽 경로들의 보행 구간을 백그라운드에서 미리 준비합니다 (route_prefetch).
     """
-    response = call_tmap_transit_api(
-        start_x, start_y, end_x, end_y, count, lang, format
-    )
+    try:
+        # Tmap 장애/한도 초과 시 호출하지 않고 바로 503 (upstream_governor)
+        async with tmap_governor.request(api_key=os.getenv("TMAP_APPKEY")) as call:
+            response = call_tmap_transit_api(
+                start_x, start_y, end_x, end_y, count, lang, format
+            )
+            if response.status_code >= 500 or response.status_code == 429:
+                call.mark_failure()
+    except UpstreamUnavailableError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+        )
 
     if response.status_code == 200:
         data = response.json()
         itineraries = data.get("metaData", {}).get("plan", {}).get("itineraries", [])
         print(f"✅ 대중교통 경로 검색 성공 - {len(itineraries)}개 경로")
+        if prefetch:
+            route_prefetcher.schedule(itineraries)
         return data
     else:
         # 에러 처리
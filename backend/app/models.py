@@ -9,7 +9,9 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     Numeric,
+    SmallInteger,
     String,
     Text,
     UniqueConstraint,
@@ -21,12 +23,13 @@ from sqlalchemy.types import TypeEngine
 from app.database import Base
 
 # PostgreSQL에서는 JSONB, SQLite에서는 JSON 사용
+# (postgresql 방언은 SQLAlchemy에 항상 포함되므로 import 성공 여부가 아닌 방언별 variant로 구분)
 try:
     from sqlalchemy.dialects.postgresql import JSONB
 
-    JSONType: type[TypeEngine] = JSONB  # type: ignore
+    JSONType: TypeEngine = JSON().with_variant(JSONB(), "postgresql")
 except ImportError:
-    JSONType = JSON  # type: ignore
+    JSONType = JSON()
 
 
 # 1) users
@@ -150,7 +153,7 @@ class ActivitySpeedProfile(Base):
     # speed_variance = Column(Numeric(4, 2))
     # confidence_score = Column(Numeric(3, 2))
     data_points_count = Column(Integer, server_default="0")
-    speed_history = Column(JSONType, server_default="[]")  # 속도 변화 이력 [{speed, source, timestamp, nav_log_id}, ...]
+    speed_history = Column(JSONType, server_default="[]")  # (레거시) 속도 변화 이력 JSONB - 신규 이력은 speed_history 테이블에 기록
     last_updated = Column(
         DateTime,
         server_default=func.current_timestamp(),
@@ -232,6 +235,12 @@ class Routes(Base):
     segments = relationship(
         "RouteSegments", back_populates="route", cascade="all, delete-orphan"
     )
+    segment_pack = relationship(
+        "RouteSegmentPacks", uselist=False, cascade="all, delete-orphan"
+    )
+    geometries = relationship(
+        "RouteGeometries", cascade="all, delete-orphan"
+    )
     favorites = relationship(
         "FavoriteRoutes", back_populates="route", cascade="all, delete-orphan"
     )
@@ -452,7 +461,8 @@ class NavigationLogs(Base):
     paused_time_seconds = Column(Integer, server_default="0")  # 5초 이상 정지한 시간
     real_walking_speed_kmh = Column(Numeric(4, 2))  # 실제 보행속도 (km/h)
     pause_count = Column(Integer, server_default="0")  # 정지 구간 횟수
-    movement_data = Column(JSONType)  # 움직임 구간 상세 데이터
+    movement_data = Column(JSONType)  # 움직임 구간 상세 데이터 (구간 목록은 movement_segments로 분리)
+    movement_segments = Column(LargeBinary)  # 움직임 구간 목록 바이너리 (app/utils/movement_codec.py)
     
     # 날씨 정보
     weather_id = Column(
@@ -460,7 +470,13 @@ class NavigationLogs(Base):
     )
     
     # 상세 경로 데이터 (JSON)
-    route_data = Column(JSONType)  # 전체 경로 상세 정보
+    route_data = Column(JSONType)  # 전체 경로 상세 정보 (경로 자체(legs, rawItinerary)는 route_itineraries로 분리)
+    route_itinerary_hash = Column(
+        String(64), ForeignKey("route_itineraries.itinerary_hash")
+    )  # 분리한 경로의 내용 해시 (같은 경로는 한 번만 저장)
+    
+    # 재전송 중복 방지 (클라이언트가 로그마다 생성하는 키, 사용자별 유일)
+    idempotency_key = Column(String(64))
     
     # 타임스탬프
     started_at = Column(DateTime, nullable=False)  # 안내 시작 시간
@@ -471,6 +487,159 @@ class NavigationLogs(Base):
         Index("idx_nav_user_time", "user_id", "started_at"),
         Index("idx_nav_route_mode", "route_mode"),
         Index("idx_nav_created_at", "created_at"),
+        Index("uq_nav_user_idempotency", "user_id", "idempotency_key", unique=True),
+        Index("idx_nav_route_itinerary", "route_itinerary_hash"),
     )
 
     user = relationship("Users", back_populates="navigation_logs")
+    route_itinerary = relationship("RouteItineraries")
+
+
+# 13) navigation_daily_stats
+# 네비게이션 로그의 사용자별 일 단위 집계 (통계 API용 롤업)
+# 로그 저장/삭제 시 같은 트랜잭션에서 증감하므로 통계 조회가 로그 개수와 무관하게 일정
+class NavigationDailyStats(Base):
+    __tablename__ = "navigation_daily_stats"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    stat_date = Column(Date, primary_key=True)  # started_at 기준 날짜
+
+    # 횟수
+    total_count = Column(Integer, nullable=False, server_default="0")
+    walking_count = Column(Integer, nullable=False, server_default="0")
+    transit_count = Column(Integer, nullable=False, server_default="0")
+    accurate_count = Column(Integer, nullable=False, server_default="0")  # 예상 대비 ±20% 이내
+
+    # 합계
+    total_distance_m = Column(Numeric(14, 2), nullable=False, server_default="0")
+    total_actual_time_seconds = Column(Integer, nullable=False, server_default="0")
+    total_time_difference_seconds = Column(Integer, nullable=False, server_default="0")  # Σ(실제 - 예상)
+
+    # 계수 평균 계산용 (값이 있는 로그만 집계)
+    user_speed_factor_sum = Column(Numeric(12, 3), nullable=False, server_default="0")
+    user_speed_factor_count = Column(Integer, nullable=False, server_default="0")
+    slope_factor_sum = Column(Numeric(12, 3), nullable=False, server_default="0")
+    slope_factor_count = Column(Integer, nullable=False, server_default="0")
+    weather_factor_sum = Column(Numeric(12, 3), nullable=False, server_default="0")
+    weather_factor_count = Column(Integer, nullable=False, server_default="0")
+
+    updated_at = Column(
+        DateTime,
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
+    )
+
+
+# 14) speed_history
+# 속도 측정 이력 (로그 1건당 1행 추가만 하는 좁은 테이블)
+# 프로필 JSONB 배열을 매번 다시 쓰지 않도록 이력은 여기에 쌓음 (migrations/create_speed_history.py)
+class SpeedHistory(Base):
+    __tablename__ = "speed_history"
+
+    history_id = Column(Integer, primary_key=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    activity_type = Column(String(20), nullable=False, server_default="walking")
+    measured_speed_kmh = Column(Numeric(4, 2), nullable=False)
+    source = Column(String(20), nullable=False)  # navigation_log/manual/health_connect/initial
+    navigation_log_id = Column(
+        Integer, ForeignKey("navigation_logs.log_id", ondelete="SET NULL")
+    )
+    recorded_at = Column(DateTime, nullable=False, server_default=func.current_timestamp())
+
+    __table_args__ = (
+        CheckConstraint(
+            "measured_speed_kmh >= 2.0 AND measured_speed_kmh <= 8.0", name="ck_speed_range"
+        ),
+        CheckConstraint(
+            "source IN ('navigation_log', 'manual', 'health_connect', 'initial')",
+            name="ck_source_type",
+        ),
+        Index("idx_speed_history_user_time", "user_id", recorded_at.desc()),
+        Index("idx_speed_history_user_activity", "user_id", "activity_type"),
+    )
+
+
+# 15) route_segment_packs
+# 경로당 1행에 세그먼트 필드를 정수 배열로 묶어 저장 (app/utils/segment_pack.py 형식)
+# 경로 상세 조회는 이 행만 읽음, 없으면 route_segments로 대체 (migrations/create_route_segment_packs.py)
+class RouteSegmentPacks(Base):
+    __tablename__ = "route_segment_packs"
+
+    route_id = Column(
+        Integer,
+        ForeignKey("routes.route_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    format_version = Column(SmallInteger, nullable=False, server_default="1")
+    segment_count = Column(Integer, nullable=False)
+    segment_data = Column(LargeBinary, nullable=False)
+    terrain_types = Column(JSONType)  # terrain_type 종류 목록 (segment_data에는 인덱스만 저장)
+    updated_at = Column(
+        DateTime,
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
+    )
+
+
+# 16) route_geometries
+# 해상도별 단순화 경로 좌표 (Douglas-Peucker, app/utils/polyline.py)
+# GPX 적재 시 함께 계산, 원본은 routes.route_coordinates (migrations/create_route_geometries.py)
+class RouteGeometries(Base):
+    __tablename__ = "route_geometries"
+
+    route_id = Column(
+        Integer,
+        ForeignKey("routes.route_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    resolution = Column(String(10), primary_key=True)  # high/medium/low
+    tolerance_m = Column(Numeric(5, 1), nullable=False)
+    point_count = Column(Integer, nullable=False)
+    coordinates = Column(JSONType, nullable=False)  # GeoJSON LineString
+    encoded_polyline = Column(Text, nullable=False)
+    created_at = Column(DateTime, server_default=func.current_timestamp())
+
+
+# 17) route_itineraries
+# 네비게이션 로그 경로(legs, rawItinerary)를 내용 해시로 한 번만 저장 (app/utils/route_itinerary.py)
+# 같은 경로를 반복해서 걸어도 로그에는 해시만 남음 (migrations/create_route_itineraries.py)
+class RouteItineraries(Base):
+    __tablename__ = "route_itineraries"
+
+    itinerary_hash = Column(String(64), primary_key=True)  # 정규화 JSON의 SHA-256
+    itinerary = Column(JSONType, nullable=False)
+    byte_size = Column(Integer, nullable=False)  # 정규화 JSON 크기 (중복 제거 효과 확인용)
+    created_at = Column(DateTime, server_default=func.current_timestamp())
+
+
+# 18) user_speed_models
+# 사용자별 경사도/날씨 민감도 회귀 모델 (app/utils/user_speed_model.py)
+# 로그마다 충분 통계량(stats)만 더해 O(1) 갱신, 풀어 둔 민감도는 경로 시간 계산에서 사용
+class UserSpeedModels(Base):
+    __tablename__ = "user_speed_models"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    activity_type = Column(String(20), primary_key=True, server_default="walking")
+    log_count = Column(Integer, nullable=False, server_default="0")
+    stats = Column(LargeBinary, nullable=False)  # 충분 통계량 (float64 16개)
+    base_speed_kmh = Column(Numeric(4, 2), nullable=False)  # 모델 절편 (평지+맑은날 기준 속도)
+    slope_exponent = Column(Numeric(5, 3), nullable=False)  # 경사도 계수 지수 (모집단 1.0)
+    temperature_coef = Column(Numeric(5, 3), nullable=False)  # 기온 편차 민감도 (모집단 0)
+    precipitation_coef = Column(Numeric(5, 3), nullable=False)  # 강수 민감도 (모집단 0)
+    updated_at = Column(
+        DateTime,
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
+    )
@@ -0,0 +1,53 @@
+# app/routers/admin.py
+"""
+관리자 API (X-Admin-Token 필요)
+
+외부 API 호출 제어(upstream_governor) 상태 조회 및 회로 수동 복구, 경로 미리 계산 상태
+"""
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.utils.dependencies import require_admin_token
+from app.utils.elevation_helpers import elevation_cache, prepared_route_cache
+from app.utils.route_prefetch import route_prefetcher
+from app.utils.upstream_governor import upstream_governors
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_token)],
+)
+
+
+@router.get("/upstreams")
+async def get_upstream_status():
+    """
+    외부 API(google_elevation, kma, tmap)별 상태
+
+    - circuit: 회로 상태 (closed/open/half_open), 연속 실패 수, 다시 시도까지 남은 시간
+    - keys: API 키별(해시 앞부분) 남은 토큰, 오늘 사용량
+    - calls / failures / rejected: 프로세스 시작 후 누적 (워커 프로세스별)
+    """
+    return {name: governor.stats() for name, governor in upstream_governors.items()}
+
+
+@router.post("/upstreams/{name}/reset")
+async def reset_upstream(name: str):
+    """회로를 닫고 토큰 버킷을 다시 채움 (외부 API 복구를 확인한 뒤 사용)"""
+    governor = upstream_governors.get(name)
+    if governor is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"알 수 없는 외부 API입니다: {name} (가능: {', '.join(upstream_governors)})",
+        )
+    governor.reset()
+    return governor.stats()
+
+
+@router.get("/prefetch")
+async def get_prefetch_status():
+    """대중교통 검색 후 미리 계산 작업 및 관련 캐시 상태 (워커 프로세스별)"""
+    return {
+        "prefetch": route_prefetcher.stats(),
+        "elevation_cache": elevation_cache.stats(),
+        "prepared_route_cache": prepared_route_cache.stats(),
+    }
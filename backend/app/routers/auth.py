@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app import crud
-from app.database import get_db
+from app.database import get_db, run_db
 from app.models import Users
 from app.schemas import (
     TokenResponse,
@@ -17,7 +17,11 @@ from app.schemas import (
     UserRegisterRequest,
     UserResponse,
 )
-from app.utils.auth_utils import create_access_token, get_password_hash, verify_password
+from app.utils.auth_utils import (
+    create_access_token,
+    get_password_hash_async,
+    verify_password_async,
+)
 from app.utils.dependencies import get_current_user
 from app.constants.speed_constants import DEFAULT_WALKING_SPEED_CASE1, DEFAULT_WALKING_SPEED_CASE2
 
@@ -33,58 +37,67 @@ async def register(user_data: UserRegisterRequest, db: Session = Depends(get_db)
 
     - username, email, password로 새 계정 생성
     - 이메일/사용자명 중복 검사
-    - 비밀번호 해싱 후 저장
+    - 비밀번호 해싱 후 저장 (bcrypt는 DB 작업과 분리된 해싱 풀에서 실행)
     - JWT 토큰 즉시 발급 (자동 로그인)
     """
-    # 1. 이메일 중복 확인
-    existing_user = crud.get_user_by_email(db, user_data.email)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="이미 사용 중인 이메일입니다",
+    def _check_duplicates():
+        # 1. 이메일 중복 확인
+        existing_user = crud.get_user_by_email(db, user_data.email)
+        if existing_user:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="이미 사용 중인 이메일입니다",
+            )
+
+        # 2. 사용자명 중복 확인
+        existing_username = crud.get_user_by_username(db, user_data.username)
+        if existing_username:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="이미 사용 중인 사용자명입니다",
+            )
+
+        # 읽기 트랜잭션 종료 → 해싱하는 동안 커넥션을 풀에 반환
+        db.rollback()
+
+    def _register(hashed_password: str):
+        # 4. 사용자 생성
+        new_user = crud.create_user(
+            db=db,
+            username=user_data.username,
+            email=user_data.email,
+            password_hash=hashed_password,
+            auth_provider="local",
         )
 
-    # 2. 사용자명 중복 확인
-    existing_username = crud.get_user_by_username(db, user_data.username)
-    if existing_username:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="이미 사용 중인 사용자명입니다",
+        # 5. 초기 속도 프로필 생성 (기본값)
+        crud.create_speed_profile(
+            db=db,
+            user_id=new_user.user_id,
+            activity_type="walking",
+            speed_case1=DEFAULT_WALKING_SPEED_CASE1,
+            speed_case2=DEFAULT_WALKING_SPEED_CASE2,
+            data_points_count=0,
+        )
+
+        # 6. 로그인 시간 업데이트
+        crud.update_last_login(db, new_user.user_id)
+
+        # 7. JWT 토큰 생성
+        access_token = create_access_token(data={"sub": str(new_user.user_id)})
+
+        return TokenResponse(
+            access_token=access_token,
+            token_type="bearer",  # nosec B106
+            user=UserResponse.model_validate(new_user),
         )
 
-    # 3. 비밀번호 해싱
-    hashed_password = get_password_hash(user_data.password)
-
-    # 4. 사용자 생성
-    new_user = crud.create_user(
-        db=db,
-        username=user_data.username,
-        email=user_data.email,
-        password_hash=hashed_password,
-        auth_provider="local",
-    )
-
-    # 5. 초기 속도 프로필 생성 (기본값)
-    crud.create_speed_profile(
-        db=db,
-        user_id=new_user.user_id,
-        activity_type="walking",
-        speed_case1=DEFAULT_WALKING_SPEED_CASE1,
-        speed_case2=DEFAULT_WALKING_SPEED_CASE2,
-        data_points_count=0,
-    )
-
-    # 6. 로그인 시간 업데이트
-    crud.update_last_login(db, new_user.user_id)
-
-    # 7. JWT 토큰 생성
-    access_token = create_access_token(data={"sub": str(new_user.user_id)})
-
-    return TokenResponse(
-        access_token=access_token,
-        token_type="bearer",  # nosec B106
-        user=UserResponse.model_validate(new_user),
-    )
+    await run_db(_check_duplicates)
+
+    # 3. 비밀번호 해싱 (DB 커넥션을 잡지 않은 상태에서 실행, 풀 과부하는 main의 503 핸들러)
+    hashed_password = await get_password_hash_async(user_data.password)
+
+    return await run_db(_register, hashed_password)
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -92,42 +105,54 @@ async def login(login_data: UserLoginRequest, db: Session = Depends(get_db)):
     """
     로그인
 
-    - 이메일/비밀번호로 인증
+    - 이메일/비밀번호로 인증 (bcrypt는 DB 작업과 분리된 해싱 풀에서 실행)
     - JWT 토큰 발급
     """
-    # 1. 사용자 조회
-    user = crud.get_user_by_email(db, login_data.email)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="이메일 또는 비밀번호가 올바르지 않습니다",
+    def _find_user():
+        # 1. 사용자 조회
+        user = crud.get_user_by_email(db, login_data.email)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="이메일 또는 비밀번호가 올바르지 않습니다",
+            )
+
+        # 2. 소셜 로그인 계정인 경우
+        if user.auth_provider != "local":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{user.auth_provider} 계정입니다. 소셜 로그인을 이용해주세요",
+            )
+
+        user_id, password_hash = user.user_id, user.password_hash
+        # 읽기 트랜잭션 종료 → 검증하는 동안 커넥션을 풀에 반환
+        db.rollback()
+        return user_id, password_hash
+
+    def _complete_login(user_id: int):
+        # 4. 로그인 시간 업데이트
+        user = crud.update_last_login(db, user_id)
+
+        # 5. JWT 토큰 생성
+        access_token = create_access_token(data={"sub": str(user.user_id)})
+
+        return TokenResponse(
+            access_token=access_token,
+            token_type="bearer",  # nosec B106
+            user=UserResponse.model_validate(user),
         )
 
-    # 2. 소셜 로그인 계정인 경우
-    if user.auth_provider != "local":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"{user.auth_provider} 계정입니다. 소셜 로그인을 이용해주세요",
-        )
+    user_id, password_hash = await run_db(_find_user)
 
-    # 3. 비밀번호 검증
-    if not verify_password(login_data.password, user.password_hash):
+    # 3. 비밀번호 검증 (DB 커넥션을 잡지 않은 상태에서 실행)
+    password_ok = await verify_password_async(login_data.password, password_hash)
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="이메일 또는 비밀번호가 올바르지 않습니다",
         )
 
-    # 4. 로그인 시간 업데이트
-    crud.update_last_login(db, user.user_id)
-
-    # 5. JWT 토큰 생성
-    access_token = create_access_token(data={"sub": str(user.user_id)})
-
-    return TokenResponse(
-        access_token=access_token,
-        token_type="bearer",  # nosec B106
-        user=UserResponse.model_validate(user),
-    )
+    return await run_db(_complete_login, user_id)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -3,15 +3,20 @@
 (사용자는 업로드하지 않고, 조회만 함)
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from typing import List, Optional
 from pydantic import BaseModel
 import math
 import json
 
-from app.database import get_db
+from app.database import get_db, run_db
+from app.utils.route_catalog import route_catalog
+from app.utils.route_tiles import MAX_ZOOM, route_tile_cache
+from app.utils.speed_profile_cache import resolve_user_speed_kmh
+from app.utils.polyline import RESOLUTION_TOLERANCES_M, RESOLUTIONS, encode_polyline, simplify_coordinates
+from app.utils.segment_pack import unpack_segments
 
 
 router = APIRouter(
@@ -117,6 +122,135 @@ def extract_end_point(route_coordinates: dict) -> tuple:
     return (None, None)
 
 
+def build_route_description(tags, elevation_gain: Optional[float]) -> str:
+    """
+    추천 경로 설명 생성 (태그 + 고도 상승량)
+
+    strava.segments, 특수문자(_-), 숫자만 있는 태그, 언더바 포함 태그는 제외합니다.
+    """
+    description_parts = []
+    if tags:
+        try:
+            tags_list = json.loads(tags) if isinstance(tags, str) else tags
+            if isinstance(tags_list, list) and len(tags_list) > 1:
+                tag_value = tags_list[1]
+                if not (
+                    'strava.segments' in tag_value.lower() or
+                    tag_value.startswith('strava') or
+                    '_' in tag_value or  # 언더바 포함 제외
+                    all(c in '0123456789-_.' for c in tag_value)
+                ):
+                    description_parts.append(tag_value)
+        except:
+            pass
+
+    if elevation_gain:
+        if elevation_gain < 50:
+            description_parts.append("평탄한 코스")
+        elif elevation_gain < 200:
+            description_parts.append("적당한 오르막")
+        else:
+            description_parts.append("경사 있는 코스")
+
+    return ", ".join(description_parts) if description_parts else ""
+
+
+def _optional_float(value) -> Optional[float]:
+    """카탈로그 값 → 응답 값 (NaN/0이면 None, 기존 `float(x) if x else None`과 동일)"""
+    return float(value) if value and not math.isnan(value) else None
+
+
+def _optional_int(value) -> Optional[int]:
+    """카탈로그 값 → 정수 응답 값 (NaN이면 None)"""
+    return None if math.isnan(value) else int(value)
+
+
+def _segment_response(seg) -> dict:
+    """세그먼트 행(route_segments 행 또는 묶음 디코딩 결과) → 응답 dict"""
+    return {
+        "segment_id": seg["segment_id"],
+        "segment_order": seg["segment_order"],
+        "start_lat": float(seg["start_lat"]),
+        "start_lon": float(seg["start_lon"]),
+        "end_lat": float(seg["end_lat"]),
+        "end_lon": float(seg["end_lon"]),
+        "segment_distance_m": float(seg["segment_distance_m"]),
+        "segment_grade_percent": float(seg["segment_grade_percent"]) if seg["segment_grade_percent"] else None,
+        "elevation_change_m": float(seg["elevation_change_m"]) if seg["elevation_change_m"] else None,
+        "terrain_type": seg["terrain_type"],
+    }
+
+
+# 좌표 해상도/형식 쿼리 파라미터 (목록은 단순화 좌표만)
+RESOLUTION_PATTERN = "^(" + "|".join(RESOLUTIONS) + ")$"
+SIMPLIFIED_RESOLUTION_PATTERN = "^(" + "|".join(RESOLUTION_TOLERANCES_M) + ")$"
+GEOMETRY_FORMAT_PATTERN = "^(geojson|polyline)$"
+
+
+def _geometry_fields(value, geometry_format: str, encode: bool = False) -> dict:
+    """
+    좌표 값 → 응답 필드
+
+    Args:
+        value: GeoJSON LineString (encode=True) 또는 저장된 값 (geojson이면 GeoJSON, polyline이면 문자열)
+        encode: polyline 형식일 때 GeoJSON을 받아 바로 인코딩할지 여부
+    """
+    if geometry_format == "polyline":
+        if encode:
+            if isinstance(value, str):
+                value = json.loads(value)
+            value = encode_polyline((value or {}).get("coordinates", []))
+        return {"route_coordinates": None, "route_polyline": value}
+    if isinstance(value, str) and not encode:
+        value = json.loads(value)
+    return {"route_coordinates": value}
+
+
+def _load_route_geometries(db: Session, route_ids: List[int], resolution: str, geometry_format: str) -> dict:
+    """
+    route_geometries에서 해상도별 단순화 좌표 조회 (route_id → 응답 필드)
+
+    아직 단순화 좌표가 없는 경로(마이그레이션 전 등)는 원본 좌표에서 바로 계산합니다.
+    """
+    if not route_ids:
+        return {}
+    column = "encoded_polyline" if geometry_format == "polyline" else "coordinates"
+    rows = db.execute(
+        text(f"""
+        SELECT route_id, {column}
+        FROM route_geometries
+        WHERE resolution = :resolution AND route_id IN :route_ids
+        """).bindparams(bindparam("route_ids", expanding=True)),
+        {"resolution": resolution, "route_ids": list(route_ids)},
+    ).fetchall()
+    geometries = {row[0]: _geometry_fields(row[1], geometry_format) for row in rows}
+
+    missing = [route_id for route_id in route_ids if route_id not in geometries]
+    if missing:
+        rows = db.execute(
+            text("SELECT route_id, route_coordinates FROM routes WHERE route_id IN :route_ids").bindparams(
+                bindparam("route_ids", expanding=True)
+            ),
+            {"route_ids": missing},
+        ).fetchall()
+        for route_id, route_coordinates in rows:
+            if isinstance(route_coordinates, str):
+                route_coordinates = json.loads(route_coordinates)
+            simplified = simplify_coordinates(
+                (route_coordinates or {}).get("coordinates", []), RESOLUTION_TOLERANCES_M[resolution]
+            )
+            geometries[route_id] = _geometry_fields(
+                {"type": "LineString", "coordinates": simplified}, geometry_format, encode=True
+            )
+    return geometries
+
+
+def _isoformat(value) -> Optional[str]:
+    """numpy datetime64 → ISO 문자열 (NaT이면 None)"""
+    if value is None or value != value:
+        return None
+    return value.astype("datetime64[us]").item().isoformat()
+
 
 class RouteResponse(BaseModel):
     """경로 응답 모델"""
@@ -172,6 +306,8 @@ async def list_routes(
     max_distance: Optional[float] = None,
     limit: int = 50,
     offset: int = 0,
+    resolution: Optional[str] = Query(None, pattern=SIMPLIFIED_RESOLUTION_PATTERN),
+    geometry_format: str = Query("geojson", pattern=GEOMETRY_FORMAT_PATTERN),
     db: Session = Depends(get_db)
 ):
     """
@@ -184,84 +320,102 @@ async def list_routes(
         max_distance: 최대 거리 (km)
         limit: 조회 개수 제한
         offset: 오프셋
+        resolution: 지정하면 해당 해상도(high/medium/low)의 단순화 좌표를 함께 반환 (썸네일 지도용)
+        geometry_format: geojson(route_coordinates) 또는 polyline(route_polyline)
         db: DB 세션
     
     Returns:
         경로 목록 및 총 개수
+
+    인메모리 경로 카탈로그(app/utils/route_catalog.py)에서 조회합니다.
     """
-    try:
-        # 기본 쿼리문
-        base_query = """
-        SELECT 
-            route_id, route_name, route_type, distance_km,
-            estimated_duration_minutes, total_elevation_gain_m,
-            difficulty_level, avg_rating, rating_count, created_at
-        FROM routes
-        WHERE 1=1
-        """
-        
-        params = {}
-        
-        # 필터 조건 추가
-        conditions = []
-        if route_type:
-            conditions.append(" AND route_type = :route_type")
-            params['route_type'] = route_type
-        
-        if difficulty:
-            conditions.append(" AND difficulty_level = :difficulty")
-            params['difficulty'] = difficulty
-        
-        if min_distance is not None:
-            conditions.append(" AND distance_km >= :min_distance")
-            params['min_distance'] = min_distance
-        
-        if max_distance is not None:
-            conditions.append(" AND distance_km <= :max_distance")
-            params['max_distance'] = max_distance
-        
-        # 쿼리 조립
-        full_query = base_query + ''.join(conditions) + " ORDER BY created_at DESC LIMIT :limit OFFSET :offset"
-        params['limit'] = limit
-        params['offset'] = offset
-        
-        results = db.execute(text(full_query), params).fetchall()
+    def _list_routes():
+        try:
+            # 인메모리 카탈로그에서 필터링/정렬 (DB는 주기적인 변경 확인에만 사용)
+            catalog = route_catalog.get(db)
+            mask = catalog.filter_mask(
+                route_type=route_type,
+                difficulty=difficulty,
+                min_distance=min_distance,
+                max_distance=max_distance,
+            )
+            page = catalog.list_indices(mask, limit, offset)
         
-        # 총 개수 조회
-        count_query = "SELECT COUNT(*) FROM routes WHERE 1=1" + ''.join(conditions)
-        total_count = db.execute(text(count_query), params).fetchone()[0]
+            # 좌표는 요청한 경우에만 현재 페이지 경로만 조회
+            geometries = {}
+            if resolution:
+                geometries = _load_route_geometries(
+                    db, [int(catalog.route_id[i]) for i in page], resolution, geometry_format
+                )
         
-        return {
-            "total_count": total_count,
-            "limit": limit,
-            "offset": offset,
-            "routes": [
-                {
-                    "route_id": r[0],
-                    "route_name": clean_route_name(r[1]),  # 경로 이름 정리
-                    "route_type": r[2],
-                    "distance_km": float(r[3]),
-                    "estimated_duration_minutes": r[4],
-                    "total_elevation_gain_m": float(r[5]) if r[5] else None,
-                    "difficulty_level": r[6],
-                    "avg_rating": float(r[7]) if r[7] else None,
-                    "rating_count": r[8],
-                    "created_at": r[9].isoformat() if r[9] else None
-                }
-                for r in results
-            ]
-        }
+            return {
+                "total_count": int(mask.sum()),
+                "limit": limit,
+                "offset": offset,
+                "routes": [
+                    {
+                        "route_id": int(catalog.route_id[i]),
+                        "route_name": clean_route_name(catalog.route_name[i]),  # 경로 이름 정리
+                        "route_type": catalog.route_type[i] or None,
+                        "distance_km": float(catalog.distance_km[i]),
+                        "estimated_duration_minutes": _optional_int(catalog.duration_min[i]),
+                        "total_elevation_gain_m": _optional_float(catalog.elevation_gain[i]),
+                        "difficulty_level": catalog.difficulty[i] or None,
+                        "avg_rating": _optional_float(catalog.avg_rating[i]),
+                        "rating_count": int(catalog.rating_count[i]),
+                        "created_at": _isoformat(catalog.created_at[i]),
+                        **geometries.get(int(catalog.route_id[i]), {}),
+                    }
+                    for i in page
+                ]
+            }
+    
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"경로 목록 조회 중 오류가 발생했습니다: {str(e)}"
+            )
+
+    return await run_db(_list_routes)
+
+
+@router.get("/tiles/{z}/{x}/{y}")
+async def get_route_tile(
+    z: int,
+    x: int,
+    y: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    지도 오버레이용 경로 타일 (GeoJSON FeatureCollection)
+    
+    타일 범위에 걸친 경로 선만 줌 레벨에 맞게 단순화하여 반환합니다.
+    처음 요청 시 생성 후 디스크에 캐시하며, 경로가 바뀌면 다시 생성합니다 (app/utils/route_tiles.py).
     
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"경로 목록 조회 중 오류가 발생했습니다: {str(e)}"
-        )
+    Args:
+        z, x, y: XYZ 타일 좌표 (Web Mercator)
+        if_none_match: 이전 응답의 ETag (같으면 304)
+        db: DB 세션
+    
+    Returns:
+        GeoJSON FeatureCollection (feature마다 route_id, route_name 등 속성 + MultiLineString)
+    """
+    if not 0 <= z <= MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=400, detail=f"잘못된 타일 좌표입니다: {z}/{x}/{y}")
+
+    data, etag = await run_db(route_tile_cache.get_tile, db, z, x, y, clean_route_name)
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, media_type="application/geo+json", headers=headers)
 
 
 @router.get("/routes/{route_id}", response_model=dict)
 async def get_route_detail(
     route_id: int,
+    resolution: str = Query("full", pattern=RESOLUTION_PATTERN),
+    geometry_format: str = Query("geojson", pattern=GEOMETRY_FORMAT_PATTERN),
     db: Session = Depends(get_db)
 ):
     """
@@ -269,88 +423,94 @@ async def get_route_detail(
     
     Args:
         route_id: 조회할 경로 ID
+        resolution: 좌표 해상도 (full=GPX 원본, high/medium/low=단순화 좌표)
+        geometry_format: geojson(route_coordinates) 또는 polyline(route_polyline, Encoded Polyline)
         db: DB 세션
     
     Returns:
         경로 상세 정보 및 세그먼트 정보
     """
-    try:
-        # Routes 테이블에서 경로 정보 조회
-        query = text("""
-        SELECT 
-            route_id, route_name, route_type, distance_km,
-            estimated_duration_minutes, total_elevation_gain_m,
-            total_elevation_loss_m, max_elevation_m, min_elevation_m,
-            difficulty_level, route_coordinates, source, tags,
-            avg_rating, rating_count, created_at
-        FROM routes
-        WHERE route_id = :route_id
-        """)
+    def _get_route_detail():
+        try:
+            # Routes 테이블에서 경로 정보 조회
+            query = text("""
+            SELECT 
+                route_id, route_name, route_type, distance_km,
+                estimated_duration_minutes, total_elevation_gain_m,
+                total_elevation_loss_m, max_elevation_m, min_elevation_m,
+                difficulty_level, {coordinates_column}, source, tags,
+                avg_rating, rating_count, created_at,
+                p.segment_data, p.terrain_types
+            FROM routes
+            LEFT JOIN route_segment_packs p USING (route_id)
+            WHERE route_id = :route_id
+            """.format(
+                # 단순화 좌표를 쓰면 원본 좌표(트랙 포인트 전체)는 읽지 않음
+                coordinates_column="route_coordinates" if resolution == "full" else "NULL AS route_coordinates"
+            ))
         
-        result = db.execute(query, {'route_id': route_id}).fetchone()
+            result = db.execute(query, {'route_id': route_id}).fetchone()
         
-        if not result:
-            raise HTTPException(
-                status_code=404,
-                detail=f"경로 ID {route_id}를 찾을 수 없습니다."
-            )
+            if not result:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"경로 ID {route_id}를 찾을 수 없습니다."
+                )
         
-        # 세그먼트 정보 조회
-        segment_query = text("""
-        SELECT 
-            segment_id, segment_order, start_lat, start_lon,
-            end_lat, end_lon, segment_distance_m, segment_grade_percent,
-            elevation_change_m, terrain_type
-        FROM route_segments
-        WHERE route_id = :route_id
-        ORDER BY segment_order
-        """)
+            # 세그먼트 정보: 묶음 저장본이 있으면 같은 행에서 디코딩, 없으면 route_segments 조회
+            if result[16] is not None:
+                terrain_types = result[17]
+                if isinstance(terrain_types, str):
+                    terrain_types = json.loads(terrain_types)
+                segments = unpack_segments(bytes(result[16]), terrain_types)
+            else:
+                segment_query = text("""
+                SELECT 
+                    segment_id, segment_order, start_lat, start_lon,
+                    end_lat, end_lon, segment_distance_m, segment_grade_percent,
+                    elevation_change_m, terrain_type
+                FROM route_segments
+                WHERE route_id = :route_id
+                ORDER BY segment_order
+                """)
+                segments = db.execute(segment_query, {'route_id': route_id}).mappings().all()
         
-        segments = db.execute(segment_query, {'route_id': route_id}).fetchall()
+            if resolution == "full":
+                geometry = _geometry_fields(result[10], geometry_format, encode=True)
+            else:
+                geometry = _load_route_geometries(db, [route_id], resolution, geometry_format)[route_id]
         
-        return {
-            "route": {
-                "route_id": result[0],
-                "route_name": clean_route_name(result[1]),  # 경로 이름 정리
-                "route_type": result[2],
-                "distance_km": float(result[3]),
-                "estimated_duration_minutes": result[4],
-                "total_elevation_gain_m": float(result[5]) if result[5] else None,
-                "total_elevation_loss_m": float(result[6]) if result[6] else None,
-                "max_elevation_m": float(result[7]) if result[7] else None,
-                "min_elevation_m": float(result[8]) if result[8] else None,
-                "difficulty_level": result[9],
-                "route_coordinates": result[10],
-                "source": result[11],
-                "tags": result[12],
-                "avg_rating": float(result[13]) if result[13] else None,
-                "rating_count": result[14],
-                "created_at": result[15].isoformat() if result[15] else None
-            },
-            "segments": [
-                {
-                    "segment_id": seg[0],
-                    "segment_order": seg[1],
-                    "start_lat": float(seg[2]),
-                    "start_lon": float(seg[3]),
-                    "end_lat": float(seg[4]),
-                    "end_lon": float(seg[5]),
-                    "segment_distance_m": float(seg[6]),
-                    "segment_grade_percent": float(seg[7]) if seg[7] else None,
-                    "elevation_change_m": float(seg[8]) if seg[8] else None,
-                    "terrain_type": seg[9]
-                }
-                for seg in segments
-            ]
-        }
+            return {
+                "route": {
+                    "route_id": result[0],
+                    "route_name": clean_route_name(result[1]),  # 경로 이름 정리
+                    "route_type": result[2],
+                    "distance_km": float(result[3]),
+                    "estimated_duration_minutes": result[4],
+                    "total_elevation_gain_m": float(result[5]) if result[5] else None,
+                    "total_elevation_loss_m": float(result[6]) if result[6] else None,
+                    "max_elevation_m": float(result[7]) if result[7] else None,
+                    "min_elevation_m": float(result[8]) if result[8] else None,
+                    "difficulty_level": result[9],
+                    **geometry,
+                    "source": result[11],
+                    "tags": result[12],
+                    "avg_rating": float(result[13]) if result[13] else None,
+                    "rating_count": result[14],
+                    "created_at": result[15].isoformat() if result[15] else None
+                },
+                "segments": [_segment_response(seg) for seg in segments]
+            }
     
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"경로 조회 중 오류가 발생했습니다: {str(e)}"
-        )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"경로 조회 중 오류가 발생했습니다: {str(e)}"
+            )
+
+    return await run_db(_get_route_detail)
 
 
 @router.get("/recommend", response_model=dict)
@@ -362,6 +522,8 @@ async def recommend_routes(
     user_lat: Optional[float] = None,
     user_lng: Optional[float] = None,
     user_speed_kmh: Optional[float] = None,
+    user_id: Optional[int] = None,
+    slope_sensitivity: float = Query(1.0, ge=0.0, le=3.0),
     max_distance_from_user: float = 10.0,
     distance_tolerance: float = 1.0,
     duration_tolerance: int = 15,
@@ -371,11 +533,12 @@ async def recommend_routes(
     """
     사용자 위치 기반 경로 추천
     
-    로직:
-    1. PostgreSQL에서 모든 GPX 경로 조회
-    2. 각 경로의 시작점과 사용자 위치 간 거리 계산
-    3. 사용자 위치에서 가까운 순으로 정렬
-    4. 목표 거리/시간에 맞는 코스만 필터링
+    로직 (인메모리 경로 카탈로그에서 벡터 연산):
+    1. 난이도/타입 필터
+    2. 각 경로의 시작점과 사용자 위치 간 거리 계산 (검색 반경 이내만)
+    3. 목표 거리/시간에 맞는 코스만 필터링
+       (예상 시간은 경로별 경사도 히스토그램 + 사용자 속도/경사 민감도로 계산)
+    4. 사용자 위치에서 가까운 순 → 목표에 가까운 순으로 정렬
     
     Args:
         distance_km: 목표 거리 (km)
@@ -385,6 +548,8 @@ async def recommend_routes(
         user_lat: 사용자 위도 (필수)
         user_lng: 사용자 경도 (필수)
         user_speed_kmh: 사용자 평균 보행 속도 (km/h, Health Connect Case 2)
+        user_id: 사용자 ID (user_speed_kmh가 없으면 속도 프로필 speed_case2 사용)
+        slope_sensitivity: 경사 민감도 (1.0 = Tobler 기준, 클수록 오르막/급경사에서 더 느림)
         max_distance_from_user: 검색 반경 (km, 기본 10km)
         distance_tolerance: 거리 허용 오차 (km, 기본 ±1km)
         duration_tolerance: 시간 허용 오차 (분, 기본 ±15분)
@@ -394,198 +559,84 @@ async def recommend_routes(
     Returns:
         추천 경로 목록 (가까운 순)
     """
-    try:
-        # 1️⃣ 사용자 위치 필수 체크
-        if not user_lat or not user_lng:
-            raise HTTPException(
-                status_code=400,
-                detail="사용자 위치(user_lat, user_lng)가 필요합니다."
-            )
-        
-        # 2️⃣ 목표 거리 또는 시간 중 하나는 필수
-        if not distance_km and not duration_minutes:
-            raise HTTPException(
-                status_code=400,
-                detail="목표 거리(distance_km) 또는 목표 시간(duration_minutes) 중 하나를 입력해주세요."
-            )
-        
-        # 3️⃣ PostgreSQL에서 모든 GPX 경로 조회
-        base_query = """
-        SELECT 
-            route_id, route_name, route_type, distance_km,
-            estimated_duration_minutes, total_elevation_gain_m, total_elevation_loss_m,
-            difficulty_level, avg_rating, rating_count, route_coordinates,
-            tags
-        FROM routes
-        WHERE 1=1
-        """
-        
-        params = {}
-        conditions = []
-        
-        # 난이도 필터
-        if difficulty:
-            conditions.append(" AND difficulty_level = :difficulty")
-            params['difficulty'] = difficulty
-        
-        # 경로 타입 필터
-        if route_type:
-            conditions.append(" AND route_type = :route_type")
-            params['route_type'] = route_type
-        
-        # 쿼리 실행
-        full_query = base_query + ''.join(conditions)
-        results = db.execute(text(full_query), params).fetchall()
-        
-        # 4️⃣ 각 경로 처리: 거리 계산 및 필터링
-        routes = []
+    # 속도가 없으면 사용자 속도 프로필(Case2) 사용 (캐시에 있으면 DB 조회 없음)
+    if user_speed_kmh is None and user_id is not None:
+        user_speed_kmh = await resolve_user_speed_kmh(user_id, "walking", case=2)
+
+    def _recommend_routes():
+        try:
+            # 1️⃣ 사용자 위치 필수 체크
+            if not user_lat or not user_lng:
+                raise HTTPException(
+                    status_code=400,
+                    detail="사용자 위치(user_lat, user_lng)가 필요합니다."
+                )
         
-        for r in results:
-            route_id, route_name, r_route_type, dist_km, est_duration, elevation_gain, elevation_loss, \
-            diff_level, avg_rating, rating_count, route_coords, tags = r
-            
-            # 4-1. 시작점 좌표 추출
-            start_lat, start_lng = extract_start_point(route_coords)
-            if start_lat is None or start_lng is None:
-                continue
-            
-            # 4-1-1. 종료점 좌표 추출 (GeoJSON 마지막 좌표)
-            end_lat, end_lng = extract_end_point(route_coords)
-            if end_lat is None or end_lng is None:
-                end_lat, end_lng = start_lat, start_lng
-            
-            # 4-2. 사용자 위치와의 거리 계산 (Haversine)
-            distance_from_user = calculate_distance(user_lat, user_lng, start_lat, start_lng)
-            
-            # 4-3. 검색 반경 필터링 (기본 10km 이내)
-            if distance_from_user > max_distance_from_user:
-                continue
-            
-            # 4-4. 목표 거리/시간 필터링
-            match = False
-            
-            if distance_km:
-                # 목표 거리 ± 허용 오차 범위
-                # Decimal을 float로 변환하여 비교
-                if abs(float(dist_km) - distance_km) <= distance_tolerance:
-                    match = True
-            
-            if duration_minutes and not match:
-                # 사용자 속도가 제공되면 실시간 재계산, 아니면 DB 값 사용
-                if user_speed_kmh and user_speed_kmh > 0:
-                    # 사용자 속도 기반 예상 시간 재계산
-                    user_estimated_duration = (float(dist_km) / user_speed_kmh) * 60
-                    if abs(user_estimated_duration - duration_minutes) <= duration_tolerance:
-                        match = True
-                else:
-                    # 목표 시간 ± 허용 오차 범위 (DB 저장 값 사용)
-                    if abs(est_duration - duration_minutes) <= duration_tolerance:
-                        match = True
-            
-            if not match:
-                continue
-            
-            # 4-5. 설명 생성
-            description_parts = []
-            if tags:
-                try:
-                    tags_list = json.loads(tags) if isinstance(tags, str) else tags
-                    if isinstance(tags_list, list) and len(tags_list) > 1:
-                        tag_value = tags_list[1]
-                        # strava.segments, 특수문자(_-), 숫자만 있는 태그, 언더바 포함 태그 제외
-                        if not (
-                            'strava.segments' in tag_value.lower() or
-                            tag_value.startswith('strava') or
-                            '_' in tag_value or  # 언더바 포함 제외
-                            all(c in '0123456789-_.' for c in tag_value)
-                        ):
-                            description_parts.append(tag_value)
-                except:
-                    pass
-            
-            if elevation_gain:
-                if elevation_gain < 50:
-                    description_parts.append("평탄한 코스")
-                elif elevation_gain < 200:
-                    description_parts.append("적당한 오르막")
-                else:
-                    description_parts.append("경사 있는 코스")
-            
-            description = ", ".join(description_parts) if description_parts else ""
-            
-            # 경로 이름 정리 (중복 및 Strava 정보 제거)
-            cleaned_name = clean_route_name(route_name)
-            
-            # 사용자 속도 기반 예상 시간 재계산 (Tobler's Hiking Function + speed_case2)
-            final_estimated_duration = est_duration  # 기본값: DB 저장값
-            if user_speed_kmh and user_speed_kmh > 0:
-                # DB의 estimated_duration은 이미 Tobler로 계산된 값
-                # 사용자 속도 비율만 적용
-                base_speed_kmh = 6.0 * math.exp(-3.5 * 0.05)  # 평지 기준 5.036 km/h
-                speed_ratio = user_speed_kmh / base_speed_kmh
-                
-                # 최종 시간 = DB 시간 / 속도 비율
-                # (빠르면 시간 감소, 느리면 시간 증가)
-                final_estimated_duration = int(est_duration / speed_ratio)
-            
-            # 목표 거리/시간과의 차이 계산
-            target_diff = 0
-            if distance_km:
-                # 목표 거리와의 차이 (km)
-                target_diff = abs(float(dist_km) - distance_km)
-            elif duration_minutes:
-                # 목표 시간과의 차이 (분) - 사용자 속도 반영된 값 사용
-                target_diff = abs(final_estimated_duration - duration_minutes)
-            
-            # 4-6. 결과 목록에 추가
-            routes.append({
-                'route_id': route_id,
-                'route_name': cleaned_name,
-                'route_type': r_route_type,
-                'distance_km': float(dist_km),
-                'estimated_duration_minutes': final_estimated_duration,  # 사용자 속도 반영
-                'total_elevation_gain_m': float(elevation_gain) if elevation_gain else 0,
-                'total_elevation_loss_m': float(elevation_loss) if elevation_loss else 0,
-                'difficulty_level': diff_level,
-                'avg_rating': float(avg_rating) if avg_rating else None,
-                'rating_count': rating_count,
-                'start_point': {
-                    'lat': start_lat,
-                    'lng': start_lng,
-                },
-                'end_point': {
-                    'lat': end_lat,
-                    'lng': end_lng,
-                },
-                'distance_from_user': round(distance_from_user, 2),
-                'description': description,
-                'target_diff': target_diff  # 목표 거리/시간과의 차이
-            })
+            # 2️⃣ 목표 거리 또는 시간 중 하나는 필수
+            if not distance_km and not duration_minutes:
+                raise HTTPException(
+                    status_code=400,
+                    detail="목표 거리(distance_km) 또는 목표 시간(duration_minutes) 중 하나를 입력해주세요."
+                )
         
-        # 5️⃣ 정렬: 사용자 위치에 가까운 순 → 목표 거리/시간에 가까운 순
-        # 1차: 사용자 위치에서의 거리 (가까울수록 우선)
-        # 2차: 목표값과의 차이 (작을수록 우선)
-        routes.sort(key=lambda x: (x['distance_from_user'], x['target_diff']))
+            # 3️⃣ 인메모리 카탈로그에서 필터링 → 4️⃣ 거리 계산/목표 거리·시간 매칭 → 5️⃣ 정렬 (벡터 연산)
+            # 정렬: 사용자 위치에 가까운 순(1차) → 목표 거리/시간에 가까운 순(2차)
+            catalog = route_catalog.get(db)
+            result = catalog.recommend(
+                user_lat=user_lat,
+                user_lng=user_lng,
+                distance_km=distance_km,
+                duration_minutes=duration_minutes,
+                difficulty=difficulty,
+                route_type=route_type,
+                user_speed_kmh=user_speed_kmh,
+                max_distance_from_user=max_distance_from_user,
+                distance_tolerance=distance_tolerance,
+                duration_tolerance=duration_tolerance,
+                slope_sensitivity=slope_sensitivity,
+            )
+            index = result["index"]
         
-        # 6️⃣ 상위 N개만 반환 (target_diff는 응답에서 제거)
-        recommended = []
-        for route in routes[:limit]:
-            # target_diff는 내부 정렬용이므로 제거
-            route_copy = {k: v for k, v in route.items() if k != 'target_diff'}
-            recommended.append(route_copy)
+            # 6️⃣ 상위 N개만 응답 생성 (이름 정리/설명 생성은 반환하는 경로만)
+            recommended = []
+            for i in index[:limit]:
+                recommended.append({
+                    'route_id': int(catalog.route_id[i]),
+                    'route_name': clean_route_name(catalog.route_name[i]),
+                    'route_type': catalog.route_type[i] or None,
+                    'distance_km': float(catalog.distance_km[i]),
+                    'estimated_duration_minutes': _optional_int(result["estimated_duration"][i]),  # 사용자 속도 반영
+                    'total_elevation_gain_m': _optional_float(catalog.elevation_gain[i]) or 0,
+                    'total_elevation_loss_m': _optional_float(catalog.elevation_loss[i]) or 0,
+                    'difficulty_level': catalog.difficulty[i] or None,
+                    'avg_rating': _optional_float(catalog.avg_rating[i]),
+                    'rating_count': int(catalog.rating_count[i]),
+                    'start_point': {
+                        'lat': float(catalog.start_lat[i]),
+                        'lng': float(catalog.start_lng[i]),
+                    },
+                    'end_point': {
+                        'lat': float(catalog.end_lat[i]),
+                        'lng': float(catalog.end_lng[i]),
+                    },
+                    'distance_from_user': round(float(result["distance_from_user"][i]), 2),
+                    'description': build_route_description(catalog.tags[i], _optional_float(catalog.elevation_gain[i])),
+                })
         
-        return {
-            "total_count": len(routes),
-            "recommended_routes": recommended
-        }
+            return {
+                "total_count": len(index),
+                "recommended_routes": recommended
+            }
     
-    except HTTPException:
-        raise
-    except Exception as e:
-        import traceback
-        print(f"❌ 경로 추천 에러: {str(e)}")
-        print(traceback.format_exc())
-        raise HTTPException(
-            status_code=500,
-            detail=f"경로 추천 중 오류가 발생했습니다: {str(e)}"
-        )
\ No newline at end of file
+        except HTTPException:
+            raise
+        except Exception as e:
+            import traceback
+            print(f"❌ 경로 추천 에러: {str(e)}")
+            print(traceback.format_exc())
+            raise HTTPException(
+                status_code=500,
+                detail=f"경로 추천 중 오류가 발생했습니다: {str(e)}"
+            )
+
+    return await run_db(_recommend_routes)
\ No newline at end of file
@@ -5,15 +5,29 @@
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, defer, selectinload
+from sqlalchemy import and_, desc, func, or_
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from datetime import datetime, timedelta
+import base64
 
-from app.database import get_db
+from app.database import get_db, run_db
 from app.models import NavigationLogs, Users
-from app.schemas import NavigationLogCreate, NavigationLogResponse, NavigationLogListResponse
+from app.schemas import (
+    NavigationLogBatchCreate,
+    NavigationLogBatchResponse,
+    NavigationLogBatchResult,
+    NavigationLogCreate,
+    NavigationLogListResponse,
+    NavigationLogResponse,
+)
 from app import crud
+from app.utils import navigation_export
+from app.utils.dependencies import require_admin_token
+from app.utils.movement_codec import merge_movement_data, split_movement_data
+from app.utils.route_itinerary import itinerary_hash, merge_route_data, split_route_data
 
 router = APIRouter(
     prefix="/api/navigation",
@@ -21,29 +35,77 @@ router = APIRouter(
 )
 
 
-@router.post("/logs", response_model=NavigationLogResponse, status_code=201)
-async def create_navigation_log(
-    log_data: NavigationLogCreate,
-    user_id: int = Query(..., description="사용자 ID"),
-    db: Session = Depends(get_db)
-):
+def _to_response(log: NavigationLogs, include_detail: bool = True) -> NavigationLogResponse:
     """
-    네비게이션 로그 저장
-    
-    경로 안내가 종료되면 프론트엔드에서 이 API를 호출하여 로그를 저장합니다.
+    NavigationLogs → NavigationLogResponse 변환
+
+    include_detail=False이면 movement_data/route_data(대용량 JSON)를 응답에서 제외합니다.
+    목록 조회에서는 해당 컬럼을 defer하므로, 이 경우 속성에 접근하지 않아야 추가 쿼리가 발생하지 않습니다.
+    route_data는 분리 저장한 경로(route_itineraries)와 합쳐 원래 값으로 반환합니다.
+    movement_data의 구간 목록은 상세 응답을 만들 때만 바이너리에서 디코딩합니다.
+    """
+    return NavigationLogResponse(
+        log_id=log.log_id,
+        user_id=log.user_id,
+        route_mode=log.route_mode,
+        start_location=log.start_location,
+        end_location=log.end_location,
+        start_lat=float(log.start_lat),
+        start_lon=float(log.start_lon),
+        end_lat=float(log.end_lat),
+        end_lon=float(log.end_lon),
+        total_distance_m=float(log.total_distance_m),
+        walking_distance_m=float(log.walking_distance_m) if log.walking_distance_m else None,
+        transport_modes=log.transport_modes,
+        crosswalk_count=log.crosswalk_count,
+        user_speed_factor=float(log.user_speed_factor) if log.user_speed_factor else None,
+        slope_factor=float(log.slope_factor) if log.slope_factor else None,
+        weather_factor=float(log.weather_factor) if log.weather_factor else None,
+        estimated_time_seconds=log.estimated_time_seconds,
+        actual_time_seconds=log.actual_time_seconds,
+        time_difference_seconds=log.time_difference_seconds,
+        accuracy_percent=float(log.accuracy_percent) if log.accuracy_percent else None,
+        # 보행 시간 예측 정확도
+        estimated_walk_time_seconds=log.estimated_walk_time_seconds,
+        walk_time_difference_seconds=log.walk_time_difference_seconds,
+        walk_accuracy_percent=float(log.walk_accuracy_percent) if log.walk_accuracy_percent else None,
+        # 실제 보행 측정
+        active_walking_time_seconds=log.active_walking_time_seconds,
+        paused_time_seconds=log.paused_time_seconds or 0,
+        real_walking_speed_kmh=float(log.real_walking_speed_kmh) if log.real_walking_speed_kmh else None,
+        pause_count=log.pause_count or 0,
+        movement_data=merge_movement_data(log.movement_data, log.movement_segments) if include_detail else None,
+        weather_id=log.weather_id,
+        route_data=_hydrate_route_data(log) if include_detail else None,
+        started_at=log.started_at,
+        ended_at=log.ended_at,
+        created_at=log.created_at,
+    )
+
+
+def _hydrate_route_data(log: NavigationLogs) -> Optional[dict]:
+    """로그의 route_data + 분리 저장한 경로 → 원래 route_data"""
+    if log.route_itinerary_hash is None:
+        return log.route_data
+    return merge_route_data(log.route_data, log.route_itinerary.itinerary)
+
+
+def _build_navigation_log(user_id: int, log_data: NavigationLogCreate, itineraries: dict) -> NavigationLogs:
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.info(f"📥 Navigation log save request: user_id={user_id}")
-    logger.info(f"📥 Log data: {log_data.model_dump()}")
-    
-    # 사용자 존재 확인
-    user = db.query(Users).filter(Users.user_id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
-    
-    # 네비게이션 로그 생성
-    nav_log = NavigationLogs(
+    요청 데이터 → NavigationLogs 객체 (아직 세션에 추가하지 않음)
+
+    route_data의 경로 부분은 itineraries(해시 → 경로)에 모으고 로그에는 해시만 남깁니다.
+    movement_data의 구간 목록은 바이너리로 인코딩하여 movement_segments에 저장합니다.
+    로그를 flush하기 전에 crud.store_route_itineraries(db, itineraries)로 저장해야 합니다.
+    """
+    route_data, itinerary = split_route_data(log_data.route_data)
+    movement_data, movement_segments = split_movement_data(log_data.movement_data)
+    route_itinerary_hash = None
+    if itinerary is not None:
+        route_itinerary_hash = itinerary_hash(itinerary)
+        itineraries[route_itinerary_hash] = itinerary
+
+    return NavigationLogs(
         user_id=user_id,
         route_mode=log_data.route_mode,
         start_location=log_data.start_location,
@@ -72,95 +134,278 @@ async def create_navigation_log(
         paused_time_seconds=log_data.paused_time_seconds,
         real_walking_speed_kmh=log_data.real_walking_speed_kmh,
         pause_count=log_data.pause_count,
-        movement_data=log_data.movement_data,
+        movement_data=movement_data,
+        movement_segments=movement_segments,
         weather_id=log_data.weather_id,
-        route_data=log_data.route_data,
+        route_data=route_data,
+        route_itinerary_hash=route_itinerary_hash,
+        idempotency_key=log_data.idempotency_key,
         started_at=log_data.started_at,
         ended_at=log_data.ended_at,
     )
-    
-    try:
-        db.add(nav_log)
-        db.commit()
-        db.refresh(nav_log)
-        logger.info(f"✅ Navigation log saved: log_id={nav_log.log_id}")
-    except Exception as e:
-        db.rollback()
-        logger.error(f"❌ DB commit failed: {e}")
-        raise HTTPException(status_code=500, detail=f"DB 저장 실패: {str(e)}")
-    
-    # 🔄 자동 프로필 업데이트: 실측 속도로 사용자 기준 속도 갱신
-    if (
+
+
+def _profile_speed_from_log(nav_log: NavigationLogs) -> Optional[float]:
+    """
+    속도 프로필 갱신에 쓸 기준 속도 (평지+맑은날, km/h)
+
+    실측 속도와 계수가 모두 있고 최소 5분 이상 걸은 로그만 반영하며, 아니면 None을 반환합니다.
+    """
+    if not (
         nav_log.real_walking_speed_kmh
         and nav_log.slope_factor
         and nav_log.weather_factor
         and nav_log.active_walking_time_seconds
-        and nav_log.active_walking_time_seconds >= 300  # 최소 5분 이상 걸었을 때만
+        and nav_log.active_walking_time_seconds >= crud.PROFILE_MIN_WALKING_SECONDS  # 최소 5분 이상 걸었을 때만
     ):
-        try:
-            from app.utils.Factors_Affecting_Walking_Speed import reverse_calculate_base_speed
-            
-            # 역산: 평지+맑은날 기준 속도 계산
-            base_speed_kmh = reverse_calculate_base_speed(
-                real_walking_speed_kmh=float(nav_log.real_walking_speed_kmh),
-                slope_factor=float(nav_log.slope_factor),
-                weather_factor=float(nav_log.weather_factor),
-            )
-            
+        return None
+
+    from app.utils.Factors_Affecting_Walking_Speed import reverse_calculate_base_speed
+
+    # 역산: 평지+맑은날 기준 속도 계산
+    return reverse_calculate_base_speed(
+        real_walking_speed_kmh=float(nav_log.real_walking_speed_kmh),
+        slope_factor=float(nav_log.slope_factor),
+        weather_factor=float(nav_log.weather_factor),
+    )
+
+
+def _find_by_idempotency_key(db: Session, user_id: int, idempotency_key: str) -> Optional[NavigationLogs]:
+    """같은 사용자가 같은 멱등 키로 저장한 로그"""
+    return (
+        db.query(NavigationLogs)
+        .filter(
+            NavigationLogs.user_id == user_id,
+            NavigationLogs.idempotency_key == idempotency_key,
+        )
+        .first()
+    )
+
+
+def _update_speed_profile_from_log(db: Session, nav_log: NavigationLogs) -> Optional[float]:
+    """
+    실측 속도로 속도 프로필 + 경사도/날씨 민감도 모델 갱신 (commit하지 않음)
+
+    실패해도 로그 저장은 계속되도록 savepoint 안에서 실행하고 예외는 무시합니다.
+
+    Returns:
+        반영한 기준 속도 (km/h), 반영하지 않았거나 실패하면 None
+    """
+    try:
+        base_speed_kmh = _profile_speed_from_log(nav_log)
+        if base_speed_kmh is None:
+            return None
+        with db.begin_nested():
             # 가중 평균으로 프로필 업데이트
             crud.update_speed_profile_with_weighted_avg(
                 db=db,
-                user_id=user_id,
+                user_id=nav_log.user_id,
                 activity_type="walking",
                 new_speed_kmh=base_speed_kmh,
                 source="navigation_log",
                 navigation_log_id=nav_log.log_id,
+                commit=False,
+            )
+            # 경사도/날씨 민감도 모델에 관측 1개 추가
+            crud.update_user_speed_model(db, nav_log.user_id, nav_log, base_speed_kmh, commit=False)
+        return base_speed_kmh
+    except Exception as e:
+        print(f"⚠️ 속도 프로필 업데이트 실패 (무시): log_id={nav_log.log_id}, {e}")
+        return None
+
+
+def _encode_cursor(log: NavigationLogs) -> str:
+    """목록 커서 생성: (started_at, log_id)를 base64로 인코딩"""
+    raw = f"{log.started_at.isoformat()}|{log.log_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    """목록 커서 해석 → (started_at, log_id)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        started_at, log_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(started_at), int(log_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+
+@router.post("/logs", response_model=NavigationLogResponse, status_code=201)
+async def create_navigation_log(
+    log_data: NavigationLogCreate,
+    user_id: int = Query(..., description="사용자 ID"),
+    db: Session = Depends(get_db)
+):
+    """
+    네비게이션 로그 저장
+    
+    경로 안내가 종료되면 프론트엔드에서 이 API를 호출하여 로그를 저장합니다.
+    """
+    def _create_navigation_log():
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.info(f"📥 Navigation log save request: user_id={user_id}")
+        logger.info(f"📥 Log data: {log_data.model_dump()}")
+    
+        # 사용자 존재 확인
+        user = db.query(Users).filter(Users.user_id == user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    
+        # 같은 멱등 키로 이미 저장된 로그가 있으면 그대로 반환 (재전송)
+        if log_data.idempotency_key:
+            existing = _find_by_idempotency_key(db, user_id, log_data.idempotency_key)
+            if existing:
+                logger.info(f"↩️ Duplicate navigation log: log_id={existing.log_id}")
+                return _to_response(existing)
+    
+        # 네비게이션 로그 생성
+        itineraries = {}
+        nav_log = _build_navigation_log(user_id, log_data, itineraries)
+    
+        try:
+            crud.store_route_itineraries(db, itineraries)  # 같은 경로가 이미 있으면 건너뜀
+            db.add(nav_log)
+            db.flush()  # log_id 채움
+            # 일별 통계 롤업도 같은 트랜잭션에서 갱신
+            crud.apply_navigation_log_to_daily_stats(db, nav_log)
+    
+            # 🔄 자동 프로필 업데이트: 실측 속도로 사용자 기준 속도 갱신
+            # 실패해도 로그는 저장되도록 savepoint 안에서 실행하고, 로그와 함께 한 번에 commit
+            base_speed_kmh = _update_speed_profile_from_log(db, nav_log)
+            if base_speed_kmh is not None:
+                print(f"✅ 속도 프로필 자동 업데이트: {base_speed_kmh:.2f} km/h")
+    
+            db.commit()
+            db.refresh(nav_log)
+            logger.info(f"✅ Navigation log saved: log_id={nav_log.log_id}")
+        except IntegrityError as e:
+            # 같은 멱등 키로 동시에 저장한 요청이 먼저 commit됨 → 그 로그를 반환 (재전송과 같은 응답)
+            db.rollback()
+            existing = (
+                _find_by_idempotency_key(db, user_id, log_data.idempotency_key)
+                if log_data.idempotency_key
+                else None
             )
-            
-            print(f"✅ 속도 프로필 자동 업데이트: {base_speed_kmh:.2f} km/h")
+            if existing:
+                logger.info(f"↩️ Duplicate navigation log (concurrent): log_id={existing.log_id}")
+                return _to_response(existing)
+            logger.warning(f"⚠️ Navigation log conflict: {e}")
+            raise HTTPException(status_code=409, detail="동시에 저장된 데이터와 충돌했습니다. 다시 시도하세요.")
         except Exception as e:
-            print(f"⚠️ 속도 프로필 업데이트 실패 (무시): {e}")
-    
-    # 응답 생성
-    response = NavigationLogResponse(
-        log_id=nav_log.log_id,
-        user_id=nav_log.user_id,
-        route_mode=nav_log.route_mode,
-        start_location=nav_log.start_location,
-        end_location=nav_log.end_location,
-        start_lat=float(nav_log.start_lat),
-        start_lon=float(nav_log.start_lon),
-        end_lat=float(nav_log.end_lat),
-        end_lon=float(nav_log.end_lon),
-        total_distance_m=float(nav_log.total_distance_m),
-        walking_distance_m=float(nav_log.walking_distance_m) if nav_log.walking_distance_m else None,
-        transport_modes=nav_log.transport_modes,
-        crosswalk_count=nav_log.crosswalk_count,
-        user_speed_factor=float(nav_log.user_speed_factor) if nav_log.user_speed_factor else None,
-        slope_factor=float(nav_log.slope_factor) if nav_log.slope_factor else None,
-        weather_factor=float(nav_log.weather_factor) if nav_log.weather_factor else None,
-        estimated_time_seconds=nav_log.estimated_time_seconds,
-        actual_time_seconds=nav_log.actual_time_seconds,
-        time_difference_seconds=nav_log.time_difference_seconds,
-        accuracy_percent=float(nav_log.accuracy_percent) if nav_log.accuracy_percent else None,
-        # 보행 시간 예측 정확도
-        estimated_walk_time_seconds=nav_log.estimated_walk_time_seconds,
-        walk_time_difference_seconds=nav_log.walk_time_difference_seconds,
-        walk_accuracy_percent=float(nav_log.walk_accuracy_percent) if nav_log.walk_accuracy_percent else None,
-        # 실제 보행 측정
-        active_walking_time_seconds=nav_log.active_walking_time_seconds,
-        paused_time_seconds=nav_log.paused_time_seconds or 0,
-        real_walking_speed_kmh=float(nav_log.real_walking_speed_kmh) if nav_log.real_walking_speed_kmh else None,
-        pause_count=nav_log.pause_count or 0,
-        movement_data=nav_log.movement_data,
-        weather_id=nav_log.weather_id,
-        route_data=nav_log.route_data,
-        started_at=nav_log.started_at,
-        ended_at=nav_log.ended_at,
-        created_at=nav_log.created_at,
-    )
+            db.rollback()
+            logger.error(f"❌ DB commit failed: {e}")
+            raise HTTPException(status_code=500, detail=f"DB 저장 실패: {str(e)}")
+    
+        # 응답 생성
+        response = _to_response(nav_log)
     
-    return response
+        return response
+
+    return await run_db(_create_navigation_log)
+
+
+@router.post("/logs/batch", response_model=NavigationLogBatchResponse, status_code=201)
+async def create_navigation_logs_batch(
+    batch: NavigationLogBatchCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    네비게이션 로그 일괄 저장
+
+    오프라인 중 쌓인 로그를 한 번에 업로드할 때 사용합니다.
+    - 사용자 확인, 멱등 키 중복 확인을 각각 쿼리 한 번으로 처리
+    - 로그 INSERT, 일별 통계, 속도 프로필 갱신을 하나의 트랜잭션으로 commit
+      (속도 프로필 갱신은 로그마다 savepoint - 실패한 로그의 갱신만 건너뜀)
+    - 이미 저장된 멱등 키(또는 요청 안에서 반복된 키)는 새로 저장하지 않고 기존 log_id를 반환
+    """
+    def _create_navigation_logs_batch():
+        import logging
+        logger = logging.getLogger(__name__)
+
+        items = batch.logs
+        user_ids = {item.user_id for item in items}
+        logger.info(f"📥 Navigation log batch request: {len(items)} logs, {len(user_ids)} users")
+
+        # 사용자 존재 확인 (한 번에)
+        found = {row.user_id for row in db.query(Users.user_id).filter(Users.user_id.in_(user_ids))}
+        missing = sorted(user_ids - found)
+        if missing:
+            raise HTTPException(status_code=404, detail=f"사용자를 찾을 수 없습니다: {missing}")
+
+        # 이미 저장된 멱등 키 조회 (한 번에)
+        keys = {item.idempotency_key for item in items if item.idempotency_key}
+        known = {}
+        if keys:
+            rows = (
+                db.query(NavigationLogs.user_id, NavigationLogs.idempotency_key, NavigationLogs.log_id)
+                .filter(
+                    NavigationLogs.user_id.in_(user_ids),
+                    NavigationLogs.idempotency_key.in_(keys),
+                )
+            )
+            known = {(row.user_id, row.idempotency_key): row.log_id for row in rows}
+
+        # 새로 저장할 로그만 생성 (요청 안에서 반복된 키는 처음 것만)
+        new_logs = {}  # index → NavigationLogs
+        first_index = {}  # (user_id, key) → 처음 나온 index
+        itineraries = {}  # 경로 해시 → 경로 (같은 경로는 한 번만 저장)
+        for index, item in enumerate(items):
+            key = (item.user_id, item.idempotency_key)
+            if item.idempotency_key and (key in known or key in first_index):
+                continue
+            if item.idempotency_key:
+                first_index[key] = index
+            new_logs[index] = _build_navigation_log(item.user_id, item, itineraries)
+
+        try:
+            crud.store_route_itineraries(db, itineraries)
+            logs = list(new_logs.values())
+            db.add_all(logs)
+            db.flush()  # 여러 행 INSERT를 묶어서 실행하고 log_id 채움
+            crud.apply_navigation_logs_to_daily_stats(db, logs)
+
+            # 속도 프로필은 가중 평균이라 순서가 중요하므로 시작 시간 순으로 반영
+            # (로그마다 savepoint - 한 로그의 프로필 갱신이 실패해도 로그 저장과 나머지 갱신은 계속)
+            for nav_log in sorted(logs, key=lambda log: log.started_at):
+                _update_speed_profile_from_log(db, nav_log)
+
+            db.commit()
+        except IntegrityError as e:
+            # 같은 멱등 키를 가진 요청이 동시에 저장된 경우 → 클라이언트가 다시 보내면 중복으로 처리됨
+            db.rollback()
+            logger.warning(f"⚠️ Navigation log batch conflict: {e}")
+            raise HTTPException(status_code=409, detail="동시에 저장된 로그와 멱등 키가 충돌했습니다. 다시 시도하세요.")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ DB commit failed: {e}")
+            raise HTTPException(status_code=500, detail=f"DB 저장 실패: {str(e)}")
+
+        results = []
+        for index, item in enumerate(items):
+            if index in new_logs:
+                log_id, duplicate = new_logs[index].log_id, False
+            else:
+                key = (item.user_id, item.idempotency_key)
+                log_id = known[key] if key in known else new_logs[first_index[key]].log_id
+                duplicate = True
+            results.append(
+                NavigationLogBatchResult(
+                    index=index,
+                    log_id=log_id,
+                    idempotency_key=item.idempotency_key,
+                    duplicate=duplicate,
+                )
+            )
+
+        logger.info(f"✅ Navigation log batch saved: {len(new_logs)} created, {len(items) - len(new_logs)} duplicates")
+        return NavigationLogBatchResponse(
+            created_count=len(new_logs),
+            duplicate_count=len(items) - len(new_logs),
+            results=results,
+        )
+
+    return await run_db(_create_navigation_logs_batch)
 
 
 @router.get("/logs", response_model=NavigationLogListResponse)
@@ -170,82 +415,136 @@ async def get_navigation_logs(
     start_date: Optional[datetime] = Query(None, description="조회 시작 날짜"),
     end_date: Optional[datetime] = Query(None, description="조회 종료 날짜"),
     limit: int = Query(50, ge=1, le=100, description="조회 개수"),
-    offset: int = Query(0, ge=0, description="오프셋"),
+    offset: int = Query(0, ge=0, description="오프셋 (cursor가 없을 때만 사용, 하위 호환용)"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor)"),
+    include_detail: bool = Query(False, description="movement_data/route_data 포함 여부"),
+    count_mode: str = Query(
+        "exact",
+        pattern="^(exact|estimate|none)$",
+        description="전체 개수 계산 방식: exact(정확), estimate(일별 통계 기반 근사), none(생략)",
+    ),
     db: Session = Depends(get_db)
 ):
     """
     네비게이션 로그 목록 조회
     
-    사용자의 경로 안내 기록을 조회합니다.
+    사용자의 경로 안내 기록을 최신순으로 조회합니다.
+    
+    - cursor: 커서 기반 페이지네이션 (started_at, log_id 기준 keyset, idx_nav_user_time 사용)
+      깊은 페이지에서도 OFFSET처럼 앞쪽 행을 건너뛰며 읽지 않습니다.
+    - include_detail: 기본적으로 대용량 JSON 컬럼은 읽지 않으며, 필요하면 상세 조회 API 사용
+    - count_mode: 개수 계산 비용을 줄이려면 estimate 또는 none 사용
+    """
+    def _get_navigation_logs():
+        # 사용자 존재 확인
+        user = db.query(Users).filter(Users.user_id == user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    
+        # 기본 쿼리
+        query = db.query(NavigationLogs).filter(NavigationLogs.user_id == user_id)
+    
+        # 필터 적용
+        if route_mode:
+            query = query.filter(NavigationLogs.route_mode == route_mode)
+    
+        if start_date:
+            query = query.filter(NavigationLogs.started_at >= start_date)
+    
+        if end_date:
+            query = query.filter(NavigationLogs.started_at <= end_date)
+    
+        # 전체 개수
+        if count_mode == "exact":
+            total_count = query.count()
+        elif count_mode == "estimate":
+            total_count = crud.estimate_navigation_log_count(
+                db, user_id, route_mode=route_mode, start_date=start_date, end_date=end_date
+            )
+        else:
+            total_count = None
+    
+        # 대용량 JSON 컬럼은 상세 요청 시에만 로드 (분리 저장한 경로는 한 번의 추가 쿼리로 함께 로드)
+        if not include_detail:
+            query = query.options(
+                defer(NavigationLogs.movement_data),
+                defer(NavigationLogs.movement_segments),
+                defer(NavigationLogs.route_data),
+            )
+        else:
+            query = query.options(selectinload(NavigationLogs.route_itinerary))
+    
+        # 최신순 정렬 (같은 시작 시간은 log_id로 순서 고정)
+        query = query.order_by(desc(NavigationLogs.started_at), desc(NavigationLogs.log_id))
+    
+        if cursor:
+            cursor_started_at, cursor_log_id = _decode_cursor(cursor)
+            query = query.filter(
+                or_(
+                    NavigationLogs.started_at < cursor_started_at,
+                    and_(
+                        NavigationLogs.started_at == cursor_started_at,
+                        NavigationLogs.log_id < cursor_log_id,
+                    ),
+                )
+            )
+        else:
+            query = query.offset(offset)
+    
+        # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+        logs = query.limit(limit + 1).all()
+        has_more = len(logs) > limit
+        logs = logs[:limit]
+    
+        return NavigationLogListResponse(
+            total_count=total_count,
+            logs=[_to_response(log, include_detail=include_detail) for log in logs],
+            next_cursor=_encode_cursor(logs[-1]) if has_more else None,
+            has_more=has_more,
+        )
+
+    return await run_db(_get_navigation_logs)
+
+
+@router.get("/logs/export", dependencies=[Depends(require_admin_token)])
+async def export_navigation_logs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="내보내기 형식 (ndjson/csv)"),
+    columns: Optional[str] = Query(None, description="내보낼 컬럼 (쉼표 구분, 생략 시 형식별 기본값)"),
+    user_id: Optional[int] = Query(None, description="사용자 ID (생략 시 전체 사용자)"),
+    route_mode: Optional[str] = Query(None, description="경로 모드 필터 (transit/walking)"),
+    start_date: Optional[datetime] = Query(None, description="조회 시작 날짜"),
+    end_date: Optional[datetime] = Query(None, description="조회 종료 날짜"),
+    chunk_size: int = Query(1000, ge=100, le=10000, description="DB에서 한 번에 가져올 행 수"),
+):
     """
-    # 사용자 존재 확인
-    user = db.query(Users).filter(Users.user_id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
-    
-    # 기본 쿼리
-    query = db.query(NavigationLogs).filter(NavigationLogs.user_id == user_id)
-    
-    # 필터 적용
-    if route_mode:
-        query = query.filter(NavigationLogs.route_mode == route_mode)
-    
-    if start_date:
-        query = query.filter(NavigationLogs.started_at >= start_date)
-    
-    if end_date:
-        query = query.filter(NavigationLogs.started_at <= end_date)
-    
-    # 전체 개수
-    total_count = query.count()
-    
-    # 최신순 정렬 및 페이징
-    logs = query.order_by(desc(NavigationLogs.started_at)).offset(offset).limit(limit).all()
-    
-    # 응답 생성
-    log_responses = []
-    for log in logs:
-        log_responses.append(NavigationLogResponse(
-            log_id=log.log_id,
-            user_id=log.user_id,
-            route_mode=log.route_mode,
-            start_location=log.start_location,
-            end_location=log.end_location,
-            start_lat=float(log.start_lat),
-            start_lon=float(log.start_lon),
-            end_lat=float(log.end_lat),
-            end_lon=float(log.end_lon),
-            total_distance_m=float(log.total_distance_m),
-            walking_distance_m=float(log.walking_distance_m) if log.walking_distance_m else None,
-            transport_modes=log.transport_modes,
-            crosswalk_count=log.crosswalk_count,
-            user_speed_factor=float(log.user_speed_factor) if log.user_speed_factor else None,
-            slope_factor=float(log.slope_factor) if log.slope_factor else None,
-            weather_factor=float(log.weather_factor) if log.weather_factor else None,
-            estimated_time_seconds=log.estimated_time_seconds,
-            actual_time_seconds=log.actual_time_seconds,
-            time_difference_seconds=log.time_difference_seconds,
-            accuracy_percent=float(log.accuracy_percent) if log.accuracy_percent else None,
-            # 보행 시간 예측 정확도
-            estimated_walk_time_seconds=log.estimated_walk_time_seconds,
-            walk_time_difference_seconds=log.walk_time_difference_seconds,
-            walk_accuracy_percent=float(log.walk_accuracy_percent) if log.walk_accuracy_percent else None,
-            # 실제 보행 측정
-            active_walking_time_seconds=log.active_walking_time_seconds,
-            paused_time_seconds=log.paused_time_seconds or 0,
-            real_walking_speed_kmh=float(log.real_walking_speed_kmh) if log.real_walking_speed_kmh else None,
-            pause_count=log.pause_count or 0,
-            movement_data=log.movement_data,
-            weather_id=log.weather_id,
-            route_data=log.route_data,
-            started_at=log.started_at,
-            ended_at=log.ended_at,
-            created_at=log.created_at,
-        ))
-    
-    return NavigationLogListResponse(
-        total_count=total_count,
-        logs=log_responses
+    네비게이션 로그 전체 내보내기 (관리자 전용, X-Admin-Token 필요)
+    
+    모든 사용자의 로그를 log_id 순으로 스트리밍합니다.
+    서버 측 커서로 chunk_size개씩 읽으므로 로그 수와 관계없이 메모리 사용량이 일정합니다.
+    CSV 기본 컬럼은 movement_data/route_data를 제외하며, columns로 지정하면 포함할 수 있습니다.
+    """
+    try:
+        selected = navigation_export.resolve_columns(
+            columns.split(",") if columns else None, format
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    filename = f"navigation_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+
+    return StreamingResponse(
+        navigation_export.stream_export(
+            format,
+            selected,
+            chunk_size=chunk_size,
+            user_id=user_id,
+            route_mode=route_mode,
+            start_date=start_date,
+            end_date=end_date,
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
@@ -260,51 +559,18 @@ async def get_navigation_log_detail(
     
     특정 네비게이션 로그의 상세 정보를 조회합니다.
     """
-    log = db.query(NavigationLogs).filter(
-        NavigationLogs.log_id == log_id,
-        NavigationLogs.user_id == user_id
-    ).first()
+    def _get_navigation_log_detail():
+        log = db.query(NavigationLogs).filter(
+            NavigationLogs.log_id == log_id,
+            NavigationLogs.user_id == user_id
+        ).first()
     
-    if not log:
-        raise HTTPException(status_code=404, detail="로그를 찾을 수 없습니다.")
+        if not log:
+            raise HTTPException(status_code=404, detail="로그를 찾을 수 없습니다.")
     
-    return NavigationLogResponse(
-        log_id=log.log_id,
-        user_id=log.user_id,
-        route_mode=log.route_mode,
-        start_location=log.start_location,
-        end_location=log.end_location,
-        start_lat=float(log.start_lat),
-        start_lon=float(log.start_lon),
-        end_lat=float(log.end_lat),
-        end_lon=float(log.end_lon),
-        total_distance_m=float(log.total_distance_m),
-        walking_distance_m=float(log.walking_distance_m) if log.walking_distance_m else None,
-        transport_modes=log.transport_modes,
-        crosswalk_count=log.crosswalk_count,
-        user_speed_factor=float(log.user_speed_factor) if log.user_speed_factor else None,
-        slope_factor=float(log.slope_factor) if log.slope_factor else None,
-        weather_factor=float(log.weather_factor) if log.weather_factor else None,
-        estimated_time_seconds=log.estimated_time_seconds,
-        actual_time_seconds=log.actual_time_seconds,
-        time_difference_seconds=log.time_difference_seconds,
-        accuracy_percent=float(log.accuracy_percent) if log.accuracy_percent else None,
-        # 보행 시간 예측 정확도
-        estimated_walk_time_seconds=log.estimated_walk_time_seconds,
-        walk_time_difference_seconds=log.walk_time_difference_seconds,
-        walk_accuracy_percent=float(log.walk_accuracy_percent) if log.walk_accuracy_percent else None,
-        # 실제 보행 측정
-        active_walking_time_seconds=log.active_walking_time_seconds,
-        paused_time_seconds=log.paused_time_seconds or 0,
-        real_walking_speed_kmh=float(log.real_walking_speed_kmh) if log.real_walking_speed_kmh else None,
-        pause_count=log.pause_count or 0,
-        movement_data=log.movement_data,
-        weather_id=log.weather_id,
-        route_data=log.route_data,
-        started_at=log.started_at,
-        ended_at=log.ended_at,
-        created_at=log.created_at,
-    )
+        return _to_response(log)
+
+    return await run_db(_get_navigation_log_detail)
 
 
 @router.get("/logs/statistics/summary", response_model=dict)
@@ -318,70 +584,53 @@ async def get_navigation_statistics(
     
     사용자의 경로 안내 사용 통계를 제공합니다.
     """
-    # 사용자 존재 확인
-    user = db.query(Users).filter(Users.user_id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
-    
-    # 기간 설정
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
-    
-    # 통계 쿼리
-    logs = db.query(NavigationLogs).filter(
-        NavigationLogs.user_id == user_id,
-        NavigationLogs.started_at >= start_date
-    ).all()
-    
-    if not logs:
+    def _get_navigation_statistics():
+        # 사용자 존재 확인
+        user = db.query(Users).filter(Users.user_id == user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    
+        # 기간 설정 (일별 롤업 기준이므로 시작일은 날짜 단위로 포함)
+        start_date = (datetime.now() - timedelta(days=days)).date()
+    
+        # 통계 쿼리: 일별 롤업 테이블 합산 (로그 원본/JSON 컬럼은 읽지 않음)
+        totals = crud.get_navigation_stats_summary(db, user_id, start_date)
+        total_count = int(totals["total_count"])
+    
+        if total_count == 0:
+            return {
+                "period_days": days,
+                "total_navigations": 0,
+                "walking_count": 0,
+                "transit_count": 0,
+                "total_distance_km": 0,
+                "total_time_hours": 0,
+                "avg_time_difference_seconds": 0,
+                "accuracy_rate": 0,
+            }
+    
+        def _factor_average(name: str):
+            count = totals[f"{name}_count"]
+            return round(totals[f"{name}_sum"] / count, 3) if count else None
+    
+        # 정확도: 예상 시간 대비 실제 시간이 ±20% 이내인 비율
+        accuracy_rate = totals["accurate_count"] / total_count * 100
+    
         return {
             "period_days": days,
-            "total_navigations": 0,
-            "walking_count": 0,
-            "transit_count": 0,
-            "total_distance_km": 0,
-            "total_time_hours": 0,
-            "avg_time_difference_seconds": 0,
-            "accuracy_rate": 0,
+            "total_navigations": total_count,
+            "walking_count": int(totals["walking_count"]),
+            "transit_count": int(totals["transit_count"]),
+            "total_distance_km": round(totals["total_distance_m"] / 1000, 2),  # km로 변환
+            "total_time_hours": round(totals["total_actual_time_seconds"] / 3600, 2),  # 시간으로 변환
+            "avg_time_difference_seconds": round(totals["total_time_difference_seconds"] / total_count, 0),
+            "accuracy_rate": round(accuracy_rate, 1),
+            "avg_user_speed_factor": _factor_average("user_speed_factor"),
+            "avg_slope_factor": _factor_average("slope_factor"),
+            "avg_weather_factor": _factor_average("weather_factor"),
         }
-    
-    # 통계 계산
-    total_count = len(logs)
-    walking_count = sum(1 for log in logs if log.route_mode == "walking")
-    transit_count = sum(1 for log in logs if log.route_mode == "transit")
-    total_distance = sum(float(log.total_distance_m) for log in logs) / 1000  # km로 변환
-    total_time = sum(log.actual_time_seconds for log in logs) / 3600  # 시간으로 변환
-    avg_time_diff = sum(log.actual_time_seconds - log.estimated_time_seconds for log in logs) / total_count
-    
-    # 정확도 계산 (예상 시간 대비 실제 시간이 ±20% 이내인 경우)
-    accurate_count = sum(
-        1 for log in logs 
-        if abs(log.actual_time_seconds - log.estimated_time_seconds) / log.estimated_time_seconds <= 0.2
-    )
-    accuracy_rate = (accurate_count / total_count * 100) if total_count > 0 else 0
-    
-    return {
-        "period_days": days,
-        "total_navigations": total_count,
-        "walking_count": walking_count,
-        "transit_count": transit_count,
-        "total_distance_km": round(total_distance, 2),
-        "total_time_hours": round(total_time, 2),
-        "avg_time_difference_seconds": round(avg_time_diff, 0),
-        "accuracy_rate": round(accuracy_rate, 1),
-        "avg_user_speed_factor": round(
-            sum(float(log.user_speed_factor) for log in logs if log.user_speed_factor) / 
-            sum(1 for log in logs if log.user_speed_factor), 3
-        ) if any(log.user_speed_factor for log in logs) else None,
-        "avg_slope_factor": round(
-            sum(float(log.slope_factor) for log in logs if log.slope_factor) / 
-            sum(1 for log in logs if log.slope_factor), 3
-        ) if any(log.slope_factor for log in logs) else None,
-        "avg_weather_factor": round(
-            sum(float(log.weather_factor) for log in logs if log.weather_factor) / 
-            sum(1 for log in logs if log.weather_factor), 3
-        ) if any(log.weather_factor for log in logs) else None,
-    }
+
+    return await run_db(_get_navigation_statistics)
 
 
 @router.delete("/logs/{log_id}", status_code=204)
@@ -395,15 +644,23 @@ async def delete_navigation_log(
     
     특정 네비게이션 로그를 삭제합니다.
     """
-    log = db.query(NavigationLogs).filter(
-        NavigationLogs.log_id == log_id,
-        NavigationLogs.user_id == user_id
-    ).first()
+    def _delete_navigation_log():
+        log = db.query(NavigationLogs).filter(
+            NavigationLogs.log_id == log_id,
+            NavigationLogs.user_id == user_id
+        ).first()
     
-    if not log:
-        raise HTTPException(status_code=404, detail="로그를 찾을 수 없습니다.")
+        if not log:
+            raise HTTPException(status_code=404, detail="로그를 찾을 수 없습니다.")
     
-    db.delete(log)
-    db.commit()
+        crud.apply_navigation_log_to_daily_stats(db, log, sign=-1)
+        route_itinerary_hash = log.route_itinerary_hash
+        db.delete(log)
+        db.flush()
+        # 다른 로그가 참조하지 않는 경로면 함께 삭제
+        crud.delete_orphan_route_itineraries(db, [route_itinerary_hash])
+        db.commit()
     
-    return None
+        return None
+
+    return await run_db(_delete_navigation_log)
@@ -9,9 +9,10 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app import crud
-from app.database import get_db
+from app.database import get_db, run_db
 from app.models import Users
 from app.utils.dependencies import get_current_user
+from app.utils.speed_profile_cache import get_user_speed_profile, speed_profile_cache
 from app.constants.speed_constants import SLOW_WALK_SPEED_RATIO, DEFAULT_WALKING_SPEED_CASE1, DEFAULT_WALKING_SPEED_CASE2
 from pydantic import BaseModel, Field
 
@@ -54,13 +55,17 @@ async def get_speed_profile(
     
     - 로그인 필요
     - activity_type별 평균 속도 반환
+    - 캐시에 있으면 DB를 조회하지 않음
     """
-    profiles = crud.get_speed_profile_by_user(db, current_user.user_id)
+    def _get_speed_profile():
+        cached = get_user_speed_profile(db, current_user.user_id, activity_type)
+        if cached:
+            return SpeedProfileResponse(
+                user_id=current_user.user_id,
+                activity_type=activity_type,
+                **cached._asdict(),
+            )
     
-    # 해당 activity_type 찾기
-    profile = next((p for p in profiles if p.activity_type == activity_type), None)
-    
-    if not profile:
         # 프로필 없으면 기본값 생성
         profile = crud.create_speed_profile(
             db=db,
@@ -71,7 +76,9 @@ async def get_speed_profile(
             data_points_count=0,
         )
     
-    return SpeedProfileResponse.model_validate(profile)
+        return SpeedProfileResponse.model_validate(profile)
+
+    return await run_db(_get_speed_profile)
 
 
 @router.put("/speed", response_model=SpeedProfileResponse)
@@ -86,36 +93,42 @@ async def update_speed_profile(
     - 로그인 필요
     - 사용자가 직접 선택한 속도로 덮어쓰기 (가중평균 아님)
     """
-    from app.models import ActivitySpeedProfile
+    def _update_speed_profile():
+        from app.models import ActivitySpeedProfile
     
-    # 기존 프로필 조회
-    profile = (
-        db.query(ActivitySpeedProfile)
-        .filter(
-            ActivitySpeedProfile.user_id == current_user.user_id,
-            ActivitySpeedProfile.activity_type == update_data.activity_type,
+        # 기존 프로필 조회
+        profile = (
+            db.query(ActivitySpeedProfile)
+            .filter(
+                ActivitySpeedProfile.user_id == current_user.user_id,
+                ActivitySpeedProfile.activity_type == update_data.activity_type,
+            )
+            .first()
         )
-        .first()
-    )
     
-    if profile:
-        # 기존 프로필 덮어쓰기
-        profile.speed_case1 = update_data.speed_case1
-        # Case2는 명시적으로 전달되면 사용, 아니면 Case1 비율 적용
-        profile.speed_case2 = update_data.speed_case2 or (update_data.speed_case1 * SLOW_WALK_SPEED_RATIO)
-        profile.data_points_count += 1
-    else:
-        # 새 프로필 생성
-        profile = ActivitySpeedProfile(
-            user_id=current_user.user_id,
-            activity_type=update_data.activity_type,
-            speed_case1=update_data.speed_case1,
-            speed_case2=update_data.speed_case2 or (update_data.speed_case1 * SLOW_WALK_SPEED_RATIO),
-            data_points_count=1,
-        )
-        db.add(profile)
+        if profile:
+            # 기존 프로필 덮어쓰기
+            profile.speed_case1 = update_data.speed_case1
+            # Case2는 명시적으로 전달되면 사용, 아니면 Case1 비율 적용
+            profile.speed_case2 = update_data.speed_case2 or (update_data.speed_case1 * SLOW_WALK_SPEED_RATIO)
+            profile.data_points_count += 1
+        else:
+            # 새 프로필 생성
+            profile = ActivitySpeedProfile(
+                user_id=current_user.user_id,
+                activity_type=update_data.activity_type,
+                speed_case1=update_data.speed_case1,
+                speed_case2=update_data.speed_case2 or (update_data.speed_case1 * SLOW_WALK_SPEED_RATIO),
+                data_points_count=1,
+            )
+            db.add(profile)
     
-    db.commit()
-    db.refresh(profile)
+        db.flush()
+        # commit 후 캐시에 새 값 반영 (write-through)
+        speed_profile_cache.stage(db, current_user.user_id, update_data.activity_type, profile)
+        db.commit()
+        db.refresh(profile)
     
-    return SpeedProfileResponse.model_validate(profile)
+        return SpeedProfileResponse.model_validate(profile)
+
+    return await run_db(_update_speed_profile)
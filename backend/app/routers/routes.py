@@ -9,6 +9,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from ..utils.elevation_helpers import analyze_route_elevation
+from ..utils.speed_profile_cache import resolve_user_speed_mps
+from ..utils.user_speed_model import resolve_user_speed_model
+from ..utils.worker_pool import WorkerPoolBusyError
 
 router = APIRouter(prefix="/routes", tags=["routes"])
 logger = logging.getLogger(__name__)
@@ -21,6 +24,7 @@ class AnalyzeSlopeRequest(BaseModel):
     api_key: Optional[str] = None
     weather_data: Optional[Dict] = None  # 날씨 데이터
     user_speed_mps: Optional[float] = None  # 사용자 평균 보행속도 (m/s)
+    user_id: Optional[int] = None  # user_speed_mps가 없으면 서버에서 사용자 속도 프로필 사용 (개인 경사도/날씨 민감도도 적용)
 
     class Config:
         json_schema_extra = {
@@ -112,7 +116,8 @@ async def analyze_slope(request: AnalyzeSlopeRequest):
     - weather_data 파라미터를 통해 전달
 
     Args:
-        request: Tmap itinerary 데이터, 선택적 API 키, 선택적 날씨 데이터
+        request: Tmap itinerary 데이터, 선택적 API 키, 선택적 날씨 데이터,
+            선택적 사용자 속도 (user_speed_mps 또는 user_id로 프로필 조회)
 
     Returns:
         경사도 분석 결과 및 보정된 시간 (날씨 영향 포함)
@@ -128,7 +133,10 @@ async def analyze_slope(request: AnalyzeSlopeRequest):
             request.itinerary,
             api_key=request.api_key,
             weather_data=request.weather_data,
-            user_speed_mps=request.user_speed_mps,
+            user_speed_mps=await resolve_user_speed_mps(
+                request.user_speed_mps, request.user_id
+            ),
+            speed_model=await resolve_user_speed_model(request.user_id),
         )
 
         if "error" in result and not result.get("walk_legs_analysis"):
@@ -142,6 +150,10 @@ async def analyze_slope(request: AnalyzeSlopeRequest):
     except ValueError as e:
         logger.error(f"입력 데이터 오류: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
+    except WorkerPoolBusyError as e:
+        # 503 응답은 main의 WorkerPoolBusyError 핸들러
+        logger.warning(f"경사도 분석 대기열 초과: {str(e)}")
+        raise
     except Exception as e:
         logger.error(f"경사도 분석 중 예외 발생: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -12,6 +12,7 @@ import aiohttp
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from ..utils.upstream_governor import UpstreamUnavailableError, kma_governor
 from ..utils.weather_helpers import WeatherSpeedModel, calculate_eta, map_kma_to_weather
 
 router = APIRouter(prefix="/weather", tags=["weather"])
@@ -23,23 +24,33 @@ KST = timezone(timedelta(hours=9))
 
 # 간단한 인메모리 캐시
 class WeatherCache:
-    """날씨 데이터 캐싱 (5분 TTL)"""
+    """날씨 데이터 캐싱 (5분 TTL, 만료 후에도 stale_seconds 동안은 기상청 장애 대체용으로 보관)"""
 
-    def __init__(self, ttl_seconds: int = 300):
+    def __init__(self, ttl_seconds: int = 300, stale_seconds: int = 10800):
         self._cache: Dict[str, Tuple[dict, datetime]] = {}
         self._ttl = timedelta(seconds=ttl_seconds)
+        self._stale = timedelta(seconds=stale_seconds)
 
     def get(self, key: str) -> Optional[dict]:
         """캐시에서 데이터 가져오기"""
         if key in self._cache:
             data, timestamp = self._cache[key]
-            if datetime.now(KST) - timestamp < self._ttl:
+            age = datetime.now(KST) - timestamp
+            if age < self._ttl:
                 return data
-            else:
-                # 만료된 캐시 삭제
+            elif age >= self._stale:
+                # 대체용 보관 기간도 지난 캐시 삭제
                 del self._cache[key]
         return None
 
+    def get_stale(self, key: str) -> Optional[dict]:
+        """만료되었지만 대체용 보관 기간 안의 데이터 (기상청 API를 호출할 수 없을 때 사용)"""
+        if key in self._cache:
+            data, timestamp = self._cache[key]
+            if datetime.now(KST) - timestamp < self._stale:
+                return data
+        return None
+
     def set(self, key: str, data: dict) -> None:
         """캐시에 데이터 저장"""
         self._cache[key] = (data, datetime.now(KST))
@@ -208,83 +219,110 @@ async def proxy_kma_weather(
     max_retries = 2
     data = None
 
-    for attempt in range(max_retries):
-        try:
-            print(f"[KMA API] 시도 {attempt + 1}/{max_retries}")
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url, params=params) as response:
-                    body = await response.text()
-                    print(f"[KMA API] 응답 상태: {response.status}")
-                    print(f"[KMA API] 응답 본문 (처음 200자): {body[:200]}")
-
-                    if response.status != 200:
-                        print(f"[KMA API] 에러 응답: {body[:500]}")
-
-                        # 504 Gateway Timeout은 재시도할 가치가 있음
-                        if response.status == 504 and attempt < max_retries - 1:
-                            print(
-                                f"[KMA API] 504 타임아웃, {attempt + 2}번째 시도 중..."
-                            )
-                            await asyncio.sleep(2)  # 2초 대기 후 재시도
-                            continue
-
-                        raise HTTPException(
-                            status_code=response.status,
-                            detail=f"KMA API 오류: {response.reason} - {body[:500]}",
-                        )
-
-                    try:
-                        data = json.loads(body)
-                        print(
-                            f"[KMA API] ✅ 성공: {attempt + 1}번째 시도에서 데이터 수신"
-                        )
-                        break  # 성공하면 재시도 루프 종료
-                    except json.JSONDecodeError as exc:
-                        print(f"[KMA API] JSON 파싱 실패: {exc}")
-                        print(f"[KMA API] 파싱 실패한 본문: {body[:500]}")
-                        raise HTTPException(
-                            status_code=502,
-                            detail=f"KMA 응답 파싱 실패: {exc}",
-                        ) from exc
-        except asyncio.TimeoutError:
-            # 타임아웃 전용 에러 메시지
-            print(f"[KMA API] ⏱️ 타임아웃 발생 (시도 {attempt + 1}/{max_retries})")
-            if attempt < max_retries - 1:
-                print("[KMA API] 2초 후 재시도...")
-                await asyncio.sleep(2)
-                continue
-            else:
-                print("[KMA API] ❌ 최종 실패: 모든 재시도 소진")
-                print("[KMA API] ❌ 최종 실패: 모든 재시도 소진")
-                error_msg = (
-                    f"KMA API 타임아웃 ({max_retries}번 시도 실패). "
-                    "기상청 서버가 응답하지 않습니다."
-                )
-                raise HTTPException(
-                    status_code=504,
-                    detail=error_msg,
-                )
-        except aiohttp.ClientError as exc:
-            print(f"[KMA API] 네트워크 에러: {exc}")
-            if attempt < max_retries - 1:
-                print("[KMA API] 2초 후 재시도...")
-                await asyncio.sleep(2)
-                continue
-            else:
+    try:
+        for attempt in range(max_retries):
+            try:
+                print(f"[KMA API] 시도 {attempt + 1}/{max_retries}")
+                retry = False
+                # 회로 차단/한도 초과면 호출하지 않고 UpstreamUnavailableError (아래에서 캐시로 대체)
+                async with kma_governor.request(api_key=api_key) as call, aiohttp.ClientSession(
+                    timeout=timeout
+                ) as session:
+                    async with session.get(url, params=params) as response:
+                        body = await response.text()
+                        print(f"[KMA API] 응답 상태: {response.status}")
+                        print(f"[KMA API] 응답 본문 (처음 200자): {body[:200]}")
+
+                        if response.status != 200:
+                            print(f"[KMA API] 에러 응답: {body[:500]}")
+
+                            # 504 Gateway Timeout은 재시도할 가치가 있음
+                            if response.status == 504 and attempt < max_retries - 1:
+                                print(
+                                    f"[KMA API] 504 타임아웃, {attempt + 2}번째 시도 중..."
+                                )
+                                call.mark_failure()
+                                retry = True
+                            else:
+                                raise HTTPException(
+                                    status_code=response.status,
+                                    detail=f"KMA API 오류: {response.reason} - {body[:500]}",
+                                )
+                        else:
+                            try:
+                                data = json.loads(body)
+                                print(
+                                    f"[KMA API] ✅ 성공: {attempt + 1}번째 시도에서 데이터 수신"
+                                )
+                                break  # 성공하면 재시도 루프 종료
+                            except json.JSONDecodeError as exc:
+                                print(f"[KMA API] JSON 파싱 실패: {exc}")
+                                print(f"[KMA API] 파싱 실패한 본문: {body[:500]}")
+                                raise HTTPException(
+                                    status_code=502,
+                                    detail=f"KMA 응답 파싱 실패: {exc}",
+                                ) from exc
+
+                # 재시도 대기는 호출 슬롯(half_open 시험 호출 포함)과 세션을 반납한 뒤
+                # (대기하는 동안 다른 요청이 circuit_open으로 거절되지 않도록)
+                if retry:
+                    await asyncio.sleep(2)  # 2초 대기 후 재시도
+                    continue
+            except asyncio.TimeoutError:
+                # 타임아웃 전용 에러 메시지
+                print(f"[KMA API] ⏱️ 타임아웃 발생 (시도 {attempt + 1}/{max_retries})")
+                if attempt < max_retries - 1:
+                    print("[KMA API] 2초 후 재시도...")
+                    await asyncio.sleep(2)
+                    continue
+                else:
+                    print("[KMA API] ❌ 최종 실패: 모든 재시도 소진")
+                    print("[KMA API] ❌ 최종 실패: 모든 재시도 소진")
+                    error_msg = (
+                        f"KMA API 타임아웃 ({max_retries}번 시도 실패). "
+                        "기상청 서버가 응답하지 않습니다."
+                    )
+                    raise HTTPException(
+                        status_code=504,
+                        detail=error_msg,
+                    )
+            except aiohttp.ClientError as exc:
+                print(f"[KMA API] 네트워크 에러: {exc}")
+                if attempt < max_retries - 1:
+                    print("[KMA API] 2초 후 재시도...")
+                    await asyncio.sleep(2)
+                    continue
+                else:
+                    raise HTTPException(
+                        status_code=502,
+                        detail=f"KMA API 요청 실패: {exc}",
+                    ) from exc
+            except (HTTPException, UpstreamUnavailableError):
+                # 이미 처리된 HTTP 예외/호출 거절은 그대로 전달
+                raise
+            except Exception as exc:
+                # 예상하지 못한 에러
+                print(f"[KMA API] 예상치 못한 에러: {type(exc).__name__}: {exc}")
                 raise HTTPException(
-                    status_code=502,
-                    detail=f"KMA API 요청 실패: {exc}",
+                    status_code=500,
+                    detail=f"KMA API 프록시 내부 오류: {exc}",
                 ) from exc
-        except HTTPException:
-            # 이미 처리된 HTTP 예외는 그대로 전달
-            raise
-        except Exception as exc:
-            # 예상하지 못한 에러
-            print(f"[KMA API] 예상치 못한 에러: {type(exc).__name__}: {exc}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"KMA API 프록시 내부 오류: {exc}",
-            ) from exc
+    except UpstreamUnavailableError as exc:
+        # 기상청 API 장애/한도 초과: 만료된 캐시라도 있으면 사용
+        stale_data = weather_cache.get_stale(cache_key)
+        if stale_data:
+            print(f"♻️ [STALE CACHE] {cache_key} - {exc}")
+            return {
+                **stale_data,
+                "cached": True,
+                "cacheHit": True,
+                "stale": True,
+            }
+        raise HTTPException(
+            status_code=503,
+            detail=f"{exc}. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
 
     # 모든 재시도 후에도 data가 None이면 에러
     if data is None:
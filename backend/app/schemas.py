@@ -202,11 +202,45 @@ class NavigationLogCreate(BaseModel):
     weather_id: Optional[int] = Field(None, description="날씨 캐시 ID")
     route_data: Optional[dict] = Field(None, description="전체 경로 상세 정보 (JSON)")
     
+    # 재전송 중복 방지
+    idempotency_key: Optional[str] = Field(
+        None, max_length=64, description="클라이언트 생성 멱등 키 (같은 키로 다시 보내면 기존 로그 반환)"
+    )
+    
     # 타임스탬프
     started_at: datetime = Field(..., description="안내 시작 시간")
     ended_at: datetime = Field(..., description="안내 종료 시간")
 
 
+class NavigationLogBatchItem(NavigationLogCreate):
+    """일괄 저장 요청의 로그 1건 (사용자 ID 포함)"""
+    
+    user_id: int = Field(..., description="사용자 ID")
+
+
+class NavigationLogBatchCreate(BaseModel):
+    """네비게이션 로그 일괄 저장 요청 (오프라인 중 쌓인 로그 업로드)"""
+    
+    logs: List[NavigationLogBatchItem] = Field(..., min_length=1, max_length=500)
+
+
+class NavigationLogBatchResult(BaseModel):
+    """일괄 저장 결과 (요청 순서와 같음)"""
+    
+    index: int = Field(..., description="요청 logs 내 위치")
+    log_id: int
+    idempotency_key: Optional[str] = None
+    duplicate: bool = Field(False, description="이미 저장된 멱등 키라서 새로 저장하지 않음")
+
+
+class NavigationLogBatchResponse(BaseModel):
+    """네비게이션 로그 일괄 저장 응답"""
+    
+    created_count: int
+    duplicate_count: int
+    results: List[NavigationLogBatchResult]
+
+
 class NavigationLogResponse(BaseModel):
     """네비게이션 로그 응답"""
     
@@ -267,5 +301,7 @@ class NavigationLogResponse(BaseModel):
 class NavigationLogListResponse(BaseModel):
     """네비게이션 로그 목록 응답"""
     
-    total_count: int
+    total_count: Optional[int] = Field(None, description="전체 개수 (count_mode=none이면 null, estimate면 근사값)")
     logs: List[NavigationLogResponse]
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
+    has_more: bool = False
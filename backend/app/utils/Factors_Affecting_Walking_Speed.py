@@ -15,6 +15,9 @@ import logging
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+import numpy as np
+
+from .user_speed_model import PersonalSpeedModel
 from .weather_helpers import WeatherSpeedModel, map_kma_to_weather
 
 logger = logging.getLogger(__name__)
@@ -199,6 +202,7 @@ class WalkingSpeedIntegrator:
         user_speed_mps: Optional[float] = None,
         average_slope_percent: float = 0.0,
         weather_data: Optional[Dict] = None,
+        speed_model: Optional[PersonalSpeedModel] = None,
     ) -> SpeedFactors:
         """
         통합 보행 시간 계산
@@ -208,6 +212,7 @@ class WalkingSpeedIntegrator:
             user_speed_mps: 사용자 평균 보행속도 (m/s, Health Connect)
             average_slope_percent: 평균 경사도 (%)
             weather_data: 날씨 데이터
+            speed_model: 사용자 경사도/날씨 민감도 (user_speed_model, 없으면 모집단 계수 그대로)
 
         Returns:
             SpeedFactors: 모든 계수와 최종 보정 시간
@@ -226,6 +231,11 @@ class WalkingSpeedIntegrator:
         # 3. 날씨 계수
         weather_factor = self.calculate_weather_factor(weather_data)
 
+        # 개인 민감도 반영 (로그로 학습한 사용자별 경사도/날씨 영향)
+        if speed_model is not None:
+            slope_factor = speed_model.personalize_slope_factor(slope_factor)
+            weather_factor = speed_model.personalize_weather_factor(weather_factor, weather_data)
+
         # 4. 최종 통합 계수
         final_factor = user_factor * slope_factor * weather_factor
 
@@ -378,6 +388,12 @@ def calculate_route_time(
     }
 
 
+# 역산 기준 속도 안전 범위 / 실측 속도가 없을 때 기본값 (km/h)
+BASE_SPEED_MIN_KMH = 2.0
+BASE_SPEED_MAX_KMH = 8.0
+BASE_SPEED_DEFAULT_KMH = 4.0
+
+
 def reverse_calculate_base_speed(
     real_walking_speed_kmh: float,
     slope_factor: float = 1.0,
@@ -404,12 +420,12 @@ def reverse_calculate_base_speed(
     """
     if real_walking_speed_kmh <= 0:
         logger.warning(f"[역산] 유효하지 않은 실측 속도: {real_walking_speed_kmh}")
-        return 4.0  # 기본값
+        return BASE_SPEED_DEFAULT_KMH
     
     base_speed = real_walking_speed_kmh * slope_factor * weather_factor
     
     # 안전 범위: 2.0 ~ 8.0 km/h
-    base_speed = max(2.0, min(8.0, base_speed))
+    base_speed = max(BASE_SPEED_MIN_KMH, min(BASE_SPEED_MAX_KMH, base_speed))
     
     logger.debug(
         f"[역산] 실측 {real_walking_speed_kmh:.2f} km/h "
@@ -418,3 +434,23 @@ def reverse_calculate_base_speed(
     )
     
     return base_speed
+
+
+def reverse_calculate_base_speeds(
+    real_walking_speed_kmh: np.ndarray,
+    slope_factor: np.ndarray,
+    weather_factor: np.ndarray,
+) -> np.ndarray:
+    """
+    reverse_calculate_base_speed의 배열 버전 (여러 로그를 한 번에 역산)
+    
+    규칙은 reverse_calculate_base_speed와 같습니다.
+    (실측 속도 ≤ 0 → 기본값, 결과는 안전 범위로 제한)
+    """
+    real = np.asarray(real_walking_speed_kmh, dtype=np.float64)
+    base_speed = np.clip(
+        real * np.asarray(slope_factor, dtype=np.float64) * np.asarray(weather_factor, dtype=np.float64),
+        BASE_SPEED_MIN_KMH,
+        BASE_SPEED_MAX_KMH,
+    )
+    return np.where(real > 0, base_speed, BASE_SPEED_DEFAULT_KMH)
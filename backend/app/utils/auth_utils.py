@@ -10,6 +10,8 @@ from dotenv import load_dotenv
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.utils.worker_pool import password_hash_pool
+
 load_dotenv()
 
 # 환경 변수
@@ -48,6 +50,26 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    verify_password를 비밀번호 해싱 풀에서 실행 (bcrypt가 이벤트 루프를 막지 않도록)
+
+    Raises:
+        WorkerPoolBusyError: 해싱 풀 대기열이 가득 찬 경우
+    """
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    get_password_hash를 비밀번호 해싱 풀에서 실행
+
+    Raises:
+        WorkerPoolBusyError: 해싱 풀 대기열이 가득 찬 경우
+    """
+    return await password_hash_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     JWT 액세스 토큰 생성
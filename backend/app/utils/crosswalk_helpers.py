@@ -1,5 +1,42 @@
+import os
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
+from .itinerary_parser import ParsedItinerary, parse_itinerary
+
+# 횡단보도 데이터 경로 (실행 위치와 무관하게 backend/data 사용)
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
+CROSSWALK_CSV_PATH = os.path.join(DATA_DIR, "crosswalk.csv")
+RED_PER_GREEN_CSV_PATH = os.path.join(DATA_DIR, "red_per_green.csv")
+
+# 가장 가까운 신호 횡단보도로 인정하는 최대 거리 (위경도 단위)
+NEAREST_CROSSWALK_THRESHOLD = 0.0005
+
+
+@lru_cache(maxsize=1)
+def load_crosswalk_table():
+    """
+    횡단보도 CSV를 한 번만 읽어 numpy 배열로 보관
+
+    Returns:
+        (lat 배열, lng 배열, red 배열)
+    """
+    gyo = pd.read_csv(CROSSWALK_CSV_PATH)
+    return (
+        gyo['lat'].to_numpy(dtype=float),
+        gyo['lng'].to_numpy(dtype=float),
+        gyo['red'].to_numpy(dtype=float),
+    )
+
+
+@lru_cache(maxsize=1)
+def load_red_per_green_table():
+    """녹색 신호 길이별 적색 신호 시간 CSV (한 번만 읽음)"""
+    return pd.read_csv(RED_PER_GREEN_CSV_PATH)
+
 
 def extract_number_from_text(text):
     """문자열에서 숫자만 추출"""
@@ -17,7 +54,6 @@ def extract_number_from_text(text):
 def crosswalk_wait(real_coord):
     """횡단보도 대기 시간 계산 - 안전한 반환값 보장"""
     try:
-        gyo = pd.read_csv('data/crosswalk.csv')
         # 입력값 검증
         if not real_coord or len(real_coord) != 4:
             return 0
@@ -27,18 +63,21 @@ def crosswalk_wait(real_coord):
             return 0
         lat = (lat1 + lat2) / 2
         lng = (lng1 + lng2) / 2
-        min_dist = 1
-        idx = -1
-        for i in range(len(gyo)):
-            dist = (abs(lat - gyo.loc[i, 'lat']) ** 2 + abs(lng - gyo.loc[i, 'lng']) ** 2) ** 0.5
-            if dist <= min_dist:
-                min_dist = dist
-                idx = i
-
-        if min_dist > 0.0005 or idx == -1:
+
+        lats, lngs, reds = load_crosswalk_table()
+        if len(lats) == 0:
+            return 0
+        dist = np.sqrt((lat - lats) ** 2 + (lng - lngs) ** 2)
+        # NaN 좌표 행은 후보에서 제외
+        dist = np.where(np.isnan(dist), np.inf, dist)
+        # 최소 거리가 같은 행이 여럿이면 마지막 행 사용 (기존 순회 방식과 동일)
+        idx = len(dist) - 1 - int(np.argmin(dist[::-1]))
+        min_dist = dist[idx]
+
+        if min_dist > NEAREST_CROSSWALK_THRESHOLD:
             return 0
         else:
-            wait = int(gyo.loc[idx, 'red'])
+            wait = int(reds[idx])
 
         # 음수나 비정상적인 값 방지
         result = max(0, int(wait))
@@ -48,9 +87,13 @@ def crosswalk_wait(real_coord):
         return 0
 
 
-def crosswalk_waiting_time(itinerary):
+def crosswalk_waiting_time(itinerary, parsed: Optional[ParsedItinerary] = None):
     """
     횡단보도 대기 시간 및 개수 계산 - Pedestrian/Transit API 모두 지원
+
+    Args:
+        itinerary: Tmap itinerary
+        parsed: 이미 파싱한 결과 (parse_itinerary) - 있으면 itinerary를 다시 파싱하지 않음
     
     Returns:
         dict: {
@@ -60,91 +103,42 @@ def crosswalk_waiting_time(itinerary):
         }
     """
     try:
-        red_per_green = pd.read_csv('data/red_per_green.csv')
-        gyo = pd.read_csv('data/crosswalk.csv')
-        
-        if not itinerary or not isinstance(itinerary, dict):
-            return {"count": 0, "total_wait_time": 0, "details": []}
+        red_per_green = load_red_per_green_table()
         
-        legs = itinerary.get("legs", [])
+        if parsed is None:
+            if not itinerary or not isinstance(itinerary, dict):
+                return {"count": 0, "total_wait_time": 0, "details": []}
+            parsed = parse_itinerary(itinerary)
         
         crosswalk_list = []  # [(좌표, 대기시간), ...]
         checked_crosswalks = set()  # 중복 방지
 
-        for i, leg in enumerate(legs):
-            if not isinstance(leg, dict):
+        for crosswalk in parsed.crosswalks:
+            # 지하철 진입 직전의 마지막 step + 출구 횡단보도는 제외 (실제로 안 건넘)
+            if crosswalk.skipped or crosswalk.endpoints is None:
                 continue
-            
-            mode = leg.get("mode")
-            if mode != "WALK":
+            lat1, lng1, lat2, lng2 = crosswalk.endpoints
+            length = crosswalk.length
+
+            # 중복 체크용 좌표 ID
+            crosswalk_id = (round(lat1, 5), round(lng1, 5), round(lat2, 5), round(lng2, 5))
+            if crosswalk_id in checked_crosswalks:
                 continue
             
-            # 다음 leg가 지하철인지 확인 (지하 진입 여부 판단)
-            next_leg = legs[i + 1] if i + 1 < len(legs) else None
-            is_entering_subway = next_leg and next_leg.get("mode") == "SUBWAY"
-
-            steps = leg.get("steps", [])
+            wait = crosswalk_wait((lat1, lng1, lat2, lng2))
             
-            # Pedestrian API와 Transit API 모두 동일한 steps 구조 사용
-            if not steps:
-                continue
-                
-            for step_index, step in enumerate(steps):
-                if not isinstance(step, dict):
-                    continue
-                description = step.get("description", "")
-                linestring = step.get("linestring", "")
-                if "횡단보도" not in description:
-                    continue
-                
-                # 지하철 진입 직전의 마지막 step + 출구 횡단보도는 제외 (실제로 안 건넘)
-                is_last_step = step_index == len(steps) - 1
-                if is_entering_subway and is_last_step and "출구에서" in description:
-                    continue
-
-                # 횡단보도 이후의 숫자만 추출
-                length = None
-                crosswalk_index = description.find("횡단보도")
-                text_after = description[crosswalk_index:]
-                number_str = ''
-                for char in text_after:
-                    if char.isdigit():
-                        number_str += char
-                    elif number_str:
-                        break
-                if number_str:
-                    length = int(number_str)
-
-                try:
-                    coords = linestring.split()
-                    if len(coords) < 2:
-                        continue
-                    first_coord = coords[0]
-                    last_coord = coords[-1]
-                    lng1, lat1 = map(float, first_coord.split(','))
-                    lng2, lat2 = map(float, last_coord.split(','))
-                    
-                    # 중복 체크용 좌표 ID
-                    crosswalk_id = (round(lat1, 5), round(lng1, 5), round(lat2, 5), round(lng2, 5))
-                    if crosswalk_id in checked_crosswalks:
-                        continue
-                    
-                    wait = crosswalk_wait((lat1, lng1, lat2, lng2))
-                    
-                    if wait == 0 and length is not None:
-                        # green 컬럼에 해당 값이 있는지 확인
-                        matching_rows = red_per_green.loc[red_per_green['green'] == length + 7, 'red']
-                        if len(matching_rows) > 0:
-                            wait = int(matching_rows.values[0])
-                        else:
-                            wait = 0  # 매칭되는 값이 없으면 0
-                    else:
-                        wait = max(wait, 0)
-                    
-                    crosswalk_list.append((crosswalk_id, wait))
-                    checked_crosswalks.add(crosswalk_id)
-                except (ValueError, IndexError):
-                    continue
+            if wait == 0 and length is not None:
+                # green 컬럼에 해당 값이 있는지 확인
+                matching_rows = red_per_green.loc[red_per_green['green'] == length + 7, 'red']
+                if len(matching_rows) > 0:
+                    wait = int(matching_rows.values[0])
+                else:
+                    wait = 0  # 매칭되는 값이 없으면 0
+            else:
+                wait = max(wait, 0)
+            
+            crosswalk_list.append((crosswalk_id, wait))
+            checked_crosswalks.add(crosswalk_id)
 
         total_wait = sum(wait for _, wait in crosswalk_list)
         
@@ -2,20 +2,45 @@
 """
 FastAPI 의존성 함수 - 인증 미들웨어
 """
+import hmac
+import os
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, run_db
 from app.models import Users
 from app.utils.auth_utils import verify_token
+from app.utils.principal_cache import principal_cache
 
 # Bearer 토큰 스키마
 security = HTTPBearer()
 
 
+def _get_user_by_id(db: Session, user_id) -> Optional[Users]:
+    """토큰의 사용자 ID로 사용자 조회 (동기, run_db로 실행)"""
+    return db.query(Users).filter(Users.user_id == user_id).first()
+
+
+async def _resolve_principal(db: Session, user_id) -> Optional[Users]:
+    """
+    토큰 subject → 사용자 (캐시 → 없으면 DB 조회 후 캐시)
+
+    캐시 적중 시에는 세션에 속하지 않은 Users 객체를 새로 만들어 반환합니다.
+    (컬럼 값만 있으므로 관계 속성에는 접근하지 않아야 함)
+    """
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        return Users(**cached)
+
+    user = await run_db(_get_user_by_id, db, user_id)
+    if user is not None:
+        principal_cache.set(user_id, user)
+    return user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
@@ -54,8 +79,8 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
-    # 데이터베이스에서 사용자 조회
-    user = db.query(Users).filter(Users.user_id == user_id).first()
+    # 사용자 조회 (짧은 TTL 캐시 → 없으면 DB 전용 스레드 풀)
+    user = await _resolve_principal(db, user_id)
     if user is None:
         raise credentials_exception
 
@@ -94,5 +119,28 @@ async def get_current_user_optional(
     if user_id is None:
         return None
 
-    user = db.query(Users).filter(Users.user_id == user_id).first()
+    user = await _resolve_principal(db, user_id)
     return user
+
+
+async def require_admin_token(
+    x_admin_token: Optional[str] = Header(None, description="관리자 토큰 (ADMIN_API_TOKEN)"),
+) -> None:
+    """
+    관리자 전용 API 보호 (전체 사용자 데이터 내보내기 등)
+
+    X-Admin-Token 헤더가 환경 변수 ADMIN_API_TOKEN과 일치해야 합니다.
+    ADMIN_API_TOKEN이 설정되지 않은 서버에서는 관리자 API를 사용할 수 없습니다.
+    """
+    admin_token = os.getenv("ADMIN_API_TOKEN")
+    if not admin_token:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 API가 비활성화되어 있습니다 (ADMIN_API_TOKEN 미설정)",
+        )
+
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 토큰이 올바르지 않습니다",
+        )
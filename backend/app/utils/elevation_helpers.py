@@ -11,15 +11,31 @@ Google Elevation API를 사용하여 경로의 경사도를 계산합니다.
 - Tmap 기준값(1.0)에 사용자 속도, 경사도, 날씨 계수를 모두 적용
 """
 
+import asyncio
+import hashlib
 import math
 import os
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import aiohttp
 
 from .Factors_Affecting_Walking_Speed import get_integrator
-from .geo_helpers import coords_to_latlng_string, haversine, parse_linestring
+from .geo_helpers import coords_to_latlng_string, haversine
 from .crosswalk_helpers import crosswalk_waiting_time
+from .elevation_sampling import ElevationSampler, elevation_sampler
+from .itinerary_parser import (
+    CROSSWALK_KEYWORD,
+    CROSSWALK_TURN_TYPES,
+    ParsedLeg,
+    parse_coords,
+    parse_itinerary,
+    parse_walk_leg,
+)
+from .route_itinerary import itinerary_hash
+from .ttl_cache import TTLCache
+from .upstream_governor import INTERACTIVE, UpstreamUnavailableError, elevation_governor
+from .user_speed_model import PersonalSpeedModel
+from .worker_pool import route_analysis_pool
 
 # 경사도별 속도 계수 (참고용 - 실제로는 Tobler's Function 사용)
 # Tobler's Function은 연속적인 값을 반환하므로 더 정확함
@@ -36,6 +52,16 @@ SLOPE_SPEED_FACTORS_REFERENCE = {
 # Google Elevation API 설정
 GOOGLE_ELEVATION_API_URL = "https://maps.googleapis.com/maps/api/elevation/json"
 MAX_COORDINATES_PER_REQUEST = 512  # Google API 제한
+GOOGLE_ELEVATION_TIMEOUT = 30  # 초 (Tmap 호출과 동일)
+
+# 좌표 목록 → 고도 캐시 (고도는 바뀌지 않으므로 같은 경로는 API 재호출 생략)
+elevation_cache = TTLCache.from_env("ELEVATION_CACHE", default_max_entries=2000, default_ttl=86400)
+
+# itinerary 내용 해시 → _prepare_route_elevation 결과 (좌표 수집/횡단보도 계산 재사용, 읽기 전용)
+prepared_route_cache = TTLCache.from_env("PREPARED_ROUTE_CACHE", default_max_entries=500, default_ttl=900)
+
+# 같은 좌표 목록에 대해 진행 중인 고도 조회 (동시 요청은 API를 한 번만 호출)
+_elevation_inflight: Dict[str, "asyncio.Future"] = {}
 
 
 def count_crosswalks(itinerary: Dict) -> int:
@@ -68,186 +94,114 @@ def count_crosswalks(itinerary: Dict) -> int:
             ):
                 turn_type = feature.get("properties", {}).get("turnType")
                 # 횡단보도 관련 turnType 체크
-                if turn_type in [211, 214, 215, 216, 217]:
+                if turn_type in CROSSWALK_TURN_TYPES:
                     total_count += 1
         return total_count
 
-    # 기존 itinerary 구조 처리
-    legs = itinerary.get("legs", [])
-    for leg in legs:
-        # WALK 모드만 검사
-        if leg.get("mode") != "WALK":
-            continue
-
-        # steps에서 turnType 확인
-        steps = leg.get("steps", [])
-        for step in steps:
-            turn_type = step.get("turnType")
-            if turn_type in [211, 214, 215, 216, 217]:
+    # 기존 itinerary 구조 처리 (WALK 모드만 검사)
+    for parsed_leg in parse_itinerary(itinerary).legs:
+        for step in parsed_leg.steps:
+            # steps에서 turnType 확인
+            if step.turn_type in CROSSWALK_TURN_TYPES:
                 total_count += 1
 
             # 하위 호환성: description에서도 검사
-            description = step.get("description", "")
             # 한 description에 여러 개의 횡단보도가 있을 수 있음
-            total_count += description.count("횡단보도")
+            total_count += step.description.count(CROSSWALK_KEYWORD)
 
     return total_count
 
 
-def count_total_coordinates(walk_legs: List[Dict]) -> int:
+def _as_parsed_legs(walk_legs: List[Union[Dict, ParsedLeg]]) -> List[ParsedLeg]:
+    """leg dict는 파싱, 이미 파싱한 leg는 그대로"""
+    return [leg if isinstance(leg, ParsedLeg) else parse_walk_leg(leg) for leg in walk_legs]
+
+
+def count_total_coordinates(walk_legs: List[Union[Dict, ParsedLeg]]) -> int:
     """
     전체 보행 구간의 좌표 수를 계산
 
     Args:
-        walk_legs: mode가 'WALK'인 leg 리스트
+        walk_legs: mode가 'WALK'인 leg 리스트 (또는 parse_walk_leg 결과)
 
     Returns:
         전체 좌표 개수
     """
-    total = 0
-    for leg in walk_legs:
-        if "steps" in leg:
-            for step in leg["steps"]:
-                coords = step["linestring"].split()
-                total += len(coords)
-        elif "passShape" in leg:
-            coords = leg["passShape"]["linestring"].split()
-            total += len(coords)
-    return total
+    return sum(leg.coord_count for leg in _as_parsed_legs(walk_legs))
 
 
 def smart_sample_coordinates(
     linestring: str, target_points: int, distance: float
 ) -> List[Dict[str, float]]:
     """
-    거리 기반 적응형 샘플링 (20m 간격)
+    거리 기반 적응형 샘플링 (10m 간격)
 
     Args:
         linestring: 좌표 문자열
         target_points: 목표 샘플 개수 (참고용, 실제로는 거리 기반)
-        distance: 구간 거리 (미터)
+        distance: 구간 거리 (미터, 참고용 - 좌표 간 실제 거리 사용)
 
     Returns:
         샘플링된 좌표 리스트
-    """
-    coords = parse_linestring(linestring)
-
-    if not coords:
-        return []
-
-    # 10m 간격으로 샘플링 (높은 정확도)
-    SAMPLE_INTERVAL_M = 10.0
-
-    # 필요한 샘플 개수 계산 (올림 처리로 중간 샘플 보장)
-    needed_samples = max(2, math.ceil(distance / SAMPLE_INTERVAL_M) + 1)
 
-    # 좌표가 필요한 샘플보다 적으면 그대로 반환
-    if len(coords) <= needed_samples:
-        return coords
-
-    # 시작점과 끝점은 항상 포함
-    if needed_samples == 2:
-        return [coords[0], coords[-1]]
-
-    sampled = [coords[0]]
-
-    # 각 좌표 간 실제 거리 계산하여 누적 거리 배열 생성
-    cumulative_distances = [0.0]
-    for i in range(1, len(coords)):
-        dist = haversine(coords[i - 1], coords[i])
-        cumulative_distances.append(cumulative_distances[-1] + dist)
-
-    total_distance = cumulative_distances[-1]
-
-    # 10m 간격으로 샘플링할 목표 거리들
-    target_distances = []
-    current_distance = SAMPLE_INTERVAL_M
-    while current_distance < total_distance:
-        target_distances.append(current_distance)
-        current_distance += SAMPLE_INTERVAL_M
-
-    # 각 목표 거리에 가장 가까운 좌표 선택
-    for target_dist in target_distances:
-        # 목표 거리에 가장 가까운 인덱스 찾기
-        closest_idx = 0
-        min_diff = float('inf')
-        
-        for i, cum_dist in enumerate(cumulative_distances):
-            diff = abs(cum_dist - target_dist)
-            if diff < min_diff:
-                min_diff = diff
-                closest_idx = i
-            elif diff > min_diff:
-                # 이미 최소값을 지나쳤으므로 종료
-                break
-        
-        # 중복 방지
-        if closest_idx > 0 and coords[closest_idx] != sampled[-1]:
-            sampled.append(coords[closest_idx])
-
-    # 끝점 추가 (중복 방지)
-    if coords[-1] != sampled[-1]:
-        sampled.append(coords[-1])
-
-    return sampled
+    Note:
+        경로 좌표 수집은 optimize_all_coordinates의 elevation_sampler 설정을 사용합니다.
+    """
+    return ElevationSampler(interval_m=10.0).sample(parse_coords(linestring))
 
 
 def optimize_all_coordinates(
-    walk_legs: List[Dict]
+    walk_legs: List[Union[Dict, ParsedLeg]],
+    sampler: Optional[ElevationSampler] = None,
 ) -> Dict:
     """
-    보행 구간의 좌표를 수집 (샘플링 없이 Tmap 원본 사용)
+    보행 구간의 고도 조회용 좌표를 수집 (step별 적응형 샘플링)
 
     Args:
-        walk_legs: 보행 구간 리스트
+        walk_legs: 보행 구간 리스트 (또는 parse_walk_leg / parse_itinerary 결과 - 다시 파싱하지 않음)
+        sampler: 샘플링 설정 (기본: ELEVATION_SAMPLING* 환경 변수의 elevation_sampler)
 
     Returns:
         좌표 데이터와 메타정보
     
     Note:
-        - Tmap API가 제공하는 좌표를 그대로 사용 (최적화된 간격)
+        - ELEVATION_SAMPLING=off이면 Tmap 좌표를 그대로 사용
         - API 호출 시 250개씩 자동 배치 처리
         - GPS 오차 필터링은 adjust_walking_time에서 처리
     """
+    sampler = sampler or elevation_sampler
+
     # 각 leg의 거리와 좌표 수 분석
     leg_info = []
     total_distance = 0
     total_coords = 0
 
-    for leg in walk_legs:
-        leg_distance = leg.get("distance", 0)
-
-        if "steps" in leg:
-            leg_coords = sum(len(step["linestring"].split()) for step in leg["steps"])
-            steps = leg["steps"]
-        elif "passShape" in leg:
-            leg_coords = len(leg["passShape"]["linestring"].split())
-            # passShape를 steps 형식으로 변환
-            steps = [
-                {"linestring": leg["passShape"]["linestring"], "distance": leg_distance}
-            ]
-        else:
+    for parsed_leg in _as_parsed_legs(walk_legs):
+        # steps도 passShape도 없는 leg는 제외 (passShape는 step 하나로 파싱됨)
+        if not parsed_leg.has_shape:
             continue
 
+        leg_distance = parsed_leg.distance
+        leg_coords = parsed_leg.coord_count
         leg_info.append(
             {
-                "leg": leg,
+                "leg": parsed_leg.leg,
                 "distance": leg_distance,
                 "original_coords": leg_coords,
-                "steps": steps,
+                "steps": parsed_leg.steps,
             }
         )
         total_distance += leg_distance
         total_coords += leg_coords
 
-    print(f"[좌표 수집] 원본 좌표: {total_coords}개 (샘플링 없이 그대로 사용)")
+    print(f"[좌표 수집] 원본 좌표: {total_coords}개 (샘플링: {sampler.mode})")
     print(f"[좌표 수집] 총 거리: {total_distance:.0f}m")
     print(f"[좌표 수집] 평균 간격: {total_distance/total_coords:.1f}m" if total_coords > 0 else "[좌표 수집] 평균 간격: N/A")
 
     if total_distance == 0:
         return {"legs": [], "total_sampled_coords": 0}
 
-    # Tmap 좌표를 그대로 수집 (샘플링 없음)
+    # step별 샘플링 (시작/끝 좌표 유지 - step 경계가 그대로 남음)
     result = {
         "legs": [],
         "total_sampled_coords": 0,
@@ -255,16 +209,14 @@ def optimize_all_coordinates(
     }
     
     for info in leg_info:
-        step_coords = []
-        for i, step in enumerate(info["steps"]):
-            coords = parse_linestring(step["linestring"])
-            step_coords.append(
-                {
-                    "step_index": i,
-                    "coords": coords,
-                    "distance": step.get("distance", 0),
-                }
-            )
+        step_coords = [
+            {
+                "step_index": i,
+                "coords": sampler.sample(step.coords),
+                "distance": step.distance,
+            }
+            for i, step in enumerate(info["steps"])
+        ]
         
         result["legs"].append(
             {
@@ -275,7 +227,8 @@ def optimize_all_coordinates(
         )
         result["total_sampled_coords"] += sum(len(s["coords"]) for s in step_coords)
     
-    print(f"[좌표 수집] 최종 좌표: {result['total_sampled_coords']}개")
+    ratio = f" (원본 대비 {result['total_sampled_coords'] / total_coords * 100:.0f}%)" if total_coords > 0 else ""
+    print(f"[좌표 수집] 최종 좌표: {result['total_sampled_coords']}개{ratio}")
     
     # 배치 처리 예상 정보
     batch_count = (result['total_sampled_coords'] + 249) // 250
@@ -286,7 +239,7 @@ def optimize_all_coordinates(
 
 
 async def call_google_elevation_api(
-    coords: List[Dict[str, float]], api_key: str
+    coords: List[Dict[str, float]], api_key: str, priority: str = INTERACTIVE
 ) -> List[float]:
     """
     Google Elevation API를 호출하여 고도 데이터를 가져옴 (배치 처리 지원)
@@ -294,11 +247,13 @@ async def call_google_elevation_api(
     Args:
         coords: [{'lon': float, 'lat': float}, ...] 형식의 좌표 리스트
         api_key: Google API 키
+        priority: 외부 API 호출 우선순위 (upstream_governor.INTERACTIVE / BATCH)
 
     Returns:
         고도 값 리스트 (미터 단위)
 
     Raises:
+        UpstreamUnavailableError: 회로 차단/요청 한도 초과로 호출하지 않은 경우
         Exception: API 호출 실패 시
     
     Note:
@@ -315,23 +270,28 @@ async def call_google_elevation_api(
         locations = coords_to_latlng_string(coords)
         params = {"locations": locations, "key": api_key}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(GOOGLE_ELEVATION_API_URL, params=params) as response:
-                data = await response.json()
+        async with elevation_governor.request(api_key=api_key, priority=priority):
+            async with aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=GOOGLE_ELEVATION_TIMEOUT)
+            ) as session:
+                async with session.get(GOOGLE_ELEVATION_API_URL, params=params) as response:
+                    data = await response.json()
 
-                if data.get("status") != "OK":
-                    error_message = data.get("error_message", data.get("status"))
-                    raise Exception(f"Google Elevation API 오류: {error_message}")
+                    if data.get("status") != "OK":
+                        error_message = data.get("error_message", data.get("status"))
+                        raise Exception(f"Google Elevation API 오류: {error_message}")
 
-                elevations = [result["elevation"] for result in data.get("results", [])]
-                return elevations
+                    elevations = [result["elevation"] for result in data.get("results", [])]
+                    return elevations
     
     # 배치 처리: 250개씩 나눠서 여러 번 호출
     print(f"[배치 처리] 총 {len(coords)}개 좌표를 {math.ceil(len(coords) / MAX_PER_BATCH)}개 배치로 분할")
     
     all_elevations = []
     
-    async with aiohttp.ClientSession() as session:
+    async with aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=GOOGLE_ELEVATION_TIMEOUT)
+    ) as session:
         for i in range(0, len(coords), MAX_PER_BATCH):
             batch = coords[i:i + MAX_PER_BATCH]
             batch_num = (i // MAX_PER_BATCH) + 1
@@ -341,15 +301,16 @@ async def call_google_elevation_api(
             locations = coords_to_latlng_string(batch)
             params = {"locations": locations, "key": api_key}
             
-            async with session.get(GOOGLE_ELEVATION_API_URL, params=params) as response:
-                data = await response.json()
-                
-                if data.get("status") != "OK":
-                    error_message = data.get("error_message", data.get("status"))
-                    raise Exception(f"Google Elevation API 오류 (배치 {batch_num}): {error_message}")
-                
-                elevations = [result["elevation"] for result in data.get("results", [])]
-                all_elevations.extend(elevations)
+            async with elevation_governor.request(api_key=api_key, priority=priority):
+                async with session.get(GOOGLE_ELEVATION_API_URL, params=params) as response:
+                    data = await response.json()
+
+                    if data.get("status") != "OK":
+                        error_message = data.get("error_message", data.get("status"))
+                        raise Exception(f"Google Elevation API 오류 (배치 {batch_num}): {error_message}")
+
+                    elevations = [result["elevation"] for result in data.get("results", [])]
+                    all_elevations.extend(elevations)
                 
                 print(f"  배치 {batch_num}: ✅ {len(elevations)}개 고도 데이터 수신")
     
@@ -357,6 +318,39 @@ async def call_google_elevation_api(
     return all_elevations
 
 
+def elevation_cache_key(coords: List[Dict[str, float]]) -> str:
+    """좌표 목록 → 고도 캐시 키 (API 요청 문자열의 해시)"""
+    return hashlib.sha1(coords_to_latlng_string(coords).encode("utf-8")).hexdigest()
+
+
+def _finish_elevation_fetch(key: str, future: "asyncio.Future"):
+    _elevation_inflight.pop(key, None)
+    if not future.cancelled() and future.exception() is None:
+        elevation_cache.set(key, tuple(future.result()))
+
+
+async def fetch_route_elevations(
+    coords: List[Dict[str, float]], api_key: str, priority: str = INTERACTIVE
+) -> List[float]:
+    """
+    고도 조회 (캐시 → 진행 중인 같은 조회 → Google Elevation API)
+
+    호출한 쪽이 취소되어도(마감 시간 초과 등) 진행 중인 API 호출은 끝까지 실행되어 캐시를 채웁니다.
+    """
+    key = elevation_cache_key(coords)
+    cached = elevation_cache.get(key)
+    if cached is not None:
+        return list(cached)
+
+    future = _elevation_inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(call_google_elevation_api(coords, api_key, priority))
+        _elevation_inflight[key] = future
+        future.add_done_callback(lambda f: _finish_elevation_fetch(key, f))
+
+    return list(await asyncio.shield(future))
+
+
 def calculate_slope(elevation1: float, elevation2: float, distance: float) -> float:
     """
     두 지점 간의 경사도를 계산 (%)
@@ -536,6 +530,8 @@ def adjust_walking_time(
     for step_info in steps_coords:
         coords = step_info["coords"]
         step_distance = step_info["distance"]
+        # elevations는 step마다 좌표 전체(경계 좌표 포함)를 이어 붙인 순서
+        step_start_idx = elevation_idx
 
         for i in range(len(coords) - 1):
             if elevation_idx + 1 >= len(elevations):
@@ -605,132 +601,86 @@ def adjust_walking_time(
 
             elevation_idx += 1
 
+        # 다음 step의 첫 좌표로 이동 (step마다 한 칸씩 밀리지 않도록)
+        elevation_idx = step_start_idx + len(coords)
+
     return int(total_adjusted_time), segment_analysis
 
 
-async def analyze_route_elevation(
-    itinerary: Dict,
-    api_key: Optional[str] = None,
-    weather_data: Optional[Dict] = None,
-    user_speed_mps: Optional[float] = None,
-) -> Dict:
+def _prepare_route_elevation(itinerary: Dict, sampler: Optional[ElevationSampler] = None) -> Dict:
     """
-    전체 경로의 경사도를 분석하고 시간을 보정 (통합 계산)
+    고도 API 호출 전 단계 (동기 CPU 작업, 워커 풀에서 실행)
 
-    Args:
-        itinerary: Tmap API의 itinerary 데이터
-        api_key: Google Elevation API 키 (None이면 환경변수에서 가져옴)
-        weather_data: 날씨 데이터 (선택사항)
-            - temp_c: 기온 (°C)
-            - pty: 강수형태 (0:없음, 1:비, 2:진눈깨비, 3:눈)
-            - rain_mm_per_h: 시간당 강수량 (mm/h)
-            - snow_cm_per_h: 시간당 신적설 (cm/h)
-        user_speed_mps: 사용자 평균 보행속도 (m/s, Health Connect)
+    - WALK leg의 sectionTime을 4km/h 기준으로 재계산
+    - 실외 보행 / 환승(실내) 보행 분류
+    - 고도 조회용 좌표 수집 (sampler: 기본 elevation_sampler)
+    - 횡단보도 대기 시간 계산 (고도와 무관하므로 미리 계산)
 
-    Returns:
-        경사도 분석 결과 및 보정된 시간 정보 (모든 요인 통합)
+    itinerary는 parse_itinerary로 한 번만 파싱하고, 좌표 수집/횡단보도 계산이 같은 결과를 사용합니다.
 
-    처리 흐름:
-        1. Google Elevation API로 고도 데이터 획득
-        2. 경사도 계산
-        3. Factors_Affecting_Walking_Speed로 통합 계산
-           - Tmap 기준 시간 (1.0)
-           - × 사용자 속도 계수 (Health Connect)
-           - × 경사도 계수 (Tobler's Function)
-           - × 날씨 계수 (WeatherSpeedModel)
-        4. 횡단보도 대기 시간 추가 (개당 116초, 중앙값 기준)
+    프로세스 풀에서 실행되면 itinerary가 복사본이므로,
+    재계산된 sectionTime은 section_times로 함께 반환합니다.
     """
-    if api_key is None:
-        api_key = os.getenv("GOOGLE_ELEVATION_API_KEY")
-
-    if not api_key:
-        raise ValueError("Google Elevation API 키가 설정되지 않았습니다.")
-
-    # 통합 계산기 초기화
-    integrator = get_integrator()
-
     # 모든 leg 가져오기
     all_legs = itinerary.get("legs", [])
 
+    # WALK leg 파싱 (linestring당 한 번, ParsedLeg.leg는 원본 dict 참조)
+    parsed = parse_itinerary(itinerary)
+
     # ===== 중요: 모든 WALK leg의 sectionTime을 4km/h 기준으로 재계산 =====
     # Tmap API가 반환한 시간이 아닌, 거리를 4km/h로 나눈 기준 시간 사용
     # 이후 사용자 속도, 경사도, 날씨로 보정
     tmap_base_speed_mps = 1.111  # 4 km/h = 1.111 m/s (Tmap 기준)
 
     print("\n[🔄 4km/h 기준 재계산]")
-    for leg in all_legs:
-        if leg.get("mode") == "WALK":
-            original_time = leg.get("sectionTime", 0)
-            distance = leg.get("distance", 0)
-
-            # 4km/h 기준으로 재계산
-            recalculated_time = (
-                int(distance / tmap_base_speed_mps)
-                if tmap_base_speed_mps > 0 and distance > 0
-                else original_time
-            )
+    for parsed_leg in parsed.legs:
+        leg = parsed_leg.leg
+        original_time = leg.get("sectionTime", 0)
+        distance = leg.get("distance", 0)
 
-            # leg의 sectionTime을 재계산된 값으로 업데이트
-            leg["sectionTime"] = recalculated_time
+        # 4km/h 기준으로 재계산
+        recalculated_time = (
+            int(distance / tmap_base_speed_mps)
+            if tmap_base_speed_mps > 0 and distance > 0
+            else original_time
+        )
 
-            print(
-                f"  {leg.get('start', {}).get('name', '')} → {leg.get('end', {}).get('name', '')}"
-            )
-            print(f"    거리: {distance}m")
-            print(
-                f"    API 원본: {original_time}초 ({original_time//60}분 {original_time%60}초)"
-            )
-            print(
-                f"    4km/h 재계산: {recalculated_time}초 ({recalculated_time//60}분 {recalculated_time%60}초)"
-            )
+        # leg의 sectionTime을 재계산된 값으로 업데이트
+        leg["sectionTime"] = recalculated_time
 
-    # WALK 모드인 leg 분류: 실외 보행 vs 환승(실내) 보행
-    outdoor_walk_legs = []  # 경사도 + 날씨 적용
-    transfer_walk_legs = []  # 사용자 속도만 적용
+        print(
+            f"  {leg.get('start', {}).get('name', '')} → {leg.get('end', {}).get('name', '')}"
+        )
+        print(f"    거리: {distance}m")
+        print(
+            f"    API 원본: {original_time}초 ({original_time//60}분 {original_time%60}초)"
+        )
+        print(
+            f"    4km/h 재계산: {recalculated_time}초 ({recalculated_time//60}분 {recalculated_time%60}초)"
+        )
 
-    for i, leg in enumerate(all_legs):
-        if leg.get("mode") == "WALK":
-            # 이전 leg과 다음 leg 확인
-            prev_leg = all_legs[i - 1] if i > 0 else None
-            next_leg = all_legs[i + 1] if i < len(all_legs) - 1 else None
-
-            # 환승 구간 판단: 앞뒤가 모두 대중교통(지하철, 버스)이면 환승(실내)으로 간주
-            is_transfer = (
-                prev_leg
-                and prev_leg.get("mode") in ["SUBWAY", "BUS", "TRAIN"]
-                and next_leg
-                and next_leg.get("mode") in ["SUBWAY", "BUS", "TRAIN"]
-            )
+    # WALK 모드인 leg 분류: 실외 보행(경사도 + 날씨 적용) vs 환승(실내) 보행(사용자 속도만 적용)
+    # 환승 구간 판단: 앞뒤가 모두 대중교통(지하철, 버스)이면 환승(실내)으로 간주
+    outdoor_legs = parsed.outdoor_legs
+    transfer_walk_legs = [parsed_leg.leg for parsed_leg in parsed.transfer_legs]
+    for leg in transfer_walk_legs:
+        print(
+            f"[경사도 분석] 환승(실내) 구간: {leg.get('start', {}).get('name', '')} → {leg.get('end', {}).get('name', '')} (거리: {leg.get('distance', 0)}m, 재계산 시간: {leg.get('sectionTime', 0)}초) - 사용자 속도만 적용"
+        )
 
-            if is_transfer:
-                transfer_walk_legs.append(leg)
-                print(
-                    f"[경사도 분석] 환승(실내) 구간: {leg.get('start', {}).get('name', '')} → {leg.get('end', {}).get('name', '')} (거리: {leg.get('distance', 0)}m, 재계산 시간: {leg.get('sectionTime', 0)}초) - 사용자 속도만 적용"
-                )
-            else:
-                outdoor_walk_legs.append(leg)
+    walk_legs = [parsed_leg.leg for parsed_leg in outdoor_legs]  # 경사도 분석 대상
 
-    walk_legs = outdoor_walk_legs  # 경사도 분석 대상
+    section_times = [leg.get("sectionTime") for leg in all_legs]
 
     if not walk_legs:
         return {
-            "error": "보행 구간이 없습니다.",
-            "walk_legs_analysis": [],
-            "total_original_walk_time": 0,
-            "total_adjusted_walk_time": 0,
-            "total_route_time_adjustment": 0,
-            "user_speed_mps": user_speed_mps,
-            "weather_applied": weather_data is not None,
-            "factors": {
-                "user_speed_factor": 1.0,
-                "slope_factor": 1.0,
-                "weather_factor": 1.0,
-                "final_factor": 1.0,
-            },
+            "section_times": section_times,
+            "walk_legs": [],
+            "transfer_walk_legs": transfer_walk_legs,
         }
 
-    # 좌표 수집 (샘플링 없이 Tmap 원본 사용)
-    optimized = optimize_all_coordinates(walk_legs)
+    # 좌표 수집 (step마다 sampler로 고도 조회 좌표 샘플링, ELEVATION_SAMPLING=off면 Tmap 원본 그대로)
+    optimized = optimize_all_coordinates(outdoor_legs, sampler)
 
     print(f"[경사도 분석] 원본 좌표: {optimized['original_coords']}개")
     print(f"[경사도 분석] 사용 좌표: {optimized['total_sampled_coords']}개")
@@ -754,29 +704,36 @@ async def analyze_route_elevation(
                 }
             )
 
-    # Google Elevation API 호출
-    try:
-        elevations = await call_google_elevation_api(all_coords, api_key)
-    except Exception as e:
-        return {
-            "error": f"고도 데이터 획득 실패: {str(e)}",
-            "walk_legs_analysis": [],
-            "total_original_walk_time": sum(
-                leg.get("sectionTime", 0) for leg in walk_legs
-            ),
-            "total_adjusted_walk_time": sum(
-                leg.get("sectionTime", 0) for leg in walk_legs
-            ),
-            "total_route_time_adjustment": 0,
-            "user_speed_mps": user_speed_mps,
-            "weather_applied": weather_data is not None,
-            "factors": {
-                "user_speed_factor": 1.0,
-                "slope_factor": 1.0,
-                "weather_factor": 1.0,
-                "final_factor": 1.0,
-            },
-        }
+    # 횡단보도 대기 시간 및 개수 계산 (통합)
+    crosswalk_result = crosswalk_waiting_time(itinerary, parsed)
+
+    return {
+        "section_times": section_times,
+        "walk_legs": walk_legs,
+        "transfer_walk_legs": transfer_walk_legs,
+        "optimized": optimized,
+        "all_coords": all_coords,
+        "crosswalk_result": crosswalk_result,
+    }
+
+
+def _build_route_elevation_result(
+    prepared: Dict,
+    elevations: List[float],
+    weather_data: Optional[Dict] = None,
+    user_speed_mps: Optional[float] = None,
+    speed_model: Optional[PersonalSpeedModel] = None,
+) -> Dict:
+    """
+    고도 데이터로 leg별 시간을 보정하고 결과를 구성 (동기 CPU 작업, 워커 풀에서 실행)
+    """
+    # 통합 계산기 초기화
+    integrator = get_integrator()
+
+    walk_legs = prepared["walk_legs"]
+    transfer_walk_legs = prepared["transfer_walk_legs"]
+    optimized = prepared["optimized"]
+    crosswalk_result = prepared["crosswalk_result"]
 
     # 각 leg별 분석
     analysis = []
@@ -838,6 +795,7 @@ async def analyze_route_elevation(
             user_speed_mps=user_speed_mps,
             average_slope_percent=avg_slope,
             weather_data=weather_data,
+            speed_model=speed_model,
         )
 
         final_adjusted_time = int(speed_factors.adjusted_time)
@@ -891,6 +849,7 @@ async def analyze_route_elevation(
                 user_speed_mps=user_speed_mps,
                 average_slope_percent=0.0,  # 실내이므로 경사도 무시
                 weather_data=None,  # 실내이므로 날씨 무시
+                speed_model=speed_model,
             )
 
             adjusted_time = int(speed_factors.adjusted_time)
@@ -940,8 +899,6 @@ async def analyze_route_elevation(
         f"  전체 합계: 원본 {total_original_walk_time}초 ({total_original_walk_time // 60}분 {total_original_walk_time % 60}초), 보정: {total_adjusted_walk_time}초 ({total_adjusted_walk_time // 60}분 {total_adjusted_walk_time % 60}초)"
     )
 
-    # 횡단보도 대기 시간 및 개수 계산 (통합)
-    crosswalk_result = crosswalk_waiting_time(itinerary)
     crosswalk_count = crosswalk_result["count"]
     crosswalk_wait_time = crosswalk_result["total_wait_time"]
 
@@ -1008,6 +965,7 @@ async def analyze_route_elevation(
         },
         "user_speed_mps": user_speed_mps,
         "weather_applied": weather_data is not None,
+        "personal_sensitivity_applied": speed_model is not None,
         "sampled_coords_count": optimized["total_sampled_coords"],
         "original_coords_count": optimized["original_coords"],
         "data_quality": {
@@ -1023,3 +981,157 @@ async def analyze_route_elevation(
     print(f"  factors 값: {result.get('factors', 'NOT FOUND')}")
 
     return result
+
+
+async def analyze_route_elevation(
+    itinerary: Dict,
+    api_key: Optional[str] = None,
+    weather_data: Optional[Dict] = None,
+    user_speed_mps: Optional[float] = None,
+    speed_model: Optional[PersonalSpeedModel] = None,
+) -> Dict:
+    """
+    전체 경로의 경사도를 분석하고 시간을 보정 (통합 계산)
+
+    Args:
+        itinerary: Tmap API의 itinerary 데이터
+        api_key: Google Elevation API 키 (None이면 환경변수에서 가져옴)
+        weather_data: 날씨 데이터 (선택사항)
+            - temp_c: 기온 (°C)
+            - pty: 강수형태 (0:없음, 1:비, 2:진눈깨비, 3:눈)
+            - rain_mm_per_h: 시간당 강수량 (mm/h)
+            - snow_cm_per_h: 시간당 신적설 (cm/h)
+        user_speed_mps: 사용자 평균 보행속도 (m/s, Health Connect)
+        speed_model: 사용자 경사도/날씨 민감도 (resolve_user_speed_model, 없으면 모집단 계수)
+
+    Returns:
+        경사도 분석 결과 및 보정된 시간 정보 (모든 요인 통합)
+
+    처리 흐름:
+        1. Google Elevation API로 고도 데이터 획득
+        2. 경사도 계산
+        3. Factors_Affecting_Walking_Speed로 통합 계산
+           - Tmap 기준 시간 (1.0)
+           - × 사용자 속도 계수 (Health Connect)
+           - × 경사도 계수 (Tobler's Function)
+           - × 날씨 계수 (WeatherSpeedModel)
+        4. 횡단보도 대기 시간 추가 (개당 116초, 중앙값 기준)
+    """
+    if api_key is None:
+        api_key = os.getenv("GOOGLE_ELEVATION_API_KEY")
+
+    if not api_key:
+        raise ValueError("Google Elevation API 키가 설정되지 않았습니다.")
+
+    prepared = await prepare_route_elevation(itinerary)
+    return await analyze_prepared_route(
+        prepared, api_key, weather_data, user_speed_mps, speed_model
+    )
+
+
+async def prepare_route_elevation(itinerary: Dict) -> Dict:
+    """
+    좌표 수집/횡단보도 계산 (고도 API 호출 전 단계)
+
+    같은 내용의 itinerary는 캐시된 결과를 사용합니다 (대중교통 검색 후 미리 계산한 경로 등).
+    재계산된 sectionTime은 원본 itinerary에 반영됩니다.
+    """
+    key = itinerary_hash(itinerary)
+    prepared = prepared_route_cache.get(key)
+    if prepared is None:
+        # 좌표 수집/횡단보도 계산은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        prepared = await route_analysis_pool.run(_prepare_route_elevation, itinerary)
+        prepared_route_cache.set(key, prepared)
+
+    # 재계산된 sectionTime을 원본 itinerary에 반영 (프로세스 풀 사용 시 복사본이므로)
+    for leg, section_time in zip(itinerary.get("legs", []), prepared["section_times"]):
+        if leg.get("mode") == "WALK":
+            leg["sectionTime"] = section_time
+
+    return prepared
+
+
+def _empty_route_result(
+    error: str,
+    walk_legs: List[Dict],
+    weather_data: Optional[Dict],
+    user_speed_mps: Optional[float],
+) -> Dict:
+    """분석할 수 없을 때의 결과 (모든 계수 1.0)"""
+    walk_time = sum(leg.get("sectionTime", 0) for leg in walk_legs)
+    return {
+        "error": error,
+        "walk_legs_analysis": [],
+        "total_original_walk_time": walk_time,
+        "total_adjusted_walk_time": walk_time,
+        "total_route_time_adjustment": 0,
+        "user_speed_mps": user_speed_mps,
+        "weather_applied": weather_data is not None,
+        "factors": {
+            "user_speed_factor": 1.0,
+            "slope_factor": 1.0,
+            "weather_factor": 1.0,
+            "final_factor": 1.0,
+        },
+    }
+
+
+async def analyze_prepared_route(
+    prepared: Dict,
+    api_key: str,
+    weather_data: Optional[Dict] = None,
+    user_speed_mps: Optional[float] = None,
+    speed_model: Optional[PersonalSpeedModel] = None,
+) -> Dict:
+    """prepare_route_elevation 결과로 고도 조회 + 통합 계산"""
+    walk_legs = prepared["walk_legs"]
+
+    if not walk_legs:
+        return _empty_route_result("보행 구간이 없습니다.", [], weather_data, user_speed_mps)
+
+    # Google Elevation API 호출 (캐시/진행 중인 같은 조회 재사용)
+    try:
+        elevations = await fetch_route_elevations(prepared["all_coords"], api_key)
+    except UpstreamUnavailableError as e:
+        # 회로 차단/한도 초과: 기다리지 않고 평지 추정 결과 사용
+        result = await estimate_flat_route(prepared, weather_data, user_speed_mps, speed_model)
+        result["slope_unavailable"] = str(e)
+        return result
+    except Exception as e:
+        return _empty_route_result(
+            f"고도 데이터 획득 실패: {str(e)}", walk_legs, weather_data, user_speed_mps
+        )
+
+    return await route_analysis_pool.run(
+        _build_route_elevation_result,
+        prepared,
+        elevations,
+        weather_data,
+        user_speed_mps,
+        speed_model,
+    )
+
+
+async def estimate_flat_route(
+    prepared: Dict,
+    weather_data: Optional[Dict] = None,
+    user_speed_mps: Optional[float] = None,
+    speed_model: Optional[PersonalSpeedModel] = None,
+) -> Dict:
+    """
+    고도 없이 평지로 가정한 추정 결과 (경사도 계수 1.0)
+
+    사용자 속도/날씨/횡단보도는 그대로 반영하므로 결과 형식은 analyze_prepared_route와 같습니다.
+    """
+    walk_legs = prepared["walk_legs"]
+    if not walk_legs:
+        return _empty_route_result("보행 구간이 없습니다.", [], weather_data, user_speed_mps)
+
+    return await route_analysis_pool.run(
+        _build_route_elevation_result,
+        prepared,
+        [0.0] * len(prepared["all_coords"]),
+        weather_data,
+        user_speed_mps,
+        speed_model,
+    )
@@ -0,0 +1,170 @@
+"""
+고도 조회 좌표 적응형 샘플링 (Google Elevation API 요청 좌표 수 절감)
+
+Tmap 좌표는 직선 구간에도 몇 m 간격으로 촘촘히 들어 있어, 그대로 보내면 경로 하나에 수백~수천 개를 조회합니다.
+step 좌표마다 다음 순서로 줄입니다 (시작/끝 좌표는 항상 유지, 원본보다 늘어나지 않음).
+
+1. 형태 유지: Douglas-Peucker로 경로에서 tolerance_m 이상 벗어나는 꺾이는 점만 남김 (직선 구간 제거)
+2. 고도 간격: 남은 점 사이가 interval_m보다 멀면 누적 거리에서 이분 탐색 + 선형 보간으로 중간 점 추가
+3. 밀집 제거: 앞 점과 경로 거리 min_gap_m 미만인 점 제거
+
+오차 상한: 구간별 평균 경사도는 (끝 고도 - 시작 고도) / 경로 길이로 정리되므로,
+ETA 오차는 주로 경로 길이 오차에서 옵니다. 샘플링한 step 길이가 원본보다
+max_length_error 비율 이상 짧아지면 tolerance를 절반씩 줄여(최대 REFINE_STEPS번) 다시 샘플링하고,
+그래도 넘으면 해당 step은 원본 좌표를 그대로 사용합니다.
+(GPX 실측 고도 대비 검증: scripts/validate_elevation_sampling.py)
+
+환경 변수:
+- ELEVATION_SAMPLING: adaptive(기본) / off (원본 좌표 그대로)
+- ELEVATION_SAMPLING_INTERVAL: 고도 샘플 최대 간격 (m, 기본 20)
+- ELEVATION_SAMPLING_TOLERANCE: 형태 허용 오차 (m, 기본 2)
+- ELEVATION_SAMPLING_MIN_GAP: 최소 샘플 간격 (m, 기본 5)
+- ELEVATION_SAMPLING_MAX_LENGTH_ERROR: step 길이 오차 상한 (비율, 기본 0.01)
+"""
+
+import math
+import os
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .geo_helpers import haversine
+from .polyline import simplify_indices
+
+SAMPLING_MODES = ("adaptive", "off")
+
+# 길이 오차 상한을 넘을 때 tolerance를 절반으로 줄여 다시 시도하는 횟수
+REFINE_STEPS = 2
+
+# haversine과 같은 지구 반지름 (m)
+EARTH_RADIUS_M = 6371000
+
+
+def _project(coords: List[Dict[str, float]]) -> List[Tuple[float, float]]:
+    """위경도 → 첫 점 기준 평면 좌표 (m, 짧은 step에서는 오차 무시 가능)"""
+    lon0, lat0 = coords[0]["lon"], coords[0]["lat"]
+    scale_y = math.pi / 180 * EARTH_RADIUS_M
+    scale_x = scale_y * math.cos(math.radians(lat0))
+    return [((c["lon"] - lon0) * scale_x, (c["lat"] - lat0) * scale_y) for c in coords]
+
+
+def _path_length(coords: List[Dict[str, float]]) -> float:
+    return sum(haversine(coords[i - 1], coords[i]) for i in range(1, len(coords)))
+
+
+class ElevationSampler:
+    """step 좌표 → 고도 조회용 좌표 (adaptive: 위 3단계 + 길이 오차 상한, off: 그대로)"""
+
+    def __init__(
+        self,
+        mode: str = "adaptive",
+        interval_m: float = 20.0,
+        tolerance_m: float = 2.0,
+        min_gap_m: float = 5.0,
+        max_length_error: float = 0.01,
+    ):
+        if mode not in SAMPLING_MODES:
+            raise ValueError(f"ELEVATION_SAMPLING은 {', '.join(SAMPLING_MODES)} 중 하나여야 합니다: {mode}")
+        self.mode = mode
+        self.interval_m = max(1.0, interval_m)
+        self.tolerance_m = max(0.0, tolerance_m)
+        self.min_gap_m = max(0.0, min(min_gap_m, self.interval_m))
+        self.max_length_error = max(0.0, max_length_error)
+
+    @classmethod
+    def from_env(cls) -> "ElevationSampler":
+        """환경 변수에서 설정을 읽어 생성"""
+        return cls(
+            mode=os.getenv("ELEVATION_SAMPLING", "adaptive").lower(),
+            interval_m=float(os.getenv("ELEVATION_SAMPLING_INTERVAL", "20")),
+            tolerance_m=float(os.getenv("ELEVATION_SAMPLING_TOLERANCE", "2")),
+            min_gap_m=float(os.getenv("ELEVATION_SAMPLING_MIN_GAP", "5")),
+            max_length_error=float(os.getenv("ELEVATION_SAMPLING_MAX_LENGTH_ERROR", "0.01")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def sample(self, coords: List[Dict[str, float]]) -> List[Dict[str, float]]:
+        """
+        step 좌표 샘플링
+
+        Args:
+            coords: [{'lon': float, 'lat': float}, ...] (파싱 결과 공유 - 수정하지 않음)
+
+        Returns:
+            새 좌표 리스트 (원본 좌표 dict는 그대로 재사용, 보간한 점만 새로 만듦)
+        """
+        if not self.enabled or len(coords) <= 2:
+            return list(coords)
+
+        cumulative = [0.0]
+        for i in range(1, len(coords)):
+            cumulative.append(cumulative[-1] + haversine(coords[i - 1], coords[i]))
+        total = cumulative[-1]
+        if total == 0:
+            return [coords[0], coords[-1]]
+
+        projected = np.asarray(_project(coords))
+        tolerance = self.tolerance_m
+        for _ in range(REFINE_STEPS + 1):
+            result = self._sample_with_tolerance(coords, projected, cumulative, tolerance)
+            # 오차 상한: 길이가 max_length_error 이상 줄면 더 촘촘하게
+            if total - _path_length(result) <= total * self.max_length_error:
+                return result
+            tolerance /= 2
+        return list(coords)
+
+    def _sample_with_tolerance(
+        self,
+        coords: List[Dict[str, float]],
+        projected: np.ndarray,
+        cumulative: List[float],
+        tolerance: float,
+    ) -> List[Dict[str, float]]:
+        total = cumulative[-1]
+
+        # 1. 형태 유지 (직선 구간 제거)
+        kept = simplify_indices(projected, tolerance).tolist()
+
+        # 2. 고도 간격 보장 (누적 거리 이분 탐색 + 보간) → (경로 위치, 좌표)
+        positioned = [(0.0, coords[0])]
+        for start, end in zip(kept, kept[1:]):
+            gap = cumulative[end] - cumulative[start]
+            needed = math.ceil(gap / self.interval_m) - 1
+            between = end - start - 1
+            if needed >= between:
+                # 원본 점이 더 적거나 같으면 원본 사용
+                positioned.extend((cumulative[i], coords[i]) for i in range(start + 1, end))
+            elif needed > 0:
+                for k in range(1, needed + 1):
+                    target = cumulative[start] + gap * k / (needed + 1)
+                    j = bisect_left(cumulative, target, start + 1, end + 1)
+                    span = cumulative[j] - cumulative[j - 1]
+                    ratio = (target - cumulative[j - 1]) / span if span > 0 else 1.0
+                    a, b = coords[j - 1], coords[j]
+                    positioned.append(
+                        (
+                            target,
+                            {
+                                "lon": a["lon"] + (b["lon"] - a["lon"]) * ratio,
+                                "lat": a["lat"] + (b["lat"] - a["lat"]) * ratio,
+                            },
+                        )
+                    )
+            positioned.append((cumulative[end], coords[end]))
+
+        # 3. 밀집 제거 (끝점은 유지, 끝점 바로 앞의 가까운 점을 대신 제거)
+        sampled = [positioned[0]]
+        for position, coord in positioned[1:-1]:
+            if position - sampled[-1][0] >= self.min_gap_m:
+                sampled.append((position, coord))
+        if len(sampled) > 1 and total - sampled[-1][0] < self.min_gap_m:
+            sampled.pop()
+        sampled.append(positioned[-1])
+        return [coord for _, coord in sampled]
+
+
+elevation_sampler = ElevationSampler.from_env()
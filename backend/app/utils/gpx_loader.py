@@ -1,5 +1,5 @@
 """
-GPX 파일을 파싱하여 PostgreSQL DB의 routes 및 route_segments 테이블에 적재하는 유틸리티
+GPX 파일을 파싱하여 PostgreSQL DB의 routes 및 route_segments(+ route_segment_packs) 테이블에 적재하는 유틸리티
 app/database.py의 DB 연결을 사용
 """
 
@@ -9,7 +9,11 @@ import math
 from pathlib import Path
 from typing import List, Dict
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import insert, text
+
+from app.crud import save_route_geometries, save_route_segment_pack
+from app.models import RouteSegments
+from app.utils.route_catalog import route_catalog
 
 
 class GPXLoader:
@@ -323,22 +327,15 @@ class GPXLoader:
         return route_id
     
     def insert_segments(self, route_id: int, segments: List[Dict]):
-        """route_segments 테이블에 세그먼트 삽입"""
-        
-        for seg in segments:
-            insert_query = text("""
-            INSERT INTO route_segments (
-                route_id, segment_order, start_lat, start_lon, end_lat, end_lon,
-                segment_distance_m, segment_grade_percent, elevation_change_m,
-                start_elevation_m, end_elevation_m, terrain_type
-            ) VALUES (
-                :route_id, :segment_order, :start_lat, :start_lon, :end_lat, :end_lon,
-                :segment_distance_m, :segment_grade_percent, :elevation_change_m,
-                :start_elevation_m, :end_elevation_m, :terrain_type
-            )
-            """)
-            
-            self.db.execute(insert_query, {
+        """
+        route_segments 테이블에 세그먼트 삽입 + 경로당 1행 묶음(route_segment_packs) 저장
+
+        세그먼트 행은 INSERT 한 번(executemany)으로 넣고, 받은 segment_id까지 묶음에 저장합니다.
+        (route_segments는 search_route_segments FK·카탈로그 경사도 집계용으로 유지)
+        """
+        table = RouteSegments.__table__
+        rows = [
+            {
                 'route_id': route_id,
                 'segment_order': seg['segment_order'],
                 'start_lat': seg['start_lat'],
@@ -351,9 +348,23 @@ class GPXLoader:
                 'start_elevation_m': seg['start_elevation_m'],
                 'end_elevation_m': seg['end_elevation_m'],
                 'terrain_type': seg['terrain_type']
-            })
+            }
+            for seg in segments
+        ]
+        
+        segment_ids = self.db.execute(
+            insert(table).returning(table.c.segment_id, sort_by_parameter_order=True),
+            rows
+        ).scalars().all()
+        
+        for row, segment_id in zip(rows, segment_ids):
+            row['segment_id'] = segment_id
+        save_route_segment_pack(self.db, route_id, rows, commit=False)
         
         self.db.commit()
+        # 세그먼트(경사도 히스토그램)까지 저장된 뒤 카탈로그에 반영
+        # (경로 행만 있을 때 갱신되면 세그먼트가 빈 채로 남으므로 여기서 invalidate)
+        route_catalog.invalidate()
     
     def load_gpx_file(self, gpx_file_path: str, segment_length: int = 100) -> Dict:
         """
@@ -374,8 +385,10 @@ class GPXLoader:
         if not stats:
             raise ValueError("유효하지 않은 GPX 파일입니다.")
         
-        # 3. Routes 테이블에 삽입
+        # 3. Routes 테이블에 삽입 + 해상도별 단순화 좌표 저장
         route_id = self.insert_route(route_data, stats)
+        coordinates = [[pt['lon'], pt['lat']] for pt in route_data['track_points']]
+        save_route_geometries(self.db, route_id, coordinates)
         
         # 4. 세그먼트 생성 및 삽입
         segments = self.create_segments(route_data['track_points'], segment_length)
@@ -0,0 +1,238 @@
+"""
+Tmap itinerary 한 번 파싱 (경사도/횡단보도 분석 공통 전처리)
+
+좌표 수 계산, 고도 조회용 좌표 수집, 횡단보도 개수/대기 시간 계산이 각자 legs를 순회하며
+linestring을 split/파싱하던 것을 한 번으로 합칩니다.
+
+- ParsedItinerary.legs: WALK leg별 step 좌표 (필요할 때 linestring당 한 번만 파싱), 환승/지하철 진입 여부
+- ParsedItinerary.crosswalks: 횡단보도 step (신호 길이, 시작/끝 좌표, 지하철 출구 제외 여부)
+
+파싱 결과의 좌표 dict는 여러 단계가 함께 사용하므로 수정하지 않습니다 (읽기 전용).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .geo_helpers import parse_linestring
+
+# 앞뒤가 모두 이 모드이면 환승(실내) 보행 구간
+TRANSIT_MODES = ("SUBWAY", "BUS", "TRAIN")
+
+# Tmap Pedestrian API의 횡단보도 turnType (211: 횡단보도, 214~217: 방향별 횡단보도)
+CROSSWALK_TURN_TYPES = (211, 214, 215, 216, 217)
+
+CROSSWALK_KEYWORD = "횡단보도"
+
+
+@dataclass
+class ParsedStep:
+    """
+    보행 step (passShape만 있는 leg는 step 하나로 취급)
+
+    coords는 처음 사용할 때 파싱 (환승 구간처럼 좌표를 쓰지 않는 step은 파싱하지 않음)
+    """
+
+    index: int
+    linestring: str = ""
+    distance: float = 0
+    description: str = ""
+    turn_type: Optional[int] = None
+    _coords: Optional[List[Dict[str, float]]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def coords(self) -> List[Dict[str, float]]:
+        if self._coords is None:
+            self._coords = parse_coords(self.linestring)
+        return self._coords
+
+    def endpoints(self) -> Optional[Tuple[float, float, float, float]]:
+        """(lat1, lng1, lat2, lng2) - 좌표가 2개 미만이거나 시작/끝 좌표가 잘못되면 None"""
+        coord_strs = self.linestring.split()
+        if len(coord_strs) < 2:
+            return None
+        try:
+            lng1, lat1 = map(float, coord_strs[0].split(","))
+            lng2, lat2 = map(float, coord_strs[-1].split(","))
+        except ValueError:
+            return None
+        return (lat1, lng1, lat2, lng2)
+
+
+@dataclass
+class CrosswalkStep:
+    """설명에 '횡단보도'가 들어 있는 step"""
+
+    leg_index: int
+    step_index: int
+    # "횡단보도 20m" → 20 (없으면 None)
+    length: Optional[int]
+    # (lat1, lng1, lat2, lng2), 좌표가 2개 미만이면 None (시작/끝 좌표만 파싱)
+    endpoints: Optional[Tuple[float, float, float, float]]
+    # 지하철 진입 직전 마지막 step의 출구 횡단보도 (실제로 건너지 않음)
+    skipped: bool = False
+
+
+@dataclass
+class ParsedLeg:
+    """WALK leg (leg는 원본 dict 참조 - sectionTime 재계산 값이 그대로 보임)"""
+
+    index: int
+    leg: Dict
+    steps: List[ParsedStep]
+    # steps/passShape 중 하나라도 있으면 True (좌표 수집 대상)
+    has_shape: bool = False
+    is_transfer: bool = False
+    is_entering_subway: bool = False
+
+    @property
+    def distance(self) -> float:
+        return self.leg.get("distance", 0)
+
+    @property
+    def coord_count(self) -> int:
+        return sum(len(step.coords) for step in self.steps)
+
+
+@dataclass
+class ParsedItinerary:
+    legs: List[ParsedLeg] = field(default_factory=list)
+    crosswalks: List[CrosswalkStep] = field(default_factory=list)
+
+    @property
+    def outdoor_legs(self) -> List[ParsedLeg]:
+        """경사도 + 날씨를 적용하는 실외 보행 구간"""
+        return [leg for leg in self.legs if not leg.is_transfer]
+
+    @property
+    def transfer_legs(self) -> List[ParsedLeg]:
+        """사용자 속도만 적용하는 환승(실내) 보행 구간"""
+        return [leg for leg in self.legs if leg.is_transfer]
+
+
+def parse_coords(linestring: str) -> List[Dict[str, float]]:
+    """
+    linestring → [{'lon', 'lat'}, ...] (geo_helpers.parse_linestring과 같은 결과)
+
+    정상 형식이면 split 한 번 + float 변환만 하고, 잘못된 좌표가 섞여 있을 때만
+    parse_linestring으로 다시 파싱해 해당 좌표를 건너뜁니다.
+    """
+    coords = []
+    try:
+        for coord_str in linestring.split():
+            lon, _, lat = coord_str.partition(",")
+            coords.append({"lon": float(lon), "lat": float(lat)})
+    except (ValueError, AttributeError):
+        return parse_linestring(linestring)
+    return coords
+
+
+def extract_crosswalk_length(description: str) -> Optional[int]:
+    """'횡단보도' 이후 처음 나오는 숫자 (신호 길이 추정용)"""
+    start = description.find(CROSSWALK_KEYWORD)
+    if start < 0:
+        return None
+    number_str = ""
+    for char in description[start:]:
+        if char.isdigit():
+            number_str += char
+        elif number_str:
+            break
+    return int(number_str) if number_str else None
+
+
+def _parse_steps(leg: Dict) -> Tuple[List[ParsedStep], bool]:
+    if "steps" in leg:
+        steps = []
+        for index, step in enumerate(leg.get("steps") or []):
+            if not isinstance(step, dict):
+                continue
+            steps.append(
+                ParsedStep(
+                    index=index,
+                    linestring=step.get("linestring") or "",
+                    distance=step.get("distance", 0),
+                    description=step.get("description") or "",
+                    turn_type=step.get("turnType"),
+                )
+            )
+        return steps, True
+    if "passShape" in leg:
+        linestring = (leg.get("passShape") or {}).get("linestring") or ""
+        return [ParsedStep(index=0, linestring=linestring, distance=leg.get("distance", 0))], True
+    return [], False
+
+
+def _parse_crosswalks(parsed_leg: ParsedLeg) -> List[CrosswalkStep]:
+    crosswalks = []
+    last_index = len(parsed_leg.leg.get("steps") or []) - 1
+    for step in parsed_leg.steps:
+        if CROSSWALK_KEYWORD not in step.description:
+            continue
+        crosswalks.append(
+            CrosswalkStep(
+                leg_index=parsed_leg.index,
+                step_index=step.index,
+                length=extract_crosswalk_length(step.description),
+                endpoints=step.endpoints(),
+                skipped=(
+                    parsed_leg.is_entering_subway
+                    and step.index == last_index
+                    and "출구에서" in step.description
+                ),
+            )
+        )
+    return crosswalks
+
+
+def parse_walk_leg(
+    leg: Dict, index: int = 0, prev_mode: Optional[str] = None, next_mode: Optional[str] = None
+) -> ParsedLeg:
+    """
+    WALK leg 하나 파싱
+
+    Args:
+        leg: WALK leg
+        index: itinerary legs에서의 위치
+        prev_mode / next_mode: 앞뒤 leg의 mode (환승/지하철 진입 판단, 모르면 None)
+    """
+    steps, has_shape = _parse_steps(leg)
+    return ParsedLeg(
+        index=index,
+        leg=leg,
+        steps=steps,
+        has_shape=has_shape,
+        is_transfer=prev_mode in TRANSIT_MODES and next_mode in TRANSIT_MODES,
+        is_entering_subway=next_mode == "SUBWAY",
+    )
+
+
+def parse_itinerary(itinerary: Optional[Dict]) -> ParsedItinerary:
+    """
+    itinerary → ParsedItinerary (WALK leg만, 각 linestring은 한 번만 파싱)
+
+    Args:
+        itinerary: Tmap Transit itinerary 또는 보행자 경로를 같은 형식으로 변환한 dict
+
+    Returns:
+        ParsedItinerary (itinerary가 dict가 아니면 빈 결과)
+    """
+    parsed = ParsedItinerary()
+    if not isinstance(itinerary, dict):
+        return parsed
+
+    all_legs = itinerary.get("legs") or []
+    for i, leg in enumerate(all_legs):
+        if not isinstance(leg, dict) or leg.get("mode") != "WALK":
+            continue
+        prev_leg = all_legs[i - 1] if i > 0 else None
+        next_leg = all_legs[i + 1] if i + 1 < len(all_legs) else None
+        parsed_leg = parse_walk_leg(
+            leg,
+            index=i,
+            prev_mode=prev_leg.get("mode") if isinstance(prev_leg, dict) else None,
+            next_mode=next_leg.get("mode") if isinstance(next_leg, dict) else None,
+        )
+        parsed.legs.append(parsed_leg)
+        parsed.crosswalks.extend(_parse_crosswalks(parsed_leg))
+
+    return parsed
@@ -0,0 +1,198 @@
+"""
+네비게이션 로그 움직임 구간(movement_data.segments) 바이너리 저장 형식
+
+movement_data는 걷기/정지 구간마다 ISO 시각 문자열 2개와 같은 키 이름이 반복되는 JSON이라
+긴 세션일수록 저장 공간과 직렬화 비용이 커집니다.
+구간 목록만 고정 길이 정수 배열(리틀 엔디언)로 묶어 navigation_logs.movement_segments에 저장하고,
+movement_data에는 나머지 값(total_pauses, detection_method 등)만 남깁니다.
+
+형식 (버전 1):
+- 헤더: 버전(u8), 구간 수(u32), 기준 시각(i64, 첫 구간 시작 epoch ms), 문자열 표 길이(u16), 문자열 표(UTF-8, 줄바꿈 구분)
+- 구간: 시작 시각 = 이전 구간 종료 시각 + 간격(ms), 종료 시각 = 시작 시각 + 길이(ms) (델타 인코딩)
+  거리/시간/속도는 0.01 단위 정수, status/reason은 문자열 표 인덱스 (NO_CODE = 없음)
+
+소수 2자리 이하 숫자와 ms 단위 UTC 시각(앱이 보내는 값)만 인코딩하므로 저장한 값은 그대로 복원됩니다.
+형식에 맞지 않는 구간 목록(알 수 없는 키, 다른 시각 형식, 소수 3자리 이상 값 등)은 JSON 그대로 저장합니다.
+"""
+
+import struct
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CODEC_VERSION = 1
+
+# 문자열 표 인덱스 없음 (reason이 없는 구간)
+NO_CODE = 0xFF
+
+# 구간 dict 키 → 저장 필드 (0.01 단위 정수)
+_SCALED_FIELDS = (
+    ("distance", "distance_m"),
+    ("duration", "duration_seconds"),
+    ("speed", "avg_speed_ms"),
+)
+_REQUIRED_KEYS = {"start_time", "end_time", "status"} | {key for _, key in _SCALED_FIELDS}
+_OPTIONAL_KEYS = {"reason"}
+
+_HEADER = struct.Struct("<BIqH")
+
+SEGMENT_DTYPE = np.dtype([
+    ("gap_ms", "<i4"),
+    ("span_ms", "<i4"),
+    ("distance", "<i4"),
+    ("duration", "<i4"),
+    ("speed", "<i4"),
+    ("status", "u1"),
+    ("reason", "u1"),
+])
+
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def _parse_time_ms(value) -> Optional[int]:
+    """'2025-12-03T16:22:01.771Z' → epoch ms (같은 문자열로 복원되지 않으면 None)"""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return None
+    ms = round(parsed.timestamp() * 1000)
+    return ms if _format_time_ms(ms) == value else None
+
+
+def _format_time_ms(ms: int) -> str:
+    """epoch ms → 앱과 같은 형식 (JavaScript Date.toISOString)"""
+    moment = datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{ms % 1000:03d}Z"
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def encode_segments(segments: Sequence[Dict]) -> Optional[bytes]:
+    """
+    구간 목록 → 바이너리 (형식에 맞지 않으면 None)
+    """
+    if not isinstance(segments, list) or not segments:
+        return None
+
+    strings: List[str] = []
+    starts, ends = [], []
+    for seg in segments:
+        if not isinstance(seg, dict):
+            return None
+        keys = set(seg)
+        if not _REQUIRED_KEYS <= keys or not keys <= _REQUIRED_KEYS | _OPTIONAL_KEYS:
+            return None
+        if not all(_is_number(seg[key]) for _, key in _SCALED_FIELDS):
+            return None
+        for key in ("status", "reason"):
+            text_value = seg.get(key)
+            if key in seg and (not isinstance(text_value, str) or "\n" in text_value):
+                return None
+            if text_value is not None and text_value not in strings:
+                strings.append(text_value)
+        start_ms, end_ms = _parse_time_ms(seg["start_time"]), _parse_time_ms(seg["end_time"])
+        if start_ms is None or end_ms is None:
+            return None
+        starts.append(start_ms)
+        ends.append(end_ms)
+    if len(strings) >= NO_CODE:
+        return None
+
+    starts_ms = np.array(starts, dtype=np.int64)
+    ends_ms = np.array(ends, dtype=np.int64)
+    gap_ms = np.zeros_like(starts_ms)
+    gap_ms[1:] = starts_ms[1:] - ends_ms[:-1]
+    span_ms = ends_ms - starts_ms
+    values = {name: np.array([float(seg[key]) for seg in segments]) for name, key in _SCALED_FIELDS}
+    scaled = {name: np.round(v * 100) for name, v in values.items()}
+    # 0.01 단위로 나타낼 수 없는 값은 반올림하지 않고 JSON으로 저장
+    if any(not np.array_equal(scaled[name] / 100, v) for name, v in values.items()):
+        return None
+    if max(
+        np.abs(gap_ms).max(), np.abs(span_ms).max(), *(np.abs(v).max() for v in scaled.values())
+    ) > _INT32_MAX:
+        return None
+
+    packed = np.zeros(len(segments), dtype=SEGMENT_DTYPE)
+    packed["gap_ms"] = gap_ms
+    packed["span_ms"] = span_ms
+    for name, values in scaled.items():
+        packed[name] = values
+    packed["status"] = [strings.index(seg["status"]) for seg in segments]
+    packed["reason"] = [
+        strings.index(seg["reason"]) if seg.get("reason") is not None else NO_CODE for seg in segments
+    ]
+
+    string_table = "\n".join(strings).encode("utf-8")
+    header = _HEADER.pack(CODEC_VERSION, len(segments), int(starts_ms[0]), len(string_table))
+    return header + string_table + packed.tobytes()
+
+
+def decode_segments(data: bytes) -> List[Dict]:
+    """바이너리 → 구간 목록 (앱이 보낸 JSON과 같은 dict)"""
+    data = bytes(data)
+    version, count, base_ms, table_size = _HEADER.unpack_from(data)
+    if version != CODEC_VERSION:
+        raise ValueError(f"지원하지 않는 movement_segments 버전입니다: {version}")
+    offset = _HEADER.size
+    table = data[offset:offset + table_size].decode("utf-8")
+    # status는 항상 있으므로 표는 비어 있지 않음 (길이 0이면 빈 문자열 하나: [""])
+    strings = table.split("\n")
+    packed = np.frombuffer(data, dtype=SEGMENT_DTYPE, count=count, offset=offset + table_size)
+
+    # 시작/종료 시각 복원: 종료 = 시작 + 길이, 다음 시작 = 이전 종료 + 간격
+    gap_ms = packed["gap_ms"].astype(np.int64)
+    span_ms = packed["span_ms"].astype(np.int64)
+    ends_ms = base_ms + np.cumsum(gap_ms + span_ms)
+    starts_ms = ends_ms - span_ms
+
+    # 0.01 단위 정수 → 숫자 (정수 값은 int로, JavaScript JSON과 같은 표현)
+    columns = {}
+    for name, key in _SCALED_FIELDS:
+        values = packed[name].tolist()
+        columns[key] = [v // 100 if v % 100 == 0 else v / 100 for v in values]
+
+    segments = []
+    for i, (start_ms, end_ms, status, reason) in enumerate(zip(
+        starts_ms.tolist(), ends_ms.tolist(), packed["status"].tolist(), packed["reason"].tolist()
+    )):
+        seg = {
+            "start_time": _format_time_ms(start_ms),
+            "end_time": _format_time_ms(end_ms),
+            "status": strings[status],
+        }
+        for _, key in _SCALED_FIELDS:
+            seg[key] = columns[key][i]
+        if reason != NO_CODE:
+            seg["reason"] = strings[reason]
+        segments.append(seg)
+    return segments
+
+
+def split_movement_data(movement_data: Optional[Dict]) -> Tuple[Optional[Dict], Optional[bytes]]:
+    """
+    movement_data → (JSON으로 남길 값, 구간 바이너리)
+
+    구간 목록을 인코딩할 수 없으면 (movement_data, None) - 그대로 JSON 저장
+    """
+    if not isinstance(movement_data, dict):
+        return movement_data, None
+    encoded = encode_segments(movement_data.get("segments"))
+    if encoded is None:
+        return movement_data, None
+    remaining = {key: value for key, value in movement_data.items() if key != "segments"}
+    return remaining, encoded
+
+
+def merge_movement_data(remaining: Optional[Dict], segments_data: Optional[bytes]) -> Optional[Dict]:
+    """JSON으로 남긴 값 + 구간 바이너리 → 원래 movement_data"""
+    if segments_data is None:
+        return remaining
+    return {"segments": decode_segments(segments_data), **(remaining or {})}
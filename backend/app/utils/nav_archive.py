@@ -0,0 +1,441 @@
+"""
+네비게이션 로그 컬럼형 분석 아카이브
+
+분석 노트북/오프라인 모델 튜닝에서 Postgres나 JSON API를 거치지 않고
+정확도, 계수, 실측 속도를 빠르게 읽기 위한 append-only 아카이브입니다.
+
+구조 (NAV_ARCHIVE_DIR, 기본: backend/data/nav_archive):
+    _manifest.json                 # 동기화 시점(created_at), 문자열 사전, 파티션별 통계
+    2025-11/part-000001.npz        # started_at 월 단위 파티션
+    2025-12/part-000002.npz
+
+- 숫자 컬럼은 float64 배열 (NULL → NaN), ID는 int64, 시간은 datetime64[s]
+- route_mode는 사전 인코딩 (uint8 코드 + manifest의 사전)
+- 파티션마다 시간/사용자/route_mode 범위를 manifest에 기록해 scan 시 불필요한 파일은 읽지 않음
+- append-only: 이미 아카이브된 log_id는 건너뜀 (원본 삭제/수정은 반영하지 않음)
+- 증분 동기화는 log_id가 아니라 저장 시각(created_at) 기준:
+  log_id는 INSERT 순서로 발급되지만 commit 순서는 다를 수 있어, 큰 log_id 이후만 읽으면
+  늦게 commit된 작은 log_id를 영영 놓칩니다. 그래서 지금보다 NAV_ARCHIVE_SAFETY_LAG_SECONDS
+  (기본 300초) 이전에 저장된 로그만 읽고, 다음 동기화는 그 시점부터 이어 읽습니다
+  (트랜잭션이 이 시간 안에 끝난다고 가정).
+
+사용 예:
+    archive = NavigationArchive()
+    data = archive.scan(user_ids=[3], start=datetime(2025, 11, 1),
+                        columns=["accuracy_percent", "real_walking_speed_kmh"])
+    df = archive.to_dataframe(route_modes=["walking"])
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+DEFAULT_ARCHIVE_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "nav_archive"
+MANIFEST_NAME = "_manifest.json"
+ARCHIVE_VERSION = 1
+
+# 동기화 시 최근 이 시간 안에 저장된 로그는 제외 (아직 commit되지 않은 트랜잭션 대비)
+DEFAULT_SAFETY_LAG_SECONDS = 300
+
+# 정수 ID 컬럼
+ID_COLUMNS = ["log_id", "user_id"]
+# 시간 컬럼 (datetime64[s])
+TIME_COLUMNS = ["started_at", "ended_at"]
+# 숫자 컬럼 (float64, NULL → NaN)
+NUMERIC_COLUMNS = [
+    "total_distance_m",
+    "walking_distance_m",
+    "crosswalk_count",
+    "user_speed_factor",
+    "slope_factor",
+    "weather_factor",
+    "estimated_time_seconds",
+    "actual_time_seconds",
+    "time_difference_seconds",
+    "accuracy_percent",
+    "estimated_walk_time_seconds",
+    "walk_time_difference_seconds",
+    "walk_accuracy_percent",
+    "active_walking_time_seconds",
+    "paused_time_seconds",
+    "real_walking_speed_kmh",
+    "pause_count",
+]
+# 사전 인코딩 문자열 컬럼
+DICT_COLUMNS = ["route_mode"]
+
+ARCHIVE_COLUMNS = ID_COLUMNS + TIME_COLUMNS + NUMERIC_COLUMNS + DICT_COLUMNS
+
+
+def _to_naive_datetime(value) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    # DB(timestamp without time zone)와 같은 벽시계 시간으로 저장
+    return value.replace(tzinfo=None) if value.tzinfo else value
+
+
+def _to_float(value) -> float:
+    if value is None:
+        return np.nan
+    if isinstance(value, Decimal):
+        return float(value)
+    return float(value)
+
+
+class NavigationArchive:
+    """navigation_logs 컬럼형 아카이브 (npz 파티션 + manifest)"""
+
+    def __init__(self, root: Optional[str] = None, safety_lag_seconds: Optional[float] = None):
+        self.root = Path(root or os.getenv("NAV_ARCHIVE_DIR") or DEFAULT_ARCHIVE_DIR)
+        if safety_lag_seconds is None:
+            safety_lag_seconds = float(
+                os.getenv("NAV_ARCHIVE_SAFETY_LAG_SECONDS", DEFAULT_SAFETY_LAG_SECONDS)
+            )
+        self.safety_lag = timedelta(seconds=max(0.0, safety_lag_seconds))
+        self.manifest = self._load_manifest()
+
+    # ---------------- manifest ----------------
+    def _load_manifest(self) -> Dict:
+        path = self.root / MANIFEST_NAME
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        return {
+            "version": ARCHIVE_VERSION,
+            "watermark_log_id": 0,
+            "synced_until": None,
+            "next_part_id": 1,
+            "dictionaries": {c: [] for c in DICT_COLUMNS},
+            "parts": [],
+        }
+
+    def _save_manifest(self) -> None:
+        # 임시 파일에 쓴 후 교체 (중간에 실패해도 이전 manifest 유지)
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / MANIFEST_NAME
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    @property
+    def watermark(self) -> int:
+        """아카이브에 포함된 가장 큰 log_id (정보용 - 그보다 작은 log_id도 나중에 추가될 수 있음)"""
+        return int(self.manifest["watermark_log_id"])
+
+    @property
+    def synced_until(self) -> Optional[datetime]:
+        """이 시각 이전에 저장된(created_at) 로그는 모두 아카이브됨 (None: 시각 기준 동기화 전)"""
+        value = self.manifest.get("synced_until")
+        return datetime.fromisoformat(value) if value else None
+
+    @property
+    def row_count(self) -> int:
+        return sum(part["rows"] for part in self.manifest["parts"])
+
+    def _encode(self, column: str, values: List[Optional[str]]) -> np.ndarray:
+        """문자열 → 사전 코드 (처음 보는 값은 사전 끝에 추가)"""
+        dictionary = self.manifest["dictionaries"].setdefault(column, [])
+        index = {v: i for i, v in enumerate(dictionary)}
+        codes = np.empty(len(values), dtype=np.uint8)
+        for i, value in enumerate(values):
+            value = value or ""
+            if value not in index:
+                if len(dictionary) >= 255:
+                    raise ValueError(f"{column} 사전 크기 초과 (최대 255)")
+                index[value] = len(dictionary)
+                dictionary.append(value)
+            codes[i] = index[value]
+        return codes
+
+    # ---------------- 쓰기 ----------------
+    def append(self, rows: Iterable[Dict]) -> int:
+        """
+        로그 행(dict)들을 아카이브에 추가
+
+        이미 아카이브된 log_id(또는 rows 안에서 반복된 log_id)는 무시하고,
+        started_at 월별로 새 파티션 파일을 만듭니다.
+        manifest는 모든 파일을 쓴 뒤 마지막에 갱신합니다.
+
+        Returns:
+            추가된 행 수
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        log_ids = [int(row["log_id"]) for row in rows]
+        seen = self._archived_log_ids(min(log_ids), max(log_ids))
+
+        by_month: Dict[str, List[Dict]] = {}
+        for log_id, row in zip(log_ids, rows):
+            if log_id in seen:
+                continue
+            seen.add(log_id)
+            started_at = _to_naive_datetime(row["started_at"])
+            by_month.setdefault(started_at.strftime("%Y-%m"), []).append(row)
+
+        if not by_month:
+            return 0
+
+        added = 0
+        max_log_id = self.watermark
+        for month, month_rows in sorted(by_month.items()):
+            arrays = self._build_arrays(month_rows)
+            # 사용자/시간순 정렬 (사용자 필터 시 연속 구간으로 읽힘)
+            order = np.lexsort((arrays["started_at"], arrays["user_id"]))
+            arrays = {k: v[order] for k, v in arrays.items()}
+
+            part_id = self.manifest["next_part_id"]
+            relative_path = f"{month}/part-{part_id:06d}.npz"
+            path = self.root / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(path, **arrays)
+
+            self.manifest["parts"].append(self._part_stats(relative_path, month, arrays))
+            self.manifest["next_part_id"] = part_id + 1
+            added += len(month_rows)
+            max_log_id = max(max_log_id, int(arrays["log_id"].max()))
+
+        self.manifest["watermark_log_id"] = max_log_id
+        self._save_manifest()
+        return added
+
+    def _archived_log_ids(self, min_log_id: int, max_log_id: int) -> set:
+        """[min_log_id, max_log_id] 범위에서 이미 아카이브된 log_id (범위가 겹치는 파티션의 log_id만 로드)"""
+        archived = set()
+        for part in self.manifest["parts"]:
+            if part["max_log_id"] < min_log_id or part["min_log_id"] > max_log_id:
+                continue
+            log_ids = self._load_part(part, ["log_id"])["log_id"]
+            archived.update(int(i) for i in log_ids[(log_ids >= min_log_id) & (log_ids <= max_log_id)])
+        return archived
+
+    def _build_arrays(self, rows: List[Dict]) -> Dict[str, np.ndarray]:
+        arrays = {
+            "log_id": np.array([int(r["log_id"]) for r in rows], dtype=np.int64),
+            "user_id": np.array([int(r["user_id"]) for r in rows], dtype=np.int64),
+        }
+        for column in TIME_COLUMNS:
+            arrays[column] = np.array(
+                [_to_naive_datetime(r.get(column)) or np.datetime64("NaT") for r in rows],
+                dtype="datetime64[s]",
+            )
+        for column in NUMERIC_COLUMNS:
+            arrays[column] = np.array([_to_float(r.get(column)) for r in rows], dtype=np.float64)
+        for column in DICT_COLUMNS:
+            arrays[column] = self._encode(column, [r.get(column) for r in rows])
+        return arrays
+
+    @staticmethod
+    def _part_stats(relative_path: str, month: str, arrays: Dict[str, np.ndarray]) -> Dict:
+        """파티션 프루닝용 통계"""
+        return {
+            "path": relative_path,
+            "month": month,
+            "rows": int(len(arrays["log_id"])),
+            "min_log_id": int(arrays["log_id"].min()),
+            "max_log_id": int(arrays["log_id"].max()),
+            "started_min": str(arrays["started_at"].min()),
+            "started_max": str(arrays["started_at"].max()),
+            "user_ids": sorted(int(u) for u in np.unique(arrays["user_id"])),
+            "route_mode_codes": sorted(int(c) for c in np.unique(arrays["route_mode"])),
+        }
+
+    def sync_from_db(self, db, batch_size: int = 5000) -> int:
+        """
+        DB에서 지난 동기화 이후 저장된 로그를 읽어 아카이브에 추가
+
+        created_at이 [synced_until, DB 현재 시각 - safety_lag) 범위인 로그만 읽습니다.
+        안전 지연보다 오래 걸린 트랜잭션이 없다면 이 범위의 로그는 모두 commit된 상태이므로,
+        commit 순서가 log_id 순서와 달라도 빠지는 로그가 없습니다.
+        (synced_until이 없는 이전 manifest는 한 번만 워터마크 log_id 이후를 읽어 이어 붙임)
+
+        batch_size행씩 나눠 추가하므로 메모리 사용량이 일정합니다.
+        중간에 실패하면 synced_until을 갱신하지 않으며, 다시 실행하면 이미 추가된 log_id는 건너뜁니다.
+        """
+        from sqlalchemy import func
+
+        from app.utils.navigation_export import iter_navigation_logs
+
+        # 저장 시각과 같은 기준(DB 시계)으로 비교
+        cutoff = _to_naive_datetime(db.query(func.current_timestamp()).scalar()) - self.safety_lag
+        synced_until = self.synced_until
+        if synced_until is not None and cutoff <= synced_until:
+            return 0
+        if synced_until is None:
+            filters = {"after_log_id": self.watermark}
+        else:
+            filters = {"created_after": synced_until}
+
+        total = 0
+        batch: List[Dict] = []
+        for row in iter_navigation_logs(
+            db, list(ARCHIVE_COLUMNS), created_before=cutoff, chunk_size=batch_size, **filters
+        ):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                total += self.append(batch)
+                batch = []
+        if batch:
+            total += self.append(batch)
+
+        self.manifest["synced_until"] = cutoff.isoformat()
+        self._save_manifest()
+        return total
+
+    def compact(self) -> int:
+        """
+        월 파티션마다 여러 part 파일을 하나로 합침 (주기 작업 누적 파일 정리)
+
+        Returns:
+            합쳐진(제거된) 파일 수
+        """
+        removed = 0
+        parts_by_month: Dict[str, List[Dict]] = {}
+        for part in self.manifest["parts"]:
+            parts_by_month.setdefault(part["month"], []).append(part)
+
+        new_parts = []
+        for month, parts in sorted(parts_by_month.items()):
+            if len(parts) == 1:
+                new_parts.append(parts[0])
+                continue
+
+            loaded = [self._load_part(p) for p in parts]
+            arrays = {k: np.concatenate([a[k] for a in loaded]) for k in loaded[0]}
+            order = np.lexsort((arrays["started_at"], arrays["user_id"]))
+            arrays = {k: v[order] for k, v in arrays.items()}
+
+            part_id = self.manifest["next_part_id"]
+            relative_path = f"{month}/part-{part_id:06d}.npz"
+            np.savez(self.root / relative_path, **arrays)
+            self.manifest["next_part_id"] = part_id + 1
+            new_parts.append(self._part_stats(relative_path, month, arrays))
+            removed += len(parts)
+
+        old_paths = {p["path"] for p in self.manifest["parts"]} - {p["path"] for p in new_parts}
+        self.manifest["parts"] = new_parts
+        self._save_manifest()
+        # manifest 교체 후 이전 파일 삭제
+        for relative_path in old_paths:
+            (self.root / relative_path).unlink(missing_ok=True)
+        return removed
+
+    # ---------------- 읽기 ----------------
+    def _load_part(self, part: Dict, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        with np.load(self.root / part["path"]) as data:
+            names = columns or list(data.files)
+            return {name: data[name] for name in names}
+
+    def _part_may_match(
+        self,
+        part: Dict,
+        user_ids: Optional[set],
+        start: Optional[np.datetime64],
+        end: Optional[np.datetime64],
+        route_codes: Optional[set],
+    ) -> bool:
+        if user_ids is not None and not user_ids.intersection(part["user_ids"]):
+            return False
+        if start is not None and np.datetime64(part["started_max"]) < start:
+            return False
+        if end is not None and np.datetime64(part["started_min"]) > end:
+            return False
+        if route_codes is not None and not route_codes.intersection(part["route_mode_codes"]):
+            return False
+        return True
+
+    def scan(
+        self,
+        user_ids: Optional[Iterable[int]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        route_modes: Optional[Iterable[str]] = None,
+        columns: Optional[List[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        조건에 맞는 행을 컬럼별 배열로 반환
+
+        Args:
+            user_ids: 사용자 ID 목록 (None이면 전체)
+            start / end: started_at 범위 (양 끝 포함)
+            route_modes: 경로 모드 목록 (walking/transit)
+            columns: 반환할 컬럼 (None이면 전체). route_mode는 문자열 배열로 복원
+
+        Returns:
+            {컬럼명: numpy 배열}
+        """
+        columns = list(columns or ARCHIVE_COLUMNS)
+        unknown = [c for c in columns if c not in ARCHIVE_COLUMNS]
+        if unknown:
+            raise ValueError(f"존재하지 않는 컬럼입니다: {', '.join(unknown)}")
+
+        user_set = {int(u) for u in user_ids} if user_ids is not None else None
+        start64 = np.datetime64(_to_naive_datetime(start), "s") if start else None
+        end64 = np.datetime64(_to_naive_datetime(end), "s") if end else None
+
+        dictionary = self.manifest["dictionaries"].get("route_mode", [])
+        route_codes = None
+        if route_modes is not None:
+            route_codes = {dictionary.index(m) for m in route_modes if m in dictionary}
+
+        # 필터에 필요한 컬럼도 함께 로드
+        filter_columns = ["user_id", "started_at", "route_mode"]
+        load_columns = list(dict.fromkeys(columns + filter_columns))
+
+        chunks: Dict[str, List[np.ndarray]] = {c: [] for c in columns}
+        for part in self.manifest["parts"]:
+            if not self._part_may_match(part, user_set, start64, end64, route_codes):
+                continue
+            data = self._load_part(part, load_columns)
+
+            mask = np.ones(len(data["user_id"]), dtype=bool)
+            if user_set is not None:
+                mask &= np.isin(data["user_id"], list(user_set))
+            if start64 is not None:
+                mask &= data["started_at"] >= start64
+            if end64 is not None:
+                mask &= data["started_at"] <= end64
+            if route_codes is not None:
+                mask &= np.isin(data["route_mode"], list(route_codes))
+
+            if mask.any():
+                for c in columns:
+                    chunks[c].append(data[c][mask])
+
+        result = {}
+        for c in columns:
+            if chunks[c]:
+                result[c] = np.concatenate(chunks[c])
+            else:
+                result[c] = np.array([], dtype=self._empty_dtype(c))
+
+        # 사전 인코딩 컬럼 복원
+        for c in DICT_COLUMNS:
+            if c in result:
+                values = np.array(self.manifest["dictionaries"].get(c, []) or [""], dtype=object)
+                result[c] = values[result[c].astype(np.intp)] if len(result[c]) else np.array([], dtype=object)
+        return result
+
+    @staticmethod
+    def _empty_dtype(column: str):
+        if column in ID_COLUMNS:
+            return np.int64
+        if column in TIME_COLUMNS:
+            return "datetime64[s]"
+        if column in DICT_COLUMNS:
+            return np.uint8
+        return np.float64
+
+    def to_dataframe(self, **scan_kwargs):
+        """scan 결과를 pandas DataFrame으로 반환 (분석 노트북용)"""
+        import pandas as pd
+
+        return pd.DataFrame(self.scan(**scan_kwargs))
@@ -0,0 +1,221 @@
+"""
+네비게이션 로그 내보내기 (NDJSON / CSV 스트리밍)
+
+전체 로그를 메모리에 올리지 않고 서버 측 커서(stream_results)로
+chunk_size개씩 읽어 바로 직렬화합니다. 로그 수와 무관하게 메모리 사용량이 일정합니다.
+
+- API: GET /api/navigation/logs/export
+- CLI: python scripts/export_navigation_logs.py
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import NavigationLogs, RouteItineraries
+from app.utils.movement_codec import merge_movement_data
+from app.utils.route_itinerary import merge_route_data
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+# 저장 방식 내부 컬럼 (route_data/movement_data는 분리 저장한 값과 합쳐서 내보냄)
+_INTERNAL_COLUMNS = {"route_itinerary_hash", "movement_segments"}
+
+# 내보낼 수 있는 전체 컬럼 (테이블 정의 순서)
+EXPORT_COLUMNS: List[str] = [
+    column.name for column in NavigationLogs.__table__.columns if column.name not in _INTERNAL_COLUMNS
+]
+
+# JSON 값을 가지는 컬럼 (CSV에서는 JSON 문자열로 기록)
+JSON_COLUMNS = {"transport_modes", "movement_data", "route_data"}
+
+# CSV 기본 컬럼: 대용량 JSON(movement_data, route_data) 제외
+DEFAULT_CSV_COLUMNS: List[str] = [
+    c for c in EXPORT_COLUMNS if c not in ("movement_data", "route_data")
+]
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def resolve_columns(columns: Optional[Iterable[str]], fmt: str) -> List[str]:
+    """
+    내보낼 컬럼 목록 결정
+
+    Args:
+        columns: 요청한 컬럼 (None/빈 값이면 형식별 기본값)
+        fmt: "ndjson" 또는 "csv"
+
+    Raises:
+        ValueError: 지원하지 않는 형식이나 존재하지 않는 컬럼
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt} (가능: {', '.join(EXPORT_FORMATS)})")
+
+    requested = [c.strip() for c in (columns or []) if c and c.strip()]
+    if not requested:
+        return list(EXPORT_COLUMNS) if fmt == "ndjson" else list(DEFAULT_CSV_COLUMNS)
+
+    unknown = [c for c in requested if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"존재하지 않는 컬럼입니다: {', '.join(unknown)}")
+    return requested
+
+
+def iter_navigation_logs(
+    db: Session,
+    columns: List[str],
+    user_id: Optional[int] = None,
+    route_mode: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    after_log_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Dict]:
+    """
+    조건에 맞는 로그를 log_id 순으로 한 행씩 반환 (선택한 컬럼만 조회)
+
+    stream_results + yield_per로 서버 측 커서에서 chunk_size개씩 가져옵니다.
+    after_log_id를 주면 그보다 큰 log_id만 반환합니다.
+    created_after(포함) / created_before(제외)는 저장 시각(created_at) 범위입니다 (증분 아카이브용).
+    route_data는 route_itineraries를 함께 조인하여 원래 값으로 합칩니다.
+    movement_data는 movement_segments(구간 바이너리)를 함께 읽어 디코딩합니다.
+    """
+    table = NavigationLogs.__table__
+    stmt = select(*[table.c[c] for c in columns]).order_by(table.c.log_id)
+    hydrate = "route_data" in columns
+    if hydrate:
+        itineraries = RouteItineraries.__table__
+        stmt = stmt.add_columns(itineraries.c.itinerary.label("_itinerary")).outerjoin(
+            itineraries, itineraries.c.itinerary_hash == table.c.route_itinerary_hash
+        )
+    decode_movement = "movement_data" in columns
+    if decode_movement:
+        stmt = stmt.add_columns(table.c.movement_segments.label("_movement_segments"))
+
+    if user_id is not None:
+        stmt = stmt.where(table.c.user_id == user_id)
+    if route_mode:
+        stmt = stmt.where(table.c.route_mode == route_mode)
+    if start_date:
+        stmt = stmt.where(table.c.started_at >= start_date)
+    if end_date:
+        stmt = stmt.where(table.c.started_at <= end_date)
+    if after_log_id is not None:
+        stmt = stmt.where(table.c.log_id > after_log_id)
+    if created_after is not None:
+        stmt = stmt.where(table.c.created_at >= created_after)
+    if created_before is not None:
+        stmt = stmt.where(table.c.created_at < created_before)
+
+    result = db.execute(
+        stmt.execution_options(stream_results=True, yield_per=chunk_size)
+    )
+    try:
+        for row in result:
+            values = dict(row._mapping)
+            if hydrate:
+                values["route_data"] = merge_route_data(values["route_data"], values.pop("_itinerary"))
+            if decode_movement:
+                values["movement_data"] = merge_movement_data(
+                    values["movement_data"], values.pop("_movement_segments")
+                )
+            yield values
+    finally:
+        result.close()
+
+
+def _to_json_value(value):
+    """JSON 직렬화 가능한 값으로 변환"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _to_csv_value(column: str, value):
+    """CSV 셀 값으로 변환 (JSON 컬럼은 JSON 문자열)"""
+    if value is None:
+        return ""
+    if column in JSON_COLUMNS:
+        return json.dumps(value, ensure_ascii=False)
+    return _to_json_value(value)
+
+
+def iter_ndjson(rows: Iterable[Dict], batch_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """행을 NDJSON 문자열로 변환 (batch_size행씩 묶어서 반환)"""
+    batch = []
+    for row in rows:
+        batch.append(
+            json.dumps({k: _to_json_value(v) for k, v in row.items()}, ensure_ascii=False)
+        )
+        if len(batch) >= batch_size:
+            yield "\n".join(batch) + "\n"
+            batch = []
+    if batch:
+        yield "\n".join(batch) + "\n"
+
+
+def iter_csv(
+    rows: Iterable[Dict], columns: List[str], batch_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """행을 CSV 문자열로 변환 (헤더 포함, batch_size행씩 묶어서 반환)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    count = 0
+    for row in rows:
+        writer.writerow([_to_csv_value(c, row.get(c)) for c in columns])
+        count += 1
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    remaining = buffer.getvalue()
+    if remaining:
+        yield remaining
+
+
+def iter_export(
+    db: Session,
+    fmt: str,
+    columns: List[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **filters,
+) -> Iterator[str]:
+    """지정한 형식으로 직렬화된 내보내기 스트림"""
+    rows = iter_navigation_logs(db, columns, chunk_size=chunk_size, **filters)
+    if fmt == "csv":
+        return iter_csv(rows, columns, batch_size=chunk_size)
+    return iter_ndjson(rows, batch_size=chunk_size)
+
+
+def stream_export(
+    fmt: str,
+    columns: List[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **filters,
+) -> Iterator[str]:
+    """
+    API 응답용 내보내기 스트림 (자체 DB 세션 사용)
+
+    get_db 세션은 응답 본문을 보내기 전에 닫히므로,
+    StreamingResponse에서는 스트림이 끝날 때까지 유지되는 별도 세션을 엽니다.
+    """
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        yield from iter_export(db, fmt, columns, chunk_size=chunk_size, **filters)
+    finally:
+        db.close()
@@ -0,0 +1,131 @@
+"""
+경로 좌표 단순화 + Encoded Polyline
+
+GPX 경로의 route_coordinates는 트랙 포인트 전체(수천 개)라 썸네일 지도에는 과합니다.
+- simplify_coordinates: Douglas-Peucker (허용 오차는 미터, 위도 기준 평면 근사)
+- simplify_indices: 평면 좌표(미터) Douglas-Peucker 공통 구현 (고도 샘플링에서도 사용)
+- encode_polyline / decode_polyline: Google Encoded Polyline Algorithm Format
+
+좌표는 모두 GeoJSON 순서 [경도, 위도]로 주고받습니다.
+"""
+
+import math
+from typing import List, Sequence
+
+import numpy as np
+
+# 해상도별 Douglas-Peucker 허용 오차 (미터) - full은 원본 그대로
+RESOLUTION_TOLERANCES_M = {
+    "high": 2.0,
+    "medium": 10.0,
+    "low": 30.0,
+}
+RESOLUTIONS = ("full",) + tuple(RESOLUTION_TOLERANCES_M)
+
+_METERS_PER_DEGREE = 111_320.0
+
+
+def _project(coords: np.ndarray) -> np.ndarray:
+    """[경도, 위도] → 평균 위도 기준 평면 좌표 (미터)"""
+    mean_lat = math.radians(float(np.mean(coords[:, 1])))
+    x = coords[:, 0] * _METERS_PER_DEGREE * math.cos(mean_lat)
+    y = coords[:, 1] * _METERS_PER_DEGREE
+    return np.column_stack((x, y))
+
+
+def _segment_distances(points: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """각 점에서 선분(start-end)까지 거리"""
+    direction = end - start
+    length_sq = float(direction @ direction)
+    if length_sq == 0.0:
+        return np.hypot(*(points - start).T)
+    t = np.clip(((points - start) @ direction) / length_sq, 0.0, 1.0)
+    nearest = start + t[:, None] * direction
+    return np.hypot(*(points - nearest).T)
+
+
+def simplify_coordinates(coordinates: Sequence[Sequence[float]], tolerance_m: float) -> List[List[float]]:
+    """
+    Douglas-Peucker 좌표 단순화
+
+    Args:
+        coordinates: [[경도, 위도], ...] (고도 등 3번째 값이 있으면 그대로 유지)
+        tolerance_m: 허용 오차 (미터) - 원래 선에서 이보다 가까운 점은 제거
+
+    Returns:
+        남은 좌표 목록 (시작/끝 점은 항상 유지)
+    """
+    if len(coordinates) <= 2 or tolerance_m <= 0:
+        return [list(c) for c in coordinates]
+
+    points = _project(np.asarray([c[:2] for c in coordinates], dtype=np.float64))
+    return [list(coordinates[i]) for i in simplify_indices(points, tolerance_m)]
+
+
+def simplify_indices(points: np.ndarray, tolerance_m: float) -> np.ndarray:
+    """
+    평면 좌표 Douglas-Peucker → 남길 점의 인덱스 (오름차순, 시작/끝 포함)
+
+    Args:
+        points: (N, 2) 평면 좌표 (미터)
+        tolerance_m: 허용 오차 (미터)
+    """
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+
+    # 재귀 대신 스택 (긴 경로에서 재귀 깊이 제한 회피)
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = _segment_distances(points[first + 1:last], points[first], points[last])
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance_m:
+            index = first + 1 + farthest
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return np.flatnonzero(keep)
+
+
+def encode_polyline(coordinates: Sequence[Sequence[float]], precision: int = 5) -> str:
+    """[[경도, 위도], ...] → Encoded Polyline 문자열 (위도, 경도 순으로 인코딩)"""
+    factor = 10 ** precision
+    result = []
+    previous_lat = previous_lng = 0
+    for coord in coordinates:
+        lat = int(round(coord[1] * factor))
+        lng = int(round(coord[0] * factor))
+        for delta in (lat - previous_lat, lng - previous_lng):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                result.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            result.append(chr(value + 63))
+        previous_lat, previous_lng = lat, lng
+    return "".join(result)
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> List[List[float]]:
+    """Encoded Polyline 문자열 → [[경도, 위도], ...]"""
+    factor = 10 ** precision
+    coordinates = []
+    index = lat = lng = 0
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            shift = value = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                value |= (byte & 0x1F) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(value >> 1) if value & 1 else value >> 1)
+        lat += deltas[0]
+        lng += deltas[1]
+        coordinates.append([lng / factor, lat / factor])
+    return coordinates
@@ -0,0 +1,63 @@
+"""
+인증 사용자(principal) 캐시
+
+get_current_user는 인증이 필요한 모든 요청에서 JWT를 검증한 뒤 Users를 조회합니다.
+토큰 subject(user_id) → 사용자 컬럼 값을 짧은 TTL 동안 보관하여 반복 조회를 생략합니다.
+
+- 저장소는 ttl_cache.TTLCache (키는 subject 문자열)
+- 사용자 정보가 바뀌는 곳(로그인 시간 갱신, 사용자 삭제)에서 invalidate()
+- 다른 워커 프로세스의 변경은 TTL 안에 반영되므로 TTL은 짧게 유지
+
+환경 변수:
+- AUTH_PRINCIPAL_CACHE_TTL: 항목 유효 시간 (초, 0이면 캐시 사용 안 함)
+- AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: 최대 항목 수
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from app.utils.ttl_cache import TTLCache
+
+# 캐시에 보관하는 Users 컬럼 (관계/비밀번호 해시 제외)
+PRINCIPAL_COLUMNS = ("user_id", "username", "email", "auth_provider", "created_at", "last_login")
+
+
+class PrincipalCache:
+    """토큰 subject → 사용자 컬럼 값"""
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 10000):
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    @classmethod
+    def from_env(cls) -> "PrincipalCache":
+        """환경 변수에서 설정을 읽어 생성"""
+        return cls(
+            ttl_seconds=float(os.getenv("AUTH_PRINCIPAL_CACHE_TTL", "60")),
+            max_entries=int(os.getenv("AUTH_PRINCIPAL_CACHE_MAX_ENTRIES", "10000")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._cache.enabled
+
+    def get(self, subject) -> Optional[Dict[str, Any]]:
+        """캐시된 사용자 컬럼 값 (없거나 만료되면 None)"""
+        return self._cache.get(str(subject))
+
+    def set(self, subject, user) -> None:
+        """Users 객체의 컬럼 값을 저장"""
+        if not self.enabled:
+            return
+        self._cache.set(str(subject), {column: getattr(user, column) for column in PRINCIPAL_COLUMNS})
+
+    def invalidate(self, subject) -> None:
+        self._cache.pop(str(subject))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, float]:
+        return self._cache.stats()
+
+
+principal_cache = PrincipalCache.from_env()
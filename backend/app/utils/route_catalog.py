@@ -0,0 +1,463 @@
+"""
+GPX 경로 카탈로그 (인메모리 컬럼형)
+
+경로 목록/추천 API는 요청마다 routes 전체를 조회하고 Python 루프로 거리 계산·필터링을 했습니다.
+경로 데이터(약 2.3천 개)는 거의 바뀌지 않으므로, 필요한 컬럼만 NumPy 배열로 메모리에 올려 두고
+필터링·반경 검색·사용자 속도 기반 시간 계산·정렬을 벡터 연산으로 처리합니다.
+(route_coordinates 전체 대신 시작/종료 좌표만 읽음)
+
+경사도 프로필:
+- route_segments(100m 단위)의 경사도를 1% 구간으로 묶은 경사도별 거리 히스토그램을 경로마다 보관
+- 사용자 속도/경사 민감도가 주어지면 히스토그램 × 구간별 Tobler 시간으로
+  전체 경로의 개인화 예상 시간을 행렬-벡터 곱 한 번으로 계산
+
+갱신:
+- 앱 시작 시 전체 로드
+- 이후 ROUTE_CATALOG_REFRESH_INTERVAL초마다 (개수, 최대 route_id, 최대 updated_at)만 확인하여
+  새 route_id는 추가, updated_at이 바뀐 행은 교체, 개수가 맞지 않으면(삭제) 전체 다시 로드
+- 같은 프로세스에서 경로를 추가/삭제하면(crud.create_route / delete_route, GPXLoader 적재)
+  invalidate()로 다음 조회 때 바로 확인. 다른 프로세스(scripts/bulk_load_gpx.py 등)의 변경은 위 주기로 반영
+- ROUTE_CATALOG_FULL_RELOAD초마다 전체 다시 로드 (updated_at을 갱신하지 않는 raw SQL 수정 대비)
+
+스냅샷은 갱신 시 새 객체로 통째로 교체하므로, 요청은 잠금 없이 읽습니다.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+
+# Tobler 평지 기준 속도 (km/h) - DB의 estimated_duration_minutes 기준
+TOBLER_FLAT_SPEED_KMH = 6.0 * math.exp(-3.5 * 0.05)
+
+# 경사도 히스토그램 구간 (1% 단위, ±GRADE_LIMIT_PERCENT 밖은 양 끝 구간으로 제한)
+GRADE_LIMIT_PERCENT = 40
+GRADE_BINS_PERCENT = np.arange(-GRADE_LIMIT_PERCENT, GRADE_LIMIT_PERCENT + 1, dtype=np.float64)
+
+# 카탈로그에 올리는 routes 컬럼 (route_coordinates는 시작/종료 좌표만)
+_BASE_COLUMNS = """
+    route_id, route_name, route_type, difficulty_level, distance_km,
+    estimated_duration_minutes, total_elevation_gain_m, total_elevation_loss_m,
+    avg_rating, rating_count, tags, created_at, updated_at
+"""
+
+
+def _parse_point(value) -> Optional[tuple]:
+    """GeoJSON 좌표 [경도, 위도] → (위도, 경도)"""
+    if value is None:
+        return None
+    try:
+        if isinstance(value, str):
+            value = json.loads(value)
+        lng, lat = value[0], value[1]
+        return float(lat), float(lng)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _endpoints_from_coordinates(route_coordinates) -> tuple:
+    """route_coordinates 전체에서 (시작점, 종료점) 추출 (JSON 경로 조회가 안 되는 행용)"""
+    try:
+        if isinstance(route_coordinates, str):
+            route_coordinates = json.loads(route_coordinates)
+        coordinates = route_coordinates.get("coordinates", [])
+        if coordinates:
+            return _parse_point(coordinates[0]), _parse_point(coordinates[-1])
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return None, None
+
+
+def _to_float(value) -> float:
+    return float(value) if value is not None else np.nan
+
+
+def tobler_speed_factor(grade_percent) -> np.ndarray:
+    """경사도(%) → 평지 대비 Tobler 속도 비율 (평지 1.0)"""
+    slope = np.asarray(grade_percent, dtype=np.float64) / 100
+    return 6.0 * np.exp(-3.5 * np.abs(slope + 0.05)) / TOBLER_FLAT_SPEED_KMH
+
+
+def build_grade_histogram(grades: Sequence, distances_m: Sequence) -> np.ndarray:
+    """
+    세그먼트 경사도/거리 → 경사도 구간별 거리 합 (m)
+
+    경사도가 없는 세그먼트는 평지(0%)로 봅니다.
+    """
+    histogram = np.zeros(len(GRADE_BINS_PERCENT), dtype=np.float32)
+    if len(grades) == 0:
+        return histogram
+    grade = np.array([g if g is not None else 0.0 for g in grades], dtype=np.float64)
+    index = np.clip(np.round(grade), -GRADE_LIMIT_PERCENT, GRADE_LIMIT_PERCENT).astype(np.int64)
+    np.add.at(histogram, index + GRADE_LIMIT_PERCENT, np.asarray(distances_m, dtype=np.float64))
+    return histogram
+
+
+class RouteCatalogSnapshot:
+    """특정 시점의 카탈로그 (불변, route_id 오름차순)"""
+
+    def __init__(self, rows: Sequence[Dict]):
+        rows = sorted(rows, key=lambda r: r["route_id"])
+        n = len(rows)
+
+        self.route_id = np.array([r["route_id"] for r in rows], dtype=np.int64)
+        self.route_type = np.array([r["route_type"] or "" for r in rows], dtype=object)
+        self.difficulty = np.array([r["difficulty_level"] or "" for r in rows], dtype=object)
+        self.distance_km = np.array([_to_float(r["distance_km"]) for r in rows], dtype=np.float64)
+        self.duration_min = np.array(
+            [_to_float(r["estimated_duration_minutes"]) for r in rows], dtype=np.float64
+        )
+        self.elevation_gain = np.array(
+            [_to_float(r["total_elevation_gain_m"]) for r in rows], dtype=np.float64
+        )
+        self.elevation_loss = np.array(
+            [_to_float(r["total_elevation_loss_m"]) for r in rows], dtype=np.float64
+        )
+        self.avg_rating = np.array([_to_float(r["avg_rating"]) for r in rows], dtype=np.float64)
+        self.rating_count = np.array([r["rating_count"] or 0 for r in rows], dtype=np.int64)
+
+        start = [r["start"] or (np.nan, np.nan) for r in rows]
+        end = [r["end"] or r["start"] or (np.nan, np.nan) for r in rows]  # 종료점 없으면 시작점
+        self.start_lat = np.array([p[0] for p in start], dtype=np.float64).reshape(n)
+        self.start_lng = np.array([p[1] for p in start], dtype=np.float64).reshape(n)
+        self.end_lat = np.array([p[0] for p in end], dtype=np.float64).reshape(n)
+        self.end_lng = np.array([p[1] for p in end], dtype=np.float64).reshape(n)
+
+        self.created_at = np.array(
+            [np.datetime64(r["created_at"], "us") if r["created_at"] else np.datetime64("NaT") for r in rows],
+            dtype="datetime64[us]",
+        ).reshape(n)
+
+        # 경사도 구간별 거리 (m, 경로 × 구간), 세그먼트가 없는 경로는 0행
+        self.grade_distance_m = np.zeros((n, len(GRADE_BINS_PERCENT)), dtype=np.float32)
+        self.has_grade_profile = np.zeros(n, dtype=bool)
+        for i, r in enumerate(rows):
+            histogram = r.get("grade_histogram")
+            if histogram is not None and histogram.any():
+                self.grade_distance_m[i] = histogram
+                self.has_grade_profile[i] = True
+
+        # 응답을 만들 때만 쓰는 값 (반환하는 행만 접근)
+        self.route_name: List[str] = [r["route_name"] for r in rows]
+        self.tags: List = [r["tags"] for r in rows]
+
+        self.rows = {r["route_id"]: r for r in rows}  # 증분 갱신용 원본 행
+        self.updated_at: Optional[datetime] = max(
+            (r["updated_at"] for r in rows if r["updated_at"]), default=None
+        )
+
+        # 목록 기본 정렬 (created_at 최신순, NULL 먼저 - PostgreSQL DESC와 동일, 같으면 route_id 큰 순)
+        created = self.created_at.astype(np.int64)
+        created = np.where(np.isnat(self.created_at), np.iinfo(np.int64).max, created)
+        self.created_desc_order = np.lexsort((-self.route_id, -created)) if n else np.array([], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.route_id)
+
+    @property
+    def max_route_id(self) -> int:
+        return int(self.route_id[-1]) if len(self.route_id) else 0
+
+    def filter_mask(
+        self,
+        route_type: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        min_distance: Optional[float] = None,
+        max_distance: Optional[float] = None,
+    ) -> np.ndarray:
+        """목록/추천 공통 필터"""
+        mask = np.ones(len(self), dtype=bool)
+        if route_type:
+            mask &= self.route_type == route_type
+        if difficulty:
+            mask &= self.difficulty == difficulty
+        if min_distance is not None:
+            mask &= self.distance_km >= min_distance
+        if max_distance is not None:
+            mask &= self.distance_km <= max_distance
+        return mask
+
+    def distance_from(self, lat: float, lng: float) -> np.ndarray:
+        """사용자 위치 → 각 경로 시작점 거리 (km, Haversine, 시작점 없으면 NaN)"""
+        phi1 = math.radians(lat)
+        phi2 = np.radians(self.start_lat)
+        delta_phi = phi2 - phi1
+        delta_lambda = np.radians(self.start_lng - lng)
+        a = np.sin(delta_phi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(delta_lambda / 2) ** 2
+        return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    def list_indices(self, mask: np.ndarray, limit: int, offset: int) -> np.ndarray:
+        """필터된 행을 created_at 최신순으로 정렬 후 offset/limit 적용"""
+        order = self.created_desc_order[mask[self.created_desc_order]]
+        return order[offset: offset + limit]
+
+    def personalized_duration(
+        self, user_speed_kmh: float, slope_sensitivity: float = 1.0
+    ) -> np.ndarray:
+        """
+        사용자 평지 속도 + 경사 민감도 기준 전체 경로 예상 시간 (분)
+
+        구간 속도 = user_speed_kmh × (Tobler 속도 비율 ** slope_sensitivity)
+        - slope_sensitivity 1.0: Tobler 그대로, 1보다 크면 오르막/급경사에서 더 느려지는 사용자
+        - 0이면 경사 무시 (거리 / 평지 속도)
+
+        경사도 프로필이 없는 경로는 NaN (호출하는 쪽에서 대체 값 사용)
+        """
+        factor = tobler_speed_factor(GRADE_BINS_PERCENT) ** slope_sensitivity
+        minutes_per_m = 60.0 / (1000.0 * user_speed_kmh * factor)
+        duration = self.grade_distance_m.astype(np.float64) @ minutes_per_m
+        return np.where(self.has_grade_profile, duration, np.nan)
+
+    def recommend(
+        self,
+        user_lat: float,
+        user_lng: float,
+        distance_km: Optional[float] = None,
+        duration_minutes: Optional[int] = None,
+        difficulty: Optional[str] = None,
+        route_type: Optional[str] = None,
+        user_speed_kmh: Optional[float] = None,
+        max_distance_from_user: float = 10.0,
+        distance_tolerance: float = 1.0,
+        duration_tolerance: int = 15,
+        slope_sensitivity: float = 1.0,
+    ) -> Dict[str, np.ndarray]:
+        """
+        위치 기반 경로 추천 (벡터 연산)
+
+        1. 난이도/타입 필터 + 시작점 반경 필터
+        2. 목표 거리 또는 목표 시간 허용 오차 이내
+           (사용자 속도/경사 민감도가 있으면 경사도 프로필로 개인화한 시간 기준,
+            프로필이 없는 경로는 기존처럼 거리/속도)
+        3. 사용자 위치에서 가까운 순 → 목표와의 차이가 작은 순 정렬
+
+        Returns:
+            index(정렬된 행 위치), distance_from_user, estimated_duration (사용자 속도 반영, 분)
+        """
+        mask = self.filter_mask(route_type=route_type, difficulty=difficulty)
+
+        distance_from_user = self.distance_from(user_lat, user_lng)
+        with np.errstate(invalid="ignore"):
+            mask &= distance_from_user <= max_distance_from_user  # 시작점 없는 행(NaN)도 제외
+
+            match = np.zeros(len(self), dtype=bool)
+            if distance_km:
+                match |= np.abs(self.distance_km - distance_km) <= distance_tolerance
+            has_speed = bool(user_speed_kmh and user_speed_kmh > 0)
+            personalized = has_speed or slope_sensitivity != 1.0
+            speed = user_speed_kmh if has_speed else TOBLER_FLAT_SPEED_KMH
+
+            # 사용자 속도 반영 예상 시간
+            # 경사도 프로필이 있으면 구간별 Tobler 시간, 없으면 DB 값(Tobler 평지 속도 기준)에 속도 비율만 적용
+            if personalized:
+                profile_duration = self.personalized_duration(speed, slope_sensitivity)
+                estimated = np.where(
+                    self.has_grade_profile,
+                    np.trunc(profile_duration),
+                    np.trunc(self.duration_min / (speed / TOBLER_FLAT_SPEED_KMH)),
+                )
+            else:
+                estimated = self.duration_min
+
+            if duration_minutes:
+                if personalized:
+                    fallback = self.distance_km / speed * 60 if has_speed else self.duration_min
+                    user_duration = np.where(self.has_grade_profile, profile_duration, fallback)
+                    match |= np.abs(user_duration - duration_minutes) <= duration_tolerance
+                else:
+                    match |= np.abs(self.duration_min - duration_minutes) <= duration_tolerance
+            mask &= match
+
+            if distance_km:
+                target_diff = np.abs(self.distance_km - distance_km)
+            elif duration_minutes:
+                target_diff = np.abs(estimated - duration_minutes)
+            else:
+                target_diff = np.zeros(len(self))
+
+        index = np.flatnonzero(mask)
+        rounded_distance = np.round(distance_from_user[index], 2)
+        index = index[np.lexsort((target_diff[index], rounded_distance))]
+        return {
+            "index": index,
+            "distance_from_user": distance_from_user,
+            "estimated_duration": estimated,
+        }
+
+
+class RouteCatalog:
+    """routes 테이블 인메모리 카탈로그 (주기적 증분 갱신)"""
+
+    def __init__(self, refresh_interval: float = 60.0, full_reload_interval: float = 3600.0):
+        self.refresh_interval = refresh_interval
+        self.full_reload_interval = full_reload_interval
+        self._snapshot: Optional[RouteCatalogSnapshot] = None
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._last_full_load = 0.0
+
+    @classmethod
+    def from_env(cls) -> "RouteCatalog":
+        return cls(
+            refresh_interval=float(os.getenv("ROUTE_CATALOG_REFRESH_INTERVAL", "60")),
+            full_reload_interval=float(os.getenv("ROUTE_CATALOG_FULL_RELOAD", "3600")),
+        )
+
+    @property
+    def snapshot(self) -> Optional[RouteCatalogSnapshot]:
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        """다음 get()에서 바로 변경 확인 (같은 프로세스에서 routes를 수정한 경우)"""
+        self._last_check = 0.0
+
+    def get(self, db: Session) -> RouteCatalogSnapshot:
+        """최신 스냅샷 반환 (필요하면 갱신, 동기 - run_db 안에서 호출)"""
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and now - self._last_check < self.refresh_interval:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and now - self._last_check < self.refresh_interval:
+                return self._snapshot
+            if self._snapshot is None or now - self._last_full_load >= self.full_reload_interval:
+                self._snapshot = self._load_full(db)
+                self._last_full_load = now
+            else:
+                self._snapshot = self._refresh(db, self._snapshot)
+            self._last_check = now
+            return self._snapshot
+
+    # ---------- 로드 ----------
+    def _select_rows(self, db: Session, where: str = "", params: Optional[Dict] = None) -> List[Dict]:
+        """카탈로그 컬럼 + 시작/종료 좌표 조회"""
+        if db.get_bind().dialect.name == "postgresql":
+            endpoints = """,
+                route_coordinates->'coordinates'->0 AS start_coord,
+                route_coordinates->'coordinates'->-1 AS end_coord"""
+        else:
+            endpoints = """,
+                json_extract(route_coordinates, '$.coordinates[0]') AS start_coord,
+                json_extract(route_coordinates, '$.coordinates[#-1]') AS end_coord"""
+
+        result = db.execute(
+            text(f"SELECT {_BASE_COLUMNS}{endpoints} FROM routes {where}"), params or {}
+        )
+        rows = []
+        for r in result.mappings():
+            row = dict(r)
+            row["start"] = _parse_point(row.pop("start_coord"))
+            row["end"] = _parse_point(row.pop("end_coord"))
+            if isinstance(row["tags"], str):
+                try:
+                    row["tags"] = json.loads(row["tags"])
+                except ValueError:
+                    pass
+            rows.append(row)
+
+        histograms = self._select_grade_histograms(db, [row["route_id"] for row in rows] if where else None)
+        for row in rows:
+            row["grade_histogram"] = histograms.get(row["route_id"])
+
+        # route_coordinates가 JSON 문자열로 저장된 행 등은 전체 좌표에서 추출
+        missing = [row["route_id"] for row in rows if row["start"] is None]
+        if missing:
+            coords = db.execute(
+                text("SELECT route_id, route_coordinates FROM routes WHERE route_id IN :ids").bindparams(
+                    bindparam("ids", expanding=True)
+                ),
+                {"ids": missing},
+            )
+            endpoints_by_id = {r[0]: _endpoints_from_coordinates(r[1]) for r in coords}
+            for row in rows:
+                if row["route_id"] in endpoints_by_id:
+                    row["start"], row["end"] = endpoints_by_id[row["route_id"]]
+        return rows
+
+    def _select_grade_histograms(
+        self, db: Session, route_ids: Optional[List[int]] = None
+    ) -> Dict[int, np.ndarray]:
+        """route_segments → 경로별 경사도 히스토그램 (DB에서 1% 구간으로 먼저 집계)"""
+        if route_ids is not None and not route_ids:
+            return {}
+        sql = """
+            SELECT route_id, ROUND(segment_grade_percent) AS grade, SUM(segment_distance_m) AS distance_m
+            FROM route_segments
+            {where}
+            GROUP BY route_id, ROUND(segment_grade_percent)
+        """
+        if route_ids is None:
+            result = db.execute(text(sql.format(where="")))
+        else:
+            result = db.execute(
+                text(sql.format(where="WHERE route_id IN :ids")).bindparams(
+                    bindparam("ids", expanding=True)
+                ),
+                {"ids": route_ids},
+            )
+
+        grouped: Dict[int, tuple] = {}
+        for route_id, grade, distance_m in result:
+            grades, distances = grouped.setdefault(route_id, ([], []))
+            grades.append(float(grade) if grade is not None else None)
+            distances.append(float(distance_m or 0))
+        return {
+            route_id: build_grade_histogram(grades, distances)
+            for route_id, (grades, distances) in grouped.items()
+        }
+
+    def _load_full(self, db: Session) -> RouteCatalogSnapshot:
+        started = time.perf_counter()
+        snapshot = RouteCatalogSnapshot(self._select_rows(db))
+        logger.info(
+            f"[경로 카탈로그] 전체 로드 - {len(snapshot)}개 경로 ({(time.perf_counter() - started) * 1000:.0f}ms)"
+        )
+        return snapshot
+
+    def _refresh(self, db: Session, snapshot: RouteCatalogSnapshot) -> RouteCatalogSnapshot:
+        """워터마크 비교 후 바뀐 행만 반영"""
+        count, max_id, max_updated = db.execute(
+            text("SELECT COUNT(*), COALESCE(MAX(route_id), 0), MAX(updated_at) FROM routes")
+        ).one()
+
+        has_new = max_id > snapshot.max_route_id
+        has_updates = max_updated is not None and (
+            snapshot.updated_at is None or max_updated > snapshot.updated_at
+        )
+        if not has_new and not has_updates and count == len(snapshot):
+            return snapshot
+
+        conditions, params = [], {"max_id": snapshot.max_route_id}
+        if has_new:
+            conditions.append("route_id > :max_id")
+        if has_updates and snapshot.updated_at is not None:
+            conditions.append("(route_id <= :max_id AND updated_at > :since)")
+            params["since"] = snapshot.updated_at
+        if not conditions or (has_updates and snapshot.updated_at is None):
+            return self._load_full(db)
+
+        changed = self._select_rows(db, "WHERE " + " OR ".join(conditions), params)
+        rows = dict(snapshot.rows)
+        rows.update({row["route_id"]: row for row in changed})
+        if len(rows) != count:
+            # 삭제된 경로가 있음 → 전체 다시 로드
+            return self._load_full(db)
+
+        logger.info(f"[경로 카탈로그] 증분 갱신 - {len(changed)}개 경로 추가/변경")
+        return RouteCatalogSnapshot(list(rows.values()))
+
+
+route_catalog = RouteCatalog.from_env()
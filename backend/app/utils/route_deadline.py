@@ -0,0 +1,154 @@
+"""
+경로 분석 마감 시간 (latency budget) 모드
+
+Google Elevation API가 느리면 경로 응답 전체가 API 타임아웃만큼 늦어집니다.
+마감 시간 안에 분석이 끝나지 않으면:
+
+1. 평지 가정 추정 결과(사용자 속도/날씨/횡단보도 반영, 경사도 계수 1.0)를 바로 반환하고
+   provisional=True, analysis_id를 붙임
+2. 전체 분석은 백그라운드에서 계속 실행되어 고도 캐시(elevation_cache)를 채움
+3. GET /api/walking/analysis/{analysis_id}로 보정된 결과를 조회하거나,
+   같은 경로를 다시 요청하면 캐시된 고도로 마감 시간 안에 전체 분석 결과를 받음
+
+환경 변수:
+- ROUTE_ANALYSIS_DEADLINE: 분석 결과를 기다리는 최대 시간 (초, 0이면 사용 안 함 - 분석 완료까지 대기)
+- ROUTE_ANALYSIS_RESULT_MAX_ENTRIES / ROUTE_ANALYSIS_RESULT_TTL: 백그라운드 분석 결과 보관
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from typing import Dict, Optional, Tuple
+
+from .elevation_helpers import (
+    analyze_prepared_route,
+    estimate_flat_route,
+    prepare_route_elevation,
+)
+from .ttl_cache import TTLCache
+from .user_speed_model import PersonalSpeedModel
+
+logger = logging.getLogger(__name__)
+
+ROUTE_ANALYSIS_DEADLINE = float(os.getenv("ROUTE_ANALYSIS_DEADLINE", "0"))
+
+# analysis_id → 백그라운드 분석 Task (완료 후에도 TTL 동안 결과 조회용으로 보관)
+pending_analyses = TTLCache.from_env(
+    "ROUTE_ANALYSIS_RESULT", default_max_entries=1000, default_ttl=600
+)
+
+# 실행 중인 Task 참조 유지 (이벤트 루프는 Task를 약한 참조로만 보관)
+_running = set()
+
+
+def _finish_background_analysis(analysis_id: str, task: "asyncio.Task"):
+    _running.discard(task)
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error(f"[경로 분석] 백그라운드 분석 실패 ({analysis_id}): {error}")
+    elif task.result().get("error"):
+        logger.warning(f"[경로 분석] 백그라운드 분석 에러 ({analysis_id}): {task.result()['error']}")
+    else:
+        logger.info(f"[경로 분석] 백그라운드 분석 완료 ({analysis_id})")
+
+
+def get_background_analysis(analysis_id: str) -> Optional[Tuple[str, Optional[Dict]]]:
+    """
+    백그라운드 분석 상태 조회
+
+    Returns:
+        (상태, 결과) - 상태는 "pending" | "completed" | "failed", 모르는/만료된 ID면 None
+    """
+    task = pending_analyses.get(analysis_id)
+    if task is None:
+        return None
+    if not task.done():
+        return "pending", None
+    if task.cancelled() or task.exception() is not None:
+        return "failed", None
+    result = task.result()
+    return ("failed" if result.get("error") else "completed"), result
+
+
+async def analyze_route_within_deadline(
+    itinerary: Dict,
+    api_key: Optional[str] = None,
+    weather_data: Optional[Dict] = None,
+    user_speed_mps: Optional[float] = None,
+    speed_model: Optional[PersonalSpeedModel] = None,
+    deadline_seconds: Optional[float] = None,
+) -> Dict:
+    """
+    analyze_route_elevation과 같은 결과를 마감 시간 안에 반환
+
+    Args:
+        deadline_seconds: 마감 시간 (초, None이면 ROUTE_ANALYSIS_DEADLINE, 0 이하면 마감 없음)
+
+    Returns:
+        전체 분석 결과 (provisional=False) 또는
+        평지 추정 결과 (provisional=True, analysis_id로 전체 결과 조회)
+    """
+    if api_key is None:
+        api_key = os.getenv("GOOGLE_ELEVATION_API_KEY")
+
+    if not api_key:
+        raise ValueError("Google Elevation API 키가 설정되지 않았습니다.")
+
+    if deadline_seconds is None:
+        deadline_seconds = ROUTE_ANALYSIS_DEADLINE
+
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+
+    prepared = await prepare_route_elevation(itinerary)
+    if deadline_seconds > 0:
+        deadline_seconds = max(deadline_seconds - (loop.time() - started_at), 1e-3)
+    return await analyze_prepared_within_deadline(
+        prepared, api_key, weather_data, user_speed_mps, speed_model, deadline_seconds
+    )
+
+
+async def analyze_prepared_within_deadline(
+    prepared: Dict,
+    api_key: str,
+    weather_data: Optional[Dict] = None,
+    user_speed_mps: Optional[float] = None,
+    speed_model: Optional[PersonalSpeedModel] = None,
+    deadline_seconds: Optional[float] = None,
+) -> Dict:
+    """prepare_route_elevation 결과로 analyze_route_within_deadline과 같은 처리 (스트리밍 응답용)"""
+    if deadline_seconds is None:
+        deadline_seconds = ROUTE_ANALYSIS_DEADLINE
+
+    task = asyncio.ensure_future(
+        analyze_prepared_route(prepared, api_key, weather_data, user_speed_mps, speed_model)
+    )
+
+    if deadline_seconds <= 0:
+        result = await task
+        result["provisional"] = False
+        return result
+
+    try:
+        result = await asyncio.wait_for(asyncio.shield(task), timeout=deadline_seconds)
+        result["provisional"] = False
+        return result
+    except asyncio.TimeoutError:
+        pass
+
+    analysis_id = uuid.uuid4().hex
+    pending_analyses.set(analysis_id, task)
+    _running.add(task)
+    task.add_done_callback(lambda t: _finish_background_analysis(analysis_id, t))
+    logger.warning(
+        f"[경로 분석] 마감 시간 {deadline_seconds}초 초과 - 평지 추정 결과 반환, "
+        f"백그라운드 분석 계속 ({analysis_id})"
+    )
+
+    result = await estimate_flat_route(prepared, weather_data, user_speed_mps, speed_model)
+    result["provisional"] = True
+    result["analysis_id"] = analysis_id
+    return result
@@ -0,0 +1,48 @@
+"""
+네비게이션 로그 경로(itinerary) 중복 제거 저장
+
+navigation_logs.route_data의 대부분은 step별 linestring이 들어 있는 경로 자체(legs, rawItinerary)이고,
+같은 출퇴근 경로를 매일 걸으면 같은 값이 로그마다 반복 저장됩니다.
+경로 부분만 정규화한 JSON의 SHA-256을 키로 route_itineraries에 한 번만 저장하고,
+로그에는 해시(route_itinerary_hash)와 나머지 값(경사도 분석, 개인화 시간 등)만 남깁니다.
+
+- split_route_data: route_data → (로그에 남길 값, 경로 부분)
+- merge_route_data: 조회 시 다시 합쳐 원래 route_data로 복원
+"""
+
+import hashlib
+import json
+from typing import Dict, Optional, Tuple
+
+# route_itineraries로 분리하는 route_data 키 (사용자/날씨 계수와 무관한 경로 자체)
+ITINERARY_KEYS = ("legs", "rawItinerary")
+
+
+def canonical_json(value) -> str:
+    """키 정렬 + 공백 없는 JSON (같은 내용이면 같은 문자열)"""
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def itinerary_hash(itinerary: Dict) -> str:
+    """정규화한 경로 JSON의 SHA-256 (hex 64자)"""
+    return hashlib.sha256(canonical_json(itinerary).encode("utf-8")).hexdigest()
+
+
+def split_route_data(route_data: Optional[Dict]) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """
+    route_data → (로그에 남길 값, 경로 부분)
+
+    경로 키가 없으면 (route_data, None) - 그대로 로그에 저장
+    """
+    if not isinstance(route_data, dict) or not any(key in route_data for key in ITINERARY_KEYS):
+        return route_data, None
+    itinerary = {key: route_data[key] for key in ITINERARY_KEYS if key in route_data}
+    remaining = {key: value for key, value in route_data.items() if key not in ITINERARY_KEYS}
+    return remaining, itinerary
+
+
+def merge_route_data(remaining: Optional[Dict], itinerary: Optional[Dict]) -> Optional[Dict]:
+    """로그에 남긴 값 + 경로 부분 → 원래 route_data"""
+    if itinerary is None:
+        return remaining
+    return {**itinerary, **(remaining or {})}
@@ -0,0 +1,122 @@
+"""
+대중교통 경로 검색 후 보행 구간 고도/횡단보도 미리 계산 (speculative prefetch)
+
+사용자는 /transit-route 결과를 몇 초 동안 살펴본 뒤 하나를 골라 /api/routes/analyze-slope를 호출합니다.
+검색 직후 반환한 경로들의 보행 구간을 백그라운드에서 미리 준비해 두면,
+어떤 경로를 고르든 경사도 분석은 캐시만 사용합니다.
+
+- 좌표 수집/횡단보도 계산 → prepared_route_cache (itinerary 내용 해시 키)
+- 고도 → elevation_cache (외부 API는 batch 우선순위: 사용자 요청 몫의 토큰/한도는 쓰지 않음)
+
+백그라운드 작업량 제한 (초과분은 버림 - 미리 계산은 실패해도 결과에 영향 없음):
+- ROUTE_PREFETCH_MAX_ITINERARIES: 검색 1번에 미리 계산할 최대 경로 수 (앞에서부터)
+- ROUTE_PREFETCH_CONCURRENCY: 동시에 미리 계산하는 경로 수
+- ROUTE_PREFETCH_MAX_PENDING: 실행 중 + 대기 중인 경로 수 상한
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import weakref
+from typing import Any, Dict, List, Optional
+
+from .elevation_helpers import fetch_route_elevations, prepare_route_elevation
+from .upstream_governor import BATCH, UpstreamUnavailableError
+from .worker_pool import WorkerPoolBusyError
+
+logger = logging.getLogger(__name__)
+
+
+class RoutePrefetcher:
+    """경로 목록의 보행 구간을 백그라운드에서 미리 준비 (동시 실행/대기 수 제한)"""
+
+    def __init__(self, max_itineraries: int = 3, concurrency: int = 2, max_pending: int = 20):
+        self.max_itineraries = max(0, max_itineraries)
+        self.concurrency = max(1, concurrency)
+        self.max_pending = max(0, max_pending)
+        # 루프마다 세마포어를 따로 둔다 (asyncio 세마포어는 생성된 루프에 묶임)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # 실행 중인 Task 참조 유지 (이벤트 루프는 Task를 약한 참조로만 보관)
+        self._tasks = set()
+        self._scheduled = 0
+        self._completed = 0
+        self._skipped = 0
+        self._dropped = 0
+        self._failed = 0
+
+    @classmethod
+    def from_env(cls) -> "RoutePrefetcher":
+        """환경 변수에서 설정을 읽어 생성"""
+        return cls(
+            max_itineraries=int(os.getenv("ROUTE_PREFETCH_MAX_ITINERARIES", "3")),
+            concurrency=int(os.getenv("ROUTE_PREFETCH_CONCURRENCY", "2")),
+            max_pending=int(os.getenv("ROUTE_PREFETCH_MAX_PENDING", "20")),
+        )
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    def schedule(self, itineraries: List[Dict], api_key: Optional[str] = None) -> List["asyncio.Task"]:
+        """
+        경로 목록의 미리 계산 작업 등록 (실행 중인 이벤트 루프에서 호출, 기다리지 않음)
+
+        Returns:
+            등록된 Task 목록 (대기 수 상한을 넘은 경로는 버림)
+        """
+        api_key = api_key or os.getenv("GOOGLE_ELEVATION_API_KEY")
+        if not api_key:
+            return []
+
+        candidates = itineraries[: self.max_itineraries]
+        available = max(0, self.max_pending - len(self._tasks))
+        self._dropped += max(0, len(candidates) - available)
+
+        tasks = []
+        for itinerary in candidates[:available]:
+            # 응답으로 나갈 itinerary는 건드리지 않도록 복사본 사용 (내용 해시는 같음)
+            task = asyncio.ensure_future(self._prefetch(copy.deepcopy(itinerary), api_key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            tasks.append(task)
+        self._scheduled += len(tasks)
+        return tasks
+
+    async def _prefetch(self, itinerary: Dict, api_key: str):
+        async with self._get_semaphore():
+            try:
+                prepared = await prepare_route_elevation(itinerary)
+                if prepared["walk_legs"]:
+                    await fetch_route_elevations(prepared["all_coords"], api_key, priority=BATCH)
+                self._completed += 1
+            except (UpstreamUnavailableError, WorkerPoolBusyError) as e:
+                # 외부 API 한도/장애, 분석 풀 혼잡: 사용자 요청에 양보
+                self._skipped += 1
+                logger.info(f"[경로 미리 계산] 건너뜀: {e}")
+            except Exception as e:
+                self._failed += 1
+                logger.warning(f"[경로 미리 계산] 실패: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 현재 상태"""
+        return {
+            "max_itineraries": self.max_itineraries,
+            "concurrency": self.concurrency,
+            "max_pending": self.max_pending,
+            "pending": len(self._tasks),
+            "scheduled": self._scheduled,
+            "completed": self._completed,
+            "skipped": self._skipped,
+            "dropped": self._dropped,
+            "failed": self._failed,
+        }
+
+
+route_prefetcher = RoutePrefetcher.from_env()
@@ -0,0 +1,269 @@
+"""
+GPX 경로 오버레이 타일 (GeoJSON, 디스크 캐시)
+
+지도 화면이 주변 경로마다 전체 GeoJSON을 받는 대신
+/api/routes/tiles/{z}/{x}/{y}로 타일 범위에 걸친 경로 선만 받도록 합니다.
+
+- 타일 좌표: Web Mercator (XYZ, 256px)
+- 타일 범위(+ 경계 여유)에 걸친 구간만 잘라내고, 줌 레벨의 1픽셀 크기로 Douglas-Peucker 단순화
+- 좌표 소수 자릿수도 줌에 맞게 줄임
+- 처음 요청될 때 생성하여 디스크에 저장 (ROUTE_TILE_CACHE_DIR/{데이터 버전}/{z}/{x}/{y}.geojson)
+- 데이터 버전은 경로 카탈로그의 (개수, 최대 route_id, 최대 updated_at)에서 만듦
+  → 경로가 바뀌면 새 버전 디렉토리에 다시 생성하고 이전 버전 디렉토리는 삭제
+- ETag는 타일 내용 해시
+
+환경 변수:
+- ROUTE_TILE_CACHE_DIR: 타일 캐시 경로 (기본: backend/data/route_tiles)
+- ROUTE_TILE_MIN_ZOOM: 이보다 작은 줌은 빈 타일 (경로가 너무 많고 선이 점처럼 보임)
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.utils.polyline import RESOLUTION_TOLERANCES_M, simplify_coordinates
+from app.utils.route_catalog import RouteCatalogSnapshot, route_catalog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TILE_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "route_tiles"
+MAX_ZOOM = 22
+TILE_SIZE_PX = 256
+# 타일 경계 여유 (타일 크기 대비) - 경계에서 선이 끊겨 보이지 않도록
+TILE_BUFFER_RATIO = 1 / 16
+# 타일 원본으로 쓰는 단순화 좌표 해상도 (route_geometries)
+SOURCE_RESOLUTION = "high"
+
+_EARTH_CIRCUMFERENCE_M = 40_075_016.686
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """XYZ 타일 → (최소 경도, 최소 위도, 최대 경도, 최대 위도)"""
+    n = 2 ** z
+
+    def lat(tile_y: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+
+    return x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y)
+
+
+def meters_per_pixel(z: int, lat: float) -> float:
+    """줌 레벨/위도에서 1픽셀 크기 (미터)"""
+    return _EARTH_CIRCUMFERENCE_M * math.cos(math.radians(lat)) / (TILE_SIZE_PX * 2 ** z)
+
+
+def coordinate_decimals(z: int) -> int:
+    """줌 레벨에서 1픽셀보다 세밀한 좌표 소수 자릿수"""
+    pixels_per_degree = TILE_SIZE_PX * 2 ** z / 360.0
+    return max(0, math.ceil(math.log10(pixels_per_degree)) + 1)
+
+
+class RouteGeometryIndex:
+    """타일 생성용 경로 좌표 + 경계 상자 (데이터 버전마다 1개)"""
+
+    def __init__(self, route_ids: List[int], coordinates: List[np.ndarray], properties: List[Dict]):
+        self.route_ids = route_ids
+        self.coordinates = coordinates
+        self.properties = properties
+        bounds = np.array(
+            [
+                (c[:, 0].min(), c[:, 1].min(), c[:, 0].max(), c[:, 1].max()) if len(c) else (np.nan,) * 4
+                for c in coordinates
+            ],
+            dtype=np.float64,
+        ).reshape(len(coordinates), 4)
+        self.min_lng, self.min_lat, self.max_lng, self.max_lat = bounds.T
+
+    def render(self, z: int, x: int, y: int) -> Dict:
+        """타일 GeoJSON FeatureCollection 생성"""
+        min_lng, min_lat, max_lng, max_lat = tile_bounds(z, x, y)
+        buffer_lng = (max_lng - min_lng) * TILE_BUFFER_RATIO
+        buffer_lat = (max_lat - min_lat) * TILE_BUFFER_RATIO
+        min_lng, max_lng = min_lng - buffer_lng, max_lng + buffer_lng
+        min_lat, max_lat = min_lat - buffer_lat, max_lat + buffer_lat
+
+        tolerance_m = meters_per_pixel(z, (min_lat + max_lat) / 2)
+        decimals = coordinate_decimals(z)
+
+        with np.errstate(invalid="ignore"):
+            candidates = np.flatnonzero(
+                (self.max_lng >= min_lng) & (self.min_lng <= max_lng)
+                & (self.max_lat >= min_lat) & (self.min_lat <= max_lat)
+            )
+
+        features = []
+        for i in candidates:
+            lines = self._clip(self.coordinates[i], min_lng, min_lat, max_lng, max_lat)
+            lines = [simplify_coordinates(line, tolerance_m) for line in lines]
+            lines = [np.round(np.asarray(line), decimals).tolist() for line in lines if len(line) >= 2]
+            if not lines:
+                continue
+            features.append({
+                "type": "Feature",
+                "id": self.route_ids[i],
+                "geometry": {"type": "MultiLineString", "coordinates": lines},
+                "properties": self.properties[i],
+            })
+        return {"type": "FeatureCollection", "features": features}
+
+    @staticmethod
+    def _clip(coords: np.ndarray, min_lng, min_lat, max_lng, max_lat) -> List[np.ndarray]:
+        """
+        타일 범위에 걸친 구간만 남김 (연속된 구간은 한 선으로)
+
+        걸친 선분은 자르지 않고 그대로 두므로 선이 경계 밖으로 최대 한 선분만큼 나갈 수 있습니다
+        (경로 좌표는 단순화 전 트랙 포인트라 선분이 짧음, 렌더러가 타일 경계에서 잘라냄).
+        """
+        if len(coords) < 2:
+            return []
+        lng0, lat0 = coords[:-1, 0], coords[:-1, 1]
+        lng1, lat1 = coords[1:, 0], coords[1:, 1]
+        touches = (
+            (np.maximum(lng0, lng1) >= min_lng) & (np.minimum(lng0, lng1) <= max_lng)
+            & (np.maximum(lat0, lat1) >= min_lat) & (np.minimum(lat0, lat1) <= max_lat)
+        )
+        if not touches.any():
+            return []
+        # 걸친 선분 구간(run)의 시작/끝 찾기
+        edges = np.diff(np.concatenate(([0], touches.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)  # 마지막 선분 다음 인덱스
+        return [coords[start:end + 1] for start, end in zip(starts, ends)]
+
+
+class RouteTileCache:
+    """경로 타일 지연 생성 + 디스크 캐시"""
+
+    def __init__(self, root: Optional[str] = None, min_zoom: int = 10):
+        self.root = Path(root or DEFAULT_TILE_DIR)
+        self.min_zoom = min_zoom
+        self._index: Optional[RouteGeometryIndex] = None
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RouteTileCache":
+        return cls(
+            root=os.getenv("ROUTE_TILE_CACHE_DIR") or None,
+            min_zoom=int(os.getenv("ROUTE_TILE_MIN_ZOOM", "10")),
+        )
+
+    @staticmethod
+    def data_version(snapshot: RouteCatalogSnapshot) -> str:
+        """경로 데이터 버전 (경로 추가/수정/삭제 시 바뀜)"""
+        updated_at = str(snapshot.updated_at) if snapshot.updated_at else ""
+        key = f"{len(snapshot)}:{snapshot.max_route_id}:{updated_at}"
+        return hashlib.blake2b(key.encode(), digest_size=6).hexdigest()
+
+    @staticmethod
+    def etag(data: bytes) -> str:
+        return '"' + hashlib.blake2b(data, digest_size=8).hexdigest() + '"'
+
+    def get_tile(
+        self, db: Session, z: int, x: int, y: int, format_name: Optional[Callable[[str], str]] = None
+    ) -> Tuple[bytes, str]:
+        """
+        타일 내용(GeoJSON 바이트)과 ETag 반환 (동기 - run_db 안에서 호출)
+
+        Args:
+            format_name: 경로 이름 정리 함수 (타일 생성 시에만 사용)
+        """
+        snapshot = route_catalog.get(db)
+        version = self.data_version(snapshot)
+        path = self.root / version / str(z) / str(x) / f"{y}.geojson"
+        try:
+            data = path.read_bytes()
+            return data, self.etag(data)
+        except FileNotFoundError:
+            pass
+
+        if z < self.min_zoom:
+            tile = {"type": "FeatureCollection", "features": []}
+        else:
+            tile = self._get_index(db, snapshot, version, format_name).render(z, x, y)
+        data = json.dumps(tile, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        # 임시 파일에 쓴 뒤 교체 (동시에 같은 타일을 만들어도 읽는 쪽은 완성된 파일만 봄)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        return data, self.etag(data)
+
+    # ---------- 좌표 인덱스 ----------
+    def _get_index(
+        self, db: Session, snapshot: RouteCatalogSnapshot, version: str, format_name
+    ) -> RouteGeometryIndex:
+        if self._version == version and self._index is not None:
+            return self._index
+        with self._lock:
+            if self._version != version or self._index is None:
+                self._index = self._load_index(db, snapshot, format_name)
+                self._version = version
+                self._remove_old_versions(version)
+            return self._index
+
+    def _load_index(self, db: Session, snapshot: RouteCatalogSnapshot, format_name) -> RouteGeometryIndex:
+        """단순화 좌표(high) 전체 로드 (없는 경로는 원본 좌표에서 계산)"""
+        rows = db.execute(
+            text("SELECT route_id, coordinates FROM route_geometries WHERE resolution = :resolution"),
+            {"resolution": SOURCE_RESOLUTION},
+        )
+        geometries = {route_id: coordinates for route_id, coordinates in rows}
+
+        missing = [int(route_id) for route_id in snapshot.route_id if int(route_id) not in geometries]
+        if missing:
+            for route_id, route_coordinates in db.execute(
+                text("SELECT route_id, route_coordinates FROM routes")
+            ):
+                if route_id in geometries:
+                    continue
+                if isinstance(route_coordinates, str):
+                    route_coordinates = json.loads(route_coordinates)
+                simplified = simplify_coordinates(
+                    (route_coordinates or {}).get("coordinates", []), RESOLUTION_TOLERANCES_M[SOURCE_RESOLUTION]
+                )
+                geometries[route_id] = {"type": "LineString", "coordinates": simplified}
+
+        route_ids, coordinates, properties = [], [], []
+        for i, route_id in enumerate(snapshot.route_id.tolist()):
+            geometry = geometries.get(route_id)
+            if isinstance(geometry, str):
+                geometry = json.loads(geometry)
+            points = np.asarray((geometry or {}).get("coordinates") or [], dtype=np.float64)
+            if points.ndim != 2 or len(points) < 2:
+                continue
+            name = snapshot.route_name[i]
+            route_ids.append(route_id)
+            coordinates.append(points[:, :2])
+            properties.append({
+                "route_id": route_id,
+                "route_name": format_name(name) if format_name else name,
+                "route_type": snapshot.route_type[i] or None,
+                "difficulty_level": snapshot.difficulty[i] or None,
+                "distance_km": float(snapshot.distance_km[i]),
+            })
+
+        logger.info(f"[경로 타일] 좌표 인덱스 로드 - {len(route_ids)}개 경로")
+        return RouteGeometryIndex(route_ids, coordinates, properties)
+
+    def _remove_old_versions(self, version: str) -> None:
+        """이전 데이터 버전의 타일 디렉토리 삭제"""
+        if not self.root.exists():
+            return
+        for entry in self.root.iterdir():
+            if entry.is_dir() and entry.name != version:
+                shutil.rmtree(entry, ignore_errors=True)
+
+
+route_tile_cache = RouteTileCache.from_env()
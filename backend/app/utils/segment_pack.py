@@ -0,0 +1,116 @@
+"""
+경로 세그먼트 묶음 저장 형식 (route_segment_packs)
+
+route_segments는 100m마다 1행이라 경로 상세 조회 시 수십~수백 행을 읽고
+Numeric 컬럼을 행마다 float로 바꿔야 합니다.
+경로당 1행에 세그먼트 필드를 고정 길이 정수 배열(리틀 엔디언)로 묶어 저장하면
+조회·적재 모두 1행만 다루고, 디코딩은 NumPy 배열 연산 한 번으로 끝납니다.
+
+정수 스케일 (DB Numeric 자릿수와 같아 값 손실 없음):
+- 위도/경도 Numeric(9,6) → 1e-6도 단위
+- 거리/고도/고도 변화 Numeric(_,2) → cm 단위, 경사도 Numeric(5,2) → 0.01% 단위
+- NULL은 NULL_VALUE로 표시
+- terrain_type은 종류 목록(terrain_types) 인덱스로 저장 (-1 = NULL)
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+PACK_FORMAT_VERSION = 1
+
+NULL_VALUE = np.iinfo(np.int32).min
+
+# (필드명, 원본 키, 스케일) - 원본 값 × 스케일을 반올림한 정수로 저장
+_SCALED_FIELDS = (
+    ("start_lat", "start_lat", 1_000_000),
+    ("start_lon", "start_lon", 1_000_000),
+    ("end_lat", "end_lat", 1_000_000),
+    ("end_lon", "end_lon", 1_000_000),
+    ("segment_distance", "segment_distance_m", 100),
+    ("segment_grade", "segment_grade_percent", 100),
+    ("elevation_change", "elevation_change_m", 100),
+    ("start_elevation", "start_elevation_m", 100),
+    ("end_elevation", "end_elevation_m", 100),
+)
+
+SEGMENT_DTYPE = np.dtype(
+    [("segment_id", "<i4"), ("segment_order", "<i4")]
+    + [(name, "<i4") for name, _, _ in _SCALED_FIELDS]
+    + [("terrain", "<i2")]
+)
+
+
+def _scaled(values: Sequence, scale: int) -> np.ndarray:
+    """숫자(또는 None) 목록 → 정수 배열 (None은 NULL_VALUE)"""
+    result = np.full(len(values), NULL_VALUE, dtype=np.int64)
+    present = np.array([v is not None for v in values], dtype=bool)
+    if present.any():
+        numbers = np.array([float(v) for v in values if v is not None], dtype=np.float64)
+        result[present] = np.round(numbers * scale)
+    return result
+
+
+def pack_segments(segments: Sequence[Mapping]) -> Tuple[bytes, Optional[List[str]]]:
+    """
+    세그먼트 목록 → (묶음 바이트, terrain 종류 목록)
+
+    Args:
+        segments: route_segments 행과 같은 키를 가진 dict 목록 (segment_order 순)
+                  segment_id가 없으면 0으로 저장
+
+    Returns:
+        (segment_data, terrain_types) - terrain_type이 모두 없으면 terrain_types는 None
+    """
+    packed = np.zeros(len(segments), dtype=SEGMENT_DTYPE)
+    packed["segment_id"] = [seg.get("segment_id") or 0 for seg in segments]
+    packed["segment_order"] = [seg["segment_order"] for seg in segments]
+    for name, key, scale in _SCALED_FIELDS:
+        packed[name] = _scaled([seg.get(key) for seg in segments], scale)
+
+    terrain_types: List[str] = []
+    codes = []
+    for seg in segments:
+        terrain = seg.get("terrain_type")
+        if terrain is None:
+            codes.append(-1)
+            continue
+        if terrain not in terrain_types:
+            terrain_types.append(terrain)
+        codes.append(terrain_types.index(terrain))
+    packed["terrain"] = codes
+
+    return packed.tobytes(), (terrain_types or None)
+
+
+def unpack_arrays(segment_data: bytes) -> Dict[str, np.ndarray]:
+    """묶음 바이트 → 필드별 float 배열 (NULL은 NaN), segment_id/segment_order/terrain은 정수"""
+    packed = np.frombuffer(segment_data, dtype=SEGMENT_DTYPE)
+    arrays = {
+        "segment_id": packed["segment_id"],
+        "segment_order": packed["segment_order"],
+        "terrain": packed["terrain"],
+    }
+    for name, key, scale in _SCALED_FIELDS:
+        raw = packed[name]
+        arrays[key] = np.where(raw == NULL_VALUE, np.nan, raw / scale)
+    return arrays
+
+
+def unpack_segments(segment_data: bytes, terrain_types: Optional[List[str]] = None) -> List[Dict]:
+    """
+    묶음 바이트 → route_segments 행과 같은 키의 dict 목록
+
+    NULL이던 값은 None, 나머지는 float입니다.
+    """
+    arrays = unpack_arrays(segment_data)
+    terrain_types = terrain_types or []
+
+    columns = {"segment_id": arrays["segment_id"].tolist(), "segment_order": arrays["segment_order"].tolist()}
+    for _, key, _ in _SCALED_FIELDS:
+        values = arrays[key]
+        columns[key] = [None if v != v else v for v in values.tolist()]  # NaN → None
+    columns["terrain_type"] = [terrain_types[c] if c >= 0 else None for c in arrays["terrain"].tolist()]
+
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
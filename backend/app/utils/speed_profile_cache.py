@@ -0,0 +1,218 @@
+"""
+사용자 속도 프로필 인메모리 캐시 (write-through)
+
+경로 분석/추천 요청마다 사용자 기준 속도가 필요하므로
+(user_id, activity_type) → 프로필 값을 프로세스 메모리에 보관하여 DB 조회를 생략합니다.
+
+- 저장소는 ttl_cache.TTLCache (다른 워커 프로세스의 갱신은 TTL 안에 반영)
+- 프로필이 없는 사용자도 캐시 (매번 빈 조회를 반복하지 않도록)
+- 프로필을 바꾸는 쪽은 stage()로 새 값을 세션에 등록 → commit 후에만 캐시에 반영,
+  rollback되면 버려서 저장되지 않은 값이 캐시에 남지 않음
+- 같은 키 구조의 다른 사용자별 값(개인 보행 모델 등)도 from_row만 바꿔 같은 클래스로 캐시
+
+환경 변수:
+- SPEED_PROFILE_CACHE_MAX_ENTRIES: 최대 항목 수 (0이면 캐시 사용 안 함)
+- SPEED_PROFILE_CACHE_TTL: 항목 유효 시간 (초)
+"""
+
+import os
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.utils.ttl_cache import TTLCache
+
+# 세션 info에 commit 대기 중인 캐시 갱신을 보관하는 키
+_PENDING_KEY = "speed_profile_cache_pending"
+
+
+class CachedSpeedProfile(NamedTuple):
+    """캐시에 저장하는 프로필 값 (ORM 객체 대신 불변 값만 보관)"""
+
+    profile_id: int
+    speed_case1: Optional[float]  # 경로 안내용 (km/h)
+    speed_case2: Optional[float]  # 코스 추천용 (km/h)
+    data_points_count: int
+
+    @classmethod
+    def from_row(cls, row) -> "CachedSpeedProfile":
+        """ORM 객체 또는 RETURNING Row → 캐시 값"""
+        return cls(
+            profile_id=row.profile_id,
+            speed_case1=round(float(row.speed_case1), 2) if row.speed_case1 is not None else None,
+            speed_case2=round(float(row.speed_case2), 2) if row.speed_case2 is not None else None,
+            data_points_count=row.data_points_count or 0,
+        )
+
+
+class SpeedProfileCache:
+    """(user_id, activity_type) 키의 TTLCache + commit 연동 갱신"""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 600.0,
+        from_row: Optional[Callable] = None,
+    ):
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        # ORM 객체/Row → 캐시 값 변환 (기본: 속도 프로필)
+        self.from_row = from_row or CachedSpeedProfile.from_row
+
+    @classmethod
+    def from_env(cls, from_row: Optional[Callable] = None) -> "SpeedProfileCache":
+        """환경 변수에서 설정을 읽어 생성"""
+        return cls(
+            max_entries=int(os.getenv("SPEED_PROFILE_CACHE_MAX_ENTRIES", "10000")),
+            ttl_seconds=float(os.getenv("SPEED_PROFILE_CACHE_TTL", "600")),
+            from_row=from_row,
+        )
+
+    def lookup(self, user_id: int, activity_type: str = "walking") -> Tuple[bool, Optional[CachedSpeedProfile]]:
+        """
+        캐시 조회
+
+        Returns:
+            (적중 여부, 프로필 값) - 적중했지만 프로필이 없는 사용자면 (True, None)
+        """
+        return self._cache.lookup((user_id, activity_type))
+
+    def set(self, user_id: int, activity_type: str, value: Optional[CachedSpeedProfile]):
+        """값 저장 (None이면 프로필 없음으로 저장)"""
+        self._cache.set((user_id, activity_type), value)
+
+    def invalidate(self, user_id: int, activity_type: Optional[str] = None):
+        """항목 삭제 (activity_type이 None이면 해당 사용자 전체)"""
+        if activity_type is not None:
+            self._cache.pop((user_id, activity_type))
+        else:
+            self._cache.discard_where(lambda key: key[0] == user_id)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, float]:
+        return self._cache.stats()
+
+    # ---------- 트랜잭션 연동 (write-through) ----------
+    def stage(self, db: Session, user_id: int, activity_type: str, row=None):
+        """
+        commit 후 캐시에 반영할 값 등록
+
+        row가 None이면 commit 후 해당 항목을 삭제합니다 (프로필 삭제 등).
+        값이 바뀌는 동안 예전 값이 읽히지 않도록 기존 항목은 바로 삭제합니다.
+        """
+        value = self.from_row(row) if row is not None else None
+        db.info.setdefault(_PENDING_KEY, {})[(self, user_id, activity_type)] = value
+        self.invalidate(user_id, activity_type)
+
+
+speed_profile_cache = SpeedProfileCache.from_env()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session):
+    """commit된 프로필 변경을 캐시에 반영"""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    for (cache, user_id, activity_type), value in pending.items():
+        if value is None:
+            cache.invalidate(user_id, activity_type)
+        else:
+            cache.set(user_id, activity_type, value)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction):
+    """
+    rollback된 프로필 변경은 캐시에 반영하지 않음
+
+    savepoint rollback이어도 대기 중인 값을 모두 버립니다.
+    stage()에서 기존 항목을 이미 삭제했으므로 다음 조회 때 DB에서 다시 읽습니다.
+    """
+    session.info.pop(_PENDING_KEY, None)
+
+
+def get_user_speed_profile(
+    db: Session, user_id: int, activity_type: str = "walking"
+) -> Optional[CachedSpeedProfile]:
+    """
+    사용자 속도 프로필 조회 (캐시 → 없으면 해당 행만 조회 후 캐시)
+
+    Returns:
+        프로필 값, 프로필이 없으면 None
+    """
+    hit, value = speed_profile_cache.lookup(user_id, activity_type)
+    if hit:
+        return value
+
+    from app.models import ActivitySpeedProfile
+
+    row = (
+        db.query(
+            ActivitySpeedProfile.profile_id,
+            ActivitySpeedProfile.speed_case1,
+            ActivitySpeedProfile.speed_case2,
+            ActivitySpeedProfile.data_points_count,
+        )
+        .filter(
+            ActivitySpeedProfile.user_id == user_id,
+            ActivitySpeedProfile.activity_type == activity_type,
+        )
+        .first()
+    )
+    value = CachedSpeedProfile.from_row(row) if row is not None else None
+    speed_profile_cache.set(user_id, activity_type, value)
+    return value
+
+
+def peek_user_speed_profile(user_id: int, activity_type: str = "walking") -> Tuple[bool, Optional[CachedSpeedProfile]]:
+    """DB 없이 캐시만 조회 (이벤트 루프에서 바로 호출 가능)"""
+    return speed_profile_cache.lookup(user_id, activity_type)
+
+
+async def resolve_user_speed_kmh(
+    user_id: int, activity_type: str = "walking", case: int = 1
+) -> Optional[float]:
+    """
+    경로 API용 사용자 기준 속도 (km/h)
+
+    캐시에 있으면 DB 없이 바로 반환하고, 없을 때만 DB 스레드 풀에서 조회합니다.
+
+    Args:
+        case: 1이면 speed_case1(경로 안내용), 2면 speed_case2(코스 추천용)
+
+    Returns:
+        속도 (km/h), 프로필이 없으면 None
+    """
+    hit, profile = peek_user_speed_profile(user_id, activity_type)
+    if not hit:
+        from app.database import SessionLocal, run_db
+
+        def _load():
+            db = SessionLocal()
+            try:
+                return get_user_speed_profile(db, user_id, activity_type)
+            finally:
+                db.close()
+
+        profile = await run_db(_load)
+
+    if profile is None:
+        return None
+    return profile.speed_case2 if case == 2 else profile.speed_case1
+
+
+async def resolve_user_speed_mps(
+    user_speed_mps: Optional[float], user_id: Optional[int]
+) -> Optional[float]:
+    """
+    경로 분석용 보행 속도 (m/s)
+
+    요청에 속도가 있으면 그대로 사용하고, 없고 user_id가 있으면 프로필 speed_case1을 사용합니다.
+    """
+    if user_speed_mps is not None or user_id is None:
+        return user_speed_mps
+    speed_kmh = await resolve_user_speed_kmh(user_id, "walking", case=1)
+    return speed_kmh / 3.6 if speed_kmh else None
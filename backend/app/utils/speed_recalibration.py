@@ -0,0 +1,262 @@
+"""
+사용자 속도 프로필 일괄 재계산 (오프라인 작업)
+
+속도 프로필(activity_speed_profile, walking)은 네비게이션 로그가 저장될 때마다
+crud.update_speed_profile_with_weighted_avg의 가중 평균(get_alpha 알파 구간)으로만 갱신됩니다.
+역산 규칙(reverse_calculate_base_speed)이나 알파 구간을 바꾸면 기존 프로필에 반영할 방법이 없으므로,
+전체 로그를 (사용자, 시작 시간) 순으로 다시 읽어 같은 규칙으로 프로필을 다시 만듭니다.
+
+- 로그는 필요한 숫자 컬럼만 서버 측 커서로 읽어 NumPy 배열로 모음
+- 역산/가중 평균은 사용자별 그룹 배열 연산으로 계산 (로그 단위 Python 반복 없음)
+- 프로필은 executemany UPDATE/INSERT 한 번씩으로 반영
+
+주의:
+- 반영 대상은 로그 저장 시와 같은 조건의 로그뿐입니다 (crud.PROFILE_MIN_WALKING_SECONDS 이상 걸은 로그).
+  수동 입력(PUT /api/personalization/speed-profile)으로 바꾼 값은 로그로 다시 만들 수 없으므로 덮어씁니다.
+- 회원가입 시 만든 기본 프로필(DEFAULT_WALKING_SPEED_CASE1, data_points_count=0)이 있으면
+  첫 로그도 그 값에서 get_alpha(0)으로 갱신되므로, 기존 프로필이 있는 사용자는 기본값에서 다시 시작합니다.
+  (기존 프로필이 없는 사용자는 첫 로그가 INSERT로 100% 반영된 것으로 계산)
+- 실시간 갱신은 매번 소수 2자리로 반올림하고 이 작업은 마지막에만 반올림하므로
+  규칙이 같아도 0.01 km/h 정도 차이가 날 수 있습니다.
+- 실행 중인 서버의 프로필 캐시는 TTL(SPEED_PROFILE_CACHE_TTL) 안에 새 값으로 바뀝니다.
+
+CLI: python scripts/recalibrate_speed_profiles.py --dry-run
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.constants.speed_constants import DEFAULT_WALKING_SPEED_CASE1, SLOW_WALK_SPEED_RATIO
+from app.models import ActivitySpeedProfile, NavigationLogs
+from app.utils.Factors_Affecting_Walking_Speed import reverse_calculate_base_speeds
+
+ACTIVITY_TYPE = "walking"
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+@dataclass
+class ReplayedProfiles:
+    """로그로 다시 계산한 사용자별 프로필 (user_id 오름차순)"""
+
+    user_id: np.ndarray  # int64
+    speed_kmh: np.ndarray  # float64, 반올림 전
+    data_points_count: np.ndarray  # int64
+
+    def __len__(self) -> int:
+        return len(self.user_id)
+
+
+@dataclass
+class ProfileChange:
+    """프로필 1개의 변경 내용 (profile_id가 None이면 새로 생성)"""
+
+    user_id: int
+    profile_id: Optional[int]
+    old_speed_kmh: Optional[float]
+    new_speed_kmh: float
+    old_count: Optional[int]
+    new_count: int
+
+    @property
+    def delta_kmh(self) -> Optional[float]:
+        if self.old_speed_kmh is None:
+            return None
+        return round(self.new_speed_kmh - self.old_speed_kmh, 2)
+
+
+def alphas_for_counts(data_points_count: np.ndarray) -> np.ndarray:
+    """crud.get_alpha의 배열 버전 (갱신 전 data_points_count → 알파)"""
+    counts = np.asarray(data_points_count)
+    return np.select(
+        [counts <= max_count for max_count, _ in crud.ALPHA_SCHEDULE],
+        [alpha for _, alpha in crud.ALPHA_SCHEDULE],
+        default=crud.ALPHA_LONG_TERM,
+    )
+
+
+def replay_weighted_average(
+    user_ids: np.ndarray,
+    speeds_kmh: np.ndarray,
+    seeded_user_ids: Optional[Iterable[int]] = None,
+    initial_speed_kmh: float = DEFAULT_WALKING_SPEED_CASE1,
+) -> ReplayedProfiles:
+    """
+    사용자별 가중 평균을 로그 순서대로 적용한 최종 값
+
+    update_speed_profile_with_weighted_avg를 로그마다 호출한 것과 같은 결과입니다. (반올림 제외)
+    - seeded_user_ids의 사용자: 회원가입 기본 프로필(initial_speed_kmh, 횟수 0)에서 시작하여
+      k번째 로그(0부터)는 알파 = get_alpha(k)
+    - 그 밖의 사용자: 프로필이 없어 첫 로그는 100% 반영(INSERT), 이후 k번째 로그는 알파 = get_alpha(k)
+
+    s_n = s_0·Π_k(1 - a_k) + Σ_k a_k·x_k·Π_{j>k}(1 - a_j) 를 사용자 그룹별 누적합으로 계산합니다.
+
+    Args:
+        user_ids: 로그별 사용자 ID (사용자별로 모여 있고 그룹 안은 시간 순)
+        speeds_kmh: 로그별 기준 속도
+        seeded_user_ids: 첫 로그 전에 기본 프로필이 있던 사용자 ID
+        initial_speed_kmh: 기본 프로필 속도
+    """
+    user_ids = np.asarray(user_ids, dtype=np.int64)
+    speeds = np.asarray(speeds_kmh, dtype=np.float64)
+    if len(user_ids) == 0:
+        empty = np.array([], dtype=np.int64)
+        return ReplayedProfiles(empty, np.array([], dtype=np.float64), empty)
+
+    starts = np.flatnonzero(np.diff(user_ids, prepend=user_ids[0] - 1))
+    counts = np.diff(np.append(starts, len(user_ids)))
+    ends = starts + counts - 1
+    seeded = np.isin(user_ids[starts], np.fromiter(seeded_user_ids or (), dtype=np.int64))
+    # 그룹 안 순번 (= 갱신 전 data_points_count)
+    positions = np.arange(len(user_ids)) - np.repeat(starts, counts)
+
+    alphas = alphas_for_counts(positions)
+    alphas[starts[~seeded]] = 1.0
+
+    # 이후 로그들의 (1 - a_j) 곱 = exp(그룹 끝까지 log(1 - a_j) 합 - 자신까지의 합)
+    log_keep = np.zeros(len(alphas))
+    partial = alphas < 1.0
+    log_keep[partial] = np.log1p(-alphas[partial])
+    cumulative = np.cumsum(log_keep)
+    weights = alphas * np.exp(np.repeat(cumulative[ends], counts) - cumulative)
+
+    # 기본 프로필 값은 모든 로그의 (1 - a_k) 곱만큼 남음
+    group_keep = np.exp(cumulative[ends] - np.where(starts > 0, cumulative[starts - 1], 0.0))
+    initial = np.where(seeded, initial_speed_kmh * group_keep, 0.0)
+
+    return ReplayedProfiles(
+        user_id=user_ids[starts],
+        speed_kmh=np.add.reduceat(weights * speeds, starts) + initial,
+        data_points_count=counts.astype(np.int64),
+    )
+
+
+def load_profile_logs(db: Session, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, np.ndarray]:
+    """
+    프로필 반영 대상 로그를 (사용자, 시작 시간, log_id) 순으로 읽어 배열로 반환
+
+    _profile_speed_from_log와 같은 조건 (실측 속도/계수가 있고 최소 보행 시간 이상)
+    """
+    stmt = (
+        select(
+            NavigationLogs.user_id,
+            NavigationLogs.real_walking_speed_kmh,
+            NavigationLogs.slope_factor,
+            NavigationLogs.weather_factor,
+        )
+        .where(
+            NavigationLogs.real_walking_speed_kmh.isnot(None),
+            NavigationLogs.real_walking_speed_kmh != 0,
+            NavigationLogs.slope_factor.isnot(None),
+            NavigationLogs.slope_factor != 0,
+            NavigationLogs.weather_factor.isnot(None),
+            NavigationLogs.weather_factor != 0,
+            NavigationLogs.active_walking_time_seconds >= crud.PROFILE_MIN_WALKING_SECONDS,
+        )
+        .order_by(NavigationLogs.user_id, NavigationLogs.started_at, NavigationLogs.log_id)
+        .execution_options(stream_results=True, yield_per=chunk_size)
+    )
+
+    chunks: List[np.ndarray] = []
+    result = db.execute(stmt)
+    try:
+        for partition in result.partitions():
+            chunks.append(np.array([tuple(map(float, row)) for row in partition], dtype=np.float64))
+    finally:
+        result.close()
+
+    rows = np.concatenate(chunks) if chunks else np.empty((0, 4), dtype=np.float64)
+    return {
+        "user_id": rows[:, 0].astype(np.int64),
+        "real_walking_speed_kmh": rows[:, 1],
+        "slope_factor": rows[:, 2],
+        "weather_factor": rows[:, 3],
+    }
+
+
+def plan_recalibration(db: Session, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[ProfileChange]:
+    """로그로 프로필을 다시 계산하여 기존 프로필과 비교한 변경 목록 (DB는 바꾸지 않음)"""
+    logs = load_profile_logs(db, chunk_size=chunk_size)
+    base_speeds = reverse_calculate_base_speeds(
+        logs["real_walking_speed_kmh"], logs["slope_factor"], logs["weather_factor"]
+    )
+    existing = {
+        row.user_id: row
+        for row in db.execute(
+            select(
+                ActivitySpeedProfile.user_id,
+                ActivitySpeedProfile.profile_id,
+                ActivitySpeedProfile.speed_case1,
+                ActivitySpeedProfile.data_points_count,
+            ).where(ActivitySpeedProfile.activity_type == ACTIVITY_TYPE)
+        )
+    }
+    # 기존 프로필이 있는 사용자는 회원가입 기본 프로필에서 시작
+    replayed = replay_weighted_average(logs["user_id"], base_speeds, seeded_user_ids=existing)
+
+    changes = []
+    for user_id, speed, count in zip(
+        replayed.user_id.tolist(), np.round(replayed.speed_kmh, 2).tolist(), replayed.data_points_count.tolist()
+    ):
+        current = existing.get(user_id)
+        changes.append(ProfileChange(
+            user_id=user_id,
+            profile_id=current.profile_id if current else None,
+            old_speed_kmh=float(current.speed_case1) if current and current.speed_case1 is not None else None,
+            new_speed_kmh=speed,
+            old_count=current.data_points_count if current else None,
+            new_count=count,
+        ))
+    return changes
+
+
+def apply_recalibration(db: Session, changes: List[ProfileChange]) -> Dict[str, int]:
+    """변경 목록을 프로필에 반영 (UPDATE/INSERT 각 1번, 한 트랜잭션)"""
+    updates = [
+        {
+            "b_profile_id": change.profile_id,
+            "b_speed_case1": change.new_speed_kmh,
+            "b_speed_case2": round(change.new_speed_kmh * SLOW_WALK_SPEED_RATIO, 2),
+            "b_data_points_count": change.new_count,
+        }
+        for change in changes
+        if change.profile_id is not None
+        and (change.old_speed_kmh != change.new_speed_kmh or change.old_count != change.new_count)
+    ]
+    inserts = [
+        {
+            "user_id": change.user_id,
+            "activity_type": ACTIVITY_TYPE,
+            "speed_case1": change.new_speed_kmh,
+            "speed_case2": round(change.new_speed_kmh * SLOW_WALK_SPEED_RATIO, 2),
+            "data_points_count": change.new_count,
+        }
+        for change in changes
+        if change.profile_id is None
+    ]
+
+    table = ActivitySpeedProfile.__table__
+    try:
+        if updates:
+            db.execute(
+                update(table)
+                .where(table.c.profile_id == bindparam("b_profile_id"))
+                .values(
+                    speed_case1=bindparam("b_speed_case1"),
+                    speed_case2=bindparam("b_speed_case2"),
+                    data_points_count=bindparam("b_data_points_count"),
+                ),
+                updates,
+            )
+        if inserts:
+            db.execute(insert(table), inserts)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {"updated": len(updates), "inserted": len(inserts)}
@@ -0,0 +1,105 @@
+"""
+크기 제한 LRU + TTL 인메모리 캐시 (스레드 안전)
+
+외부 API 응답처럼 키 하나에 값 하나를 일정 시간 보관하는 용도입니다.
+인메모리 캐시의 공통 구현이며, 사용자별 캐시는 이 클래스 위에 키 규칙만 더합니다.
+(principal_cache.PrincipalCache, speed_profile_cache.SpeedProfileCache)
+
+환경 변수 (prefix 예: ELEVATION_CACHE):
+- {PREFIX}_MAX_ENTRIES: 최대 항목 수 (0이면 캐시 사용 안 함)
+- {PREFIX}_TTL: 항목 유효 시간 (초)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """키 → 값 크기 제한 LRU + TTL 캐시"""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 600.0):
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def from_env(
+        cls,
+        prefix: str,
+        default_max_entries: int = 1000,
+        default_ttl: float = 600.0,
+    ) -> "TTLCache":
+        """환경 변수({prefix}_MAX_ENTRIES, {prefix}_TTL)에서 설정을 읽어 생성"""
+        return cls(
+            max_entries=int(os.getenv(f"{prefix}_MAX_ENTRIES", str(default_max_entries))),
+            ttl_seconds=float(os.getenv(f"{prefix}_TTL", str(default_ttl))),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Optional[Any]]:
+        """
+        값 조회
+
+        Returns:
+            (적중 여부, 값) - None을 저장한 키도 적중으로 처리 (빈 조회 결과 캐시용)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return True, value
+                del self._entries[key]
+            self._misses += 1
+            return False, None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """값 조회 (없거나 만료되면 None)"""
+        return self.lookup(key)[1]
+
+    def set(self, key: Hashable, value: Any):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return entry[0] if entry is not None else None
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """키가 조건에 맞는 항목 모두 삭제 (삭제한 개수 반환)"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
@@ -0,0 +1,385 @@
+"""
+외부 API(Google Elevation, 기상청, Tmap) 호출 제어 - 요청 한도 + 회로 차단기
+
+외부 API가 장애일 때 요청마다 타임아웃/재시도를 반복하면 대기 중인 코루틴이 쌓이고,
+일일 한도를 배치/미리 가져오기 작업이 다 써버리면 사용자 요청이 실패합니다.
+UpstreamGovernor는 API별로 하나씩 두고 모든 호출이 거쳐 가도록 합니다.
+
+- API 키별 토큰 버킷 (초당 요청 수 + 순간 허용량) 과 일일 한도 (KST 자정 초기화)
+- 우선순위: interactive(사용자 요청)는 토큰을 잠시 기다리고,
+  batch(배치/미리 가져오기)는 기다리지 않으며 버킷 여유분과 일일 한도 일부만 사용
+- 회로 차단기: 연속 실패가 기준을 넘으면 일정 시간 호출하지 않고 바로 실패 (캐시/대체 경로 사용)
+  → 시간이 지나면 요청 1개만 시험 호출하여 성공하면 복구
+
+호출 쪽은 UpstreamUnavailableError를 받으면 캐시/평지 추정 같은 대체 경로를 쓰거나 503을 반환합니다.
+상태 조회: GET /api/admin/upstreams (X-Admin-Token)
+
+환경 변수 (prefix 예: UPSTREAM_KMA):
+- {PREFIX}_RATE_PER_SECOND / {PREFIX}_BURST: 토큰 버킷 (API 키별)
+- {PREFIX}_DAILY_QUOTA: API 키별 일일 요청 수 (0이면 제한 없음)
+- {PREFIX}_MAX_WAIT: interactive 요청이 토큰을 기다리는 최대 시간 (초)
+- {PREFIX}_FAILURE_THRESHOLD: 회로를 여는 연속 실패 수
+- {PREFIX}_OPEN_SECONDS: 회로를 연 뒤 다시 시험 호출할 때까지의 시간 (초)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+# batch 요청은 버킷에 이만큼(비율)의 토큰을 남겨 두고, 일일 한도도 이 비율까지만 사용
+BATCH_RESERVE_RATIO = 0.5
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class UpstreamUnavailableError(RuntimeError):
+    """회로 차단/요청 한도 초과로 외부 API를 호출하지 않을 때 발생"""
+
+    def __init__(self, upstream: str, reason: str, retry_after: float):
+        self.upstream = upstream
+        self.reason = reason
+        self.retry_after = max(1, int(retry_after + 0.999))
+        super().__init__(f"{upstream} API를 일시적으로 사용할 수 없습니다 ({reason})")
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self._updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_take(self, reserve: float = 0.0) -> bool:
+        """토큰 1개 사용 (reserve개는 남겨 둠)"""
+        self._refill()
+        if self.tokens - 1.0 < reserve:
+            return False
+        self.tokens -= 1.0
+        return True
+
+    def wait_time(self, reserve: float = 0.0) -> float:
+        """토큰을 쓸 수 있을 때까지 남은 시간 (초)"""
+        self._refill()
+        missing = reserve + 1.0 - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float("inf")
+
+
+class CircuitBreaker:
+    """연속 실패 기준 회로 차단기 (closed → open → half_open → closed)"""
+
+    def __init__(self, failure_threshold: int = 5, open_seconds: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def retry_after(self) -> float:
+        """호출 가능하면 0, 아니면 다시 시도할 수 있을 때까지의 시간 (초)"""
+        if self.state == OPEN:
+            remaining = self.opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                return remaining
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and self._probe_in_flight:
+            return 1.0
+        return 0.0
+
+    def start_call(self):
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = True
+
+    def end_call(self):
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+
+class UpstreamCall:
+    """request() 블록 안에서 예외 없이 실패를 기록할 때 사용 (재시도할 응답 등)"""
+
+    def __init__(self):
+        self.failed = False
+
+    def mark_failure(self):
+        self.failed = True
+
+
+def _is_upstream_failure(exc: Exception) -> bool:
+    """외부 API 장애로 볼 예외인지 (요청 자체가 잘못된 4xx는 제외, 429는 포함)"""
+    if isinstance(exc, HTTPException):
+        return exc.status_code >= 500 or exc.status_code == 429
+    return True
+
+
+def _key_id(api_key: Optional[str]) -> str:
+    """상태 조회용 API 키 식별자 (키 원문 대신 해시 앞부분)"""
+    if not api_key:
+        return "default"
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:8]
+
+
+class UpstreamGovernor:
+    """외부 API 하나의 요청 한도 + 회로 차단기"""
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_second: float = 5.0,
+        burst: float = 10.0,
+        daily_quota: int = 0,
+        max_wait: float = 2.0,
+        failure_threshold: int = 5,
+        open_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.daily_quota = max(0, daily_quota)
+        self.max_wait = max_wait
+        self.breaker = CircuitBreaker(failure_threshold, open_seconds)
+
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        # API 키별 (KST 날짜, 요청 수)
+        self._daily_usage: Dict[str, list] = {}
+        self._in_flight = 0
+        self._calls = {priority: 0 for priority in PRIORITIES}
+        self._failures = 0
+        self._rejected = {"circuit_open": 0, "rate_limited": 0, "quota_exceeded": 0}
+
+    @classmethod
+    def from_env(
+        cls,
+        name: str,
+        prefix: str,
+        default_rate: float = 5.0,
+        default_burst: float = 10.0,
+        default_daily_quota: int = 0,
+        default_max_wait: float = 2.0,
+        default_failure_threshold: int = 5,
+        default_open_seconds: float = 30.0,
+    ) -> "UpstreamGovernor":
+        """환경 변수({prefix}_RATE_PER_SECOND 등)에서 설정을 읽어 생성"""
+        return cls(
+            name=name,
+            rate_per_second=float(os.getenv(f"{prefix}_RATE_PER_SECOND", default_rate)),
+            burst=float(os.getenv(f"{prefix}_BURST", default_burst)),
+            daily_quota=int(os.getenv(f"{prefix}_DAILY_QUOTA", default_daily_quota)),
+            max_wait=float(os.getenv(f"{prefix}_MAX_WAIT", default_max_wait)),
+            failure_threshold=int(os.getenv(f"{prefix}_FAILURE_THRESHOLD", default_failure_threshold)),
+            open_seconds=float(os.getenv(f"{prefix}_OPEN_SECONDS", default_open_seconds)),
+        )
+
+    def _reject(self, reason: str, retry_after: float):
+        self._rejected[reason] += 1
+        logger.warning(f"[외부 API] {self.name} 호출 거절 - {reason} ({retry_after:.1f}초 후 재시도)")
+        raise UpstreamUnavailableError(self.name, reason, retry_after)
+
+    def _try_acquire(self, key_id: str, priority: str) -> float:
+        """
+        호출 허가 (self._lock 안에서 실행)
+
+        Returns:
+            0이면 허가, 양수면 토큰이 생길 때까지 기다릴 시간 (초)
+        Raises:
+            UpstreamUnavailableError: 회로 차단/일일 한도 초과
+        """
+        retry_after = self.breaker.retry_after()
+        if retry_after > 0:
+            self._reject("circuit_open", retry_after)
+
+        now = datetime.now(KST)
+        today = now.date().isoformat()
+        usage = self._daily_usage.setdefault(key_id, [today, 0])
+        if usage[0] != today:
+            usage[:] = [today, 0]
+        if self.daily_quota:
+            quota = self.daily_quota if priority == INTERACTIVE else int(self.daily_quota * BATCH_RESERVE_RATIO)
+            if usage[1] >= quota:
+                tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), KST)
+                self._reject("quota_exceeded", (tomorrow - now).total_seconds())
+
+        bucket = self._buckets.get(key_id)
+        if bucket is None:
+            bucket = self._buckets[key_id] = TokenBucket(self.rate_per_second, self.burst)
+        reserve = 0.0 if priority == INTERACTIVE else bucket.burst * BATCH_RESERVE_RATIO
+        if not bucket.try_take(reserve):
+            wait = bucket.wait_time(reserve)
+            if priority != INTERACTIVE:
+                self._reject("rate_limited", wait)
+            return wait
+
+        usage[1] += 1
+        self._calls[priority] += 1
+        self._in_flight += 1
+        self.breaker.start_call()
+        return 0.0
+
+    async def acquire(self, api_key: Optional[str] = None, priority: str = INTERACTIVE):
+        """
+        호출 허가를 받을 때까지 대기 (interactive는 최대 max_wait초, batch는 대기 없음)
+
+        Raises:
+            UpstreamUnavailableError: 허가를 받지 못한 경우
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"지원하지 않는 우선순위입니다: {priority} (가능: {PRIORITIES})")
+
+        key_id = _key_id(api_key)
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            with self._lock:
+                wait = self._try_acquire(key_id, priority)
+                if wait == 0:
+                    return
+                if time.monotonic() + wait > deadline:
+                    self._reject("rate_limited", wait)
+            await asyncio.sleep(wait)
+
+    def release(self, failure: Optional[bool]):
+        """호출 결과 기록 (acquire 이후 반드시 한 번 호출, None이면 결과를 모름 - 취소 등)"""
+        with self._lock:
+            self._in_flight -= 1
+            self.breaker.end_call()
+            if failure is None:
+                return
+            if failure:
+                self._failures += 1
+                was_open = self.breaker.state == OPEN
+                self.breaker.record_failure()
+                if self.breaker.state == OPEN and not was_open:
+                    logger.error(
+                        f"[외부 API] {self.name} 회로 차단 - 연속 {self.breaker.consecutive_failures}회 실패, "
+                        f"{self.breaker.open_seconds:.0f}초 동안 호출 중단"
+                    )
+            else:
+                if self.breaker.state != CLOSED:
+                    logger.info(f"[외부 API] {self.name} 회로 복구")
+                self.breaker.record_success()
+
+    @asynccontextmanager
+    async def request(
+        self, api_key: Optional[str] = None, priority: str = INTERACTIVE
+    ) -> AsyncIterator[UpstreamCall]:
+        """
+        외부 API 호출 1번을 감싸는 컨텍스트
+
+        블록에서 예외가 나면 실패로 기록합니다 (4xx HTTPException 제외, 취소는 기록하지 않음).
+        예외 없이 실패로 볼 응답은 call.mark_failure()로 표시합니다.
+
+        사용 예:
+            async with kma_governor.request(api_key=key) as call:
+                ...
+        """
+        await self.acquire(api_key, priority)
+        call = UpstreamCall()
+        try:
+            yield call
+        except BaseException as exc:
+            # 취소 등 Exception이 아닌 경우는 결과를 알 수 없으므로 회로 상태는 그대로
+            self.release(failure=_is_upstream_failure(exc) if isinstance(exc, Exception) else None)
+            raise
+        else:
+            self.release(failure=call.failed)
+
+    def _used_today(self, key_id: str, today: str) -> int:
+        day, count = self._daily_usage.get(key_id, (today, 0))
+        return count if day == today else 0
+
+    def reset(self):
+        """회로를 닫고 버킷을 다시 채움 (관리자 수동 복구용)"""
+        with self._lock:
+            self.breaker.record_success()
+            self._buckets.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 현재 상태"""
+        with self._lock:
+            self.breaker.retry_after()  # open 시간이 지났으면 half_open으로 표시
+            today = datetime.now(KST).date().isoformat()
+            return {
+                "name": self.name,
+                "circuit": {
+                    "state": self.breaker.state,
+                    "consecutive_failures": self.breaker.consecutive_failures,
+                    "failure_threshold": self.breaker.failure_threshold,
+                    "open_seconds": self.breaker.open_seconds,
+                    "retry_after": round(self.breaker.retry_after(), 1),
+                    "times_opened": self.breaker.times_opened,
+                },
+                "rate_per_second": self.rate_per_second,
+                "burst": self.burst,
+                "daily_quota": self.daily_quota,
+                "keys": {
+                    key_id: {
+                        "tokens": round(bucket.tokens, 2),
+                        "used_today": self._used_today(key_id, today),
+                    }
+                    for key_id, bucket in self._buckets.items()
+                },
+                "in_flight": self._in_flight,
+                "calls": dict(self._calls),
+                "failures": self._failures,
+                "rejected": dict(self._rejected),
+            }
+
+
+# Google Elevation API (요금제 기준 초당 한도, 일일 한도는 결제 설정에 따름)
+elevation_governor = UpstreamGovernor.from_env(
+    "google_elevation", "UPSTREAM_GOOGLE_ELEVATION", default_rate=10.0, default_burst=20.0
+)
+
+# 기상청 단기예보 API (공공데이터포털 개발 계정 일일 10,000건)
+kma_governor = UpstreamGovernor.from_env(
+    "kma", "UPSTREAM_KMA", default_rate=5.0, default_burst=10.0, default_daily_quota=10000
+)
+
+# Tmap 보행자/대중교통 경로 API
+tmap_governor = UpstreamGovernor.from_env(
+    "tmap", "UPSTREAM_TMAP", default_rate=5.0, default_burst=10.0
+)
+
+upstream_governors: Dict[str, UpstreamGovernor] = {
+    governor.name: governor for governor in (elevation_governor, kma_governor, tmap_governor)
+}
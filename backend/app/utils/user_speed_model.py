@@ -0,0 +1,217 @@
+"""
+사용자별 경사도/날씨 민감도 온라인 회귀 모델
+
+속도 프로필(speed_case1)은 평지+맑은날 기준 속도 하나뿐이고, 경사도/날씨 영향은
+모든 사용자에게 같은 계수(Tobler, WeatherSpeedModel)를 씁니다.
+사용자마다 오르막에서 더 느려지거나 비에 덜 민감한 정도를 로그에서 학습합니다.
+
+모델 (로그 1건 = 관측 1개):
+    y = ln(실측 속도 × slope_factor × weather_factor)   # 모집단 계수로 역산한 기준 속도의 로그
+    x = [1, ln(slope_factor), |기온 - 10°C| / 10, ln(1 + 강수량 mm/h)]
+    y ≈ x · β
+
+모집단 계수가 이 사용자에게 정확하면 β[1:] = 0 입니다.
+- 경사도: 시간 계수 = slope_factor ^ (1 - β1)   → slope_exponent (모집단 1.0)
+- 날씨: 시간 계수 = weather_factor × exp(-(β2·기온 편차 + β3·강수))
+
+로그마다 충분 통계량(XᵀX, Xᵀy, yᵀy, n)만 더하므로 이력을 다시 읽지 않고 O(1)로 갱신합니다.
+민감도는 모집단 값(0)으로 당기는 ridge 정규화로 풀어 로그가 적을 때 과하게 흔들리지 않습니다.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+from app.utils.speed_profile_cache import SpeedProfileCache
+
+FEATURE_NAMES = ("intercept", "slope", "temperature", "precipitation")
+N_FEATURES = len(FEATURE_NAMES)
+
+# WeatherSpeedModel의 쾌적 기온 (comfort 가우시안 중심) / 기온 편차 단위
+COMFORT_TEMPERATURE_C = 10.0
+TEMPERATURE_SCALE_C = 10.0
+
+# 민감도 정규화 강도 (모집단 값 쪽으로 당기는 가상 관측 수) / 특성별 전형적인 크기
+PRIOR_STRENGTH = 5.0
+FEATURE_SCALES = (0.0, 0.1, 1.0, 1.0)
+
+# 개인 민감도를 적용하는 최소 로그 수
+MIN_MODEL_LOGS = 5
+
+# 안전 범위
+SLOPE_EXPONENT_RANGE = (0.5, 2.0)
+WEATHER_COEF_RANGE = (-0.3, 0.3)
+
+# 충분 통계량 직렬화: n, XᵀX 상삼각(10), Xᵀy(4), yᵀy → float64 16개 (128 bytes)
+_TRIU = np.triu_indices(N_FEATURES)
+STATS_SIZE = 1 + len(_TRIU[0]) + N_FEATURES + 1
+
+
+def speed_features(
+    slope_factor: float,
+    temperature_c: Optional[float] = None,
+    precipitation_mm: Optional[float] = None,
+) -> np.ndarray:
+    """
+    관측 특성 벡터 x
+
+    날씨 값이 없으면 쾌적 기온/강수 없음으로 봅니다 (해당 민감도에 영향 없음).
+    """
+    temperature_dev = (
+        abs(float(temperature_c) - COMFORT_TEMPERATURE_C) / TEMPERATURE_SCALE_C
+        if temperature_c is not None
+        else 0.0
+    )
+    precipitation = math.log1p(max(float(precipitation_mm or 0.0), 0.0))
+    return np.array(
+        [1.0, math.log(float(slope_factor)), temperature_dev, precipitation], dtype=np.float64
+    )
+
+
+@dataclass
+class SpeedModelStats:
+    """최소제곱 충분 통계량"""
+
+    n: int = 0
+    xtx: np.ndarray = field(default_factory=lambda: np.zeros((N_FEATURES, N_FEATURES)))
+    xty: np.ndarray = field(default_factory=lambda: np.zeros(N_FEATURES))
+    yty: float = 0.0
+
+    def add(self, x: np.ndarray, y: float) -> None:
+        """관측 1개 추가 (O(1))"""
+        self.n += 1
+        self.xtx += np.outer(x, x)
+        self.xty += x * y
+        self.yty += y * y
+
+    def solve(self) -> np.ndarray:
+        """ridge 해 β (민감도만 정규화, 절편은 자유)"""
+        penalty = PRIOR_STRENGTH * np.square(FEATURE_SCALES)
+        penalty[0] = 1e-9
+        return np.linalg.solve(self.xtx + np.diag(penalty), self.xty)
+
+    def to_bytes(self) -> bytes:
+        values = np.concatenate(([self.n], self.xtx[_TRIU], self.xty, [self.yty]))
+        return values.astype("<f8").tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> "SpeedModelStats":
+        if not data:
+            return cls()
+        values = np.frombuffer(bytes(data), dtype="<f8", count=STATS_SIZE)
+        xtx = np.zeros((N_FEATURES, N_FEATURES))
+        xtx[_TRIU] = values[1:1 + len(_TRIU[0])]
+        xtx = xtx + np.triu(xtx, 1).T
+        return cls(
+            n=int(values[0]),
+            xtx=xtx,
+            xty=values[1 + len(_TRIU[0]):-1].copy(),
+            yty=float(values[-1]),
+        )
+
+
+class PersonalSpeedModel(NamedTuple):
+    """경로 시간 계산에 쓰는 개인 민감도 (캐시/프로세스 풀 전달용 불변 값)"""
+
+    log_count: int
+    base_speed_kmh: float  # 모델 절편 (평지+맑은날+쾌적 기온 기준 속도)
+    slope_exponent: float  # 모집단 1.0
+    temperature_coef: float  # 모집단 0.0 (기온 편차 10°C당 시간 로그 증가)
+    precipitation_coef: float  # 모집단 0.0 (ln(1+mm/h)당 시간 로그 증가)
+
+    @classmethod
+    def from_stats(cls, stats: SpeedModelStats) -> "PersonalSpeedModel":
+        beta = stats.solve()
+        return cls(
+            log_count=stats.n,
+            base_speed_kmh=round(math.exp(beta[0]), 2),
+            slope_exponent=round(float(np.clip(1.0 - beta[1], *SLOPE_EXPONENT_RANGE)), 3),
+            temperature_coef=round(float(np.clip(-beta[2], *WEATHER_COEF_RANGE)), 3) + 0.0,
+            precipitation_coef=round(float(np.clip(-beta[3], *WEATHER_COEF_RANGE)), 3) + 0.0,
+        )
+
+    @classmethod
+    def from_row(cls, row) -> "PersonalSpeedModel":
+        """UserSpeedModels 행 → 캐시 값"""
+        return cls(
+            log_count=row.log_count,
+            base_speed_kmh=float(row.base_speed_kmh),
+            slope_exponent=float(row.slope_exponent),
+            temperature_coef=float(row.temperature_coef),
+            precipitation_coef=float(row.precipitation_coef),
+        )
+
+    @property
+    def is_active(self) -> bool:
+        return self.log_count >= MIN_MODEL_LOGS
+
+    def personalize_slope_factor(self, slope_factor: float) -> float:
+        """모집단 경사도 계수 → 개인 경사도 계수"""
+        if not self.is_active or slope_factor <= 0:
+            return slope_factor
+        return slope_factor ** self.slope_exponent
+
+    def personalize_weather_factor(self, weather_factor: float, weather_data: Optional[Dict]) -> float:
+        """모집단 날씨 계수 → 개인 날씨 계수 (weather_data는 calculate_weather_factor 입력과 같은 형식)"""
+        if not self.is_active or weather_data is None:
+            return weather_factor
+        x = speed_features(1.0, weather_data.get("temp_c", 15), weather_data.get("rain_mm_per_h"))
+        return weather_factor * math.exp(self.temperature_coef * x[2] + self.precipitation_coef * x[3])
+
+
+speed_model_cache = SpeedProfileCache.from_env(from_row=PersonalSpeedModel.from_row)
+
+
+def get_user_speed_model(db, user_id: int, activity_type: str = "walking") -> Optional[PersonalSpeedModel]:
+    """
+    개인 보행 모델 조회 (캐시 → 없으면 해당 행만 조회 후 캐시)
+
+    Returns:
+        모델 값, 아직 로그가 없으면 None
+    """
+    hit, value = speed_model_cache.lookup(user_id, activity_type)
+    if hit:
+        return value
+
+    from app.models import UserSpeedModels
+
+    row = (
+        db.query(
+            UserSpeedModels.log_count,
+            UserSpeedModels.base_speed_kmh,
+            UserSpeedModels.slope_exponent,
+            UserSpeedModels.temperature_coef,
+            UserSpeedModels.precipitation_coef,
+        )
+        .filter(UserSpeedModels.user_id == user_id, UserSpeedModels.activity_type == activity_type)
+        .first()
+    )
+    value = PersonalSpeedModel.from_row(row) if row is not None else None
+    speed_model_cache.set(user_id, activity_type, value)
+    return value
+
+
+async def resolve_user_speed_model(user_id: Optional[int]) -> Optional[PersonalSpeedModel]:
+    """
+    경로 분석용 개인 보행 모델 (로그가 MIN_MODEL_LOGS개 미만이면 None)
+
+    캐시에 있으면 DB 없이 바로 반환하고, 없을 때만 DB 스레드 풀에서 조회합니다.
+    """
+    if user_id is None:
+        return None
+    hit, model = speed_model_cache.lookup(user_id, "walking")
+    if not hit:
+        from app.database import SessionLocal, run_db
+
+        def _load():
+            db = SessionLocal()
+            try:
+                return get_user_speed_model(db, user_id)
+            finally:
+                db.close()
+
+        model = await run_db(_load)
+
+    return model if model is not None and model.is_active else None
@@ -3,19 +3,32 @@
 Tmap 보행자 경로 API를 호출하여 도보 경로를 제공
 """
 
+import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiohttp
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from .elevation_helpers import analyze_route_elevation
+from .elevation_helpers import prepare_route_elevation
+from .route_deadline import (
+    analyze_prepared_within_deadline,
+    analyze_route_within_deadline,
+    get_background_analysis,
+)
+from .speed_profile_cache import resolve_user_speed_mps
+from .upstream_governor import UpstreamUnavailableError, tmap_governor
+from .user_speed_model import resolve_user_speed_model
 
 router = APIRouter(prefix="/walking", tags=["walking"])
 logger = logging.getLogger(__name__)
 
+TMAP_PEDESTRIAN_URL = "https://apis.openapi.sk.com/tmap/routes/pedestrian"
+TMAP_BASE_SPEED_MPS = 1.111  # 4 km/h = 1.111 m/s (Tmap 기준)
+
 
 class WalkingRouteRequest(BaseModel):
     """보행자 경로 요청 모델"""
@@ -27,6 +40,7 @@ class WalkingRouteRequest(BaseModel):
     start_name: Optional[str] = None
     end_name: Optional[str] = None
     user_speed_mps: Optional[float] = None  # 사용자 보행속도 (m/s)
+    user_id: Optional[int] = None  # user_speed_mps가 없으면 서버에서 사용자 속도 프로필 사용 (개인 경사도/날씨 민감도도 적용)
     weather_data: Optional[Dict[str, Any]] = None  # 날씨 데이터
 
 
@@ -38,6 +52,236 @@ class WalkingRouteResponse(BaseModel):
     properties: Dict[str, Any]
 
 
+async def _fetch_pedestrian_route(request: WalkingRouteRequest) -> Dict[str, Any]:
+    """
+    Tmap 보행자 경로 API 호출
+
+    Returns:
+        검증된 GeoJSON FeatureCollection (features가 비어있지 않음)
+
+    Raises:
+        UpstreamUnavailableError: 회로 차단/요청 한도 초과로 호출하지 않은 경우
+    """
+    # Tmap API Key 가져오기 (대중교통 API와 동일한 Key 사용)
+    tmap_api_key = os.getenv("TMAP_APPKEY")
+    if not tmap_api_key:
+        raise ValueError("TMAP_APPKEY 환경변수가 설정되지 않았습니다.")
+
+    headers = {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+        "appKey": tmap_api_key,
+    }
+
+    payload = {
+        "startX": request.start_x,
+        "startY": request.start_y,
+        "endX": request.end_x,
+        "endY": request.end_y,
+        "reqCoordType": "WGS84GEO",
+        "resCoordType": "WGS84GEO",
+        "searchOption": "0",  # 0: 추천 경로
+        "sort": "index",
+    }
+
+    # 출발지/도착지 이름이 있으면 추가
+    if request.start_name:
+        payload["startName"] = request.start_name
+    if request.end_name:
+        payload["endName"] = request.end_name
+
+    logger.info(
+        f"[보행자 경로] API 호출 시작: {request.start_name or '출발지'} → {request.end_name or '도착지'}"
+    )
+
+    async with tmap_governor.request(api_key=tmap_api_key), aiohttp.ClientSession() as session:
+        async with session.post(
+            f"{TMAP_PEDESTRIAN_URL}?version=1",
+            headers=headers,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=30),
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(
+                    f"[보행자 경로] Tmap API 오류: {response.status} - {error_text}"
+                )
+                raise HTTPException(
+                    status_code=response.status,
+                    detail=f"Tmap API 오류: {error_text}",
+                )
+
+            data = await response.json()
+
+    # GeoJSON 데이터 검증
+    if not isinstance(data, dict) or data.get("type") != "FeatureCollection":
+        logger.error(f"[보행자 경로] 잘못된 응답 형식: {data}")
+        raise HTTPException(
+            status_code=500,
+            detail="Tmap API 응답 형식이 올바르지 않습니다.",
+        )
+
+    if not data.get("features"):
+        logger.warning("[보행자 경로] 경로 데이터가 비어있습니다.")
+        raise HTTPException(status_code=404, detail="경로를 찾을 수 없습니다.")
+
+    return data
+
+
+def _build_route_body(request: WalkingRouteRequest, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Tmap 응답 → 경로 응답 본문 (elevation_analysis 제외)
+
+    대중교통과 동일한 구조(metaData.plan.itineraries)로 변환하여 프론트엔드 호환성 확보
+    """
+    features = data.get("features", [])
+
+    # 총 거리 및 시간 추출 (첫 번째 feature의 properties에서)
+    total_distance = 0
+    total_time = 0
+
+    if features and features[0].get("properties"):
+        props = features[0]["properties"]
+        total_distance = props.get("totalDistance", 0)
+        total_time = props.get("totalTime", 0)
+
+    logger.info(
+        f"[보행자 경로] 성공 - 거리: {total_distance}m, "
+        f"시간: {total_time}초, features: {len(features)}개"
+    )
+
+    # ===== 중요: 4km/h 기준으로 재계산 =====
+    # Tmap API가 반환한 시간이 아닌, 거리를 4km/h로 나눈 기준 시간 사용
+    # 이후 사용자 속도, 경사도, 날씨로 보정
+    recalculated_base_time = (
+        int(total_distance / TMAP_BASE_SPEED_MPS)
+        if TMAP_BASE_SPEED_MPS > 0
+        else total_time
+    )
+
+    logger.info(
+        f"[보행자 경로] 시간 재계산\n"
+        f"  - API 반환 시간: {total_time}초 ({total_time//60}분 {total_time%60}초)\n"
+        f"  - 거리: {total_distance}m\n"
+        f"  - 4km/h 기준 재계산: {recalculated_base_time}초 ({recalculated_base_time//60}분 {recalculated_base_time%60}초)"
+    )
+
+    # GeoJSON을 Itinerary 형식으로 변환하여 경사도 분석
+    itinerary = {
+        "legs": [
+            {
+                "mode": "WALK",
+                "sectionTime": recalculated_base_time,  # 재계산된 기준 시간 사용
+                "distance": total_distance,
+                "start": {
+                    "lat": request.start_y,
+                    "lon": request.start_x,
+                    "name": request.start_name or "출발지",
+                },
+                "end": {
+                    "lat": request.end_y,
+                    "lon": request.end_x,
+                    "name": request.end_name or "도착지",
+                },
+                "steps": [],
+            }
+        ],
+        "totalTime": recalculated_base_time,  # 재계산된 시간
+        "totalWalkTime": recalculated_base_time,  # 재계산된 시간
+        "totalDistance": total_distance,
+        "totalWalkDistance": total_distance,
+    }
+
+    # GeoJSON features에서 linestring 추출하여 steps에 추가
+    # Point feature의 description을 다음 LineString에 병합
+    point_description = None
+
+    for feature in features:
+        geometry_type = feature.get("geometry", {}).get("type")
+        properties = feature.get("properties", {})
+
+        # Point: 다음 LineString에 사용할 description 저장
+        if geometry_type == "Point":
+            turn_type = properties.get("turnType")
+            # 출발점(200)과 도착점(201)은 제외
+            if turn_type not in [200, 201]:
+                point_description = properties.get("description", "")
+
+        # LineString: 실제 이동 구간
+        elif geometry_type == "LineString":
+            coords = feature["geometry"].get("coordinates", [])
+            if coords:
+                # 좌표를 "lng,lat" 형식의 문자열로 변환
+                linestring = " ".join([f"{lng},{lat}" for lng, lat in coords])
+
+                # Point description이 있으면 사용, 없으면 LineString description 사용
+                description = point_description or properties.get("description", "")
+                point_description = None  # 사용 후 초기화
+
+                itinerary["legs"][0]["steps"].append(
+                    {
+                        "linestring": linestring,
+                        "distance": properties.get("distance", 0),
+                        "description": description,
+                        "roadName": properties.get("name", ""),
+                        "turnType": properties.get("turnType"),
+                    }
+                )
+
+    return {
+        "type": data.get("type"),
+        "features": features,
+        "properties": {
+            "totalDistance": total_distance,
+            "totalTime": recalculated_base_time,  # 재계산된 기준 시간 반환
+            "totalWalkTime": recalculated_base_time,  # 재계산된 기준 시간
+            "originalTime": total_time,  # API 원본 시간 (참고용)
+            "mode": "WALK",
+        },
+        # 대중교통과 동일한 구조 추가 (상세 경로 표시용)
+        "metaData": {
+            "plan": {
+                "itineraries": [itinerary]  # 이미 변환된 itinerary 사용
+            }
+        },
+    }
+
+
+def _failed_elevation_analysis(
+    error: Exception, base_time: int, user_speed_mps: Optional[float]
+) -> Dict[str, Any]:
+    """경사도 분석 실패 시 결과 (보정 없이 기준 시간 사용)"""
+    return {
+        "error": str(error),
+        "crosswalk_count": 0,  # 분석 실패 시 횡단보도 정보 없음
+        "factors": {
+            "user_speed_factor": 1,
+            "slope_factor": 1,
+            "weather_factor": 1,
+            "final_factor": 1,
+        },
+        "walk_legs_analysis": [],
+        "total_original_walk_time": base_time,
+        "total_adjusted_walk_time": base_time,
+        "total_route_time_adjustment": 0,
+        "weather_applied": False,
+        "user_speed_mps": user_speed_mps or TMAP_BASE_SPEED_MPS,
+    }
+
+
+def _log_elevation_analysis(elevation_analysis: Optional[Dict[str, Any]]):
+    logger.info(f"[보행자 경로] 경사도 분석 완료: {elevation_analysis is not None}")
+    if elevation_analysis:
+        logger.info(
+            f"[보행자 경로] 횡단보도: {elevation_analysis.get('crosswalk_count', 0)}개, "
+            f"대기시간: {elevation_analysis.get('crosswalk_wait_time', 0)}초"
+        )
+    if elevation_analysis and elevation_analysis.get("error"):
+        logger.warning(
+            f"[보행자 경로] 경사도 분석 에러: {elevation_analysis['error']}"
+        )
+
+
 @router.post("/route", response_model=Dict[str, Any])
 async def get_walking_route(request: WalkingRouteRequest):
     """
@@ -53,250 +297,170 @@ async def get_walking_route(request: WalkingRouteRequest):
         - properties: 총 거리, 총 시간 등 요약 정보
     """
     try:
-        # Tmap API Key 가져오기 (대중교통 API와 동일한 Key 사용)
-        tmap_api_key = os.getenv("TMAP_APPKEY")
-        if not tmap_api_key:
-            raise ValueError("TMAP_APPKEY 환경변수가 설정되지 않았습니다.")
-
-        # Tmap 보행자 경로 API 호출
-        url = "https://apis.openapi.sk.com/tmap/routes/pedestrian"
-
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "appKey": tmap_api_key,
-        }
-
-        payload = {
-            "startX": request.start_x,
-            "startY": request.start_y,
-            "endX": request.end_x,
-            "endY": request.end_y,
-            "reqCoordType": "WGS84GEO",
-            "resCoordType": "WGS84GEO",
-            "searchOption": "0",  # 0: 추천 경로
-            "sort": "index",
-        }
-
-        # 출발지/도착지 이름이 있으면 추가
-        if request.start_name:
-            payload["startName"] = request.start_name
-        if request.end_name:
-            payload["endName"] = request.end_name
+        data = await _fetch_pedestrian_route(request)
+        result = _build_route_body(request, data)
+        itinerary = result["metaData"]["plan"]["itineraries"][0]
+        base_time = result["properties"]["totalTime"]
+
+        # 경사도/날씨/속도 분석 수행 (횡단보도 계산 포함)
+        elevation_analysis = None
+        user_speed_mps = request.user_speed_mps
+        try:
+            user_speed_mps = await resolve_user_speed_mps(
+                request.user_speed_mps, request.user_id
+            )
+            # 마감 시간(ROUTE_ANALYSIS_DEADLINE) 초과 시 평지 추정 결과 (provisional)
+            elevation_analysis = await analyze_route_within_deadline(
+                itinerary=itinerary,
+                api_key=None,  # Google API 키는 elevation_helpers에서 자동으로 가져옴
+                weather_data=request.weather_data,
+                user_speed_mps=user_speed_mps,
+                speed_model=await resolve_user_speed_model(request.user_id),
+            )
+            _log_elevation_analysis(elevation_analysis)
+        except Exception as e:
+            logger.error(f"[보행자 경로] 경사도 분석 실패: {e}", exc_info=True)
+            elevation_analysis = _failed_elevation_analysis(e, base_time, user_speed_mps)
+
+        # 응답 데이터에 경사도 분석 결과 추가
+        result["elevation_analysis"] = elevation_analysis
+        return result
+
+    except HTTPException:
+        raise
+    except UpstreamUnavailableError as e:
+        logger.warning(f"[보행자 경로] {e}")
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+        )
+    except aiohttp.ClientError as e:
+        logger.error(f"[보행자 경로] 네트워크 오류: {e}")
+        raise HTTPException(status_code=503, detail=f"Tmap API 연결 실패: {str(e)}")
+    except ValueError as e:
+        logger.error(f"[보행자 경로] 설정 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        logger.error(f"[보행자 경로] 예상치 못한 오류: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"보행자 경로 검색 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+def _ndjson_event(event: str, **payload) -> str:
+    return json.dumps({"event": event, **payload}, ensure_ascii=False, default=str) + "\n"
+
+
+async def _stream_route_analysis(
+    request: WalkingRouteRequest, result: Dict[str, Any]
+) -> AsyncIterator[str]:
+    """
+    경로 → 횡단보도 → 최종 예상 시간 순으로 NDJSON 이벤트 생성
+
+    고도는 경로 전체 좌표를 한 번에 조회하고 구간 계산도 한 번에 하므로 구간별 결과가 따로 끝나지 않습니다.
+    구간별 경사도는 eta의 walk_legs_analysis로 함께 보냅니다.
+    분석 중 오류가 나도 스트림은 /walking/route와 같은 실패 결과로 eta 이벤트를 보내고 끝납니다.
+    """
+    yield _ndjson_event("route", **result)
+
+    itinerary = result["metaData"]["plan"]["itineraries"][0]
+    base_time = result["properties"]["totalTime"]
+    user_speed_mps = request.user_speed_mps
+    try:
+        api_key = os.getenv("GOOGLE_ELEVATION_API_KEY")
+        if not api_key:
+            raise ValueError("Google Elevation API 키가 설정되지 않았습니다.")
 
-        logger.info(
-            f"[보행자 경로] API 호출 시작: {request.start_name or '출발지'} → {request.end_name or '도착지'}"
+        user_speed_mps = await resolve_user_speed_mps(
+            request.user_speed_mps, request.user_id
+        )
+        prepared = await prepare_route_elevation(itinerary)
+
+        crosswalk_result = prepared.get("crosswalk_result") or {"count": 0, "total_wait_time": 0}
+        yield _ndjson_event(
+            "crosswalks",
+            crosswalk_count=crosswalk_result["count"],
+            crosswalk_wait_time=crosswalk_result["total_wait_time"],
+            crosswalk_wait_time_adjusted=int(crosswalk_result["total_wait_time"] / 3),
         )
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{url}?version=1",
-                headers=headers,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(
-                        f"[보행자 경로] Tmap API 오류: {response.status} - {error_text}"
-                    )
-                    raise HTTPException(
-                        status_code=response.status,
-                        detail=f"Tmap API 오류: {error_text}",
-                    )
-
-                data = await response.json()
-
-                # GeoJSON 데이터 검증
-                if (
-                    not isinstance(data, dict)
-                    or data.get("type") != "FeatureCollection"
-                ):
-                    logger.error(f"[보행자 경로] 잘못된 응답 형식: {data}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Tmap API 응답 형식이 올바르지 않습니다.",
-                    )
-
-                features = data.get("features", [])
-                if not features:
-                    logger.warning("[보행자 경로] 경로 데이터가 비어있습니다.")
-                    raise HTTPException(
-                        status_code=404, detail="경로를 찾을 수 없습니다."
-                    )
-
-                # 총 거리 및 시간 추출 (첫 번째 feature의 properties에서)
-                total_distance = 0
-                total_time = 0
-
-                if features and features[0].get("properties"):
-                    props = features[0]["properties"]
-                    total_distance = props.get("totalDistance", 0)
-                    total_time = props.get("totalTime", 0)
-
-                logger.info(
-                    f"[보행자 경로] 성공 - 거리: {total_distance}m, "
-                    f"시간: {total_time}초, features: {len(features)}개"
-                )
+        elevation_analysis = await analyze_prepared_within_deadline(
+            prepared,
+            api_key,
+            weather_data=request.weather_data,
+            user_speed_mps=user_speed_mps,
+            speed_model=await resolve_user_speed_model(request.user_id),
+        )
+        _log_elevation_analysis(elevation_analysis)
+    except Exception as e:
+        logger.error(f"[보행자 경로] 경사도 분석 실패: {e}", exc_info=True)
+        elevation_analysis = _failed_elevation_analysis(e, base_time, user_speed_mps)
 
-                # ===== 중요: 4km/h 기준으로 재계산 =====
-                # Tmap API가 반환한 시간이 아닌, 거리를 4km/h로 나눈 기준 시간 사용
-                # 이후 사용자 속도, 경사도, 날씨로 보정
-                tmap_base_speed_mps = 1.111  # 4 km/h = 1.111 m/s (Tmap 기준)
-                recalculated_base_time = (
-                    int(total_distance / tmap_base_speed_mps)
-                    if tmap_base_speed_mps > 0
-                    else total_time
-                )
+    yield _ndjson_event("eta", elevation_analysis=elevation_analysis)
 
-                logger.info(
-                    f"[보행자 경로] 시간 재계산\n"
-                    f"  - API 반환 시간: {total_time}초 ({total_time//60}분 {total_time%60}초)\n"
-                    f"  - 거리: {total_distance}m\n"
-                    f"  - 4km/h 기준 재계산: {recalculated_base_time}초 ({recalculated_base_time//60}분 {recalculated_base_time%60}초)"
-                )
 
-                # GeoJSON을 Itinerary 형식으로 변환하여 경사도 분석
-                itinerary = {
-                    "legs": [
-                        {
-                            "mode": "WALK",
-                            "sectionTime": recalculated_base_time,  # 재계산된 기준 시간 사용
-                            "distance": total_distance,
-                            "start": {
-                                "lat": request.start_y,
-                                "lon": request.start_x,
-                                "name": request.start_name or "출발지",
-                            },
-                            "end": {
-                                "lat": request.end_y,
-                                "lon": request.end_x,
-                                "name": request.end_name or "도착지",
-                            },
-                            "steps": [],
-                        }
-                    ],
-                    "totalTime": recalculated_base_time,  # 재계산된 시간
-                    "totalWalkTime": recalculated_base_time,  # 재계산된 시간
-                    "totalDistance": total_distance,
-                    "totalWalkDistance": total_distance,
-                }
-
-                # GeoJSON features에서 linestring 추출하여 steps에 추가
-                # Point feature의 description을 다음 LineString에 병합
-                point_description = None
-
-                for feature in features:
-                    geometry_type = feature.get("geometry", {}).get("type")
-                    properties = feature.get("properties", {})
-
-                    # Point: 다음 LineString에 사용할 description 저장
-                    if geometry_type == "Point":
-                        turn_type = properties.get("turnType")
-                        # 출발점(200)과 도착점(201)은 제외
-                        if turn_type not in [200, 201]:
-                            point_description = properties.get("description", "")
-
-                    # LineString: 실제 이동 구간
-                    elif geometry_type == "LineString":
-                        coords = feature["geometry"].get("coordinates", [])
-                        if coords:
-                            # 좌표를 "lng,lat" 형식의 문자열로 변환
-                            linestring = " ".join(
-                                [f"{lng},{lat}" for lng, lat in coords]
-                            )
-
-                            # Point description이 있으면 사용, 없으면 LineString description 사용
-                            description = point_description or properties.get(
-                                "description", ""
-                            )
-                            point_description = None  # 사용 후 초기화
-
-                            itinerary["legs"][0]["steps"].append(
-                                {
-                                    "linestring": linestring,
-                                    "distance": properties.get("distance", 0),
-                                    "description": description,
-                                    "roadName": properties.get("name", ""),
-                                    "turnType": properties.get("turnType"),
-                                }
-                            )
-
-                # 경사도/날씨/속도 분석 수행 (횡단보도 계산 포함)
-                elevation_analysis = None
-                try:
-                    elevation_analysis = await analyze_route_elevation(
-                        itinerary=itinerary,
-                        api_key=None,  # Google API 키는 elevation_helpers에서 자동으로 가져옴
-                        weather_data=request.weather_data,
-                        user_speed_mps=request.user_speed_mps,
-                    )
-                    logger.info(
-                        f"[보행자 경로] 경사도 분석 완료: {elevation_analysis is not None}"
-                    )
-                    if elevation_analysis:
-                        logger.info(
-                            f"[보행자 경로] 횡단보도: {elevation_analysis.get('crosswalk_count', 0)}개, "
-                            f"대기시간: {elevation_analysis.get('crosswalk_wait_time', 0)}초"
-                        )
-                    if elevation_analysis and elevation_analysis.get("error"):
-                        logger.warning(
-                            f"[보행자 경로] 경사도 분석 에러: {elevation_analysis['error']}"
-                        )
-                except Exception as e:
-                    logger.error(f"[보행자 경로] 경사도 분석 실패: {e}", exc_info=True)
-                    elevation_analysis = {
-                        "error": str(e),
-                        "crosswalk_count": crosswalk_count,  # 횡단보도 정보 포함
-                        "factors": {
-                            "user_speed_factor": 1,
-                            "slope_factor": 1,
-                            "weather_factor": 1,
-                            "final_factor": 1,
-                        },
-                        "walk_legs_analysis": [],
-                        "total_original_walk_time": recalculated_base_time,
-                        "total_adjusted_walk_time": recalculated_base_time,
-                        "total_route_time_adjustment": 0,
-                        "weather_applied": False,
-                        "user_speed_mps": request.user_speed_mps or 1.111,
-                    }
+@router.post("/route/stream")
+async def stream_walking_route(request: WalkingRouteRequest):
+    """
+    보행자 경로 스트리밍 (NDJSON, 한 줄에 이벤트 하나)
+
+    Tmap 경로를 받는 즉시 첫 줄을 보내므로 앱은 경사도 분석을 기다리지 않고 경로를 그릴 수 있습니다.
 
-                # 응답 데이터에 요약 정보 추가
-                # 대중교통과 동일한 구조로 변환하여 프론트엔드 호환성 확보
-                result = {
-                    "type": data.get("type"),
-                    "features": features,
-                    "properties": {
-                        "totalDistance": total_distance,
-                        "totalTime": recalculated_base_time,  # 재계산된 기준 시간 반환
-                        "totalWalkTime": recalculated_base_time,  # 재계산된 기준 시간
-                        "originalTime": total_time,  # API 원본 시간 (참고용)
-                        "mode": "WALK",
-                    },
-                    "elevation_analysis": elevation_analysis,  # 경사도 분석 결과 추가
-                    # 대중교통과 동일한 구조 추가 (상세 경로 표시용)
-                    "metaData": {
-                        "plan": {
-                            "itineraries": [itinerary]  # 이미 변환된 itinerary 사용
-                        }
-                    },
-                }
-
-                return result
+    이벤트 (event 필드):
+    - route: /walking/route 응답에서 elevation_analysis를 뺀 본문 (경로 좌표, 기준 시간)
+    - crosswalks: 횡단보도 개수/대기 시간
+    - eta: 최종 결과 (/walking/route의 elevation_analysis와 같은 형식, provisional 포함)
+      구간별 경사도/계수는 elevation_analysis.walk_legs_analysis (경사도 분석이 끝나야 함께 나옴)
 
+    Tmap 호출 실패는 스트림 시작 전에 /walking/route와 같은 HTTP 오류로 응답합니다.
+    """
+    try:
+        data = await _fetch_pedestrian_route(request)
+        result = _build_route_body(request, data)
+    except HTTPException:
+        raise
+    except UpstreamUnavailableError as e:
+        logger.warning(f"[보행자 경로] {e}")
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+        )
     except aiohttp.ClientError as e:
         logger.error(f"[보행자 경로] 네트워크 오류: {e}")
         raise HTTPException(status_code=503, detail=f"Tmap API 연결 실패: {str(e)}")
     except ValueError as e:
         logger.error(f"[보행자 경로] 설정 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        logger.error(f"[보행자 경로] 예상치 못한 오류: {e}", exc_info=True)
+
+    return StreamingResponse(
+        _stream_route_analysis(request, result),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/analysis/{analysis_id}", response_model=Dict[str, Any])
+async def get_walking_route_analysis(analysis_id: str):
+    """
+    마감 시간 초과로 평지 추정 결과(provisional)를 받은 경로의 전체 분석 결과 조회
+
+    Returns:
+        - status: pending | completed | failed
+        - elevation_analysis: completed면 경사도 반영 결과 (/walking/route의 elevation_analysis와 같은 형식)
+    """
+    state = get_background_analysis(analysis_id)
+    if state is None:
         raise HTTPException(
-            status_code=500, detail=f"보행자 경로 검색 중 오류가 발생했습니다: {str(e)}"
+            status_code=404, detail="분석 결과를 찾을 수 없습니다. (만료되었거나 잘못된 ID)"
         )
 
+    status, elevation_analysis = state
+    if elevation_analysis is not None:
+        elevation_analysis = {**elevation_analysis, "provisional": False}
+    return {
+        "analysis_id": analysis_id,
+        "status": status,
+        "elevation_analysis": elevation_analysis,
+    }
+
 
 @router.get("/health")
 async def health_check():
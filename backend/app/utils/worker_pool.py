@@ -0,0 +1,193 @@
+"""
+동기(블로킹) 작업을 이벤트 루프 밖에서 실행하기 위한 워커 풀
+
+이벤트 루프 스레드에서 pandas CSV 처리, 좌표 루프 같은 CPU 작업이 실행되면
+동시에 들어온 날씨/헬스체크 요청까지 모두 멈춥니다.
+BoundedExecutor는 이런 작업을 스레드/프로세스 풀로 보내고,
+대기열 길이를 제한하여 과부하 시 빠르게 거절(backpressure)합니다.
+
+환경 변수 (prefix 예: ROUTE_ANALYSIS):
+- {PREFIX}_POOL: "thread" | "process" | "inline" (inline은 루프에서 직접 실행, 비교/비상용)
+- {PREFIX}_WORKERS: 워커 수
+- {PREFIX}_MAX_PENDING: 실행 중인 작업 외에 대기할 수 있는 작업 수
+- {PREFIX}_QUEUE_TIMEOUT: 대기열 자리가 날 때까지 기다리는 최대 시간 (초)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+POOL_KINDS = ("thread", "process", "inline")
+
+
+class WorkerPoolBusyError(RuntimeError):
+    """대기열이 가득 차서 작업을 받을 수 없을 때 발생"""
+
+
+class BoundedExecutor:
+    """
+    대기열 길이가 제한된 실행기
+
+    동시에 (max_workers + max_pending)개까지만 작업을 받고,
+    그 이상은 queue_timeout 동안 기다린 뒤 WorkerPoolBusyError를 발생시킵니다.
+    자리는 풀의 작업이 끝날 때 반납합니다 (기다리던 요청이 취소되어도 실행 중인 작업은 자리를 유지).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str = "thread",
+        max_workers: Optional[int] = None,
+        max_pending: int = 16,
+        queue_timeout: float = 5.0,
+    ):
+        if kind not in POOL_KINDS:
+            raise ValueError(f"지원하지 않는 풀 종류입니다: {kind} (가능: {POOL_KINDS})")
+
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max(0, max_pending)
+        self.queue_timeout = queue_timeout
+        self.capacity = self.max_workers + self.max_pending
+
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        # 루프마다 세마포어를 따로 둔다 (asyncio 세마포어는 생성된 루프에 묶임)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    @classmethod
+    def from_env(
+        cls,
+        prefix: str,
+        default_kind: str = "thread",
+        default_workers: Optional[int] = None,
+        default_max_pending: int = 16,
+        default_queue_timeout: float = 5.0,
+    ) -> "BoundedExecutor":
+        """환경 변수({prefix}_POOL 등)에서 설정을 읽어 생성"""
+        kind = os.getenv(f"{prefix}_POOL", default_kind).lower()
+        workers = os.getenv(f"{prefix}_WORKERS")
+        return cls(
+            name=prefix.lower(),
+            kind=kind,
+            max_workers=int(workers) if workers else default_workers,
+            max_pending=int(os.getenv(f"{prefix}_MAX_PENDING", default_max_pending)),
+            queue_timeout=float(
+                os.getenv(f"{prefix}_QUEUE_TIMEOUT", default_queue_timeout)
+            ),
+        )
+
+    def _get_executor(self) -> Executor:
+        """실행기는 첫 사용 시점에 생성 (import 시 프로세스 생성 방지)"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix=self.name,
+                        )
+                    logger.info(
+                        f"[워커 풀] {self.name} 생성 - 종류: {self.kind}, "
+                        f"워커: {self.max_workers}, 대기열: {self.max_pending}"
+                    )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.capacity)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        func(*args, **kwargs)를 풀에서 실행하고 결과를 반환
+
+        Raises:
+            WorkerPoolBusyError: queue_timeout 안에 대기열 자리를 얻지 못한 경우
+        """
+        if self.kind == "inline":
+            return func(*args, **kwargs)
+
+        semaphore = self._get_semaphore()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            with self._stats_lock:
+                self._rejected += 1
+            logger.warning(
+                f"[워커 풀] {self.name} 대기열 초과 - {self.capacity}개 작업 처리 중"
+            )
+            raise WorkerPoolBusyError(
+                f"{self.name} 작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요."
+            )
+
+        with self._stats_lock:
+            self._in_flight += 1
+        loop = asyncio.get_running_loop()
+
+        def _release(_future=None):
+            with self._stats_lock:
+                self._in_flight -= 1
+                self._completed += 1
+            # 콜백은 워커 스레드에서 호출되므로 세마포어는 루프 스레드에서 반납
+            try:
+                loop.call_soon_threadsafe(semaphore.release)
+            except RuntimeError:
+                pass  # 루프가 이미 닫힘 (세마포어도 함께 버려짐)
+
+        try:
+            future = self._get_executor().submit(partial(func, *args, **kwargs))
+        except BaseException:
+            _release()
+            raise
+        # 기다리는 코루틴이 취소되어도 작업이 끝날 때까지 자리를 유지 (시작 전이면 취소 후 바로 반납)
+        future.add_done_callback(_release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 현재 상태"""
+        with self._stats_lock:
+            return {
+                "name": self.name,
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """풀 종료 (앱 종료 시 호출)"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+
+
+# 경로 분석(경사도/횡단보도 계산)용 CPU 풀
+route_analysis_pool = BoundedExecutor.from_env("ROUTE_ANALYSIS")
+
+# 비밀번호 해싱/검증(bcrypt)용 풀 - 로그인이 몰려도 DB 풀과 경로 분석 풀을 점유하지 않도록 분리
+password_hash_pool = BoundedExecutor.from_env(
+    "PASSWORD_HASH", default_workers=2, default_max_pending=32, default_queue_timeout=3.0
+)
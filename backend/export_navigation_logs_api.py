@@ -1,98 +1,61 @@
 """
 EC2 서버 API를 통해 Navigation Logs를 CSV로 내보내기
 
-API 엔드포인트를 사용하여 모든 사용자의 navigation_logs를 수집합니다.
-"""
-
-import requests
-import csv
-import json
-from datetime import datetime
+관리자 내보내기 API(/api/navigation/logs/export)에서 전체 사용자의 로그를
+스트리밍으로 받아 바로 파일에 기록합니다. (사용자 수/로그 수 제한 없음, 메모리 사용량 일정)
 
-# EC2 서버 API URL
-BASE_URL = "http://3.36.70.73:8000"
+환경 변수:
+    EXPORT_BASE_URL: 서버 주소 (기본: EC2 서버)
+    ADMIN_API_TOKEN: 서버와 동일한 관리자 토큰 (X-Admin-Token 헤더로 전송)
 
-# 출력 파일
-output_file = f"navigation_logs_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+사용법:
+    python export_navigation_logs_api.py
+    python export_navigation_logs_api.py ndjson
+"""
 
-# CSV 헤더 (NavigationLogResponse 스키마 기반) - route_data, movement_data 제외
-headers = [
-    "log_id", "user_id", "route_mode", "start_location", "end_location",
-    "start_lat", "start_lon", "end_lat", "end_lon",
-    "total_distance_m", "walking_distance_m", "transport_modes", "crosswalk_count",
-    "user_speed_factor", "slope_factor", "weather_factor",
-    "estimated_time_seconds", "actual_time_seconds", "time_difference_seconds", "accuracy_percent",
-    "estimated_walk_time_seconds", "walk_time_difference_seconds", "walk_accuracy_percent",
-    "active_walking_time_seconds", "paused_time_seconds", "real_walking_speed_kmh", "pause_count",
-    "weather_id",
-    "started_at", "ended_at", "created_at"
-]
+import os
+import sys
+from datetime import datetime
 
-all_logs = []
+import requests
+from dotenv import load_dotenv
 
-print("📊 EC2 서버에서 Navigation Logs 수집 중...")
+load_dotenv()
 
-# 여러 user_id를 시도 (1~100)
-for user_id in range(1, 101):
-    try:
-        response = requests.get(
-            f"{BASE_URL}/api/navigation/logs",
-            params={"user_id": user_id, "limit": 100},
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("total_count", 0) > 0:
-                logs = data.get("logs", [])
-                all_logs.extend(logs)
-                print(f"  ✅ user_id={user_id}: {len(logs)}개 로그 발견")
-        elif response.status_code == 404:
-            # 사용자 없음 - 무시
-            pass
-        else:
-            print(f"  ⚠️ user_id={user_id}: HTTP {response.status_code}")
-            
-    except requests.exceptions.RequestException as e:
-        print(f"  ❌ user_id={user_id}: 요청 실패 - {e}")
-        break
+# EC2 서버 API URL
+BASE_URL = os.getenv("EXPORT_BASE_URL", "http://3.36.70.73:8000")
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN", "")
 
-print(f"\n📊 총 {len(all_logs)}개의 로그를 수집했습니다.")
+# 내보내기 형식 (csv/ndjson)
+export_format = sys.argv[1] if len(sys.argv) > 1 else "csv"
 
-if len(all_logs) > 0:
-    # log_id가 정수가 아닌 로그 필터링
-    valid_logs = []
-    skipped_count = 0
-    for log in all_logs:
-        log_id = log.get("log_id")
-        if log_id is not None and isinstance(log_id, int):
-            valid_logs.append(log)
-        else:
-            skipped_count += 1
-            print(f"  ⚠️ 스킵: log_id={log_id} (정수 아님)")
-    
-    if skipped_count > 0:
-        print(f"⚠️ {skipped_count}개의 잘못된 log_id 레코드 제외됨")
-    
-    # CSV로 저장
-    with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=headers, extrasaction='ignore')
-        writer.writeheader()
-        
-        for log in valid_logs:
-            # 복사본 생성하여 원본 데이터 보존
-            row = log.copy()
-            
-            # 긴 JSON 필드 제거 (CSV 파싱 문제 방지)
-            row.pop("movement_data", None)
-            row.pop("route_data", None)
-            
-            # transport_modes는 간단하므로 유지
-            if row.get("transport_modes"):
-                row["transport_modes"] = json.dumps(row["transport_modes"], ensure_ascii=False)
-            
-            writer.writerow(row)
-    
-    print(f"✅ CSV 파일 저장 완료: {output_file} ({len(valid_logs)}개 레코드)")
-else:
-    print("⚠️ 수집된 데이터가 없습니다.")
+# 출력 파일
+output_file = f"navigation_logs_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+
+print("📊 EC2 서버에서 Navigation Logs 내보내는 중...")
+
+try:
+    with requests.get(
+        f"{BASE_URL}/api/navigation/logs/export",
+        params={"format": export_format},
+        headers={"X-Admin-Token": ADMIN_API_TOKEN},
+        stream=True,
+        timeout=(10, 300),  # (연결, 읽기) 타임아웃
+    ) as response:
+        if response.status_code != 200:
+            print(f"❌ HTTP {response.status_code}: {response.text[:200]}")
+            sys.exit(1)
+
+        # CSV는 엑셀 호환을 위해 BOM 포함 (CSV 기본 컬럼은 route_data, movement_data 제외)
+        received = 0
+        with open(output_file, "wb") as f:
+            if export_format == "csv":
+                f.write("﻿".encode("utf-8"))
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)
+                received += len(chunk)
+
+    print(f"✅ 파일 저장 완료: {output_file} ({received / 1024:.1f} KB)")
+except requests.exceptions.RequestException as e:
+    print(f"❌ 요청 실패 - {e}")
+    sys.exit(1)
@@ -0,0 +1,105 @@
+"""
+네비게이션 로그 움직임 구간 바이너리 저장 마이그레이션
+
+navigation_logs.movement_data의 구간 목록(segments)을 바이너리로 인코딩하여
+movement_segments(BYTEA) 컬럼으로 옮기고, movement_data에는 나머지 값만 남깁니다.
+(저장 형식: app/utils/movement_codec.py)
+
+- 다시 실행하면 아직 변환하지 않은 로그만 처리합니다.
+- 형식에 맞지 않는 구간 목록은 JSON 그대로 둡니다.
+- 완료 후 공간 회수를 위해 VACUUM (FULL) navigation_logs 실행을 권장합니다.
+"""
+import json
+
+from sqlalchemy import text
+from app.database import engine
+from app.utils.movement_codec import merge_movement_data, split_movement_data
+
+# 한 번에 처리하는 로그 수
+BATCH_LOGS = 500
+
+def upgrade():
+    """movement_segments 컬럼 추가 + 기존 로그의 구간 목록 변환"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            ALTER TABLE navigation_logs
+            ADD COLUMN IF NOT EXISTS movement_segments BYTEA
+        """))
+        conn.commit()
+        print("✅ navigation_logs.movement_segments 컬럼 추가 완료")
+
+        last_log_id = 0
+        converted = 0
+        bytes_before = bytes_after = 0
+        while True:
+            rows = conn.execute(text("""
+                SELECT log_id, movement_data
+                FROM navigation_logs
+                WHERE log_id > :last_log_id
+                  AND movement_segments IS NULL
+                  AND movement_data IS NOT NULL
+                ORDER BY log_id
+                LIMIT :limit
+            """), {"last_log_id": last_log_id, "limit": BATCH_LOGS}).fetchall()
+            if not rows:
+                break
+            last_log_id = rows[-1][0]
+
+            updates = []
+            for log_id, movement_data in rows:
+                if isinstance(movement_data, str):
+                    movement_data = json.loads(movement_data)
+                remaining, segments_data = split_movement_data(movement_data)
+                if segments_data is None:
+                    continue
+                updates.append({
+                    "log_id": log_id,
+                    "movement_data": json.dumps(remaining, ensure_ascii=False),
+                    "movement_segments": segments_data,
+                })
+                bytes_before += len(json.dumps(movement_data, ensure_ascii=False).encode("utf-8"))
+                bytes_after += len(updates[-1]["movement_data"].encode("utf-8")) + len(segments_data)
+
+            if updates:
+                conn.execute(text("""
+                    UPDATE navigation_logs
+                    SET movement_data = CAST(:movement_data AS JSONB),
+                        movement_segments = :movement_segments
+                    WHERE log_id = :log_id
+                """), updates)
+            conn.commit()
+            converted += len(updates)
+            print(f"  - log_id {last_log_id}까지 처리 ({converted}개 로그 변환)")
+
+        print(f"✅ 구간 변환 완료 - 로그 {converted}개 (movement_data {bytes_before:,} → {bytes_after:,} bytes)")
+
+def downgrade():
+    """구간 목록을 movement_data에 다시 합친 뒤 컬럼 삭제"""
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT log_id, movement_data, movement_segments
+            FROM navigation_logs
+            WHERE movement_segments IS NOT NULL
+        """)).fetchall()
+        updates = []
+        for log_id, movement_data, movement_segments in rows:
+            if isinstance(movement_data, str):
+                movement_data = json.loads(movement_data)
+            updates.append({
+                "log_id": log_id,
+                "movement_data": json.dumps(
+                    merge_movement_data(movement_data, movement_segments), ensure_ascii=False
+                ),
+            })
+        if updates:
+            conn.execute(text("""
+                UPDATE navigation_logs SET movement_data = CAST(:movement_data AS JSONB) WHERE log_id = :log_id
+            """), updates)
+        conn.execute(text("ALTER TABLE navigation_logs DROP COLUMN IF EXISTS movement_segments"))
+        conn.commit()
+        print(f"✅ 구간 목록 {len(updates)}개 로그에 복원, movement_segments 삭제 완료")
+
+if __name__ == "__main__":
+    print("🔧 네비게이션 로그 움직임 구간 변환 마이그레이션 시작...")
+    upgrade()
+    print("✅ 마이그레이션 완료")
@@ -0,0 +1,38 @@
+"""
+navigation_logs 테이블에 멱등 키 컬럼 추가 마이그레이션
+
+오프라인 중 쌓인 로그를 일괄 업로드(/api/navigation/logs/batch)하다 재시도해도
+같은 로그가 중복 저장되지 않도록 (user_id, idempotency_key) 유니크 인덱스를 만듭니다.
+키가 없는(NULL) 기존 로그는 유니크 검사 대상이 아닙니다.
+"""
+from sqlalchemy import text
+from app.database import engine
+
+def upgrade():
+    """idempotency_key 컬럼 및 유니크 인덱스 추가"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            ALTER TABLE navigation_logs
+            ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(64)
+        """))
+
+        conn.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS uq_nav_user_idempotency
+            ON navigation_logs(user_id, idempotency_key)
+        """))
+
+        conn.commit()
+        print("✅ navigation_logs.idempotency_key 추가 완료")
+
+def downgrade():
+    """idempotency_key 컬럼 삭제"""
+    with engine.connect() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS uq_nav_user_idempotency"))
+        conn.execute(text("ALTER TABLE navigation_logs DROP COLUMN IF EXISTS idempotency_key"))
+        conn.commit()
+        print("✅ navigation_logs.idempotency_key 삭제 완료")
+
+if __name__ == "__main__":
+    print("🔧 네비게이션 로그 멱등 키 마이그레이션 시작...")
+    upgrade()
+    print("✅ 마이그레이션 완료")
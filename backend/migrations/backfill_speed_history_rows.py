@@ -0,0 +1,51 @@
+"""
+속도 이력 JSONB → speed_history 테이블 이관 마이그레이션
+
+속도 프로필 갱신이 activity_speed_profile.speed_history(JSONB 배열)를 다시 쓰는 대신
+speed_history 테이블에 1행씩 추가하도록 바뀌었으므로, 기존 JSONB 이력을 행으로 옮깁니다.
+JSONB 컬럼은 그대로 남겨 두며(롤백 대비), 다시 실행해도 중복 행을 만들지 않습니다.
+
+먼저 migrations/create_speed_history.py로 테이블을 만들어야 합니다.
+"""
+from sqlalchemy import text
+from app.database import engine
+
+def upgrade():
+    """JSONB 이력을 speed_history 행으로 복사"""
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            INSERT INTO speed_history
+                (user_id, activity_type, measured_speed_kmh, source, navigation_log_id, recorded_at)
+            SELECT
+                p.user_id,
+                p.activity_type,
+                LEAST(GREATEST(ROUND((e.entry->>'speed_kmh')::numeric, 2), 2.0), 8.0),
+                e.entry->>'source',
+                nl.log_id,
+                (e.entry->>'timestamp')::timestamptz AT TIME ZONE 'UTC'
+            FROM activity_speed_profile p
+            CROSS JOIN LATERAL jsonb_array_elements(COALESCE(p.speed_history, '[]'::jsonb)) AS e(entry)
+            LEFT JOIN navigation_logs nl
+                ON nl.log_id = (e.entry->>'navigation_log_id')::integer
+            WHERE e.entry->>'speed_kmh' IS NOT NULL
+              AND e.entry->>'timestamp' IS NOT NULL
+              AND e.entry->>'source' IN ('navigation_log', 'manual', 'health_connect', 'initial')
+              AND NOT EXISTS (
+                  SELECT 1 FROM speed_history h
+                  WHERE h.user_id = p.user_id
+                    AND h.activity_type = p.activity_type
+                    AND h.recorded_at = (e.entry->>'timestamp')::timestamptz AT TIME ZONE 'UTC'
+              )
+        """))
+
+        conn.commit()
+        print(f"✅ speed_history 이관 완료 ({result.rowcount}행)")
+
+def downgrade():
+    """이관은 되돌리지 않음 (JSONB 원본이 남아 있으므로 speed_history는 그대로 유지)"""
+    print("ℹ️ 되돌릴 작업 없음 - activity_speed_profile.speed_history 원본은 유지됩니다")
+
+if __name__ == "__main__":
+    print("🔧 속도 이력 이관 마이그레이션 시작...")
+    upgrade()
+    print("✅ 마이그레이션 완료")
@@ -0,0 +1,103 @@
+"""
+네비게이션 일별 통계 테이블 생성 마이그레이션
+
+통계 API(/api/navigation/logs/statistics/summary)가 로그 원본 대신 읽는
+사용자별 일 단위 롤업 테이블을 만들고, 기존 navigation_logs로 채웁니다.
+이후에는 로그 저장/삭제 시 애플리케이션이 같은 트랜잭션에서 증감합니다.
+"""
+from sqlalchemy import text
+from app.database import engine
+
+def upgrade():
+    """navigation_daily_stats 테이블 생성 및 기존 로그 집계"""
+    with engine.connect() as conn:
+        # 테이블 생성
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS navigation_daily_stats (
+                user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+                stat_date DATE NOT NULL,
+
+                total_count INTEGER NOT NULL DEFAULT 0,
+                walking_count INTEGER NOT NULL DEFAULT 0,
+                transit_count INTEGER NOT NULL DEFAULT 0,
+                accurate_count INTEGER NOT NULL DEFAULT 0,
+
+                total_distance_m NUMERIC(14, 2) NOT NULL DEFAULT 0,
+                total_actual_time_seconds INTEGER NOT NULL DEFAULT 0,
+                total_time_difference_seconds INTEGER NOT NULL DEFAULT 0,
+
+                user_speed_factor_sum NUMERIC(12, 3) NOT NULL DEFAULT 0,
+                user_speed_factor_count INTEGER NOT NULL DEFAULT 0,
+                slope_factor_sum NUMERIC(12, 3) NOT NULL DEFAULT 0,
+                slope_factor_count INTEGER NOT NULL DEFAULT 0,
+                weather_factor_sum NUMERIC(12, 3) NOT NULL DEFAULT 0,
+                weather_factor_count INTEGER NOT NULL DEFAULT 0,
+
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+                PRIMARY KEY (user_id, stat_date)
+            )
+        """))
+
+        # 기존 로그 집계 (다시 실행해도 같은 결과가 되도록 덮어쓰기)
+        result = conn.execute(text("""
+            INSERT INTO navigation_daily_stats (
+                user_id, stat_date,
+                total_count, walking_count, transit_count, accurate_count,
+                total_distance_m, total_actual_time_seconds, total_time_difference_seconds,
+                user_speed_factor_sum, user_speed_factor_count,
+                slope_factor_sum, slope_factor_count,
+                weather_factor_sum, weather_factor_count
+            )
+            SELECT
+                user_id,
+                DATE(started_at) AS stat_date,
+                COUNT(*),
+                COUNT(*) FILTER (WHERE route_mode = 'walking'),
+                COUNT(*) FILTER (WHERE route_mode = 'transit'),
+                COUNT(*) FILTER (
+                    WHERE estimated_time_seconds > 0
+                    AND ABS(actual_time_seconds - estimated_time_seconds)::numeric / estimated_time_seconds <= 0.2
+                ),
+                COALESCE(SUM(total_distance_m), 0),
+                COALESCE(SUM(actual_time_seconds), 0),
+                COALESCE(SUM(actual_time_seconds - estimated_time_seconds), 0),
+                COALESCE(SUM(user_speed_factor) FILTER (WHERE user_speed_factor <> 0), 0),
+                COUNT(*) FILTER (WHERE user_speed_factor <> 0),
+                COALESCE(SUM(slope_factor) FILTER (WHERE slope_factor <> 0), 0),
+                COUNT(*) FILTER (WHERE slope_factor <> 0),
+                COALESCE(SUM(weather_factor) FILTER (WHERE weather_factor <> 0), 0),
+                COUNT(*) FILTER (WHERE weather_factor <> 0)
+            FROM navigation_logs
+            GROUP BY user_id, DATE(started_at)
+            ON CONFLICT (user_id, stat_date) DO UPDATE SET
+                total_count = EXCLUDED.total_count,
+                walking_count = EXCLUDED.walking_count,
+                transit_count = EXCLUDED.transit_count,
+                accurate_count = EXCLUDED.accurate_count,
+                total_distance_m = EXCLUDED.total_distance_m,
+                total_actual_time_seconds = EXCLUDED.total_actual_time_seconds,
+                total_time_difference_seconds = EXCLUDED.total_time_difference_seconds,
+                user_speed_factor_sum = EXCLUDED.user_speed_factor_sum,
+                user_speed_factor_count = EXCLUDED.user_speed_factor_count,
+                slope_factor_sum = EXCLUDED.slope_factor_sum,
+                slope_factor_count = EXCLUDED.slope_factor_count,
+                weather_factor_sum = EXCLUDED.weather_factor_sum,
+                weather_factor_count = EXCLUDED.weather_factor_count,
+                updated_at = CURRENT_TIMESTAMP
+        """))
+
+        conn.commit()
+        print(f"✅ navigation_daily_stats 테이블 생성 완료 ({result.rowcount}개 일자 집계)")
+
+def downgrade():
+    """navigation_daily_stats 테이블 삭제"""
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS navigation_daily_stats CASCADE"))
+        conn.commit()
+        print("✅ navigation_daily_stats 테이블 삭제 완료")
+
+if __name__ == "__main__":
+    print("🔧 네비게이션 일별 통계 테이블 마이그레이션 시작...")
+    upgrade()
+    print("✅ 마이그레이션 완료")
@@ -0,0 +1,97 @@
+"""
+해상도별 단순화 경로 좌표 테이블 생성 + 기존 경로 변환 마이그레이션
+
+경로 상세/목록 API의 resolution 파라미터(high/medium/low)용으로
+routes.route_coordinates를 Douglas-Peucker로 단순화한 좌표와 Encoded Polyline을 저장합니다.
+(허용 오차: app/utils/polyline.py RESOLUTION_TOLERANCES_M)
+다시 실행하면 단순화 좌표가 없는 경로만 변환합니다.
+"""
+import json
+
+from sqlalchemy import bindparam, text
+from app.database import engine
+from app.utils.polyline import RESOLUTION_TOLERANCES_M, encode_polyline, simplify_coordinates
+
+# 한 번에 변환하는 경로 수 (route_coordinates가 크므로 작게)
+BATCH_ROUTES = 50
+
+def upgrade():
+    """route_geometries 테이블 생성 후 기존 경로 변환"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS route_geometries (
+                route_id INTEGER NOT NULL REFERENCES routes(route_id) ON DELETE CASCADE,
+                resolution VARCHAR(10) NOT NULL,
+                tolerance_m NUMERIC(5, 1) NOT NULL,
+                point_count INTEGER NOT NULL,
+                coordinates JSONB NOT NULL,
+                encoded_polyline TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (route_id, resolution)
+            )
+        """))
+        conn.commit()
+        print("✅ route_geometries 테이블 생성 완료")
+
+        route_ids = [row[0] for row in conn.execute(text("""
+            SELECT r.route_id
+            FROM routes r
+            WHERE NOT EXISTS (SELECT 1 FROM route_geometries g WHERE g.route_id = r.route_id)
+            ORDER BY r.route_id
+        """))]
+
+        converted = 0
+        original_points = simplified_points = 0
+        for start in range(0, len(route_ids), BATCH_ROUTES):
+            batch = route_ids[start:start + BATCH_ROUTES]
+            rows = conn.execute(
+                text("SELECT route_id, route_coordinates FROM routes WHERE route_id IN :ids").bindparams(
+                    bindparam("ids", expanding=True)
+                ),
+                {"ids": batch},
+            )
+
+            geometries = []
+            for route_id, route_coordinates in rows:
+                if isinstance(route_coordinates, str):
+                    route_coordinates = json.loads(route_coordinates)
+                coordinates = (route_coordinates or {}).get("coordinates", [])
+                original_points += len(coordinates)
+                for resolution, tolerance_m in RESOLUTION_TOLERANCES_M.items():
+                    simplified = simplify_coordinates(coordinates, tolerance_m)
+                    if resolution == "medium":
+                        simplified_points += len(simplified)
+                    geometries.append({
+                        "route_id": route_id,
+                        "resolution": resolution,
+                        "tolerance_m": tolerance_m,
+                        "point_count": len(simplified),
+                        "coordinates": json.dumps({"type": "LineString", "coordinates": simplified}),
+                        "encoded_polyline": encode_polyline(simplified),
+                    })
+
+            if geometries:
+                conn.execute(text("""
+                    INSERT INTO route_geometries
+                        (route_id, resolution, tolerance_m, point_count, coordinates, encoded_polyline)
+                    VALUES
+                        (:route_id, :resolution, :tolerance_m, :point_count, CAST(:coordinates AS JSONB), :encoded_polyline)
+                    ON CONFLICT (route_id, resolution) DO NOTHING
+                """), geometries)
+            conn.commit()
+            converted += len(batch)
+            print(f"  - {converted}/{len(route_ids)}개 경로 변환")
+
+        print(f"✅ 단순화 좌표 생성 완료 ({converted}개 경로, 원본 {original_points}점 → medium {simplified_points}점)")
+
+def downgrade():
+    """route_geometries 테이블 삭제 (resolution=full은 원본 좌표를 쓰므로 그대로 동작)"""
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS route_geometries"))
+        conn.commit()
+        print("✅ route_geometries 테이블 삭제 완료")
+
+if __name__ == "__main__":
+    print("🔧 경로 단순화 좌표 마이그레이션 시작...")
+    upgrade()
+    print("✅ 마이그레이션 완료")
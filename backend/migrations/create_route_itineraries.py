@@ -0,0 +1,140 @@
+"""
+네비게이션 로그 경로 중복 제거 마이그레이션
+
+navigation_logs.route_data의 경로 부분(legs, rawItinerary)을
+내용 해시(SHA-256) 키의 route_itineraries 테이블로 옮기고, 로그에는 해시만 남깁니다.
+(분리/해시 규칙: app/utils/route_itinerary.py)
+
+- 다시 실행하면 아직 분리하지 않은 로그만 처리합니다.
+- 완료 후 공간 회수를 위해 VACUUM (FULL) navigation_logs 실행을 권장합니다.
+"""
+import json
+
+from sqlalchemy import text
+from app.database import engine
+from app.utils.route_itinerary import canonical_json, itinerary_hash, merge_route_data, split_route_data
+
+# 한 번에 처리하는 로그 수 (route_data가 크므로 작게)
+BATCH_LOGS = 200
+
+def upgrade():
+    """route_itineraries 테이블 생성 + 기존 로그의 경로 분리"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS route_itineraries (
+                itinerary_hash VARCHAR(64) PRIMARY KEY,
+                itinerary JSONB NOT NULL,
+                byte_size INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+        conn.execute(text("""
+            ALTER TABLE navigation_logs
+            ADD COLUMN IF NOT EXISTS route_itinerary_hash VARCHAR(64)
+                REFERENCES route_itineraries(itinerary_hash)
+        """))
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_nav_route_itinerary
+            ON navigation_logs(route_itinerary_hash)
+        """))
+        conn.commit()
+        print("✅ route_itineraries 테이블 / navigation_logs.route_itinerary_hash 컬럼 생성 완료")
+
+        last_log_id = 0
+        converted = 0
+        bytes_before = bytes_after = 0
+        while True:
+            rows = conn.execute(text("""
+                SELECT log_id, route_data
+                FROM navigation_logs
+                WHERE log_id > :last_log_id
+                  AND route_itinerary_hash IS NULL
+                  AND route_data IS NOT NULL
+                ORDER BY log_id
+                LIMIT :limit
+            """), {"last_log_id": last_log_id, "limit": BATCH_LOGS}).fetchall()
+            if not rows:
+                break
+            last_log_id = rows[-1][0]
+
+            itineraries = {}
+            updates = []
+            for log_id, route_data in rows:
+                if isinstance(route_data, str):
+                    route_data = json.loads(route_data)
+                remaining, itinerary = split_route_data(route_data)
+                if itinerary is None:
+                    continue
+                key = itinerary_hash(itinerary)
+                itineraries[key] = itinerary
+                updates.append({
+                    "log_id": log_id,
+                    "route_data": json.dumps(remaining, ensure_ascii=False),
+                    "route_itinerary_hash": key,
+                })
+                bytes_before += len(canonical_json(route_data).encode("utf-8"))
+                bytes_after += len(canonical_json(remaining).encode("utf-8"))
+
+            if itineraries:
+                conn.execute(text("""
+                    INSERT INTO route_itineraries (itinerary_hash, itinerary, byte_size)
+                    VALUES (:itinerary_hash, CAST(:itinerary AS JSONB), :byte_size)
+                    ON CONFLICT (itinerary_hash) DO NOTHING
+                """), [
+                    {
+                        "itinerary_hash": key,
+                        "itinerary": canonical_json(itinerary),
+                        "byte_size": len(canonical_json(itinerary).encode("utf-8")),
+                    }
+                    for key, itinerary in itineraries.items()
+                ])
+                conn.execute(text("""
+                    UPDATE navigation_logs
+                    SET route_data = CAST(:route_data AS JSONB),
+                        route_itinerary_hash = :route_itinerary_hash
+                    WHERE log_id = :log_id
+                """), updates)
+            conn.commit()
+            converted += len(updates)
+            print(f"  - log_id {last_log_id}까지 처리 ({converted}개 로그 분리)")
+
+        stored = conn.execute(
+            text("SELECT COUNT(*), COALESCE(SUM(byte_size), 0) FROM route_itineraries")
+        ).one()
+        print(
+            f"✅ 경로 분리 완료 - 로그 {converted}개, 고유 경로 {stored[0]}개 "
+            f"(route_data {bytes_before:,} → {bytes_after:,} bytes, 경로 저장 {stored[1]:,} bytes)"
+        )
+
+def downgrade():
+    """분리한 경로를 route_data에 다시 합친 뒤 컬럼/테이블 삭제"""
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT l.log_id, l.route_data, i.itinerary
+            FROM navigation_logs l
+            JOIN route_itineraries i ON i.itinerary_hash = l.route_itinerary_hash
+        """)).fetchall()
+        updates = []
+        for log_id, route_data, itinerary in rows:
+            if isinstance(route_data, str):
+                route_data = json.loads(route_data)
+            if isinstance(itinerary, str):
+                itinerary = json.loads(itinerary)
+            updates.append({
+                "log_id": log_id,
+                "route_data": json.dumps(merge_route_data(route_data, itinerary), ensure_ascii=False),
+            })
+        if updates:
+            conn.execute(text("""
+                UPDATE navigation_logs SET route_data = CAST(:route_data AS JSONB) WHERE log_id = :log_id
+            """), updates)
+        conn.execute(text("DROP INDEX IF EXISTS idx_nav_route_itinerary"))
+        conn.execute(text("ALTER TABLE navigation_logs DROP COLUMN IF EXISTS route_itinerary_hash"))
+        conn.execute(text("DROP TABLE IF EXISTS route_itineraries"))
+        conn.commit()
+        print(f"✅ 경로 {len(updates)}개 로그에 복원, route_itineraries 삭제 완료")
+
+if __name__ == "__main__":
+    print("🔧 네비게이션 로그 경로 중복 제거 마이그레이션 시작...")
+    upgrade()
+    print("✅ 마이그레이션 완료")
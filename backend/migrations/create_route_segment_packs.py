@@ -0,0 +1,91 @@
+"""
+경로 세그먼트 묶음 테이블 생성 + 기존 route_segments 변환 마이그레이션
+
+경로 상세 조회가 route_segments 여러 행 대신 경로당 1행(route_segment_packs)만 읽도록
+세그먼트 필드를 정수 배열 바이트로 묶어 저장합니다 (형식: app/utils/segment_pack.py).
+route_segments 행은 그대로 두며, 다시 실행하면 묶음이 없는 경로만 변환합니다.
+"""
+import json
+
+from sqlalchemy import bindparam, text
+from app.database import engine
+from app.utils.segment_pack import PACK_FORMAT_VERSION, pack_segments
+
+# 한 번에 변환하는 경로 수
+BATCH_ROUTES = 200
+
+def upgrade():
+    """route_segment_packs 테이블 생성 후 기존 세그먼트 변환"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS route_segment_packs (
+                route_id INTEGER PRIMARY KEY REFERENCES routes(route_id) ON DELETE CASCADE,
+                format_version SMALLINT NOT NULL DEFAULT 1,
+                segment_count INTEGER NOT NULL,
+                segment_data BYTEA NOT NULL,
+                terrain_types JSONB,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+        conn.commit()
+        print("✅ route_segment_packs 테이블 생성 완료")
+
+        route_ids = [row[0] for row in conn.execute(text("""
+            SELECT DISTINCT s.route_id
+            FROM route_segments s
+            WHERE NOT EXISTS (SELECT 1 FROM route_segment_packs p WHERE p.route_id = s.route_id)
+            ORDER BY s.route_id
+        """))]
+
+        converted = 0
+        for start in range(0, len(route_ids), BATCH_ROUTES):
+            batch = route_ids[start:start + BATCH_ROUTES]
+            segments_by_route = {route_id: [] for route_id in batch}
+            rows = conn.execute(
+                text("""
+                    SELECT segment_id, route_id, segment_order, start_lat, start_lon, end_lat, end_lon,
+                           segment_distance_m, segment_grade_percent, elevation_change_m,
+                           start_elevation_m, end_elevation_m, terrain_type
+                    FROM route_segments
+                    WHERE route_id IN :ids
+                    ORDER BY route_id, segment_order
+                """).bindparams(bindparam("ids", expanding=True)),
+                {"ids": batch},
+            ).mappings()
+            for row in rows:
+                segments_by_route[row["route_id"]].append(row)
+
+            packs = []
+            for route_id, segments in segments_by_route.items():
+                segment_data, terrain_types = pack_segments(segments)
+                packs.append({
+                    "route_id": route_id,
+                    "format_version": PACK_FORMAT_VERSION,
+                    "segment_count": len(segments),
+                    "segment_data": segment_data,
+                    "terrain_types": json.dumps(terrain_types) if terrain_types else None,
+                })
+            conn.execute(text("""
+                INSERT INTO route_segment_packs
+                    (route_id, format_version, segment_count, segment_data, terrain_types)
+                VALUES
+                    (:route_id, :format_version, :segment_count, :segment_data, CAST(:terrain_types AS JSONB))
+                ON CONFLICT (route_id) DO NOTHING
+            """), packs)
+            conn.commit()
+            converted += len(packs)
+            print(f"  - {converted}/{len(route_ids)}개 경로 변환")
+
+        print(f"✅ route_segments → route_segment_packs 변환 완료 ({converted}개 경로)")
+
+def downgrade():
+    """route_segment_packs 테이블 삭제 (route_segments는 유지되므로 상세 조회는 그대로 동작)"""
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS route_segment_packs"))
+        conn.commit()
+        print("✅ route_segment_packs 테이블 삭제 완료")
+
+if __name__ == "__main__":
+    print("🔧 경로 세그먼트 묶음 마이그레이션 시작...")
+    upgrade()
+    print("✅ 마이그레이션 완료")
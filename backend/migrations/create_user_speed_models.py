@@ -0,0 +1,94 @@
+"""
+사용자별 경사도/날씨 민감도 모델 테이블 생성 + 기존 로그로 초기화 마이그레이션
+
+이후에는 네비게이션 로그 저장 시 crud.update_user_speed_model로 로그 1건씩 O(1) 갱신됩니다.
+(모델: app/utils/user_speed_model.py)
+다시 실행하면 모델이 없는 사용자만 초기화합니다.
+"""
+import math
+
+from sqlalchemy import text
+from app.crud import PROFILE_MIN_WALKING_SECONDS
+from app.database import engine
+from app.utils.Factors_Affecting_Walking_Speed import reverse_calculate_base_speed
+from app.utils.user_speed_model import PersonalSpeedModel, SpeedModelStats, speed_features
+
+def _save(conn, user_id, stats):
+    model = PersonalSpeedModel.from_stats(stats)
+    conn.execute(text("""
+        INSERT INTO user_speed_models
+            (user_id, activity_type, log_count, stats, base_speed_kmh,
+             slope_exponent, temperature_coef, precipitation_coef)
+        VALUES
+            (:user_id, 'walking', :log_count, :stats, :base_speed_kmh,
+             :slope_exponent, :temperature_coef, :precipitation_coef)
+        ON CONFLICT (user_id, activity_type) DO NOTHING
+    """), {"user_id": user_id, "stats": stats.to_bytes(), **model._asdict()})
+
+def upgrade():
+    """user_speed_models 테이블 생성 후 기존 로그로 초기화"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS user_speed_models (
+                user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+                activity_type VARCHAR(20) NOT NULL DEFAULT 'walking',
+                log_count INTEGER NOT NULL DEFAULT 0,
+                stats BYTEA NOT NULL,
+                base_speed_kmh NUMERIC(4, 2) NOT NULL,
+                slope_exponent NUMERIC(5, 3) NOT NULL,
+                temperature_coef NUMERIC(5, 3) NOT NULL,
+                precipitation_coef NUMERIC(5, 3) NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (user_id, activity_type)
+            )
+        """))
+        conn.commit()
+        print("✅ user_speed_models 테이블 생성 완료")
+
+        # 로그 저장 시 속도 프로필에 반영하는 것과 같은 조건의 로그만 사용
+        rows = conn.execute(text("""
+            SELECT l.user_id, l.real_walking_speed_kmh, l.slope_factor, l.weather_factor,
+                   w.temperature_celsius, w.precipitation_mm
+            FROM navigation_logs l
+            LEFT JOIN weather_cache w ON w.weather_id = l.weather_id
+            WHERE l.real_walking_speed_kmh > 0
+              AND l.slope_factor > 0
+              AND l.weather_factor > 0
+              AND l.active_walking_time_seconds >= :min_seconds
+              AND NOT EXISTS (
+                  SELECT 1 FROM user_speed_models m
+                  WHERE m.user_id = l.user_id AND m.activity_type = 'walking'
+              )
+            ORDER BY l.user_id, l.started_at, l.log_id
+        """), {"min_seconds": PROFILE_MIN_WALKING_SECONDS}).fetchall()
+
+        current_user, stats = None, None
+        users = logs = 0
+        for user_id, real_speed, slope_factor, weather_factor, temperature_c, precipitation_mm in rows:
+            if user_id != current_user:
+                if stats is not None:
+                    _save(conn, current_user, stats)
+                    users += 1
+                current_user, stats = user_id, SpeedModelStats()
+            base_speed = reverse_calculate_base_speed(
+                float(real_speed), float(slope_factor), float(weather_factor)
+            )
+            stats.add(speed_features(float(slope_factor), temperature_c, precipitation_mm), math.log(base_speed))
+            logs += 1
+        if stats is not None:
+            _save(conn, current_user, stats)
+            users += 1
+        conn.commit()
+        print(f"✅ 민감도 모델 초기화 완료 ({users}명, 로그 {logs}개)")
+
+def downgrade():
+    """user_speed_models 테이블 삭제 (모집단 계수로 동작)"""
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS user_speed_models"))
+        conn.commit()
+        print("✅ user_speed_models 테이블 삭제 완료")
+
+if __name__ == "__main__":
+    print("🔧 사용자 경사도/날씨 민감도 모델 마이그레이션 시작...")
+    upgrade()
+    print("✅ 마이그레이션 완료")
@@ -0,0 +1,60 @@
+"""
+네비게이션 로그를 컬럼형 분석 아카이브에 추가하는 주기 작업
+backend/scripts/archive_navigation_logs.py
+
+마지막 실행 이후 저장된(created_at) 로그만 읽어 npz 파티션으로 추가합니다.
+아직 commit되지 않은 트랜잭션의 로그를 건너뛰지 않도록 최근 --safety-lag초 안에 저장된 로그는 다음 실행으로 미룹니다.
+cron 등으로 주기 실행하고, 가끔 --compact로 월별 part 파일을 병합합니다.
+
+사용법:
+    python scripts/archive_navigation_logs.py
+    python scripts/archive_navigation_logs.py --compact
+    python scripts/archive_navigation_logs.py --archive-dir /data/nav_archive --batch-size 10000
+
+crontab 예시 (매시 10분):
+    10 * * * * cd /app/backend && python scripts/archive_navigation_logs.py
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.utils.nav_archive import NavigationArchive
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네비게이션 로그 컬럼형 아카이브 갱신")
+    parser.add_argument("--archive-dir", help="아카이브 경로 (기본: NAV_ARCHIVE_DIR 또는 data/nav_archive)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="한 번에 읽어 추가할 행 수")
+    parser.add_argument("--compact", action="store_true", help="추가 후 월별 part 파일 병합")
+    parser.add_argument(
+        "--safety-lag",
+        type=float,
+        help="최근 이 시간(초) 안에 저장된 로그는 제외 (기본: NAV_ARCHIVE_SAFETY_LAG_SECONDS 또는 300)",
+    )
+    args = parser.parse_args()
+
+    archive = NavigationArchive(args.archive_dir, safety_lag_seconds=args.safety_lag)
+    print(f"\n📦 아카이브: {archive.root}")
+    print(f"   동기화 시점: {archive.synced_until or '-'}, 행 수: {archive.row_count}")
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        added = archive.sync_from_db(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"✅ {added}개 로그 추가 ({time.perf_counter() - started:.1f}초), 동기화 시점: {archive.synced_until}")
+
+    if args.compact:
+        removed = archive.compact()
+        print(f"🧹 part 파일 {removed}개 병합 → 현재 {len(archive.manifest['parts'])}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+경사도 분석 부하 중 이벤트 루프 지연 측정 스크립트
+backend/scripts/bench_route_analysis_latency.py
+
+/api/routes/analyze-slope 요청을 동시에 보내는 동안
+/api/routes/health 응답 시간(p50/p95/p99)을 측정합니다.
+Google Elevation API는 고정 지연을 갖는 가짜 함수로 대체하므로 API 키 없이 실행됩니다.
+
+사용법:
+    python scripts/bench_route_analysis_latency.py
+    python scripts/bench_route_analysis_latency.py --concurrency 16 --requests 64
+    python scripts/bench_route_analysis_latency.py --modes inline thread
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+BENCH_MODES = ["inline", "thread", "process"]
+
+
+def build_sample_itinerary(step_count: int = 120) -> dict:
+    """횡단보도가 포함된 긴 보행 경로 생성 (강남역 부근)"""
+    steps = []
+    lat, lng = 37.4979, 127.0276
+    for i in range(step_count):
+        coords = []
+        for _ in range(8):
+            coords.append(f"{lng:.7f},{lat:.7f}")
+            lat += 0.00004
+            lng += 0.00003
+        description = f"횡단보도 {20 + i % 10}m 후 직진" if i % 3 == 0 else "보행자도로 직진"
+        steps.append(
+            {
+                "linestring": " ".join(coords),
+                "distance": 35,
+                "description": description,
+            }
+        )
+    return {
+        "legs": [
+            {
+                "mode": "WALK",
+                "sectionTime": step_count * 30,
+                "distance": step_count * 35,
+                "start": {"name": "출발지"},
+                "end": {"name": "도착지"},
+                "steps": steps,
+            }
+        ]
+    }
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+async def run_bench(concurrency: int, total_requests: int, elevation_delay: float) -> dict:
+    import httpx
+
+    from app.main import app
+    from app.utils import elevation_helpers
+
+    async def fake_elevation_api(coordinates, api_key=None, priority="interactive"):
+        # 네트워크 대기만 흉내 (이벤트 루프는 블로킹하지 않음)
+        await asyncio.sleep(elevation_delay)
+        return [30.0 + (i % 20) * 0.5 for i in range(len(coordinates))]
+
+    elevation_helpers.call_google_elevation_api = fake_elevation_api
+
+    itinerary = build_sample_itinerary()
+    transport = httpx.ASGITransport(app=app)
+    probe_latencies = []
+    analyze_latencies = []
+    status_counts = {}
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def analyze_once():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/routes/analyze-slope",
+                    json={"itinerary": json.loads(json.dumps(itinerary)), "api_key": "bench"},
+                )
+                analyze_latencies.append((time.perf_counter() - started) * 1000)
+                status_counts[response.status_code] = status_counts.get(response.status_code, 0) + 1
+
+        async def probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/api/routes/health")
+                probe_latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.01)
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(analyze_once() for _ in range(total_requests)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    return {
+        "mode": os.getenv("ROUTE_ANALYSIS_POOL", "thread"),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(total_requests / elapsed, 2) if elapsed > 0 else 0,
+        "status_counts": status_counts,
+        "analyze_p50_ms": round(percentile(analyze_latencies, 50), 1),
+        "analyze_p95_ms": round(percentile(analyze_latencies, 95), 1),
+        "probe_count": len(probe_latencies),
+        "probe_p50_ms": round(percentile(probe_latencies, 50), 1),
+        "probe_p95_ms": round(percentile(probe_latencies, 95), 1),
+        "probe_p99_ms": round(percentile(probe_latencies, 99), 1),
+    }
+
+
+def run_mode_in_subprocess(mode: str, args) -> dict:
+    """풀 설정은 import 시점에 결정되므로 모드마다 별도 프로세스로 실행"""
+    env = dict(os.environ)
+    env["ROUTE_ANALYSIS_POOL"] = mode
+    env.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+    command = [
+        sys.executable,
+        __file__,
+        "--single",
+        "--concurrency", str(args.concurrency),
+        "--requests", str(args.requests),
+        "--elevation-delay", str(args.elevation_delay),
+    ]
+    output = subprocess.run(
+        command, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    # 마지막 줄이 결과 JSON (앞쪽은 분석 로그)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="경사도 분석 부하 중 이벤트 루프 지연 측정")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 분석 요청 수")
+    parser.add_argument("--requests", type=int, default=32, help="전체 분석 요청 수")
+    parser.add_argument("--elevation-delay", type=float, default=0.05, help="가짜 고도 API 지연 (초)")
+    parser.add_argument("--modes", nargs="+", default=BENCH_MODES, choices=BENCH_MODES)
+    parser.add_argument("--single", action="store_true", help="현재 환경 설정으로 한 번만 실행 (내부용)")
+    args = parser.parse_args()
+
+    if args.single:
+        result = asyncio.run(run_bench(args.concurrency, args.requests, args.elevation_delay))
+        # 분석 로그와 섞이지 않도록 결과는 마지막 줄에 출력
+        sys.stdout.write("\n" + json.dumps(result, ensure_ascii=False) + "\n")
+        return
+
+    print(f"\n🔍 동시성 {args.concurrency}, 요청 {args.requests}개, 고도 API 지연 {args.elevation_delay}s\n")
+    print(f"{'mode':<8} {'elapsed':>8} {'rps':>7} {'probe p50':>10} {'p95':>8} {'p99':>8}  status")
+    for mode in args.modes:
+        r = run_mode_in_subprocess(mode, args)
+        print(
+            f"{r['mode']:<8} {r['elapsed_s']:>7}s {r['throughput_rps']:>7} "
+            f"{r['probe_p50_ms']:>8}ms {r['probe_p95_ms']:>6}ms {r['probe_p99_ms']:>6}ms  {r['status_counts']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
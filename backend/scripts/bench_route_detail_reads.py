@@ -0,0 +1,114 @@
+"""
+경로 상세 세그먼트 조회 지연 비교 스크립트
+backend/scripts/bench_route_detail_reads.py
+
+같은 경로들에 대해 두 방식의 세그먼트 조회 시간(p50/p95/p99)을 측정합니다.
+- rows: route_segments 여러 행 조회 + 행마다 Numeric → float 변환 (기존 방식)
+- pack: route_segment_packs 1행 조회 + 배열 디코딩
+
+migrations/create_route_segment_packs.py로 변환을 마친 DB에서 실행합니다 (읽기만 함).
+
+사용법:
+    python scripts/bench_route_detail_reads.py
+    python scripts/bench_route_detail_reads.py --routes 200 --repeat 5
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.routers.gpx_routes import _segment_response
+from app.utils.segment_pack import unpack_segments
+
+ROWS_QUERY = text("""
+    SELECT
+        segment_id, segment_order, start_lat, start_lon,
+        end_lat, end_lon, segment_distance_m, segment_grade_percent,
+        elevation_change_m, terrain_type
+    FROM route_segments
+    WHERE route_id = :route_id
+    ORDER BY segment_order
+""")
+
+PACK_QUERY = text("""
+    SELECT segment_data, terrain_types
+    FROM route_segment_packs
+    WHERE route_id = :route_id
+""")
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def read_rows(db, route_id):
+    rows = db.execute(ROWS_QUERY, {"route_id": route_id}).mappings().all()
+    return [_segment_response(row) for row in rows]
+
+
+def read_pack(db, route_id):
+    segment_data, terrain_types = db.execute(PACK_QUERY, {"route_id": route_id}).one()
+    if isinstance(terrain_types, str):
+        terrain_types = json.loads(terrain_types)
+    return [_segment_response(seg) for seg in unpack_segments(bytes(segment_data), terrain_types)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="경로 상세 세그먼트 조회 지연 비교")
+    parser.add_argument("--routes", type=int, default=100, help="측정할 경로 수 (무작위 선택)")
+    parser.add_argument("--repeat", type=int, default=3, help="경로당 반복 횟수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        route_ids = [row[0] for row in db.execute(text("SELECT route_id FROM route_segment_packs"))]
+        if not route_ids:
+            print("⚠️ route_segment_packs가 비어 있습니다. 마이그레이션을 먼저 실행하세요.")
+            return
+        random.Random(args.seed).shuffle(route_ids)
+        route_ids = route_ids[: args.routes]
+
+        # 결과가 같은지 먼저 확인
+        mismatched = [rid for rid in route_ids if read_rows(db, rid) != read_pack(db, rid)]
+        if mismatched:
+            print(f"⚠️ 결과가 다른 경로 {len(mismatched)}개: {mismatched[:10]}")
+
+        latencies = {"rows": [], "pack": []}
+        segment_total = 0
+        for _ in range(args.repeat):
+            for route_id in route_ids:
+                # 순서에 따른 캐시 효과를 줄이기 위해 두 방식을 번갈아 실행
+                for mode, reader in (("rows", read_rows), ("pack", read_pack)):
+                    started = time.perf_counter()
+                    segments = reader(db, route_id)
+                    latencies[mode].append((time.perf_counter() - started) * 1000)
+                segment_total += len(segments)
+    finally:
+        db.close()
+
+    avg_segments = segment_total / max(1, args.repeat * len(route_ids))
+    print(f"\n🔍 경로 {len(route_ids)}개 × {args.repeat}회, 경로당 평균 세그먼트 {avg_segments:.0f}개\n")
+    print(f"{'mode':<6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for mode, values in latencies.items():
+        print(
+            f"{mode:<6} {percentile(values, 50):>7.2f}ms {percentile(values, 95):>7.2f}ms "
+            f"{percentile(values, 99):>7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+네비게이션 로그를 DB에서 직접 NDJSON/CSV로 내보내는 스크립트
+backend/scripts/export_navigation_logs.py
+
+서버 측 커서로 chunk 단위 조회 후 바로 파일에 기록하므로
+로그 수와 관계없이 메모리 사용량이 일정합니다.
+
+사용법:
+    python scripts/export_navigation_logs.py --format csv
+    python scripts/export_navigation_logs.py --format ndjson --output logs.ndjson
+    python scripts/export_navigation_logs.py --columns log_id,user_id,real_walking_speed_kmh --user-id 3
+    python scripts/export_navigation_logs.py --format ndjson --output - | head
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.utils import navigation_export
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네비게이션 로그 내보내기 (NDJSON/CSV)")
+    parser.add_argument("--format", choices=navigation_export.EXPORT_FORMATS, default="csv")
+    parser.add_argument("--columns", help="내보낼 컬럼 (쉼표 구분, 생략 시 형식별 기본값)")
+    parser.add_argument("--user-id", type=int, help="특정 사용자만 내보내기")
+    parser.add_argument("--route-mode", choices=["walking", "transit"])
+    parser.add_argument("--start-date", type=datetime.fromisoformat, help="시작 날짜 (ISO 형식)")
+    parser.add_argument("--end-date", type=datetime.fromisoformat, help="종료 날짜 (ISO 형식)")
+    parser.add_argument("--chunk-size", type=int, default=navigation_export.DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--output", help="출력 파일 경로 ('-'이면 표준 출력)")
+    args = parser.parse_args()
+
+    try:
+        columns = navigation_export.resolve_columns(
+            args.columns.split(",") if args.columns else None, args.format
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    output = args.output or (
+        f"navigation_logs_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{args.format}"
+    )
+
+    db = SessionLocal()
+    try:
+        chunks = navigation_export.iter_export(
+            db,
+            args.format,
+            columns,
+            chunk_size=args.chunk_size,
+            user_id=args.user_id,
+            route_mode=args.route_mode,
+            start_date=args.start_date,
+            end_date=args.end_date,
+        )
+
+        if output == "-":
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            return
+
+        # CSV는 엑셀 호환을 위해 BOM 포함
+        encoding = "utf-8-sig" if args.format == "csv" else "utf-8"
+        with open(output, "w", newline="", encoding=encoding) as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+        print(f"✅ 내보내기 완료: {output}", file=sys.stderr)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
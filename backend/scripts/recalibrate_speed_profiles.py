@@ -0,0 +1,90 @@
+"""
+네비게이션 로그로 사용자 속도 프로필(walking)을 다시 계산하는 스크립트
+backend/scripts/recalibrate_speed_profiles.py
+
+역산 규칙(reverse_calculate_base_speed)이나 가중 평균 알파 구간(crud.ALPHA_SCHEDULE)을 바꾼 뒤
+기존 프로필을 새 규칙으로 다시 만들 때 실행합니다. (계산: app/utils/speed_recalibration.py)
+먼저 --dry-run으로 변경 내용을 확인하세요.
+
+사용법:
+    python scripts/recalibrate_speed_profiles.py --dry-run
+    python scripts/recalibrate_speed_profiles.py --dry-run --top 50
+    python scripts/recalibrate_speed_profiles.py
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.utils.speed_recalibration import (
+    DEFAULT_CHUNK_SIZE,
+    apply_recalibration,
+    plan_recalibration,
+)
+
+
+def _format_speed(value):
+    return f"{value:.2f}" if value is not None else "-"
+
+
+def print_report(changes, top: int):
+    """변경 요약 + 변화가 큰 사용자 목록"""
+    new_profiles = [c for c in changes if c.profile_id is None]
+    deltas = np.array([c.delta_kmh for c in changes if c.delta_kmh is not None], dtype=np.float64)
+    changed = int(np.count_nonzero(deltas)) if len(deltas) else 0
+
+    print(f"\n📊 대상 사용자 {len(changes)}명 (기존 프로필 {len(deltas)}개, 새 프로필 {len(new_profiles)}개)")
+    if len(deltas):
+        print(f"   속도 변경: {changed}명, 평균 |변화| {np.abs(deltas).mean():.3f} km/h, "
+              f"최대 |변화| {np.abs(deltas).max():.2f} km/h")
+        for threshold in (0.05, 0.2, 0.5):
+            print(f"   |변화| ≥ {threshold:.2f} km/h: {int(np.count_nonzero(np.abs(deltas) >= threshold))}명")
+
+    ranked = sorted(
+        changes,
+        key=lambda c: abs(c.delta_kmh) if c.delta_kmh is not None else float("inf"),
+        reverse=True,
+    )[:top]
+    if ranked:
+        print(f"\n{'user_id':>8} {'기존':>6} {'새 값':>6} {'변화':>6} {'로그 수':>11}")
+        for c in ranked:
+            delta = f"{c.delta_kmh:+.2f}" if c.delta_kmh is not None else "new"
+            counts = f"{c.old_count if c.old_count is not None else '-'}→{c.new_count}"
+            print(f"{c.user_id:>8} {_format_speed(c.old_speed_kmh):>6} {c.new_speed_kmh:>6.2f} {delta:>6} {counts:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네비게이션 로그로 속도 프로필 재계산")
+    parser.add_argument("--dry-run", action="store_true", help="변경 내용만 출력하고 DB는 바꾸지 않음")
+    parser.add_argument("--top", type=int, default=20, help="변화가 큰 사용자 출력 수")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="DB에서 한 번에 가져올 행 수")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        changes = plan_recalibration(db, chunk_size=args.chunk_size)
+        print(f"🔄 프로필 재계산 완료 ({time.perf_counter() - started:.2f}초)")
+        print_report(changes, args.top)
+
+        if args.dry_run:
+            print("\n🔍 --dry-run: DB는 변경하지 않았습니다.")
+            return
+
+        started = time.perf_counter()
+        result = apply_recalibration(db, changes)
+        print(f"\n✅ 프로필 반영 완료 - 갱신 {result['updated']}개, 생성 {result['inserted']}개 "
+              f"({time.perf_counter() - started:.2f}초)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+고도 조회 좌표 샘플링 오차 검증 스크립트
+backend/scripts/validate_elevation_sampling.py
+
+data/gpx_files의 실측 고도(<ele>)가 있는 트랙을 보행 구간으로 잘라,
+원본 좌표 전체(ELEVATION_SAMPLING=off)와 샘플링 좌표(adaptive)로 같은 경사도 분석을 실행하고
+좌표 수 감소율과 ETA(total_adjusted_walk_time) / 경사도만 반영한 시간(slope_only_time) 오차를 비교합니다.
+샘플링 좌표의 고도는 원본 선분 위 위치로 GPX 고도를 선형 보간합니다 (Google API 호출 없음).
+
+ELEVATION_SAMPLING_* 값을 바꾸기 전에 실행해 오차가 허용 범위인지 확인하세요.
+
+사용법:
+    python scripts/validate_elevation_sampling.py
+    python scripts/validate_elevation_sampling.py --interval 30 --tolerance 3 --limit 50
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import logging
+import math
+import os
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.utils.elevation_helpers import _build_route_elevation_result, _prepare_route_elevation
+from app.utils.elevation_sampling import ElevationSampler, _project
+from app.utils.geo_helpers import haversine
+
+DEFAULT_GPX_DIR = Path(__file__).parent.parent / "data" / "gpx_files"
+
+
+def load_track(path: Path):
+    """GPX → [(좌표, 고도), ...] (고도 없는 점은 제외)"""
+    try:
+        root = ET.parse(path).getroot()
+    except ET.ParseError:
+        return []
+    points = []
+    for element in root.iter():
+        if not element.tag.endswith(("trkpt", "rtept")):
+            continue
+        ele = next((child for child in element if child.tag.endswith("ele")), None)
+        if ele is None or ele.text is None:
+            continue
+        coord = {"lat": float(element.get("lat")), "lon": float(element.get("lon"))}
+        if points and points[-1][0] == coord:
+            continue
+        points.append((coord, float(ele.text)))
+    return points
+
+
+def split_legs(points, leg_length: float, step_points: int):
+    """트랙 → 보행 leg 목록 (leg_length m 단위, step은 step_points개씩, 경계 좌표 공유)"""
+    legs = []
+    current = [points[0]]
+    distance = 0.0
+    for point in points[1:]:
+        distance += haversine(current[-1][0], point[0])
+        current.append(point)
+        if distance >= leg_length:
+            legs.append((current, distance))
+            current = [point]
+            distance = 0.0
+    if distance >= 100:
+        legs.append((current, distance))
+
+    result = []
+    for leg_points, leg_distance in legs:
+        steps = []
+        for start in range(0, len(leg_points) - 1, step_points - 1):
+            steps.append(leg_points[start : start + step_points])
+        result.append((steps, leg_distance))
+    return result
+
+
+def build_itinerary(steps, leg_distance: float) -> dict:
+    return {
+        "legs": [
+            {
+                "mode": "WALK",
+                "distance": round(leg_distance),
+                "sectionTime": round(leg_distance / 1.111),
+                "start": {"name": "출발지"},
+                "end": {"name": "도착지"},
+                "steps": [
+                    {
+                        "linestring": " ".join(f"{c['lon']},{c['lat']}" for c, _ in step),
+                        "distance": round(sum(haversine(step[i - 1][0], step[i][0]) for i in range(1, len(step)))),
+                        "description": "",
+                    }
+                    for step in steps
+                ],
+            }
+        ]
+    }
+
+
+def _segment_distance(p, a, b):
+    """평면 좌표 점 p와 선분 ab 사이 거리"""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return math.hypot(p[0] - a[0], p[1] - a[1])
+    t = max(0.0, min(1.0, ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / length_sq))
+    return math.hypot(p[0] - (a[0] + t * dx), p[1] - (a[1] + t * dy))
+
+
+def profile_elevations(step, sampled_coords):
+    """샘플링 좌표 → 원본 선분 위 위치로 GPX 고도 선형 보간 (순서대로 앞으로만 탐색)"""
+    coords = [c for c, _ in step]
+    elevations = [e for _, e in step]
+    projected = _project(coords + sampled_coords)
+    original, targets = projected[: len(coords)], projected[len(coords):]
+    result = []
+    segment = 0
+    for point in targets:
+        best = min(
+            range(segment, len(coords) - 1),
+            key=lambda i: _segment_distance(point, original[i], original[i + 1]),
+        )
+        segment = best
+        a, b = original[best], original[best + 1]
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        length_sq = dx * dx + dy * dy
+        t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((point[0] - a[0]) * dx + (point[1] - a[1]) * dy) / length_sq))
+        result.append(elevations[best] + (elevations[best + 1] - elevations[best]) * t)
+    return result
+
+
+def analyze(itinerary, steps, sampler: ElevationSampler):
+    with contextlib.redirect_stdout(io.StringIO()):
+        prepared = _prepare_route_elevation(copy.deepcopy(itinerary), sampler)
+        elevations = []
+        for step, step_data in zip(steps, prepared["optimized"]["legs"][0]["steps_coords"]):
+            elevations.extend(profile_elevations(step, step_data["coords"]))
+        result = _build_route_elevation_result(prepared, elevations)
+    return len(prepared["all_coords"]), result
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="고도 조회 좌표 샘플링 오차 검증 (GPX 실측 고도)")
+    parser.add_argument("--gpx-dir", type=Path, default=DEFAULT_GPX_DIR)
+    parser.add_argument("--limit", type=int, default=0, help="검사할 GPX 파일 수 (0: 전체)")
+    parser.add_argument("--leg-length", type=float, default=1000, help="보행 leg 길이 (m)")
+    parser.add_argument("--step-points", type=int, default=30, help="step당 좌표 수")
+    parser.add_argument("--interval", type=float, default=float(os.getenv("ELEVATION_SAMPLING_INTERVAL", "20")))
+    parser.add_argument("--tolerance", type=float, default=float(os.getenv("ELEVATION_SAMPLING_TOLERANCE", "2")))
+    parser.add_argument("--min-gap", type=float, default=float(os.getenv("ELEVATION_SAMPLING_MIN_GAP", "5")))
+    parser.add_argument(
+        "--max-length-error", type=float, default=float(os.getenv("ELEVATION_SAMPLING_MAX_LENGTH_ERROR", "0.01"))
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    full = ElevationSampler(mode="off")
+    adaptive = ElevationSampler(
+        interval_m=args.interval,
+        tolerance_m=args.tolerance,
+        min_gap_m=args.min_gap,
+        max_length_error=args.max_length_error,
+    )
+
+    files = sorted(args.gpx_dir.glob("*.gpx"))
+    full_points = sampled_points = 0
+    eta_errors, slope_time_errors = [], []
+    leg_count = 0
+    for path in files[: args.limit or None]:
+        points = load_track(path)
+        if len(points) < 3:
+            continue
+        for steps, leg_distance in split_legs(points, args.leg_length, args.step_points):
+            itinerary = build_itinerary(steps, leg_distance)
+            full_count, full_result = analyze(itinerary, steps, full)
+            sampled_count, sampled_result = analyze(itinerary, steps, adaptive)
+            full_points += full_count
+            sampled_points += sampled_count
+            leg_count += 1
+
+            full_eta = full_result["total_adjusted_walk_time"]
+            if full_eta > 0:
+                eta_errors.append(abs(sampled_result["total_adjusted_walk_time"] - full_eta) / full_eta * 100)
+            full_slope_time = full_result["walk_legs_analysis"][0]["slope_only_time"]
+            if full_slope_time > 0:
+                slope_time_errors.append(
+                    abs(sampled_result["walk_legs_analysis"][0]["slope_only_time"] - full_slope_time)
+                    / full_slope_time
+                    * 100
+                )
+
+    print(f"보행 leg: {leg_count}개 (GPX 파일 {len(files)}개 중 고도 있는 트랙)")
+    print(
+        f"설정: interval={adaptive.interval_m}m, tolerance={adaptive.tolerance_m}m, "
+        f"min_gap={adaptive.min_gap_m}m, max_length_error={adaptive.max_length_error}"
+    )
+    if not leg_count:
+        return
+    print(
+        f"고도 조회 좌표: {full_points}개 → {sampled_points}개 "
+        f"({full_points / max(sampled_points, 1):.1f}배 감소)"
+    )
+    for label, errors in (("ETA", eta_errors), ("경사도 반영 시간", slope_time_errors)):
+        print(
+            f"{label} 오차(%): p50={percentile(errors, 50):.2f}, p95={percentile(errors, 95):.2f}, "
+            f"max={max(errors, default=0):.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
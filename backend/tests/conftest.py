@@ -1,6 +1,11 @@
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
+from app import models  # noqa: F401 - 테이블 정의 등록
+from app.database import Base, get_db
 from app.main import app
 
 
@@ -10,6 +15,39 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def db_session_factory():
+    """테스트마다 새로 만드는 메모리 SQLite (모든 테이블 생성, DB 스레드 풀에서도 같은 커넥션 사용)"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(db_session_factory):
+    """메모리 SQLite 세션"""
+    db = db_session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def db_client(db_session):
+    """get_db를 메모리 SQLite 세션으로 바꾼 테스트 클라이언트"""
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
 @pytest.fixture
 def sample_route_params():
     """경로 검색 테스트용 샘플 파라미터"""
@@ -0,0 +1,51 @@
+"""
+경사도 보정 시간 계산 테스트 (고도는 좌표 위치로 계산, Google Elevation API 호출 없음)
+"""
+
+import contextlib
+import io
+import math
+
+from app.utils.elevation_helpers import _prepare_route_elevation, adjust_walking_time
+
+# 위도 37.5 부근 1m에 해당하는 경도 차
+LON_PER_M = 1 / (111195 * math.cos(math.radians(37.5)))
+
+
+def _east(x_m):
+    return {"lon": 127.0 + x_m * LON_PER_M, "lat": 37.5}
+
+
+def test_multi_step_elevations_stay_aligned_at_full_resolution():
+    """Tmap 원본 좌표 그대로: step이 여러 개여도 각 구간 고도가 자기 좌표 고도와 일치 (step마다 밀리지 않음)"""
+    # 15m 간격 3점씩 step 3개 (경계 좌표는 앞뒤 step이 공유), 고도는 동쪽 거리의 5%에 비례하는 비탈
+    steps = [[_east(step * 30 + i * 15) for i in range(3)] for step in range(3)]
+    leg = {
+        "mode": "WALK",
+        "distance": 90,
+        "sectionTime": 81,
+        "start": {"name": "출발지"},
+        "end": {"name": "도착지"},
+        "steps": [
+            {
+                "linestring": " ".join(f"{c['lon']},{c['lat']}" for c in step),
+                "distance": 30,
+                "description": "",
+            }
+            for step in steps
+        ],
+    }
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        prepared = _prepare_route_elevation({"legs": [leg]})
+        steps_coords = prepared["optimized"]["legs"][0]["steps_coords"]
+        # 경계 좌표 포함 step별 좌표 전체 = 3 x 3
+        assert len(prepared["all_coords"]) == 9
+        elevations = [(c["lon"] - 127.0) / LON_PER_M * 0.05 for c in prepared["all_coords"]]
+        _, segments = adjust_walking_time(leg, elevations, steps_coords)
+
+    expected = [(x * 0.05, (x + 15) * 0.05) for x in range(0, 90, 15)]
+    assert len(segments) == len(expected)
+    for segment, (start, end) in zip(segments, expected):
+        assert math.isclose(segment["elevation_start"], start, abs_tol=0.01)
+        assert math.isclose(segment["elevation_end"], end, abs_tol=0.01)
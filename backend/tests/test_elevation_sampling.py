@@ -0,0 +1,113 @@
+"""
+고도 조회 좌표 적응형 샘플링 테스트
+"""
+
+import contextlib
+import io
+import math
+
+from app.utils.elevation_helpers import _build_route_elevation_result, _prepare_route_elevation
+from app.utils.elevation_sampling import ElevationSampler
+from app.utils.geo_helpers import haversine
+
+# 위도 37.5 부근 1m에 해당하는 위경도 차
+LAT_PER_M = 1 / 111195
+LON_PER_M = 1 / (111195 * math.cos(math.radians(37.5)))
+
+
+def _line(start_m, end_m, count):
+    """(동쪽 m, 북쪽 m) 직선 위 등간격 좌표"""
+    coords = []
+    for i in range(count):
+        x = start_m[0] + (end_m[0] - start_m[0]) * i / (count - 1)
+        y = start_m[1] + (end_m[1] - start_m[1]) * i / (count - 1)
+        coords.append({"lon": 127.0 + x * LON_PER_M, "lat": 37.5 + y * LAT_PER_M})
+    return coords
+
+
+def _length(coords):
+    return sum(haversine(coords[i - 1], coords[i]) for i in range(1, len(coords)))
+
+
+def test_straight_dense_run_collapses_to_interval():
+    """1m 간격 직선 200m → 20m 간격 (시작/끝 유지, 길이 보존)"""
+    coords = _line((0, 0), (200, 0), 201)
+    sampled = ElevationSampler(interval_m=20).sample(coords)
+
+    assert 10 <= len(sampled) <= 11
+    assert sampled[0] is coords[0] and sampled[-1] is coords[-1]
+    assert abs(_length(sampled) - _length(coords)) < 0.5
+    gaps = [haversine(sampled[i - 1], sampled[i]) for i in range(1, len(sampled))]
+    assert max(gaps) <= 20.5
+
+
+def test_corners_kept_and_never_more_points():
+    """꺾이는 점은 유지, 원본보다 늘어나지 않음, off/짧은 step은 그대로"""
+    corner = _line((0, 0), (100, 0), 101) + _line((100, 0), (100, 100), 101)[1:]
+    sampled = ElevationSampler().sample(corner)
+    assert corner[100] in sampled
+    assert abs(_length(sampled) - _length(corner)) < 1.0
+
+    sparse = _line((0, 0), (300, 0), 4)
+    sparse[1]["lat"] += 30 * LAT_PER_M
+    assert len(ElevationSampler().sample(sparse)) <= len(sparse)
+    assert ElevationSampler(mode="off").sample(corner) == corner
+    assert ElevationSampler().sample(corner[:2]) == corner[:2]
+
+
+def test_length_error_bound_on_jittery_track():
+    """허용 오차 안쪽 지그재그(GPS 흔들림)도 길이 오차 상한을 지킴"""
+    coords = []
+    for i in range(101):
+        coords.append({"lon": 127.0 + i * 2 * LON_PER_M, "lat": 37.5 + (1.5 if i % 2 else -1.5) * LAT_PER_M})
+    sampler = ElevationSampler(tolerance_m=2, max_length_error=0.01)
+    sampled = sampler.sample(coords)
+
+    assert len(sampled) <= len(coords)
+    assert _length(coords) - _length(sampled) <= _length(coords) * 0.01
+
+
+def test_sampled_route_eta_matches_full_resolution():
+    """언덕 경로: 샘플링 좌표로 계산한 ETA가 원본 좌표 결과와 1% 이내, 고도 조회 좌표는 크게 감소"""
+    steps = [_line((i * 100, 0), ((i + 1) * 100, 0), 51) for i in range(6)]
+    itinerary = {
+        "legs": [
+            {
+                "mode": "WALK",
+                "distance": 600,
+                "sectionTime": 540,
+                "start": {"name": "출발지"},
+                "end": {"name": "도착지"},
+                "steps": [
+                    {
+                        "linestring": " ".join(f"{c['lon']},{c['lat']}" for c in step),
+                        "distance": 100,
+                        "description": "",
+                    }
+                    for step in steps
+                ],
+            }
+        ]
+    }
+
+    def elevation_at(coord):
+        # 동쪽으로 갈수록 오르다 내려가는 언덕 (최대 12m)
+        x = (coord["lon"] - 127.0) / LON_PER_M
+        return 12.0 * math.sin(math.pi * x / 600)
+
+    def run(sampler):
+        with contextlib.redirect_stdout(io.StringIO()):
+            prepared = _prepare_route_elevation(
+                {"legs": [dict(itinerary["legs"][0])]}, sampler
+            )
+            elevations = [elevation_at(c) for c in prepared["all_coords"]]
+            return len(elevations), _build_route_elevation_result(prepared, elevations)
+
+    full_count, full = run(ElevationSampler(mode="off"))
+    sampled_count, sampled = run(ElevationSampler())
+
+    assert sampled_count * 3 <= full_count
+    full_eta = full["total_adjusted_walk_time"]
+    assert abs(sampled["total_adjusted_walk_time"] - full_eta) <= full_eta * 0.01
+    full_slope_time = full["walk_legs_analysis"][0]["slope_only_time"]
+    assert abs(sampled["walk_legs_analysis"][0]["slope_only_time"] - full_slope_time) <= full_slope_time * 0.02
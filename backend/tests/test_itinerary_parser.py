@@ -0,0 +1,81 @@
+"""
+itinerary 파싱 결과 공유 테스트 (좌표 수집/횡단보도 계산)
+"""
+
+import copy
+
+from app.utils.crosswalk_helpers import crosswalk_waiting_time
+from app.utils.elevation_helpers import count_crosswalks, count_total_coordinates, optimize_all_coordinates
+from app.utils.geo_helpers import parse_linestring
+from app.utils.itinerary_parser import parse_coords, parse_itinerary
+
+
+def _walk(name, steps):
+    return {
+        "mode": "WALK",
+        "distance": sum(step["distance"] for step in steps),
+        "sectionTime": 300,
+        "start": {"name": name},
+        "end": {"name": name},
+        "steps": steps,
+    }
+
+
+ITINERARY = {
+    "legs": [
+        _walk("출발", [
+            {"linestring": "126.9700,37.5500 126.9702,37.5501", "distance": 20, "description": "직진", "turnType": 11},
+            {"linestring": "126.9702,37.5501 126.9705,37.5503", "distance": 30, "description": "횡단보도 30m 건너기", "turnType": 211},
+            {"linestring": "126.9705,37.5503 126.9707,37.5504", "distance": 20, "description": "3번 출구에서 횡단보도 건너기"},
+        ]),
+        {"mode": "SUBWAY", "sectionTime": 600},
+        _walk("환승", [
+            {"linestring": "127.0000,37.5600 127.0003,37.5602", "distance": 40, "description": "횡단보도 20m", "turnType": 211},
+        ]),
+        {"mode": "BUS", "sectionTime": 600},
+        {
+            "mode": "WALK",
+            "distance": 80,
+            "sectionTime": 60,
+            "passShape": {"linestring": "127.0100,37.5700 127.0102,37.5701 127.0105,37.5703"},
+        },
+    ]
+}
+
+
+def test_parse_itinerary_flags_and_crosswalks():
+    """환승/지하철 진입 여부, passShape, 횡단보도 길이/좌표/출구 제외를 한 번에 파싱"""
+    parsed = parse_itinerary(ITINERARY)
+
+    assert [leg.index for leg in parsed.legs] == [0, 2, 4]
+    assert [leg.is_transfer for leg in parsed.legs] == [False, True, False]
+    assert parsed.legs[0].is_entering_subway
+    assert [leg.index for leg in parsed.outdoor_legs] == [0, 4]
+    assert parsed.legs[2].steps[0].distance == 80
+    assert parsed.legs[2].coord_count == 3
+
+    lengths = [(c.leg_index, c.length, c.skipped) for c in parsed.crosswalks]
+    assert lengths == [(0, 30, False), (0, None, True), (2, 20, False)]
+    assert parsed.crosswalks[0].endpoints == (37.5501, 126.9702, 37.5503, 126.9705)
+
+
+def test_parsed_itinerary_matches_dict_inputs():
+    """파싱 결과를 넘겨도 leg dict/itinerary를 넘긴 것과 같은 결과"""
+    parsed = parse_itinerary(ITINERARY)
+    walk_legs = [leg.leg for leg in parsed.outdoor_legs]
+
+    assert optimize_all_coordinates(parsed.outdoor_legs) == optimize_all_coordinates(copy.deepcopy(walk_legs))
+    assert count_total_coordinates(parsed.legs) == 11
+    assert crosswalk_waiting_time(ITINERARY, parsed) == crosswalk_waiting_time(copy.deepcopy(ITINERARY))
+    assert crosswalk_waiting_time(ITINERARY, parsed)["count"] == 2
+    assert count_crosswalks(ITINERARY) == 5
+
+
+def test_parse_coords_skips_invalid_like_parse_linestring():
+    """잘못된 좌표가 섞여 있으면 parse_linestring과 같이 해당 좌표만 건너뜀"""
+    linestring = "127.0,37.5 bad 127.1,37.6,1 127.2,37.7"
+    assert parse_coords(linestring) == parse_linestring(linestring) == [
+        {"lon": 127.0, "lat": 37.5},
+        {"lon": 127.2, "lat": 37.7},
+    ]
+    assert parse_coords("") == []
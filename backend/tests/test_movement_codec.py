@@ -0,0 +1,81 @@
+"""
+네비게이션 로그 움직임 구간 바이너리 저장 형식 테스트
+"""
+
+import json
+
+from app.utils.movement_codec import (
+    decode_segments,
+    encode_segments,
+    merge_movement_data,
+    split_movement_data,
+)
+
+
+def _movement_data(count=2):
+    segments = []
+    for i in range(count):
+        walking = i % 2 == 0
+        segment = {
+            "status": "walking" if walking else "paused",
+            "start_time": f"2025-12-03T16:{22 + i:02d}:01.778Z",
+            "end_time": f"2025-12-03T16:{22 + i:02d}:59.846Z",
+            "distance_m": 619.49 if walking else 0,
+            "duration_seconds": 58,
+            "avg_speed_ms": 1.83 if walking else 0,
+        }
+        if not walking:
+            segment["reason"] = "crosswalk"
+        segments.append(segment)
+    return {
+        "segments": segments,
+        "total_pauses": count // 2,
+        "crosswalk_pauses": count // 2,
+        "detection_method": "step_counter_hybrid",
+    }
+
+
+def test_round_trip_matches_app_json():
+    """앱이 보낸 movement_data가 그대로 복원되고 JSON보다 작음"""
+    movement_data = _movement_data(count=30)
+    remaining, segments_data = split_movement_data(movement_data)
+
+    assert "segments" not in remaining
+    assert merge_movement_data(remaining, segments_data) == movement_data
+    # 정수 값은 정수로 복원 (JSON 표현도 동일)
+    restored = decode_segments(segments_data)
+    assert json.dumps(restored[1]["distance_m"]) == "0"
+    assert len(segments_data) * 4 < len(json.dumps(movement_data["segments"]))
+
+
+def test_unsupported_segments_are_kept_as_json():
+    """알 수 없는 키, 다른 시각 형식, 빈 목록은 인코딩하지 않음"""
+    extra_key = _movement_data()
+    extra_key["segments"][0]["steps"] = 12
+    other_time_format = _movement_data()
+    other_time_format["segments"][0]["start_time"] = "2025-12-03 16:22:01"
+
+    for movement_data in (extra_key, other_time_format, {"segments": [], "total_pauses": 0}):
+        assert split_movement_data(movement_data) == (movement_data, None)
+    assert encode_segments(None) is None
+    assert merge_movement_data(None, None) is None
+
+
+def test_empty_string_status_round_trips():
+    """문자열 표에 빈 문자열만 있어도 (표 길이 0) 그대로 복원"""
+    movement_data = _movement_data()
+    for segment in movement_data["segments"]:
+        segment["status"] = ""
+        segment.pop("reason", None)
+
+    remaining, segments_data = split_movement_data(movement_data)
+    assert segments_data is not None
+    assert merge_movement_data(remaining, segments_data) == movement_data
+
+
+def test_values_finer_than_hundredths_are_kept_as_json():
+    """0.01 단위로 나타낼 수 없는 거리/시간/속도는 반올림하지 않고 JSON 그대로 저장"""
+    for key, value in (("distance_m", 12.3456), ("duration_seconds", 58.001), ("avg_speed_ms", 1.23456)):
+        movement_data = _movement_data()
+        movement_data["segments"][0][key] = value
+        assert split_movement_data(movement_data) == (movement_data, None)
@@ -0,0 +1,161 @@
+"""
+네비게이션 로그 컬럼형 아카이브 테스트
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import func
+
+from app import crud
+from app.models import NavigationLogs
+from app.utils.nav_archive import NavigationArchive
+
+
+def _make_log(log_id, user_id, started_at, route_mode="walking", **kwargs):
+    row = {
+        "log_id": log_id,
+        "user_id": user_id,
+        "route_mode": route_mode,
+        "started_at": started_at,
+        "ended_at": started_at,
+        "total_distance_m": Decimal("1200.50"),
+        "estimated_time_seconds": 900,
+        "actual_time_seconds": 960,
+        "accuracy_percent": Decimal("93.75"),
+        "real_walking_speed_kmh": None,
+    }
+    row.update(kwargs)
+    return row
+
+
+def _sample_logs():
+    return [
+        _make_log(1, 1, datetime(2025, 11, 3, 9, 0), real_walking_speed_kmh=Decimal("4.20")),
+        _make_log(2, 2, datetime(2025, 11, 15, 18, 30), route_mode="transit"),
+        _make_log(3, 1, datetime(2025, 12, 1, 8, 0), real_walking_speed_kmh=Decimal("4.50")),
+        _make_log(4, 3, datetime(2025, 12, 20, 12, 0)),
+    ]
+
+
+def test_append_partitions_by_month(tmp_path):
+    """월별 파티션 생성 및 워터마크 갱신"""
+    archive = NavigationArchive(str(tmp_path))
+    assert archive.append(_sample_logs()) == 4
+
+    assert archive.watermark == 4
+    assert sorted(p["month"] for p in archive.manifest["parts"]) == ["2025-11", "2025-12"]
+    assert (tmp_path / "_manifest.json").exists()
+
+
+def test_append_skips_rows_below_watermark(tmp_path):
+    """이미 아카이브된 log_id는 다시 추가하지 않음"""
+    archive = NavigationArchive(str(tmp_path))
+    archive.append(_sample_logs())
+
+    # 새 인스턴스에서도 manifest로 워터마크 복원
+    reopened = NavigationArchive(str(tmp_path))
+    added = reopened.append(_sample_logs() + [_make_log(5, 2, datetime(2025, 12, 21, 7, 0))])
+
+    assert added == 1
+    assert reopened.row_count == 5
+    assert reopened.watermark == 5
+
+
+def test_scan_filters_and_decodes(tmp_path):
+    """사용자/기간/route_mode 필터와 사전 인코딩 복원"""
+    archive = NavigationArchive(str(tmp_path))
+    archive.append(_sample_logs())
+
+    data = archive.scan(user_ids=[1], columns=["log_id", "route_mode", "real_walking_speed_kmh"])
+    assert sorted(data["log_id"].tolist()) == [1, 3]
+    assert set(data["route_mode"].tolist()) == {"walking"}
+    assert np.allclose(np.sort(data["real_walking_speed_kmh"]), [4.2, 4.5])
+
+    transit = archive.scan(route_modes=["transit"], columns=["log_id"])
+    assert transit["log_id"].tolist() == [2]
+
+    december = archive.scan(start=datetime(2025, 12, 1), end=datetime(2025, 12, 31), columns=["log_id"])
+    assert sorted(december["log_id"].tolist()) == [3, 4]
+
+
+def test_scan_null_values_are_nan(tmp_path):
+    """NULL 숫자 값은 NaN으로 저장"""
+    archive = NavigationArchive(str(tmp_path))
+    archive.append(_sample_logs())
+
+    data = archive.scan(user_ids=[3], columns=["real_walking_speed_kmh", "accuracy_percent"])
+    assert np.isnan(data["real_walking_speed_kmh"][0])
+    assert data["accuracy_percent"][0] == 93.75
+
+
+def test_scan_no_match_returns_empty_arrays(tmp_path):
+    """조건에 맞는 행이 없으면 빈 배열 반환"""
+    archive = NavigationArchive(str(tmp_path))
+    archive.append(_sample_logs())
+
+    data = archive.scan(user_ids=[99], columns=["log_id", "route_mode"])
+    assert len(data["log_id"]) == 0
+    assert len(data["route_mode"]) == 0
+
+
+def test_compact_merges_parts(tmp_path):
+    """같은 월의 part 파일 병합 후에도 같은 결과"""
+    archive = NavigationArchive(str(tmp_path))
+    logs = _sample_logs()
+    archive.append(logs[:1])
+    archive.append(logs[1:])
+
+    before = archive.scan(columns=["log_id"])["log_id"]
+    removed = archive.compact()
+
+    assert removed == 2  # 2025-11 파티션의 part 2개 병합
+    assert len(archive.manifest["parts"]) == 2
+    assert sorted(archive.scan(columns=["log_id"])["log_id"].tolist()) == sorted(before.tolist())
+    assert len(list(tmp_path.glob("*/part-*.npz"))) == 2
+
+
+def test_sync_picks_up_late_committed_lower_log_id(tmp_path, db_session):
+    """큰 log_id가 먼저 아카이브된 뒤 늦게 commit된 작은 log_id도 다음 동기화에서 추가 (중복 없음)"""
+    user = crud.create_user(db_session, username="walker", email="walker@example.com", password_hash="x")
+    db_now = db_session.query(func.current_timestamp()).scalar()
+
+    def insert(log_id, created_at):
+        started_at = datetime(2025, 12, 1, 9, 0) + timedelta(hours=log_id)
+        db_session.add(
+            NavigationLogs(
+                log_id=log_id,
+                user_id=user.user_id,
+                route_mode="walking",
+                start_lat=37.55,
+                start_lon=126.97,
+                end_lat=37.56,
+                end_lon=126.98,
+                total_distance_m=800,
+                estimated_time_seconds=600,
+                actual_time_seconds=620,
+                started_at=started_at,
+                ended_at=started_at + timedelta(minutes=10),
+                created_at=created_at,
+            )
+        )
+        db_session.commit()
+
+    insert(1, db_now - timedelta(hours=2))
+    insert(3, db_now - timedelta(hours=1))
+    # 안전 지연(10분) 안에 저장된 로그는 아직 commit 중일 수 있으므로 이번에는 제외
+    insert(4, db_now - timedelta(minutes=1))
+    archive = NavigationArchive(str(tmp_path), safety_lag_seconds=600)
+    assert archive.sync_from_db(db_session, batch_size=2) == 2
+    assert archive.watermark == 3
+
+    # log_id 2를 발급받은 트랜잭션이 이제야 commit됨 (저장 시각은 지난 동기화 시점 이후)
+    insert(2, archive.synced_until + timedelta(seconds=30))
+    reopened = NavigationArchive(str(tmp_path), safety_lag_seconds=0)
+    assert reopened.sync_from_db(db_session, batch_size=2) == 2
+    assert sorted(reopened.scan(columns=["log_id"])["log_id"].tolist()) == [1, 2, 3, 4]
+
+    # 다시 실행해도 중복 추가 없음
+    assert reopened.sync_from_db(db_session) == 0
+    assert reopened.row_count == 4
@@ -0,0 +1,104 @@
+"""
+네비게이션 로그 일별 통계 롤업 테스트 (메모리 SQLite)
+
+단건/일괄 저장과 삭제 후 /logs/statistics/summary 결과가 로그 원본을 직접 집계한 값과 같은지 확인합니다.
+"""
+
+from datetime import datetime, timedelta
+
+from app import crud
+from app.models import NavigationDailyStats, NavigationLogs
+
+
+def _log_payload(started_at, route_mode="walking", estimated=600, actual=660, distance=800.0, **extra):
+    payload = {
+        "route_mode": route_mode,
+        "start_lat": 37.55,
+        "start_lon": 126.97,
+        "end_lat": 37.56,
+        "end_lon": 126.98,
+        "total_distance_m": distance,
+        "estimated_time_seconds": estimated,
+        "actual_time_seconds": actual,
+        "started_at": started_at.isoformat(),
+        "ended_at": (started_at + timedelta(seconds=actual)).isoformat(),
+    }
+    payload.update(extra)
+    return payload
+
+
+def _raw_summary(db, user_id):
+    """롤업 도입 전 방식: 로그 원본을 직접 집계"""
+    logs = db.query(NavigationLogs).filter(NavigationLogs.user_id == user_id).all()
+    total = len(logs)
+    differences = [log.actual_time_seconds - log.estimated_time_seconds for log in logs]
+    accurate = sum(
+        1
+        for log, difference in zip(logs, differences)
+        if log.estimated_time_seconds > 0 and abs(difference) / log.estimated_time_seconds <= 0.2
+    )
+    slope_factors = [float(log.slope_factor) for log in logs if log.slope_factor]
+    return {
+        "total_navigations": total,
+        "walking_count": sum(1 for log in logs if log.route_mode == "walking"),
+        "transit_count": sum(1 for log in logs if log.route_mode == "transit"),
+        "total_distance_km": round(sum(float(log.total_distance_m) for log in logs) / 1000, 2),
+        "total_time_hours": round(sum(log.actual_time_seconds for log in logs) / 3600, 2),
+        "avg_time_difference_seconds": round(sum(differences) / total, 0),
+        "accuracy_rate": round(accurate / total * 100, 1),
+        "avg_slope_factor": round(sum(slope_factors) / len(slope_factors), 3) if slope_factors else None,
+    }
+
+
+def test_rollup_matches_raw_logs_after_create_batch_and_delete(db_client, db_session):
+    """단건 저장 + 일괄 저장 + 삭제 후 통계 API = 원본 로그 집계, 다른 사용자 통계와 섞이지 않음"""
+    user = crud.create_user(db_session, username="walker", email="walker@example.com", password_hash="x")
+    other = crud.create_user(db_session, username="other", email="other@example.com", password_hash="x")
+    # 자정 근처에 실행해도 날짜가 바뀌지 않도록 오늘 정오 기준
+    now = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+    yesterday = now - timedelta(days=1)
+
+    single = [
+        _log_payload(now - timedelta(hours=1), slope_factor=1.1),
+        _log_payload(yesterday, route_mode="transit", estimated=1200, actual=1800, distance=5200.5),
+    ]
+    log_ids = []
+    for payload in single:
+        response = db_client.post("/api/navigation/logs", params={"user_id": user.user_id}, json=payload)
+        assert response.status_code == 201
+        log_ids.append(response.json()["log_id"])
+
+    batch = [
+        dict(_log_payload(now - timedelta(hours=2), estimated=0, actual=300), user_id=user.user_id),
+        dict(_log_payload(yesterday - timedelta(hours=3), slope_factor=0.9, weather_factor=1.05), user_id=user.user_id),
+        dict(_log_payload(yesterday, actual=500), user_id=user.user_id),
+        dict(_log_payload(now - timedelta(hours=1), distance=10000.0), user_id=other.user_id),
+    ]
+    response = db_client.post("/api/navigation/logs/batch", json={"logs": batch})
+    assert response.status_code == 201
+    assert response.json()["created_count"] == 4
+    log_ids.extend(result["log_id"] for result in response.json()["results"][:3])
+
+    # 어제 행과 오늘 행이 모두 있는 상태에서 하나씩 삭제
+    for log_id in (log_ids[1], log_ids[2]):
+        response = db_client.delete(f"/api/navigation/logs/{log_id}", params={"user_id": user.user_id})
+        assert response.status_code == 204
+
+    db_session.expire_all()
+    response = db_client.get("/api/navigation/logs/statistics/summary", params={"user_id": user.user_id, "days": 7})
+    assert response.status_code == 200
+    summary = response.json()
+    expected = _raw_summary(db_session, user.user_id)
+    assert expected["total_navigations"] == 3
+    for key, value in expected.items():
+        assert summary[key] == value, key
+
+    # 롤업 행 합계 = 남은 로그 수 (날짜별)
+    rows = db_session.query(NavigationDailyStats).filter(NavigationDailyStats.user_id == user.user_id).all()
+    assert {row.stat_date: row.total_count for row in rows} == {now.date(): 1, yesterday.date(): 2}
+    assert (
+        db_client.get(
+            "/api/navigation/logs/statistics/summary", params={"user_id": other.user_id, "days": 7}
+        ).json()["total_navigations"]
+        == 1
+    )
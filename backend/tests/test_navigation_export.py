@@ -0,0 +1,124 @@
+"""
+네비게이션 로그 NDJSON / CSV 내보내기 테스트 (메모리 SQLite)
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import app.database
+from app import crud
+from app.utils.navigation_export import DEFAULT_CSV_COLUMNS
+
+ROUTE_DATA = {
+    "legs": [{"mode": "WALK", "sectionTime": 300, "distance": 350}],
+    "rawItinerary": {"totalTime": 300},
+    "selected_index": 0,
+}
+
+MOVEMENT_DATA = {
+    "segments": [
+        {
+            "status": "walking",
+            "start_time": "2026-10-01T09:00:01.500Z",
+            "end_time": "2026-10-01T09:05:00.250Z",
+            "distance_m": 412.35,
+            "duration_seconds": 299,
+            "avg_speed_ms": 1.38,
+        }
+    ],
+    "total_pauses": 0,
+}
+
+
+def _batch_item(user_id, index, **extra):
+    started_at = datetime(2026, 10, 1, 9, 0) + timedelta(minutes=index)
+    item = {
+        "user_id": user_id,
+        "route_mode": "transit" if index % 3 == 0 else "walking",
+        "start_lat": 37.55,
+        "start_lon": 126.97,
+        "end_lat": 37.56,
+        "end_lon": 126.98,
+        "total_distance_m": 800.0 + index,
+        "transport_modes": ["BUS"] if index % 3 == 0 else None,
+        "estimated_time_seconds": 600,
+        "actual_time_seconds": 620,
+        "started_at": started_at.isoformat(),
+        "ended_at": (started_at + timedelta(minutes=10)).isoformat(),
+    }
+    item.update(extra)
+    return item
+
+
+def _setup(db_client, db_session, db_session_factory, monkeypatch, count=150):
+    """사용자 2명, 로그 count개 (앞 2개는 경로/움직임 데이터 포함, 마지막 1개는 다른 사용자)"""
+    monkeypatch.setenv("ADMIN_API_TOKEN", "secret")
+    # 내보내기 스트림은 자체 세션을 열므로 같은 메모리 DB를 쓰도록 교체
+    monkeypatch.setattr(app.database, "SessionLocal", db_session_factory)
+    user = crud.create_user(db_session, username="walker", email="walker@example.com", password_hash="x")
+    other = crud.create_user(db_session, username="other", email="other@example.com", password_hash="x")
+    items = [
+        _batch_item(user.user_id, i, route_data=ROUTE_DATA, movement_data=MOVEMENT_DATA) if i < 2
+        else _batch_item(user.user_id if i < count - 1 else other.user_id, i)
+        for i in range(count)
+    ]
+    response = db_client.post("/api/navigation/logs/batch", json={"logs": items})
+    assert response.status_code == 201
+    return user, other
+
+
+def _export(db_client, **params):
+    return db_client.get("/api/navigation/logs/export", params=params, headers={"X-Admin-Token": "secret"})
+
+
+def test_ndjson_export_streams_all_logs_with_hydrated_json(db_client, db_session, db_session_factory, monkeypatch):
+    """chunk_size보다 많은 로그도 log_id 순으로 모두 내보내고, 분리 저장한 route_data/movement_data는 원래 값으로 복원"""
+    user, _ = _setup(db_client, db_session, db_session_factory, monkeypatch)
+
+    response = _export(db_client, format="ndjson", chunk_size=100)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+
+    assert len(rows) == 150
+    assert [row["log_id"] for row in rows] == sorted(row["log_id"] for row in rows)
+    assert rows[0]["route_data"] == ROUTE_DATA
+    assert rows[0]["movement_data"] == MOVEMENT_DATA
+    assert rows[2]["route_data"] is None
+    assert "route_itinerary_hash" not in rows[0] and "movement_segments" not in rows[0]
+    assert rows[3]["total_distance_m"] == 803.0
+    assert rows[3]["started_at"] == "2026-10-01T09:03:00"
+
+    # 사용자 / 경로 모드 필터
+    response = _export(db_client, format="ndjson", user_id=user.user_id, route_mode="transit")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 50
+    assert {(row["user_id"], row["route_mode"]) for row in rows} == {(user.user_id, "transit")}
+
+
+def test_csv_export_columns_and_json_cells(db_client, db_session, db_session_factory, monkeypatch):
+    """CSV 기본 컬럼은 대용량 JSON 제외, 지정한 JSON 컬럼은 JSON 문자열, 잘못된 요청은 거부"""
+    _setup(db_client, db_session, db_session_factory, monkeypatch, count=5)
+
+    response = _export(db_client, format="csv")
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == DEFAULT_CSV_COLUMNS
+    assert len(rows) == 6
+    header = rows[0]
+    assert json.loads(rows[1][header.index("transport_modes")]) == ["BUS"]
+    assert rows[2][header.index("transport_modes")] == ""
+
+    response = _export(db_client, format="csv", columns="log_id,route_data,movement_data")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert json.loads(rows[0]["route_data"]) == ROUTE_DATA
+    assert json.loads(rows[1]["movement_data"]) == MOVEMENT_DATA
+    assert rows[2]["route_data"] == ""
+
+    assert _export(db_client, format="csv", columns="log_id,password").status_code == 400
+    assert db_client.get("/api/navigation/logs/export").status_code == 403
+    assert (
+        db_client.get("/api/navigation/logs/export", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    )
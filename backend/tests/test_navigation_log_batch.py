@@ -0,0 +1,165 @@
+"""
+네비게이션 로그 저장 멱등성 / 일괄 저장 트랜잭션 테스트 (메모리 SQLite)
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import crud
+from app.models import ActivitySpeedProfile, NavigationDailyStats, NavigationLogs, RouteItineraries, SpeedHistory
+from app.routers import navigation_logs
+
+
+def _payload(minutes=0, idempotency_key=None, user_id=None, **extra):
+    started_at = datetime(2026, 10, 1, 9, 0) + timedelta(minutes=minutes)
+    payload = {
+        "route_mode": "walking",
+        "start_lat": 37.55,
+        "start_lon": 126.97,
+        "end_lat": 37.56,
+        "end_lon": 126.98,
+        "total_distance_m": 800.0,
+        "estimated_time_seconds": 600,
+        "actual_time_seconds": 620,
+        # 속도 프로필 갱신 대상 (5분 이상 보행 + 실측 속도/계수)
+        "real_walking_speed_kmh": 4.6,
+        "slope_factor": 1.05,
+        "weather_factor": 1.0,
+        "active_walking_time_seconds": 600,
+        "route_data": {"legs": [{"mode": "WALK", "distance": 800}], "selected_index": 0},
+        "started_at": started_at.isoformat(),
+        "ended_at": (started_at + timedelta(minutes=10)).isoformat(),
+    }
+    if idempotency_key:
+        payload["idempotency_key"] = idempotency_key
+    if user_id is not None:
+        payload["user_id"] = user_id
+    payload.update(extra)
+    return payload
+
+
+@pytest.fixture
+def users(db_session):
+    return [
+        crud.create_user(db_session, username=f"walker{i}", email=f"walker{i}@example.com", password_hash="x")
+        for i in range(2)
+    ]
+
+
+def test_resend_with_same_key_returns_existing_log(db_client, db_session, users):
+    """단건/일괄 재전송은 새로 저장하지 않고 기존 log_id 반환, 통계/프로필도 한 번만 반영"""
+    user_id = users[0].user_id
+    first = db_client.post("/api/navigation/logs", params={"user_id": user_id}, json=_payload(idempotency_key="trip-1"))
+    again = db_client.post("/api/navigation/logs", params={"user_id": user_id}, json=_payload(idempotency_key="trip-1"))
+    assert first.status_code == again.status_code == 201
+    assert first.json()["log_id"] == again.json()["log_id"]
+
+    response = db_client.post(
+        "/api/navigation/logs/batch",
+        json={"logs": [_payload(idempotency_key="trip-1", user_id=user_id)]},
+    )
+    body = response.json()
+    assert body["created_count"] == 0
+    assert body["results"][0] == {
+        "index": 0,
+        "log_id": first.json()["log_id"],
+        "idempotency_key": "trip-1",
+        "duplicate": True,
+    }
+
+    assert db_session.query(NavigationLogs).count() == 1
+    assert db_session.query(NavigationDailyStats).one().total_count == 1
+    assert db_session.query(ActivitySpeedProfile).one().data_points_count == 1
+
+
+def test_concurrent_insert_with_same_key_returns_winner(db_client, db_session, users, monkeypatch):
+    """중복 확인 후 다른 요청이 같은 키를 먼저 commit해도(IntegrityError) 500이 아니라 그 로그를 반환"""
+    user_id = users[0].user_id
+    winner = db_client.post("/api/navigation/logs", params={"user_id": user_id}, json=_payload(idempotency_key="trip-1"))
+
+    # 중복 확인 시점에는 아직 보이지 않았던 것처럼 첫 조회만 None
+    real_find = navigation_logs._find_by_idempotency_key
+    calls = []
+
+    def racing_find(db, user_id, idempotency_key):
+        calls.append(idempotency_key)
+        return None if len(calls) == 1 else real_find(db, user_id, idempotency_key)
+
+    monkeypatch.setattr(navigation_logs, "_find_by_idempotency_key", racing_find)
+    loser = db_client.post("/api/navigation/logs", params={"user_id": user_id}, json=_payload(idempotency_key="trip-1"))
+
+    assert loser.status_code == 201
+    assert loser.json()["log_id"] == winner.json()["log_id"]
+    assert len(calls) == 2
+    assert db_session.query(NavigationLogs).count() == 1
+    assert db_session.query(NavigationDailyStats).one().total_count == 1
+
+
+def test_batch_dedupes_repeated_keys_within_request(db_client, db_session, users):
+    """요청 안에서 반복된 (사용자, 키)는 처음 것만 저장, 다른 사용자의 같은 키는 별도 저장"""
+    a, b = users[0].user_id, users[1].user_id
+    logs = [
+        _payload(0, "trip-1", a),
+        _payload(20, "trip-1", a),
+        _payload(40, "trip-1", b),
+        _payload(60, None, a),
+        _payload(80, None, a),
+    ]
+    response = db_client.post("/api/navigation/logs/batch", json={"logs": logs})
+    assert response.status_code == 201
+    body = response.json()
+    results = body["results"]
+
+    assert (body["created_count"], body["duplicate_count"]) == (4, 1)
+    assert [r["duplicate"] for r in results] == [False, True, False, False, False]
+    assert results[1]["log_id"] == results[0]["log_id"]
+    assert len({r["log_id"] for r in results}) == 4
+    assert db_session.query(NavigationLogs).count() == 4
+    # 같은 경로는 한 번만 저장
+    assert db_session.query(RouteItineraries).count() == 1
+
+
+def test_batch_is_one_transaction(db_client, db_session, users, monkeypatch):
+    """일괄 저장 중 실패하면 로그/경로/통계/프로필 모두 저장되지 않음"""
+    user_id = users[0].user_id
+
+    def failing_rollup(db, logs):
+        raise RuntimeError("rollup failed")
+
+    monkeypatch.setattr(crud, "apply_navigation_logs_to_daily_stats", failing_rollup)
+    response = db_client.post(
+        "/api/navigation/logs/batch",
+        json={"logs": [_payload(i * 20, f"trip-{i}", user_id) for i in range(3)]},
+    )
+
+    assert response.status_code == 500
+    db_session.expire_all()
+    for model in (NavigationLogs, RouteItineraries, NavigationDailyStats, ActivitySpeedProfile, SpeedHistory):
+        assert db_session.query(model).count() == 0, model.__tablename__
+
+
+def test_batch_profile_failure_only_skips_that_log(db_client, db_session, users, monkeypatch):
+    """한 로그의 프로필 갱신이 실패해도 해당 savepoint만 되돌리고 로그 저장과 다른 로그 갱신은 유지"""
+    user_id = users[0].user_id
+    real_update_model = crud.update_user_speed_model
+    failed = []
+
+    def flaky_update_model(db, user_id, nav_log, base_speed_kmh, **kwargs):
+        if not failed:
+            failed.append(nav_log.log_id)
+            raise RuntimeError("model update failed")
+        return real_update_model(db, user_id, nav_log, base_speed_kmh, **kwargs)
+
+    monkeypatch.setattr(crud, "update_user_speed_model", flaky_update_model)
+    response = db_client.post(
+        "/api/navigation/logs/batch",
+        json={"logs": [_payload(i * 20, f"trip-{i}", user_id) for i in range(3)]},
+    )
+
+    assert response.status_code == 201
+    db_session.expire_all()
+    assert db_session.query(NavigationLogs).count() == 3
+    history_log_ids = {row.navigation_log_id for row in db_session.query(SpeedHistory)}
+    assert len(history_log_ids) == 2 and failed[0] not in history_log_ids
+    assert db_session.query(ActivitySpeedProfile).one().data_points_count == 2
@@ -0,0 +1,91 @@
+"""
+네비게이션 로그 목록 keyset 커서 / count_mode 테스트 (메모리 SQLite)
+"""
+
+from datetime import datetime, timedelta
+
+from app import crud
+
+
+def _batch_item(user_id, started_at, route_mode="walking"):
+    return {
+        "user_id": user_id,
+        "route_mode": route_mode,
+        "start_lat": 37.55,
+        "start_lon": 126.97,
+        "end_lat": 37.56,
+        "end_lon": 126.98,
+        "total_distance_m": 800.0,
+        "estimated_time_seconds": 600,
+        "actual_time_seconds": 620,
+        "started_at": started_at.isoformat(),
+        "ended_at": (started_at + timedelta(minutes=10)).isoformat(),
+    }
+
+
+def _create_logs(db_client, user_id, started_ats, route_modes=None):
+    route_modes = route_modes or ["walking"] * len(started_ats)
+    response = db_client.post(
+        "/api/navigation/logs/batch",
+        json={"logs": [_batch_item(user_id, t, mode) for t, mode in zip(started_ats, route_modes)]},
+    )
+    assert response.status_code == 201
+    return [result["log_id"] for result in response.json()["results"]]
+
+
+def test_cursor_pages_cover_every_log_once_in_order(db_client, db_session):
+    """같은 시작 시간이 페이지 경계에 걸려도 (started_at, log_id) 최신순으로 빠짐/중복 없이 이어짐"""
+    user = crud.create_user(db_session, username="walker", email="walker@example.com", password_hash="x")
+    base = datetime(2026, 10, 1, 9, 0)
+    started_ats = [base, base + timedelta(hours=1)] + [base + timedelta(hours=2)] * 4 + [base + timedelta(hours=3)]
+    log_ids = _create_logs(db_client, user.user_id, started_ats)
+    expected = [log_id for _, log_id in sorted(zip(started_ats, log_ids), reverse=True)]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"user_id": user.user_id, "limit": 3, "count_mode": "none"}
+        if cursor:
+            params["cursor"] = cursor
+        body = db_client.get("/api/navigation/logs", params=params).json()
+        pages += 1
+        assert body["total_count"] is None
+        seen.extend(log["log_id"] for log in body["logs"])
+        assert body["has_more"] == (body["next_cursor"] is not None)
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == expected
+    assert pages == 3
+
+    # 커서 없이 offset으로 조회한 첫 페이지와 같음 (하위 호환)
+    first_page = db_client.get("/api/navigation/logs", params={"user_id": user.user_id, "limit": 3, "offset": 0}).json()
+    assert [log["log_id"] for log in first_page["logs"]] == expected[:3]
+
+    response = db_client.get("/api/navigation/logs", params={"user_id": user.user_id, "cursor": "잘못된커서"})
+    assert response.status_code == 400
+
+
+def test_count_modes(db_client, db_session):
+    """exact: 필터 그대로 COUNT, estimate: 일별 통계 합 (날짜 단위), none: 생략"""
+    user = crud.create_user(db_session, username="walker", email="walker@example.com", password_hash="x")
+    day = datetime(2026, 10, 1)
+    started_ats = [day + timedelta(hours=8), day + timedelta(hours=18), day + timedelta(days=1, hours=9)]
+    _create_logs(db_client, user.user_id, started_ats, ["walking", "transit", "walking"])
+
+    def total(count_mode, **filters):
+        params = {"user_id": user.user_id, "count_mode": count_mode, **filters}
+        return db_client.get("/api/navigation/logs", params=params).json()["total_count"]
+
+    assert total("exact") == total("estimate") == 3
+    assert total("exact", route_mode="walking") == total("estimate", route_mode="walking") == 2
+    assert total("estimate", route_mode="transit") == 1
+
+    # 시작 시간이 당일 정오이면 exact는 18시 로그부터, estimate는 당일 전체 포함
+    noon = (day + timedelta(hours=12)).isoformat()
+    assert total("exact", start_date=noon) == 2
+    assert total("estimate", start_date=noon) == 3
+    assert total("none") is None
+    assert db_client.get(
+        "/api/navigation/logs", params={"user_id": user.user_id, "count_mode": "all"}
+    ).status_code == 422
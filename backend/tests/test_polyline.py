@@ -0,0 +1,52 @@
+"""
+경로 좌표 단순화 / Encoded Polyline 테스트
+"""
+
+import math
+
+from app.utils.polyline import decode_polyline, encode_polyline, simplify_coordinates
+
+
+def test_encode_matches_reference_example():
+    """Google 문서 예제 (38.5,-120.2), (40.7,-120.95), (43.252,-126.453)"""
+    coordinates = [[-120.2, 38.5], [-120.95, 40.7], [-126.453, 43.252]]
+    encoded = encode_polyline(coordinates)
+
+    assert encoded == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    assert decode_polyline(encoded) == coordinates
+
+
+def test_simplify_keeps_endpoints_and_corners():
+    """직선 위의 점은 제거, 꺾이는 점과 시작/끝 점은 유지"""
+    straight = [[127.0 + i * 0.0001, 37.5] for i in range(50)]
+    corner = [[127.0049, 37.5 + i * 0.0001] for i in range(1, 50)]
+    coordinates = straight + corner
+
+    simplified = simplify_coordinates(coordinates, tolerance_m=2.0)
+
+    assert simplified[0] == coordinates[0]
+    assert simplified[-1] == coordinates[-1]
+    assert [127.0049, 37.5] in simplified
+    assert len(simplified) == 3
+
+
+def test_simplify_tolerance_bounds_deviation():
+    """허용 오차가 클수록 점이 줄고, 제거된 점은 모두 허용 오차 이내"""
+    coordinates = [
+        [127.0 + i * 0.00005, 37.5 + 0.0003 * math.sin(i / 8)] for i in range(400)
+    ]
+    high = simplify_coordinates(coordinates, tolerance_m=2.0)
+    low = simplify_coordinates(coordinates, tolerance_m=30.0)
+
+    assert len(low) < len(high) < len(coordinates)
+    assert simplify_coordinates(coordinates[:2], tolerance_m=30.0) == coordinates[:2]
+
+    # 제거된 점 → 단순화된 선까지 거리 (경도 간격이 일정하므로 선형 보간으로 확인)
+    lngs = [c[0] for c in low]
+    for lng, lat in coordinates:
+        k = max(i for i, x in enumerate(lngs) if x <= lng + 1e-12)
+        if k == len(low) - 1:
+            continue
+        (x0, y0), (x1, y1) = low[k], low[k + 1]
+        interpolated = y0 + (y1 - y0) * (lng - x0) / (x1 - x0)
+        assert abs(interpolated - lat) * 111_320 <= 30.0 * 1.5
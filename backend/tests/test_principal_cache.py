@@ -0,0 +1,69 @@
+"""
+인증 사용자(principal) 캐시 테스트 (메모리 SQLite)
+"""
+
+import time
+
+from app import crud
+from app.utils.auth_utils import create_access_token
+from app.utils.principal_cache import PrincipalCache, principal_cache
+
+
+def _me(db_client, user_id):
+    token = create_access_token(data={"sub": str(user_id)})
+    return db_client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+
+def test_cached_principal_is_invalidated_on_login_and_delete(db_client, db_session):
+    """/me는 캐시된 사용자로 응답하고, 로그인 시간 갱신/사용자 삭제 후에는 바뀐 값을 반영 (삭제된 사용자는 401)"""
+    principal_cache.clear()
+    user = crud.create_user(db_session, username="walker", email="walker@example.com", password_hash="x")
+    user_id = user.user_id
+
+    first = _me(db_client, user_id)
+    assert first.status_code == 200
+    assert first.json()["last_login"] is None
+
+    # invalidate 없이 바꾼 값은 TTL 동안 캐시 값으로 응답 (DB 조회 생략 확인)
+    user.username = "renamed"
+    db_session.commit()
+    assert _me(db_client, user_id).json()["username"] == "walker"
+
+    # 로그인 시간 갱신 → 캐시 삭제 → 새 값 조회
+    crud.update_last_login(db_session, user_id)
+    refreshed = _me(db_client, user_id).json()
+    assert refreshed["username"] == "renamed"
+    assert refreshed["last_login"] is not None
+
+    # 사용자 삭제 후 같은 토큰은 캐시가 아니라 DB 기준으로 거부
+    crud.delete_user(db_session, user_id)
+    assert principal_cache.get(user_id) is None
+    assert _me(db_client, user_id).status_code == 401
+
+
+def test_ttl_and_size_limit():
+    """만료된 항목과 크기 상한을 넘은 오래된 항목은 조회되지 않음, TTL 0이면 캐시 사용 안 함"""
+
+    class _User:
+        def __init__(self, user_id):
+            self.user_id = user_id
+            self.username = f"user{user_id}"
+            self.email = f"user{user_id}@example.com"
+            self.auth_provider = "local"
+            self.created_at = None
+            self.last_login = None
+
+    cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+    for user_id in (1, 2, 3):
+        cache.set(user_id, _User(user_id))
+    assert cache.get(1) is None
+    assert cache.get("2")["username"] == "user2"
+
+    expired = PrincipalCache(ttl_seconds=0.001, max_entries=10)
+    expired.set(1, _User(1))
+    time.sleep(0.01)
+    assert expired.get(1) is None
+
+    disabled = PrincipalCache(ttl_seconds=0)
+    disabled.set(1, _User(1))
+    assert disabled.get(1) is None
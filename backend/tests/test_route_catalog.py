@@ -0,0 +1,119 @@
+"""
+경로 카탈로그 스냅샷 테스트
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from app import crud
+from app.utils.route_catalog import (
+    GRADE_LIMIT_PERCENT,
+    RouteCatalog,
+    RouteCatalogSnapshot,
+    build_grade_histogram,
+    tobler_speed_factor,
+)
+
+
+def _row(route_id, distance_km, start, created_at, route_type="walking", difficulty="easy"):
+    return {
+        "route_id": route_id,
+        "route_name": f"route {route_id}",
+        "route_type": route_type,
+        "difficulty_level": difficulty,
+        "distance_km": distance_km,
+        "estimated_duration_minutes": int(distance_km * 12),
+        "total_elevation_gain_m": 10,
+        "total_elevation_loss_m": 10,
+        "avg_rating": None,
+        "rating_count": 0,
+        "tags": [],
+        "created_at": created_at,
+        "updated_at": created_at,
+        "start": start,
+        "end": None,
+    }
+
+
+ROWS = [
+    _row(1, 3.0, (37.500, 127.000), datetime(2025, 1, 1)),
+    _row(2, 5.0, (37.510, 127.000), datetime(2025, 1, 3), route_type="running"),
+    _row(3, 3.2, (37.505, 127.000), datetime(2025, 1, 2), difficulty="hard"),
+    _row(4, 3.1, (38.500, 127.000), None),  # 시작점이 멀리 있음, created_at 없음
+    _row(5, 2.9, None, datetime(2025, 1, 4)),  # 좌표 없음
+]
+
+
+def test_filter_and_list_order():
+    """필터 조합 + created_at 최신순(NULL 먼저) 정렬"""
+    snapshot = RouteCatalogSnapshot(list(reversed(ROWS)))
+    assert list(snapshot.route_id) == [1, 2, 3, 4, 5]
+
+    mask = snapshot.filter_mask(route_type="walking", max_distance=3.15)
+    assert list(snapshot.route_id[mask]) == [1, 4, 5]
+
+    all_rows = snapshot.filter_mask()
+    assert list(snapshot.route_id[snapshot.list_indices(all_rows, limit=10, offset=0)]) == [4, 5, 2, 3, 1]
+    assert list(snapshot.route_id[snapshot.list_indices(all_rows, limit=2, offset=1)]) == [5, 2]
+
+
+def test_recommend_radius_and_sort():
+    """반경 밖/좌표 없는 경로 제외, 가까운 순 정렬"""
+    snapshot = RouteCatalogSnapshot(ROWS)
+    result = snapshot.recommend(37.506, 127.000, distance_km=3.0, max_distance_from_user=5.0)
+
+    assert list(snapshot.route_id[result["index"]]) == [3, 1]
+    assert result["distance_from_user"][result["index"][0]] < 0.2
+
+
+def test_recommend_duration_with_user_speed():
+    """목표 시간은 사용자 속도로 다시 계산한 시간 기준"""
+    snapshot = RouteCatalogSnapshot(ROWS)
+    # 6 km/h면 3km 경로는 30분, 5km 경로는 50분
+    result = snapshot.recommend(37.5, 127.0, duration_minutes=50, user_speed_kmh=6.0, duration_tolerance=5)
+    assert list(snapshot.route_id[result["index"]]) == [2]
+
+
+def test_empty_snapshot():
+    snapshot = RouteCatalogSnapshot([])
+    assert len(snapshot) == 0
+    assert snapshot.max_route_id == 0
+    assert len(snapshot.recommend(37.5, 127.0, distance_km=3.0)["index"]) == 0
+
+
+def test_grade_histogram_and_personalized_duration():
+    """경사도 히스토그램 기반 시간: 오르막이 있는 경로가 더 오래, 경사 민감도가 클수록 더 오래"""
+    flat = _row(10, 1.0, (37.5, 127.0), datetime(2025, 1, 1))
+    flat["grade_histogram"] = build_grade_histogram([0.0] * 10, [100.0] * 10)
+    hilly = _row(11, 1.0, (37.5, 127.0), datetime(2025, 1, 1))
+    hilly["grade_histogram"] = build_grade_histogram([12.4, 11.6, 80.0, None], [250.0, 250.0, 250.0, 250.0])
+    snapshot = RouteCatalogSnapshot([flat, hilly, ROWS[0]])
+    no_profile, flat_i, hilly_i = 0, 1, 2  # route_id 순
+
+    assert snapshot.grade_distance_m[hilly_i][GRADE_LIMIT_PERCENT + 12] == 500.0
+    assert snapshot.grade_distance_m[hilly_i][-1] == 250.0  # 80% → 40%로 제한
+    assert snapshot.grade_distance_m[hilly_i][GRADE_LIMIT_PERCENT] == 250.0  # 경사도 없음 → 평지
+
+    duration = snapshot.personalized_duration(6.0)
+    assert abs(duration[flat_i] - 1.0 / 6.0 * 60 / tobler_speed_factor(0.0)) < 1e-6
+    assert duration[hilly_i] > duration[flat_i]
+    assert np.isnan(duration[no_profile])
+    assert snapshot.personalized_duration(6.0, slope_sensitivity=2.0)[hilly_i] > duration[hilly_i]
+    assert abs(snapshot.personalized_duration(6.0, slope_sensitivity=0.0)[hilly_i] - 10.0) < 1e-6
+
+
+def test_route_writes_invalidate_catalog(db_session, monkeypatch):
+    """갱신 주기 안이어도 crud로 경로를 추가/삭제하면 다음 조회에 바로 반영"""
+    catalog = RouteCatalog(refresh_interval=3600, full_reload_interval=3600)
+    monkeypatch.setattr(crud, "route_catalog", catalog)
+    coordinates = {"type": "LineString", "coordinates": [[127.0, 37.5], [127.001, 37.501]]}
+
+    first = crud.create_route(db_session, route_name="first", distance_km=1.0, route_coordinates=coordinates)
+    assert list(catalog.get(db_session).route_id) == [first.route_id]
+
+    second = crud.create_route(db_session, route_name="second", distance_km=2.0, route_coordinates=coordinates)
+    assert sorted(catalog.get(db_session).route_id) == [first.route_id, second.route_id]
+
+    crud.delete_route(db_session, first.route_id)
+    assert list(catalog.get(db_session).route_id) == [second.route_id]
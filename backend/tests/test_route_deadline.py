@@ -0,0 +1,118 @@
+"""
+경로 분석 마감 시간 모드 테스트 (Google Elevation API는 느린 가짜 함수로 대체)
+"""
+
+import asyncio
+import copy
+
+from app.utils import elevation_helpers
+from app.utils.route_deadline import analyze_route_within_deadline, get_background_analysis
+from app.utils.ttl_cache import TTLCache
+
+ITINERARY = {
+    "legs": [
+        {
+            "mode": "WALK",
+            "sectionTime": 600,
+            "distance": 600,
+            "start": {"lat": 37.5547, "lon": 126.9706, "name": "출발지"},
+            "end": {"lat": 37.5500, "lon": 126.9760, "name": "도착지"},
+            "steps": [
+                {
+                    "linestring": "126.9706,37.5547 126.9730,37.5530 126.9760,37.5500",
+                    "distance": 600,
+                    "description": "",
+                }
+            ],
+        }
+    ]
+}
+
+
+def _slow_elevation_api(monkeypatch, delay):
+    calls = []
+
+    async def fake_call(coords, api_key, priority="interactive"):
+        calls.append(len(coords))
+        await asyncio.sleep(delay)
+        # 점마다 10m씩 오르막
+        return [10.0 * i for i in range(len(coords))]
+
+    monkeypatch.setattr(elevation_helpers, "call_google_elevation_api", fake_call)
+    elevation_helpers.elevation_cache.clear()
+    return calls
+
+
+def test_deadline_returns_flat_estimate_then_refines(monkeypatch):
+    """마감 초과 시 평지 추정 반환 → 백그라운드 완료 후 조회/재요청 시 경사도 반영 결과"""
+    calls = _slow_elevation_api(monkeypatch, delay=0.2)
+
+    async def scenario():
+        provisional = await analyze_route_within_deadline(
+            copy.deepcopy(ITINERARY), api_key="test", deadline_seconds=0.05
+        )
+        assert get_background_analysis(provisional["analysis_id"])[0] == "pending"
+        await asyncio.sleep(0.3)
+        refined = await analyze_route_within_deadline(
+            copy.deepcopy(ITINERARY), api_key="test", deadline_seconds=0.05
+        )
+        return provisional, refined
+
+    provisional, refined = asyncio.run(scenario())
+
+    assert provisional["provisional"] is True
+    assert provisional["factors"]["slope_factor"] == 1.0
+    status, background = get_background_analysis(provisional["analysis_id"])
+    assert status == "completed"
+    assert background["factors"]["slope_factor"] > 1.0
+
+    # 두 번째 요청은 고도 캐시로 마감 안에 완료 (API 재호출 없음)
+    assert refined["provisional"] is False
+    assert "analysis_id" not in refined
+    assert refined["total_adjusted_walk_time"] == background["total_adjusted_walk_time"]
+    assert len(calls) == 1
+
+
+def test_concurrent_requests_share_elevation_call(monkeypatch):
+    """같은 경로의 동시 요청은 고도 API를 한 번만 호출"""
+    calls = _slow_elevation_api(monkeypatch, delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(*[
+            analyze_route_within_deadline(copy.deepcopy(ITINERARY), api_key="test", deadline_seconds=0)
+            for _ in range(3)
+        ])
+
+    results = asyncio.run(scenario())
+
+    assert all(result["provisional"] is False for result in results)
+    assert len(calls) == 1
+
+
+def test_ttl_cache_eviction_and_expiry():
+    """최대 항목 수 초과 시 오래된 항목 제거, TTL 지나면 None"""
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    expired = TTLCache(max_entries=2, ttl_seconds=0)
+    expired.set("a", 1)
+    assert expired.get("a") is None
+
+
+def test_ttl_cache_lookup_none_and_discard_where():
+    """None을 저장한 키도 적중, 조건에 맞는 키만 일괄 삭제"""
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set((1, "walking"), None)
+    cache.set((1, "running"), "r")
+    cache.set((2, "walking"), "w")
+
+    assert cache.lookup((1, "walking")) == (True, None)
+    assert cache.lookup((3, "walking")) == (False, None)
+    assert cache.discard_where(lambda key: key[0] == 1) == 2
+    assert cache.lookup((1, "running")) == (False, None)
+    assert cache.get((2, "walking")) == "w"
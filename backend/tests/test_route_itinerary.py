@@ -0,0 +1,50 @@
+"""
+네비게이션 로그 경로 분리 저장 테스트
+"""
+
+from app.utils.route_itinerary import itinerary_hash, merge_route_data, split_route_data
+
+
+def _route_data(personalized_walk_time=364):
+    return {
+        "legs": [
+            {
+                "mode": "WALK",
+                "start": {"lat": 37.5580754, "lon": 126.9080448, "name": "출발"},
+                "steps": [{"distance": 7, "linestring": "126.9079,37.5580 126.9079,37.5581"}],
+            }
+        ],
+        "rawItinerary": {"totalTime": 495, "legs": []},
+        "slopeAnalysis": {"factors": {"user_speed_factor": 0.69}},
+        "personalizedWalkTime": personalized_walk_time,
+    }
+
+
+def test_split_and_merge_round_trip():
+    """경로 부분만 분리하고, 합치면 원래 값과 같음"""
+    route_data = _route_data()
+    remaining, itinerary = split_route_data(route_data)
+
+    assert set(itinerary) == {"legs", "rawItinerary"}
+    assert set(remaining) == {"slopeAnalysis", "personalizedWalkTime"}
+    assert merge_route_data(remaining, itinerary) == route_data
+
+
+def test_same_route_same_hash():
+    """같은 경로는 개인화 값/키 순서와 무관하게 같은 해시"""
+    _, first = split_route_data(_route_data(364))
+    _, second = split_route_data(_route_data(401))
+    reordered = {"rawItinerary": second["rawItinerary"], "legs": second["legs"]}
+
+    assert itinerary_hash(first) == itinerary_hash(reordered)
+    assert len(itinerary_hash(first)) == 64
+
+    second["legs"][0]["steps"][0]["distance"] = 8
+    assert itinerary_hash(first) != itinerary_hash(second)
+
+
+def test_route_data_without_itinerary_is_kept():
+    """경로 키가 없거나 route_data가 없으면 그대로 저장"""
+    assert split_route_data(None) == (None, None)
+    assert split_route_data({"totalTime": 10}) == ({"totalTime": 10}, None)
+    assert merge_route_data({"totalTime": 10}, None) == {"totalTime": 10}
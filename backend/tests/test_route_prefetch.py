@@ -0,0 +1,80 @@
+"""
+대중교통 검색 후 보행 구간 미리 계산 테스트 (Google Elevation API는 가짜 함수로 대체)
+"""
+
+import asyncio
+import copy
+
+from app.utils import elevation_helpers
+from app.utils.elevation_helpers import analyze_route_elevation
+from app.utils.route_prefetch import RoutePrefetcher
+
+
+def _transit_itinerary(offset):
+    walk = {
+        "mode": "WALK",
+        "sectionTime": 300,
+        "distance": 300,
+        "start": {"name": "출발지", "lon": 126.97 + offset, "lat": 37.55},
+        "end": {"name": "정류장", "lon": 126.972 + offset, "lat": 37.551},
+        "steps": [
+            {
+                "distance": 300,
+                "linestring": f"{126.97 + offset},37.55 {126.971 + offset},37.5505 {126.972 + offset},37.551",
+                "description": "횡단보도 후 직진",
+            }
+        ],
+    }
+    bus = {"mode": "BUS", "sectionTime": 900, "distance": 5000, "start": {"name": "정류장"}, "end": {"name": "도착"}}
+    return {"totalTime": 1200, "legs": [walk, bus]}
+
+
+def _fake_elevation_api(monkeypatch):
+    calls = []
+
+    async def fake_call(coords, api_key, priority="interactive"):
+        calls.append(priority)
+        return [float(i) for i in range(len(coords))]
+
+    monkeypatch.setattr(elevation_helpers, "call_google_elevation_api", fake_call)
+    elevation_helpers.elevation_cache.clear()
+    elevation_helpers.prepared_route_cache.clear()
+    return calls
+
+
+def test_prefetch_warms_analysis_of_picked_itinerary(monkeypatch):
+    """미리 계산한 경로를 고르면 고도 API 호출 없이 분석, 응답 itinerary는 바뀌지 않음"""
+    calls = _fake_elevation_api(monkeypatch)
+    itineraries = [_transit_itinerary(i * 0.01) for i in range(3)]
+    original = copy.deepcopy(itineraries)
+    prefetcher = RoutePrefetcher(max_itineraries=2, concurrency=1, max_pending=10)
+    hits_before = elevation_helpers.prepared_route_cache.stats()["hits"]
+
+    async def scenario():
+        await asyncio.gather(*prefetcher.schedule(itineraries, api_key="test"))
+        picked = await analyze_route_elevation(copy.deepcopy(original[1]), api_key="test")
+        other = await analyze_route_elevation(copy.deepcopy(original[2]), api_key="test")
+        return picked, other
+
+    picked, other = asyncio.run(scenario())
+
+    assert itineraries == original
+    # 미리 계산: batch 2번, 이후 3번째 경로만 사용자 요청으로 호출
+    assert calls == ["batch", "batch", "interactive"]
+    assert picked["walk_legs_analysis"] and other["walk_legs_analysis"]
+    assert elevation_helpers.prepared_route_cache.stats()["hits"] - hits_before == 1
+    assert prefetcher.stats()["completed"] == 2
+
+
+def test_prefetch_drops_work_over_pending_budget(monkeypatch):
+    """대기 상한을 넘는 경로는 버림"""
+    _fake_elevation_api(monkeypatch)
+    prefetcher = RoutePrefetcher(max_itineraries=5, concurrency=1, max_pending=2)
+
+    async def scenario():
+        tasks = prefetcher.schedule([_transit_itinerary(i * 0.01) for i in range(5)], api_key="test")
+        await asyncio.gather(*tasks)
+        return len(tasks)
+
+    assert asyncio.run(scenario()) == 2
+    assert prefetcher.stats()["dropped"] == 3
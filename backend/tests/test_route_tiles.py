@@ -0,0 +1,54 @@
+"""
+경로 오버레이 타일 테스트
+"""
+
+import numpy as np
+
+from app.utils.route_tiles import RouteGeometryIndex, coordinate_decimals, tile_bounds
+
+
+def _tile_of(lng, lat, z):
+    """경도/위도 → 해당 줌의 XYZ 타일 좌표"""
+    n = 2 ** z
+    x = int((lng + 180.0) / 360.0 * n)
+    y = int((1 - np.arcsinh(np.tan(np.radians(lat))) / np.pi) / 2 * n)
+    return x, y
+
+
+def test_tile_bounds_contains_point():
+    """타일 경계 계산 (서울 부근, 줌 15)"""
+    x, y = _tile_of(127.0276, 37.4979, 15)
+    min_lng, min_lat, max_lng, max_lat = tile_bounds(15, x, y)
+
+    assert min_lng <= 127.0276 <= max_lng
+    assert min_lat <= 37.4979 <= max_lat
+    assert tile_bounds(0, 0, 0)[0] == -180.0
+    assert coordinate_decimals(15) > coordinate_decimals(10)
+
+
+def test_render_clips_to_tile_and_skips_far_routes():
+    """타일 밖 경로는 제외, 걸친 경로는 타일 부근 구간만 포함"""
+    z = 15
+    x, y = _tile_of(127.0276, 37.4979, z)
+    min_lng, min_lat, max_lng, max_lat = tile_bounds(z, x, y)
+
+    # 타일을 가로지르는 긴 경로 (동서 방향, 타일 폭의 10배)
+    lngs = np.linspace(min_lng - 5 * (max_lng - min_lng), max_lng + 5 * (max_lng - min_lng), 500)
+    crossing = np.column_stack((lngs, np.full(500, (min_lat + max_lat) / 2)))
+    far = np.array([[126.0, 36.0], [126.01, 36.01]])
+    index = RouteGeometryIndex(
+        [1, 2],
+        [crossing, far],
+        [{"route_id": 1}, {"route_id": 2}],
+    )
+
+    tile = index.render(z, x, y)
+
+    assert [f["id"] for f in tile["features"]] == [1]
+    lines = tile["features"][0]["geometry"]["coordinates"]
+    assert len(lines) == 1
+    clipped_lngs = [p[0] for p in lines[0]]
+    width = max_lng - min_lng
+    assert min(clipped_lngs) >= min_lng - width * 0.2
+    assert max(clipped_lngs) <= max_lng + width * 0.2
+    assert len(lines[0]) == 2  # 직선이므로 양 끝만 남음
@@ -0,0 +1,59 @@
+"""
+경로 세그먼트 묶음 형식 테스트
+"""
+
+from decimal import Decimal
+
+from app.utils.segment_pack import SEGMENT_DTYPE, pack_segments, unpack_segments
+
+
+def _segment(order, grade, terrain):
+    return {
+        "segment_id": 1000 + order,
+        "segment_order": order,
+        "start_lat": Decimal("37.497912"),
+        "start_lon": Decimal("127.027634"),
+        "end_lat": Decimal("37.498801"),
+        "end_lon": Decimal("127.028105"),
+        "segment_distance_m": Decimal("100.37"),
+        "segment_grade_percent": grade,
+        "elevation_change_m": Decimal("-1.25") if grade is not None else None,
+        "start_elevation_m": Decimal("35.10"),
+        "end_elevation_m": None,
+        "terrain_type": terrain,
+    }
+
+
+def test_round_trip_matches_numeric_values():
+    """Numeric 값은 float(Decimal)과 같게, NULL은 None으로 복원"""
+    segments = [
+        _segment(0, Decimal("-1.25"), "flat"),
+        _segment(1, None, None),
+        _segment(2, Decimal("12.50"), "uphill"),
+        _segment(3, Decimal("0.00"), "flat"),
+    ]
+    data, terrain_types = pack_segments(segments)
+
+    assert len(data) == len(segments) * SEGMENT_DTYPE.itemsize
+    assert terrain_types == ["flat", "uphill"]
+
+    restored = unpack_segments(data, terrain_types)
+    for original, decoded in zip(segments, restored):
+        for key, value in original.items():
+            if value is None or isinstance(value, (int, str)):
+                assert decoded[key] == value
+            else:
+                assert decoded[key] == float(value)
+
+
+def test_empty_and_missing_segment_id():
+    """빈 목록, segment_id 없는 세그먼트(적재 전) 처리"""
+    data, terrain_types = pack_segments([])
+    assert data == b"" and terrain_types is None
+    assert unpack_segments(data) == []
+
+    segment = _segment(0, Decimal("3.00"), None)
+    del segment["segment_id"]
+    restored = unpack_segments(*pack_segments([segment]))
+    assert restored[0]["segment_id"] == 0
+    assert restored[0]["terrain_type"] is None
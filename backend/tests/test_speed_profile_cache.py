@@ -0,0 +1,88 @@
+"""
+사용자 속도 프로필 캐시 테스트
+"""
+
+import time
+from types import SimpleNamespace
+
+from sqlalchemy.orm import Session
+
+from app.utils.speed_profile_cache import (
+    CachedSpeedProfile,
+    SpeedProfileCache,
+    speed_profile_cache,
+)
+
+
+def _profile(speed_case1=4.5, speed_case2=3.8, data_points_count=3):
+    return CachedSpeedProfile(1, speed_case1, speed_case2, data_points_count)
+
+
+def test_lookup_hit_and_missing_profile():
+    """저장한 값 적중, 프로필 없음(None)도 적중으로 처리"""
+    cache = SpeedProfileCache(max_entries=10, ttl_seconds=60)
+    assert cache.lookup(1, "walking") == (False, None)
+
+    cache.set(1, "walking", _profile())
+    cache.set(2, "walking", None)
+
+    assert cache.lookup(1, "walking") == (True, _profile())
+    assert cache.lookup(2, "walking") == (True, None)
+    assert cache.stats()["hits"] == 2
+
+
+def test_lru_eviction_and_ttl():
+    """최대 항목 수 초과 시 가장 오래 안 쓴 항목 제거, TTL 지나면 만료"""
+    cache = SpeedProfileCache(max_entries=2, ttl_seconds=60)
+    cache.set(1, "walking", _profile())
+    cache.set(2, "walking", _profile())
+    cache.lookup(1, "walking")  # 1번을 최근 사용으로
+    cache.set(3, "walking", _profile())
+
+    assert cache.lookup(2, "walking")[0] is False
+    assert cache.lookup(1, "walking")[0] is True
+
+    expiring = SpeedProfileCache(max_entries=10, ttl_seconds=0.01)
+    expiring.set(1, "walking", _profile())
+    time.sleep(0.02)
+    assert expiring.lookup(1, "walking")[0] is False
+
+
+def test_invalidate_user():
+    """activity_type 없이 삭제하면 해당 사용자 항목 전체 삭제"""
+    cache = SpeedProfileCache(max_entries=10, ttl_seconds=60)
+    cache.set(1, "walking", _profile())
+    cache.set(1, "running", _profile())
+    cache.set(2, "walking", _profile())
+
+    cache.invalidate(1)
+
+    assert cache.lookup(1, "walking")[0] is False
+    assert cache.lookup(1, "running")[0] is False
+    assert cache.lookup(2, "walking")[0] is True
+
+
+def test_stage_applies_only_after_commit():
+    """stage한 값은 commit 후 반영, rollback 시 버림"""
+    row = SimpleNamespace(profile_id=7, speed_case1=4.567, speed_case2=3.9, data_points_count=5)
+    speed_profile_cache.set(99, "walking", _profile())
+
+    session = Session()
+    session.begin()  # 실제로는 프로필 UPDATE/INSERT로 트랜잭션이 이미 시작된 상태
+    speed_profile_cache.stage(session, 99, "walking", row)
+    assert speed_profile_cache.lookup(99, "walking")[0] is False  # 예전 값은 바로 삭제
+    session.commit()
+    assert speed_profile_cache.lookup(99, "walking") == (
+        True,
+        CachedSpeedProfile(7, 4.57, 3.9, 5),
+    )
+
+    session.begin()
+    speed_profile_cache.stage(session, 99, "walking", SimpleNamespace(**{**vars(row), "speed_case1": 6.0}))
+    session.rollback()
+    assert speed_profile_cache.lookup(99, "walking")[0] is False
+    session.commit()
+    assert speed_profile_cache.lookup(99, "walking")[0] is False  # rollback된 값은 이후 commit에도 반영 안 됨
+
+    session.close()
+    speed_profile_cache.invalidate(99)
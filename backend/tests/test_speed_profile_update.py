@@ -0,0 +1,57 @@
+"""
+속도 프로필 가중 평균 갱신 + 이력 기록 테스트 (메모리 SQLite)
+"""
+
+from sqlalchemy import insert
+
+from app import crud
+from app.models import ActivitySpeedProfile, SpeedHistory
+
+
+def _user(db_session):
+    return crud.create_user(db_session, username="walker", email="walker@example.com", password_hash="x")
+
+
+def test_out_of_range_speed_updates_profile_without_history(db_session):
+    """이력 허용 범위(2~8 km/h) 밖의 속도는 잘라서 기록하지 않고 이력만 생략, 프로필에는 그대로 반영"""
+    user_id = _user(db_session).user_id
+
+    crud.update_speed_profile_with_weighted_avg(db_session, user_id, "walking", 5.0)
+    row = crud.update_speed_profile_with_weighted_avg(db_session, user_id, "walking", 9.5)
+
+    # 첫 로그 5.0 (INSERT) → 두 번째 로그 알파 get_alpha(1) = 0.5
+    assert float(row.speed_case1) == 7.25
+    assert row.data_points_count == 2
+    assert [float(h.measured_speed_kmh) for h in db_session.query(SpeedHistory)] == [5.0]
+
+
+def test_insert_race_falls_back_to_update(db_session, monkeypatch):
+    """UPDATE 시점에 없던 프로필을 다른 요청이 먼저 만들면(IntegrityError) 그 프로필을 가중 평균으로 갱신"""
+    user_id = _user(db_session).user_id
+    real_execute = db_session.execute
+    calls = []
+
+    class _NoRow:
+        def first(self):
+            return None
+
+    def racing_execute(statement, *args, **kwargs):
+        calls.append(statement)
+        if len(calls) == 1:
+            # 첫 UPDATE 직전에 다른 요청이 프로필을 만든 것처럼 행을 넣고, UPDATE는 0행으로 처리
+            real_execute(insert(ActivitySpeedProfile).values(
+                user_id=user_id, activity_type="walking", speed_case1=4.0, speed_case2=3.4, data_points_count=1,
+            ))
+            return _NoRow()
+        return real_execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db_session, "execute", racing_execute)
+    row = crud.update_speed_profile_with_weighted_avg(db_session, user_id, "walking", 5.0)
+    monkeypatch.undo()
+
+    # UPDATE(0행) → INSERT(IntegrityError) → UPDATE 다시 (4.0 * 0.5 + 5.0 * 0.5)
+    assert len(calls) == 3
+    assert float(row.speed_case1) == 4.5
+    assert row.data_points_count == 2
+    assert db_session.query(ActivitySpeedProfile).count() == 1
+    assert db_session.query(SpeedHistory).count() == 1
@@ -0,0 +1,57 @@
+"""
+속도 프로필 일괄 재계산 테스트
+"""
+
+import numpy as np
+
+from app import crud
+from app.crud import get_alpha
+from app.utils.Factors_Affecting_Walking_Speed import (
+    reverse_calculate_base_speed,
+    reverse_calculate_base_speeds,
+)
+from app.utils.speed_recalibration import alphas_for_counts, replay_weighted_average
+
+
+def test_replay_matches_live_updates_from_registration(db_client, db_session):
+    """회원가입 기본 프로필에서 시작한 실시간 갱신(crud) 결과와 재계산 결과가 같음 (프로필 없던 사용자 포함)"""
+    rng = np.random.default_rng(7)
+    log_counts = {}
+    for name, count in (("walker1", 1), ("walker2", 4), ("walker3", 25)):
+        response = db_client.post(
+            "/api/auth/register",
+            json={"username": name, "email": f"{name}@example.com", "password": "secret123"},
+        )
+        assert response.status_code == 201
+        log_counts[crud.get_user_by_username(db_session, name).user_id] = count
+    # 회원가입을 거치지 않아 프로필이 없는 사용자 (첫 로그는 INSERT)
+    unseeded = crud.create_user(db_session, username="legacy", email="legacy@example.com", password_hash="x")
+    log_counts[unseeded.user_id] = 4
+
+    user_ids = np.repeat(list(log_counts), list(log_counts.values()))
+    speeds = rng.uniform(3.0, 6.0, len(user_ids))
+    for user_id, speed in zip(user_ids.tolist(), speeds.tolist()):
+        crud.update_speed_profile_with_weighted_avg(db_session, user_id, "walking", speed)
+
+    seeded = [user_id for user_id in log_counts if user_id != unseeded.user_id]
+    replayed = replay_weighted_average(user_ids, speeds, seeded_user_ids=seeded)
+
+    assert replayed.user_id.tolist() == sorted(log_counts)
+    for user_id, speed, count in zip(replayed.user_id, replayed.speed_kmh, replayed.data_points_count):
+        (profile,) = crud.get_speed_profile_by_user(db_session, int(user_id))
+        assert profile.data_points_count == count == log_counts[user_id]
+        # 실시간 갱신은 매번 소수 2자리로 반올림
+        assert abs(float(profile.speed_case1) - speed) < 0.02
+
+
+def test_vectorized_rules_match_scalar_functions():
+    """배열 버전 알파/역산이 기존 함수와 같음"""
+    counts = np.arange(0, 80)
+    assert alphas_for_counts(counts).tolist() == [get_alpha(int(c)) for c in counts]
+
+    real = np.array([3.2, 0.0, 9.5, 1.0])
+    slope = np.array([1.25, 1.0, 1.0, 1.1])
+    weather = np.array([1.15, 1.0, 1.2, 1.0])
+    expected = [reverse_calculate_base_speed(*values) for values in zip(real, slope, weather)]
+    assert np.allclose(reverse_calculate_base_speeds(real, slope, weather), expected)
+    assert len(replay_weighted_average(np.array([]), np.array([]))) == 0
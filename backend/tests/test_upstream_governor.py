@@ -0,0 +1,162 @@
+"""
+외부 API 호출 제어 (토큰 버킷, 우선순위, 회로 차단기) 테스트
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.upstream_governor import (
+    BATCH,
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    UpstreamGovernor,
+    UpstreamUnavailableError,
+)
+
+
+async def _call(governor, fail=False, priority="interactive", exc=None):
+    async with governor.request(api_key="key", priority=priority):
+        if exc is not None:
+            raise exc
+        if fail:
+            raise RuntimeError("upstream down")
+
+
+def test_circuit_opens_fails_fast_and_recovers():
+    """연속 실패 시 회로가 열려 호출 없이 거절, open 시간이 지나면 시험 호출 성공으로 복구"""
+    governor = UpstreamGovernor("test", rate_per_second=100, burst=100, failure_threshold=2, open_seconds=0.05)
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await _call(governor, fail=True)
+        assert governor.breaker.state == OPEN
+
+        with pytest.raises(UpstreamUnavailableError) as rejected:
+            await _call(governor)
+        assert rejected.value.reason == "circuit_open"
+
+        await asyncio.sleep(0.06)
+        assert governor.stats()["circuit"]["state"] == HALF_OPEN
+        await _call(governor)
+
+    asyncio.run(scenario())
+    assert governor.breaker.state == CLOSED
+    assert governor.stats()["rejected"]["circuit_open"] == 1
+
+
+def test_client_errors_do_not_open_circuit():
+    """요청이 잘못된 4xx 응답은 장애로 세지 않음 (5xx/429는 셈)"""
+    governor = UpstreamGovernor("test", rate_per_second=100, burst=100, failure_threshold=1)
+
+    async def scenario():
+        with pytest.raises(HTTPException):
+            await _call(governor, exc=HTTPException(status_code=404))
+        assert governor.breaker.state == CLOSED
+        with pytest.raises(HTTPException):
+            await _call(governor, exc=HTTPException(status_code=503))
+
+    asyncio.run(scenario())
+    assert governor.breaker.state == OPEN
+
+
+def test_batch_keeps_reserve_for_interactive():
+    """batch는 버킷 여유분만 쓰고 대기 없이 거절, interactive는 남은 토큰 사용"""
+    governor = UpstreamGovernor("test", rate_per_second=0.001, burst=4, max_wait=0)
+
+    async def scenario():
+        results = []
+        for _ in range(4):
+            try:
+                await _call(governor, priority=BATCH)
+                results.append("ok")
+            except UpstreamUnavailableError as e:
+                results.append(e.reason)
+        await _call(governor)
+        await _call(governor)
+        with pytest.raises(UpstreamUnavailableError):
+            await _call(governor)
+        return results
+
+    assert asyncio.run(scenario()) == ["ok", "ok", "rate_limited", "rate_limited"]
+    assert governor.stats()["calls"] == {"interactive": 2, "batch": 2}
+
+
+def test_daily_quota_limits_batch_first():
+    """batch는 일일 한도의 절반까지만, interactive는 한도까지"""
+    governor = UpstreamGovernor("test", rate_per_second=1000, burst=1000, daily_quota=4)
+
+    async def scenario():
+        await _call(governor, priority=BATCH)
+        await _call(governor, priority=BATCH)
+        with pytest.raises(UpstreamUnavailableError) as rejected:
+            await _call(governor, priority=BATCH)
+        assert rejected.value.reason == "quota_exceeded"
+        await _call(governor)
+        await _call(governor)
+        with pytest.raises(UpstreamUnavailableError):
+            await _call(governor)
+
+    asyncio.run(scenario())
+
+
+def test_kma_retry_backoff_releases_call_slot(monkeypatch):
+    """KMA 504 재시도 대기 중에는 호출 슬롯과 세션을 잡고 있지 않음"""
+    from app.routers import weather
+
+    governor = UpstreamGovernor("kma", rate_per_second=100, burst=100, failure_threshold=5)
+    monkeypatch.setattr(weather, "kma_governor", governor)
+    statuses = [504, 200]
+    open_sessions = []
+
+    class _Response:
+        def __init__(self, status):
+            self.status = status
+            self.reason = "Gateway Timeout" if status == 504 else "OK"
+
+        async def text(self):
+            return '{"response": {}}'
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    class _Session:
+        def __init__(self, **kwargs):
+            pass
+
+        def get(self, url, params=None):
+            return _Response(statuses.pop(0))
+
+        async def __aenter__(self):
+            open_sessions.append(self)
+            return self
+
+        async def __aexit__(self, *exc_info):
+            open_sessions.remove(self)
+            return False
+
+    during_backoff = []
+    real_sleep = asyncio.sleep
+
+    async def recording_sleep(seconds):
+        during_backoff.append((governor.stats()["in_flight"], len(open_sessions)))
+        await real_sleep(0)
+
+    monkeypatch.setattr(weather.aiohttp, "ClientSession", _Session)
+    monkeypatch.setattr(weather.asyncio, "sleep", recording_sleep)
+
+    result = asyncio.run(weather.proxy_kma_weather(
+        lat=37.5, lon=127.0, num_of_rows=60, page_no=1, data_type="JSON",
+        base_date="20261019", base_time="0500", service_key="key", use_cache=False,
+    ))
+
+    assert result["raw"] == {"response": {}}
+    assert statuses == []
+    assert during_backoff == [(0, 0)]
+    assert governor.stats()["in_flight"] == 0
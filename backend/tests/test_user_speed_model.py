@@ -0,0 +1,76 @@
+"""
+사용자 경사도/날씨 민감도 온라인 회귀 모델 테스트
+"""
+
+import math
+
+import numpy as np
+
+from app.utils.user_speed_model import (
+    MIN_MODEL_LOGS,
+    PersonalSpeedModel,
+    SpeedModelStats,
+    speed_features,
+)
+
+
+def _observations(slope_exponent, precipitation_coef, count=40, seed=3):
+    """기준 속도 4.8 km/h, 지정한 민감도로 걸은 사용자의 (slope_factor, 기온, 강수, 역산 기준 속도)"""
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        slope_factor = float(rng.uniform(0.95, 1.5))
+        temperature = float(rng.uniform(-5, 30))
+        precipitation = float(rng.choice([0, 0, 0, 2, 8]))
+        weather_factor = 1.0
+        time_factor = slope_factor ** slope_exponent * math.exp(
+            precipitation_coef * math.log1p(precipitation)
+        )
+        real_speed = 4.8 / time_factor * float(rng.normal(1.0, 0.01))
+        yield slope_factor, temperature, precipitation, real_speed * slope_factor * weather_factor
+
+
+def test_incremental_stats_match_batch_least_squares():
+    """관측을 하나씩 더한 통계량이 전체 행렬로 계산한 값과 같고, 직렬화해도 유지"""
+    stats = SpeedModelStats()
+    xs, ys = [], []
+    for slope_factor, temperature, precipitation, base_speed in _observations(1.0, 0.0):
+        x = speed_features(slope_factor, temperature, precipitation)
+        stats.add(x, math.log(base_speed))
+        xs.append(x)
+        ys.append(math.log(base_speed))
+
+    X, y = np.array(xs), np.array(ys)
+    assert np.allclose(stats.xtx, X.T @ X)
+    assert np.allclose(stats.xty, X.T @ y)
+
+    restored = SpeedModelStats.from_bytes(stats.to_bytes())
+    assert restored.n == stats.n
+    assert np.allclose(restored.xtx, stats.xtx)
+    assert np.allclose(restored.solve(), stats.solve())
+
+
+def test_model_learns_personal_sensitivity():
+    """오르막/비에 더 느려지는 사용자의 민감도를 학습하고 경로 계수에 반영"""
+    stats = SpeedModelStats()
+    for slope_factor, temperature, precipitation, base_speed in _observations(1.6, 0.1, count=200):
+        stats.add(speed_features(slope_factor, temperature, precipitation), math.log(base_speed))
+    model = PersonalSpeedModel.from_stats(stats)
+
+    assert abs(model.base_speed_kmh - 4.8) < 0.1
+    assert abs(model.slope_exponent - 1.6) < 0.1
+    assert abs(model.precipitation_coef - 0.1) < 0.03
+    assert abs(model.temperature_coef) < 0.03
+    assert model.personalize_slope_factor(1.2) > 1.2
+    assert model.personalize_weather_factor(1.0, {"temp_c": 10, "rain_mm_per_h": 8}) > 1.0
+
+
+def test_few_logs_keep_population_factors():
+    """로그가 적으면 모집단 계수를 그대로 사용"""
+    stats = SpeedModelStats()
+    for slope_factor, temperature, precipitation, base_speed in _observations(1.6, 0.1, count=MIN_MODEL_LOGS - 1):
+        stats.add(speed_features(slope_factor, temperature, precipitation), math.log(base_speed))
+    model = PersonalSpeedModel.from_stats(stats)
+
+    assert not model.is_active
+    assert model.personalize_slope_factor(1.2) == 1.2
+    assert model.personalize_weather_factor(1.1, {"temp_c": 0}) == 1.1
@@ -0,0 +1,91 @@
+"""
+보행자 경로 스트리밍 응답 테스트 (Tmap/Google Elevation API는 가짜 함수로 대체)
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.utils import elevation_helpers, walking_only
+
+TMAP_ROUTE = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "geometry": {
+                "type": "LineString",
+                "coordinates": [[126.9706, 37.5547], [126.9730, 37.5530], [126.9760, 37.5500]],
+            },
+            "properties": {"distance": 600, "name": "길", "totalDistance": 600, "totalTime": 500},
+        }
+    ],
+}
+
+
+def test_stream_emits_route_first_then_eta(client, monkeypatch):
+    """route → crosswalks → eta 순서, 최종 결과(구간별 분석 포함)는 /walking/route와 동일"""
+
+    async def fake_tmap(request):
+        return TMAP_ROUTE
+
+    async def fake_elevation(coords, api_key, priority="interactive"):
+        return [5.0 * i for i in range(len(coords))]
+
+    monkeypatch.setenv("GOOGLE_ELEVATION_API_KEY", "test")
+    monkeypatch.setattr(walking_only, "_fetch_pedestrian_route", fake_tmap)
+    monkeypatch.setattr(elevation_helpers, "call_google_elevation_api", fake_elevation)
+    elevation_helpers.elevation_cache.clear()
+
+    body = {"start_x": 126.9706, "start_y": 37.5547, "end_x": 126.9760, "end_y": 37.5500}
+    response = client.post("/api/walking/route/stream", json=body)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["route", "crosswalks", "eta"]
+    assert "elevation_analysis" not in events[0]
+    assert events[0]["properties"]["totalDistance"] == 600
+
+    plain = client.post("/api/walking/route", json=body).json()
+    assert events[-1]["elevation_analysis"]["total_adjusted_walk_time"] == (
+        plain["elevation_analysis"]["total_adjusted_walk_time"]
+    )
+    assert events[0]["features"] == plain["features"]
+    assert len(events[-1]["elevation_analysis"]["walk_legs_analysis"]) == 1
+
+
+def test_route_and_crosswalk_events_do_not_wait_for_elevation(monkeypatch):
+    """경로/횡단보도 이벤트는 고도 조회 전에 나오고, eta는 고도 조회가 끝난 뒤에만 나옴"""
+    monkeypatch.setenv("GOOGLE_ELEVATION_API_KEY", "test")
+    elevation_helpers.elevation_cache.clear()
+
+    async def scenario():
+        released = asyncio.Event()
+        requested = []
+
+        async def slow_elevation(coords, api_key, priority="interactive"):
+            requested.append(len(coords))
+            await released.wait()
+            return [5.0 * i for i in range(len(coords))]
+
+        monkeypatch.setattr(elevation_helpers, "call_google_elevation_api", slow_elevation)
+        request = walking_only.WalkingRouteRequest(start_x=126.9706, start_y=37.5547, end_x=126.9760, end_y=37.5500)
+        stream = walking_only._stream_route_analysis(request, walking_only._build_route_body(request, TMAP_ROUTE))
+
+        assert json.loads(await stream.__anext__())["event"] == "route"
+        assert json.loads(await stream.__anext__())["event"] == "crosswalks"
+        assert requested == []
+
+        eta = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.05)
+        assert requested and not eta.done()  # 고도 조회 중에는 다음 이벤트 없음
+
+        released.set()
+        event = json.loads(await eta)
+        assert event["event"] == "eta"
+        assert event["elevation_analysis"]["walk_legs_analysis"]
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+
+    asyncio.run(scenario())
@@ -0,0 +1,105 @@
+"""
+워커 풀 대기열 제한 / 과부하 응답 테스트
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+import app.database
+from app.utils.auth_utils import create_access_token
+from app.utils.principal_cache import principal_cache
+from app.utils.worker_pool import BoundedExecutor, WorkerPoolBusyError
+
+
+def test_busy_db_executor_returns_503_with_retry_after(client, monkeypatch):
+    """DB 실행기 대기열이 가득 차면 어느 라우터든 500이 아니라 503 + Retry-After"""
+
+    async def busy(func, *args, **kwargs):
+        raise WorkerPoolBusyError("db 작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+
+    monkeypatch.setattr(app.database.db_executor, "run", busy)
+    principal_cache.clear()
+    token = create_access_token(data={"sub": "1"})
+    for method, path, kwargs in (
+        ("GET", "/api/navigation/logs", {"params": {"user_id": 1}}),
+        # 인증 의존성(사용자 조회)에서 거절
+        ("GET", "/api/profile/speed", {"headers": {"Authorization": f"Bearer {token}"}}),
+        ("POST", "/api/auth/login", {"json": {"email": "walker@example.com", "password": "secret123"}}),
+    ):
+        response = client.request(method, path, **kwargs)
+        assert response.status_code == 503, path
+        assert response.headers["Retry-After"] == "1"
+        assert "대기열" in response.json()["detail"]
+
+
+def test_saturation_rejects_then_releases_on_completion():
+    """(워커 + 대기열) 개를 넘는 작업은 queue_timeout 후 거절, 작업이 끝나면 자리 반납"""
+    pool = BoundedExecutor("test", max_workers=1, max_pending=1, queue_timeout=0.05)
+    gate = threading.Event()
+
+    async def scenario():
+        running = [asyncio.create_task(pool.run(gate.wait)) for _ in range(pool.capacity)]
+        await asyncio.sleep(0.01)
+        assert pool.stats()["in_flight"] == 2
+
+        with pytest.raises(WorkerPoolBusyError):
+            await pool.run(lambda: "too many")
+
+        gate.set()
+        assert await asyncio.gather(*running) == [True, True]
+        return await pool.run(lambda: "after release")
+
+    try:
+        assert asyncio.run(scenario()) == "after release"
+        stats = pool.stats()
+        assert (stats["in_flight"], stats["completed"], stats["rejected"]) == (0, 3, 1)
+    finally:
+        gate.set()
+        pool.shutdown()
+
+
+def test_cancelled_caller_keeps_slot_until_job_finishes():
+    """기다리던 요청이 취소되어도 풀에서 실행 중인 작업이 끝날 때까지 자리는 반납되지 않음"""
+    pool = BoundedExecutor("test", max_workers=1, max_pending=0, queue_timeout=0.05)
+    started, gate = threading.Event(), threading.Event()
+
+    def blocking_job():
+        started.set()
+        gate.wait()
+
+    async def scenario():
+        caller = asyncio.create_task(pool.run(blocking_job))
+        await asyncio.to_thread(started.wait)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        # 작업은 아직 스레드에서 실행 중 → 자리 없음 (자리를 일찍 반납하면 풀에서 멈추므로 시간 제한)
+        with pytest.raises(WorkerPoolBusyError):
+            await asyncio.wait_for(pool.run(lambda: "while running"), timeout=1)
+
+        gate.set()
+        await asyncio.sleep(0.05)
+        return await pool.run(lambda: "after finish")
+
+    try:
+        assert asyncio.run(scenario()) == "after finish"
+    finally:
+        gate.set()
+        pool.shutdown()
+
+
+def test_inline_mode_and_per_loop_semaphore():
+    """inline은 호출한 스레드에서 바로 실행, 풀은 다른 이벤트 루프에서도 다시 사용 가능"""
+    inline = BoundedExecutor("test", kind="inline")
+    assert asyncio.run(inline.run(threading.get_ident)) == threading.get_ident()
+    assert inline.stats()["completed"] == 0
+
+    pool = BoundedExecutor("test", max_workers=1, max_pending=0)
+    try:
+        for _ in range(2):  # asyncio.run마다 새 루프 → 루프별 세마포어
+            assert asyncio.run(pool.run(threading.get_ident)) != threading.get_ident()
+    finally:
+        pool.shutdown()